@@ -0,0 +1,50 @@
+"""API routes for background transcription jobs"""
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+
+from app.business.job_service import TranscriptionJobService
+from app.business.transcription_service import FileTooLargeError
+from app.business.service_registry import service_registry
+from app.models.schemas import JobResponse
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def get_job_service() -> TranscriptionJobService:
+    """Dependency injection for job service (shared per worker)"""
+    return service_registry.job_service
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    language: Optional[str] = Query(None, description="Language code (e.g., 'he' for Hebrew, 'en' for English). If None, auto-detect."),
+    job_service: TranscriptionJobService = Depends(get_job_service)
+):
+    """
+    Upload an audio file (mp3/wav) and queue it for background processing
+    
+    Returns immediately with a job id. Poll GET /api/jobs/{job_id} for status and results.
+    """
+    try:
+        return await job_service.submit(file, language=language)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Job submission error: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    job_service: TranscriptionJobService = Depends(get_job_service)
+):
+    """
+    Get job status, and the transcription result once completed
+    """
+    job = await job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
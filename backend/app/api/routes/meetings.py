@@ -0,0 +1,218 @@
+"""API routes for stored meetings"""
+import asyncio
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+
+from app.api.routes.transcription import (
+    get_transcription_service, get_word_export_service, rate_limit_error, resolve_exporter, text_export_response,
+    word_document_response
+)
+from app.business.service_registry import service_registry
+from app.business.transcription_service import TranscriptionBusinessService
+from app.utils.rate_limiter import RateLimitExceededError
+from app.services.exporters import ExportDocument
+from app.services.word_export_service import WordExportService
+from app.storage.meeting_store import MeetingStore
+from app.models.schemas import (
+    MeetingListResponse, MeetingResponse, MeetingSummary, ReanalyzeRequest, ReanalyzeResponse,
+    SearchHit, SearchResponse, SegmentPage
+)
+
+router = APIRouter(prefix="/api", tags=["meetings"])
+
+
+def get_meeting_store() -> Optional[MeetingStore]:
+    """Dependency injection for the meeting store (None when disabled)"""
+    return service_registry.meeting_store
+
+
+def require_store(meeting_store: Optional[MeetingStore]) -> MeetingStore:
+    if meeting_store is None:
+        raise HTTPException(status_code=503, detail="Meeting store is disabled")
+    return meeting_store
+
+
+async def load_meeting(meeting_store: Optional[MeetingStore], meeting_id: str, with_segments: bool = False) -> dict:
+    """Fetch a meeting off the event loop, or raise 404"""
+    store = require_store(meeting_store)
+    loop = asyncio.get_running_loop()
+    meeting = await loop.run_in_executor(None, store.get, meeting_id, with_segments)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail=f"Meeting not found: {meeting_id}")
+    return meeting
+
+
+@router.get("/meetings", response_model=MeetingListResponse)
+async def list_meetings(
+    limit: int = Query(20, ge=1, le=100, description="Meetings per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    participant: Optional[str] = Query(None, description="Only meetings with this participant"),
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store)
+):
+    """
+    List stored meetings, newest first
+
+    Pages are cursor-based: pass next_cursor back as ?cursor= until it is null.
+    """
+    store = require_store(meeting_store)
+    try:
+        loop = asyncio.get_running_loop()
+        meetings, next_cursor = await loop.run_in_executor(None, store.list, limit, cursor, participant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MeetingListResponse(
+        items=[MeetingSummary(meeting_id=meeting.pop("id"), **meeting) for meeting in meetings],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_meetings(
+    q: str = Query(..., min_length=1, description='Words to find; "quoted phrase" and prefix* are supported'),
+    limit: int = Query(20, ge=1, le=100, description="Results per page"),
+    offset: int = Query(0, ge=0, description="Results to skip"),
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store)
+):
+    """
+    Search stored meetings' transcripts, summaries, decisions and action items
+    
+    Results are ranked by relevance, with decisions and summaries weighted
+    above the transcript, and each carries a snippet of the best match.
+    """
+    store = require_store(meeting_store)
+    try:
+        loop = asyncio.get_running_loop()
+        hits, total = await loop.run_in_executor(None, store.search, q, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_offset = offset + len(hits)
+    return SearchResponse(
+        items=[SearchHit(meeting_id=hit.pop("id"), **hit) for hit in hits],
+        total=total,
+        next_offset=next_offset if next_offset < total else None
+    )
+
+
+@router.get("/meetings/{meeting_id}", response_model=MeetingResponse)
+async def get_meeting(
+    meeting_id: str,
+    segments: bool = Query(False, description="Include timed transcript segments"),
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store)
+):
+    """
+    Get a stored meeting's transcription and analysis
+    """
+    meeting = await load_meeting(meeting_store, meeting_id, with_segments=segments)
+    return MeetingResponse(meeting_id=meeting.pop("id"), **meeting)
+
+
+@router.get("/meetings/{meeting_id}/segments", response_model=SegmentPage)
+async def get_meeting_segments(
+    meeting_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first segment"),
+    limit: int = Query(100, ge=1, le=1000, description="Segments per page"),
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store)
+):
+    """
+    Page through a stored meeting's timed segments
+    """
+    store = require_store(meeting_store)
+    loop = asyncio.get_running_loop()
+    page = await loop.run_in_executor(None, store.segments, meeting_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail=f"No segments stored for meeting: {meeting_id}")
+    items, total = page
+    next_offset = offset + len(items)
+    return SegmentPage(items=items, total=total, next_offset=next_offset if next_offset < total else None)
+
+
+@router.get("/meetings/{meeting_id}/export")
+async def export_meeting(
+    meeting_id: str,
+    export_format: str = Query("docx", alias="format", description="Export format: 'docx', 'markdown', 'html', 'srt', 'vtt' or 'jsonl'"),
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store),
+    word_service: WordExportService = Depends(get_word_export_service)
+):
+    """
+    Export a stored meeting to a Word document, or another format
+    
+    The same document as POST /api/export, without sending the transcript back.
+    Subtitle and JSON-lines exports use the stored segments' timestamps.
+    """
+    exporter = resolve_exporter(export_format) if export_format != "docx" else None
+    with_segments = exporter is not None and exporter.uses_segments
+    meeting = await load_meeting(meeting_store, meeting_id, with_segments=with_segments)
+    result = meeting["result"]
+    filename = os.path.splitext(meeting["filename"])[0] if meeting["filename"] else "meeting_transcription"
+    if exporter is not None:
+        return text_export_response(
+            exporter,
+            filename=filename,
+            document=ExportDocument(
+                transcription=result.transcription,
+                summary=result.summary,
+                participants=result.participants,
+                decisions=result.decisions,
+                action_items=result.action_items,
+                segments=result.segments
+            )
+        )
+    try:
+        return await word_document_response(
+            word_service,
+            filename=filename,
+            transcription=result.transcription,
+            summary=result.summary,
+            participants=result.participants,
+            decisions=result.decisions,
+            action_items=result.action_items
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+
+
+@router.post("/meetings/{meeting_id}/reanalyze", response_model=ReanalyzeResponse)
+async def reanalyze_meeting(
+    meeting_id: str,
+    request: ReanalyzeRequest,
+    analysis_backend: Optional[str] = Query(None, description="Analysis backend (e.g., 'groq', 'local')"),
+    service: TranscriptionBusinessService = Depends(get_transcription_service)
+):
+    """
+    Refresh a stored meeting's summary, decisions and action items after a transcript edit
+    
+    Send the whole edited transcript. Only the transcript segments the edit
+    touches are analyzed again, then the partial results are merged, so
+    correcting a few names in a long meeting takes seconds.
+    """
+    require_store(service.meeting_store)
+    try:
+        reanalysis = await service.reanalyze_meeting(meeting_id, request.transcription, analysis_backend)
+    except RateLimitExceededError as e:
+        raise rate_limit_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+    if reanalysis is None:
+        raise HTTPException(status_code=404, detail=f"Meeting not found: {meeting_id}")
+    result, reanalyzed, total = reanalysis
+    return ReanalyzeResponse(
+        meeting_id=meeting_id, result=result, reanalyzed_segments=reanalyzed, total_segments=total
+    )
+
+
+@router.delete("/meetings/{meeting_id}", status_code=204)
+async def delete_meeting(
+    meeting_id: str,
+    meeting_store: Optional[MeetingStore] = Depends(get_meeting_store)
+):
+    """
+    Delete a stored meeting
+    """
+    store = require_store(meeting_store)
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, store.delete, meeting_id):
+        raise HTTPException(status_code=404, detail=f"Meeting not found: {meeting_id}")
+    return Response(status_code=204)
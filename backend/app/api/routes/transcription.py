@@ -1,30 +1,93 @@
 """API routes for transcription endpoints"""
+import asyncio
+import functools
 import json
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+import math
+import os
+import re
+from typing import List, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from app.business.transcription_service import TranscriptionBusinessService
-from app.services.word_export_service import WordExportService
-from app.models.schemas import TranscriptionResponse, ActionItem, ExportRequest
+from app.business.transcription_service import TranscriptionBusinessService, FileTooLargeError
+from app.business.service_registry import service_registry
+from app.business.batch_service import BatchTranscriptionService, parse_manifest
+from app.services.exporters import ExportDocument, Exporter, get_exporter
+from app.services.word_export_service import WordExportService, get_export_executor, iter_document_chunks
+from app.storage.analysis_cache import AnalysisCache
+from app.storage.result_cache import ResultCache
+from app.utils.rate_limiter import RateLimitExceededError
+from app.models.schemas import TranscriptionResponse, ActionItem, ExportRequest, BatchResponse
 
 router = APIRouter(prefix="/api", tags=["transcription"])
 
 
 def get_transcription_service() -> TranscriptionBusinessService:
-    """Dependency injection for transcription service"""
-    return TranscriptionBusinessService()
+    """Dependency injection for transcription service (shared per worker)"""
+    return service_registry.transcription_service
+
+
+def get_batch_service() -> BatchTranscriptionService:
+    """Dependency injection for batch service (shared per worker)"""
+    return service_registry.batch_service
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Dependency injection for the result cache (None when disabled)"""
+    return service_registry.result_cache
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Dependency injection for the analysis cache (None when disabled)"""
+    return service_registry.analysis_cache
 
 
 def get_word_export_service() -> WordExportService:
-    """Dependency injection for word export service"""
-    return WordExportService()
+    """Dependency injection for word export service (shared per worker)"""
+    return service_registry.word_export_service
+
+
+def attachment_header(filename: str) -> str:
+    """
+    Content-Disposition for a download, safe for any file name
+    
+    Header values are sent as latin-1, so the real name goes in an RFC 5987
+    filename* parameter (UTF-8, percent-encoded) and filename= carries an
+    ASCII stand-in for old clients. Quotes, backslashes and control characters
+    are dropped.
+    
+    Args:
+        filename: Download name with extension
+    
+    Returns:
+        Header value
+    """
+    name = re.sub(r'["\\\x00-\x1f\x7f]', "", filename)
+    fallback = name.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+
+def remove_file(path: str) -> None:
+    """Delete a saved upload if it is still there"""
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def rate_limit_error(error: RateLimitExceededError) -> HTTPException:
+    """429 for a provider that stayed rate limited, telling the client when to retry"""
+    headers = {"Retry-After": str(math.ceil(error.retry_after))} if error.retry_after is not None else None
+    return HTTPException(status_code=429, detail=str(error), headers=headers)
 
 
 @router.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
     file: UploadFile = File(...),
     language: Optional[str] = Query(None, description="Language code (e.g., 'he' for Hebrew, 'en' for English). If None, auto-detect."),
+    backend: Optional[str] = Query(None, description="Transcription backend ('openai' or 'local'). If None, uses TRANSCRIPTION_BACKEND."),
+    analysis_backend: Optional[str] = Query(None, description="Analysis backend ('groq' or 'local'). If None, routed by transcript size and load."),
+    segments: bool = Query(False, description="Include timed transcript segments (start, end, text, confidence)"),
     transcription_service: TranscriptionBusinessService = Depends(get_transcription_service)
 ):
     """
@@ -36,41 +99,251 @@ async def transcribe_audio(
     Returns transcription, summary, participants, decisions, and action items
     """
     try:
-        result = await transcription_service.process_audio_file(file, language=language)
+        result = await transcription_service.process_audio_file(
+            file, language=language, backend=backend, analysis_backend=analysis_backend,
+            with_segments=segments
+        )
         return result
+    except RateLimitExceededError as e:
+        raise rate_limit_error(e)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
 
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    file: UploadFile = File(...),
+    language: Optional[str] = Query(None, description="Language code (e.g., 'he' for Hebrew, 'en' for English). If None, auto-detect."),
+    backend: Optional[str] = Query(None, description="Transcription backend ('openai' or 'local'). If None, uses TRANSCRIPTION_BACKEND."),
+    analysis_backend: Optional[str] = Query(None, description="Analysis backend ('groq' or 'local'). If None, routed by transcript size and load."),
+    segments: bool = Query(False, description="Include timed transcript segments (start, end, text, confidence)"),
+    transcription_service: TranscriptionBusinessService = Depends(get_transcription_service)
+):
+    """
+    Upload and process an audio file (mp3/wav), streaming progress as Server-Sent Events
+    
+    Events: upload_received, audio_preprocessed (bytes saved, when enabled),
+    chunk_transcribed (per chunk, with its text), transcription_complete,
+    analysis_started, analysis_segment (per map-stage segment on long meetings), section
+    (summary, participants, decisions, action_items), then result or error.
+    """
+    # Save the upload before streaming starts so validation errors are plain HTTP errors
+    try:
+        transcription_service.validate_backends(backend, analysis_backend)
+        audio_file_path, content_hash = await transcription_service.ingest_upload(file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        async for event, data in transcription_service.stream_audio_path(
+            audio_file_path, language=language, content_hash=content_hash,
+            backend=backend, analysis_backend=analysis_backend, with_segments=segments,
+            filename=file.filename
+        ):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    # The stream deletes the upload when it ends, but it never starts if the
+    # client disconnects first; the background task runs either way
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(remove_file, audio_file_path)
+    )
+
+
+@router.post("/transcribe/batch", response_model=BatchResponse)
+async def transcribe_batch(
+    files: List[UploadFile] = File([], description="Recordings to process"),
+    manifest: Optional[str] = Form(None, description="JSON list of server-side paths (or {\"paths\": [...]}) under BATCH_MANIFEST_ROOT"),
+    language: Optional[str] = Query(None, description="Language code for every recording. If None, auto-detect."),
+    wait: bool = Query(False, description="Process now and return results. If false, queue background jobs and return their ids."),
+    concurrency: Optional[int] = Query(None, ge=1, description="Recordings processed at once when waiting (capped by BATCH_MAX_CONCURRENCY)"),
+    backend: Optional[str] = Query(None, description="Transcription backend when waiting ('openai' or 'local')"),
+    analysis_backend: Optional[str] = Query(None, description="Analysis backend when waiting. If None, routed as batch work."),
+    batch_service: BatchTranscriptionService = Depends(get_batch_service)
+):
+    """
+    Process many recordings (mp3/wav) at once: uploaded files, a manifest of server paths, or both
+    
+    With wait=false (default) every recording becomes a background job - poll
+    GET /api/jobs/{job_id}. With wait=true they run now, a bounded number at a
+    time, and the response holds every result; one failed recording does not
+    fail the batch.
+    """
+    try:
+        paths = parse_manifest(manifest) if manifest else []
+        if wait:
+            return await batch_service.run(
+                files or [], paths, language=language, backend=backend,
+                analysis_backend=analysis_backend, concurrency=concurrency
+            )
+        return await batch_service.submit(files or [], paths, language=language)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch error: {str(e)}")
+
+
+@router.get("/cache/stats")
+async def cache_stats(result_cache: Optional[ResultCache] = Depends(get_result_cache)):
+    """
+    Result cache hit/miss counters
+    
+    Repeated uploads of the same recording (same language and models) are served from the cache
+    """
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+
+@router.get("/cache/analysis/stats")
+async def analysis_cache_stats(analysis_cache: Optional[AnalysisCache] = Depends(get_analysis_cache)):
+    """
+    Analysis cache hit/miss counters for the memory and disk tiers
+    
+    Transcripts (and map-reduce segments) already analyzed with the same prompt, model and
+    language are not sent to the LLM again
+    """
+    if analysis_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **analysis_cache.stats()}
+
+
+@router.get("/preprocessing/stats")
+async def preprocessing_stats(
+    transcription_service: TranscriptionBusinessService = Depends(get_transcription_service)
+):
+    """
+    Audio preprocessing totals: upload bytes saved and seconds of silence skipped
+    
+    Counts every recording preprocessed since the server started
+    """
+    preprocessor = transcription_service.audio_preprocessor
+    if not preprocessor.enabled:
+        return {"enabled": False}
+    return {"enabled": True, "vad": preprocessor.vad is not None, **preprocessor.stats()}
+
+
 @router.post("/export")
 async def export_to_word_post(
     request: ExportRequest,
+    export_format: str = Query("docx", alias="format", description="Export format: 'docx', 'markdown', 'html', 'srt', 'vtt' or 'jsonl'"),
     word_service: WordExportService = Depends(get_word_export_service)
 ):
     """
     Export transcription and analysis to Word document (POST method)
     
-    Accepts JSON body with all transcription data
+    Accepts JSON body with all transcription data. Other formats are streamed
+    as they are written; subtitles use the request's segments when given.
     """
+    if export_format != "docx":
+        return text_export_response(
+            resolve_exporter(export_format),
+            filename=request.filename,
+            document=ExportDocument(
+                transcription=request.transcription,
+                summary=request.summary,
+                participants=request.participants,
+                decisions=request.decisions,
+                action_items=request.action_items,
+                segments=request.segments
+            )
+        )
+    
     try:
-        # Generate Word document
-        doc_stream = word_service.create_document(
+        return await word_document_response(
+            word_service,
+            filename=request.filename,
             transcription=request.transcription,
             summary=request.summary,
             participants=request.participants,
             decisions=request.decisions,
-            action_items=request.action_items,
-            filename=request.filename
-        )
-        
-        return StreamingResponse(
-            doc_stream,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={"Content-Disposition": f'attachment; filename="{request.filename}.docx"'}
+            action_items=request.action_items
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
 
+
+async def word_document_response(
+    word_service: WordExportService,
+    filename: str,
+    transcription: str,
+    summary: str,
+    participants: List[str],
+    decisions: List[str],
+    action_items: List[ActionItem]
+) -> StreamingResponse:
+    """
+    Build a Word document and stream it as a download
+    
+    Args:
+        word_service: Word export service
+        filename: Download name without extension
+        transcription, summary, participants, decisions, action_items: Document content
+    
+    Returns:
+        StreamingResponse with the .docx attachment
+    """
+    # Generate the Word document on the export pool - building it is CPU-bound
+    loop = asyncio.get_running_loop()
+    doc_stream = await loop.run_in_executor(
+        get_export_executor(),
+        functools.partial(
+            word_service.create_document,
+            transcription=transcription,
+            summary=summary,
+            participants=participants,
+            decisions=decisions,
+            action_items=action_items,
+            filename=filename
+        )
+    )
+    
+    return StreamingResponse(
+        iter_document_chunks(doc_stream),
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={
+            "Content-Disposition": attachment_header(f"{filename}.docx"),
+            "Content-Length": str(doc_stream.getbuffer().nbytes)
+        }
+    )
+
+
+def resolve_exporter(export_format: str) -> Exporter:
+    """Registered exporter for a format, or 400"""
+    try:
+        return get_exporter(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def text_export_response(exporter: Exporter, filename: str, document: ExportDocument) -> StreamingResponse:
+    """
+    Stream a document in a text format as a download
+    
+    The exporter's generator is iterated as the response is sent, so the
+    document is never held in memory whole (and has no Content-Length).
+    
+    Args:
+        exporter: Format to write
+        filename: Download name without extension
+        document: Export content
+    
+    Returns:
+        StreamingResponse with the attachment
+    """
+    return StreamingResponse(
+        exporter.stream(document),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": attachment_header(f"{filename}.{exporter.extension}")}
+    )
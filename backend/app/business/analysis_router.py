@@ -0,0 +1,97 @@
+"""Choose an analysis backend per request by priority, transcript size and load"""
+import os
+from typing import Dict, Optional
+
+from app.services.analysis_backend import AnalysisBackend
+
+# Request priorities
+PRIORITY_INTERACTIVE = "interactive"  # A user is waiting on the result
+PRIORITY_BATCH = "batch"  # Background work where cost matters more than latency
+
+
+class AnalysisRouter:
+    """
+    Routes analysis between the hosted backend and an optional local one
+
+    Interactive requests stay on the hosted model; they spill over to the local
+    backend only when the hosted one is saturated and the transcript is small
+    enough for a local model to finish quickly. Batch requests go to the local
+    backend unless it is saturated.
+    """
+
+    def __init__(self, backends: Dict[str, AnalysisBackend], hosted: str):
+        """
+        Args:
+            backends: Analysis backends by name
+            hosted: Name of the hosted backend (e.g., 'groq')
+        """
+        self.backends = backends
+        self.hosted = hosted
+        # Backend every request uses unless it chooses one; empty enables routing
+        self.default_backend = os.getenv("ANALYSIS_BACKEND", "")
+        self.local_max_tokens = int(os.getenv("ANALYSIS_LOCAL_MAX_TOKENS", "8000"))
+        # Load (in-flight requests per worker) at which a backend counts as saturated
+        self.saturation_load = float(os.getenv("ANALYSIS_SATURATION_LOAD", "1.0"))
+
+    def get(self, name: str) -> AnalysisBackend:
+        """
+        Look up an analysis backend by name
+
+        Args:
+            name: Backend name (e.g., 'groq', 'local')
+
+        Returns:
+            The matching AnalysisBackend
+        """
+        backend = self.backends.get(name)
+        if backend is None:
+            available = ", ".join(sorted(self.backends))
+            raise ValueError(f"Unknown analysis backend: {name}. Available: {available}")
+        return backend
+
+    def _local(self) -> Optional[AnalysisBackend]:
+        for name, backend in self.backends.items():
+            if name != self.hosted:
+                return backend
+        return None
+
+    def _saturated(self, backend: AnalysisBackend) -> bool:
+        return backend.load >= self.saturation_load
+
+    def select(
+        self,
+        name: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        tokens: Optional[int] = None
+    ) -> AnalysisBackend:
+        """
+        Pick the backend for one analysis
+
+        Args:
+            name: Explicit backend name; bypasses routing. Defaults to ANALYSIS_BACKEND.
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+            tokens: Estimated transcript tokens, or None if not known yet
+
+        Returns:
+            AnalysisBackend to run the analysis on
+        """
+        name = name or self.default_backend
+        if name:
+            return self.get(name)
+
+        hosted = self.backends[self.hosted]
+        local = self._local()
+        if local is None:
+            return hosted
+
+        if priority == PRIORITY_BATCH:
+            return hosted if self._saturated(local) and not self._saturated(hosted) else local
+
+        if (
+            self._saturated(hosted)
+            and not self._saturated(local)
+            and tokens is not None
+            and tokens <= self.local_max_tokens
+        ):
+            return local
+        return hosted
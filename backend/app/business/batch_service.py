@@ -0,0 +1,223 @@
+"""Batch processing of many recordings in one request"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional
+
+from fastapi import UploadFile
+
+from app.business.analysis_router import PRIORITY_BATCH
+from app.business.job_service import TranscriptionJobService
+from app.business.transcription_service import TranscriptionBusinessService, UPLOAD_CHUNK_SIZE
+from app.models.schemas import BatchItemResponse, BatchResponse
+from app.utils.logger import setup_logger
+
+
+def parse_manifest(manifest: str) -> List[str]:
+    """
+    Parse a batch manifest: a JSON list of paths or {"paths": [...]}
+
+    Args:
+        manifest: Manifest text
+
+    Returns:
+        List of paths as given
+    """
+    try:
+        data = json.loads(manifest)
+    except ValueError:
+        raise ValueError("Manifest must be JSON: a list of paths or {\"paths\": [...]}")
+    if isinstance(data, dict):
+        data = data.get("paths")
+    if not isinstance(data, list) or not all(isinstance(path, str) for path in data):
+        raise ValueError("Manifest must be JSON: a list of paths or {\"paths\": [...]}")
+    return data
+
+
+def _hash_file(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class BatchTranscriptionService:
+    """Runs many recordings through the pipeline, or queues them as jobs"""
+
+    def __init__(
+        self,
+        transcription_service: TranscriptionBusinessService,
+        job_service: TranscriptionJobService,
+        manifest_root: Optional[str] = None
+    ):
+        """
+        Args:
+            transcription_service: Service that runs the pipeline for each recording
+            job_service: Job queue used when the caller does not wait for results
+            manifest_root: Directory manifest paths must be inside. Defaults to BATCH_MANIFEST_ROOT.
+        """
+        self.transcription_service = transcription_service
+        self.job_service = job_service
+        self.manifest_root = os.path.realpath(manifest_root or os.getenv("BATCH_MANIFEST_ROOT", "data/incoming"))
+        # Recordings in one batch running the pipeline at once
+        self.max_concurrency = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+        self.max_files = int(os.getenv("BATCH_MAX_FILES", "100"))
+        self.logger = setup_logger("batch")
+
+    def resolve_paths(self, paths: List[str]) -> List[str]:
+        """
+        Resolve manifest paths, allowing only existing recordings under the manifest root
+
+        Args:
+            paths: Absolute paths, or paths relative to the manifest root
+
+        Returns:
+            Resolved absolute paths, in the same order
+        """
+        resolved = []
+        for path in paths:
+            full_path = os.path.realpath(os.path.join(self.manifest_root, path))
+            if os.path.commonpath([full_path, self.manifest_root]) != self.manifest_root:
+                raise ValueError(f"Manifest path is outside the batch directory: {path}")
+            if not os.path.isfile(full_path):
+                raise ValueError(f"Manifest file not found: {path}")
+            self.transcription_service.validate_filename(full_path)
+            resolved.append(full_path)
+        return resolved
+
+    def _validate(self, uploads: List[UploadFile], paths: List[str]) -> None:
+        """Reject the whole batch before any work if an entry is invalid"""
+        count = len(uploads) + len(paths)
+        if count == 0:
+            raise ValueError("Batch is empty: send files or a manifest")
+        if count > self.max_files:
+            raise ValueError(f"Batch too large: {count} recordings. Maximum is {self.max_files}.")
+        for upload in uploads:
+            self.transcription_service.validate_filename(upload.filename)
+
+    async def _process_one(
+        self,
+        source: str,
+        upload: Optional[UploadFile],
+        path: Optional[str],
+        limit: asyncio.Semaphore,
+        **options
+    ) -> BatchItemResponse:
+        async with limit:
+            audio_file_path = None
+            try:
+                if upload is not None:
+                    audio_file_path, content_hash = await self.transcription_service.ingest_upload(upload)
+                else:
+                    loop = asyncio.get_running_loop()
+                    content_hash = await loop.run_in_executor(None, _hash_file, path)
+                result = await self.transcription_service.process_audio_path(
+                    audio_file_path or path, content_hash=content_hash, priority=PRIORITY_BATCH,
+                    filename=os.path.basename(source), **options
+                )
+            except Exception as e:
+                self.logger.error(f"Batch item {source} failed: {str(e)}")
+                return BatchItemResponse(source=source, status="failed", error=str(e))
+            finally:
+                # Only our own copy of an upload is removed - manifest files stay
+                if audio_file_path is not None and os.path.exists(audio_file_path):
+                    os.unlink(audio_file_path)
+            return BatchItemResponse(source=source, status="completed", result=result)
+
+    async def run(
+        self,
+        uploads: List[UploadFile],
+        paths: List[str],
+        language: Optional[str] = None,
+        backend: Optional[str] = None,
+        analysis_backend: Optional[str] = None,
+        concurrency: Optional[int] = None
+    ) -> BatchResponse:
+        """
+        Process recordings now, a bounded number at a time, and return every result
+
+        Each recording runs the full pipeline; the per-provider pools still cap
+        how many transcription and analysis calls are in flight overall. A
+        failed recording is reported in its item and does not stop the batch.
+
+        Args:
+            uploads: Uploaded recordings
+            paths: Manifest paths of recordings on the server
+            language: Optional language code for every recording
+            backend: Optional transcription backend name
+            analysis_backend: Optional analysis backend name; routed as batch work if None
+            concurrency: Recordings processed at once, capped at BATCH_MAX_CONCURRENCY
+
+        Returns:
+            BatchResponse with one item per recording, in request order
+        """
+        self._validate(uploads, paths)
+        self.transcription_service.validate_backends(backend, analysis_backend)
+        resolved = self.resolve_paths(paths)
+
+        concurrency = max(1, min(concurrency or self.max_concurrency, self.max_concurrency))
+        limit = asyncio.Semaphore(concurrency)
+        options = {"language": language, "backend": backend, "analysis_backend": analysis_backend}
+
+        started = time.perf_counter()
+        items = await asyncio.gather(
+            *(self._process_one(upload.filename, upload, None, limit, **options) for upload in uploads),
+            *(self._process_one(source, None, path, limit, **options) for source, path in zip(paths, resolved))
+        )
+        elapsed = time.perf_counter() - started
+
+        response = BatchResponse(
+            items=list(items),
+            completed=sum(item.status == "completed" for item in items),
+            failed=sum(item.status == "failed" for item in items),
+            concurrency=concurrency,
+            elapsed_seconds=round(elapsed, 3)
+        )
+        self.logger.info(
+            f"Batch of {len(items)} finished in {response.elapsed_seconds}s "
+            f"({response.completed} completed, {response.failed} failed, concurrency {concurrency})"
+        )
+        return response
+
+    async def submit(
+        self,
+        uploads: List[UploadFile],
+        paths: List[str],
+        language: Optional[str] = None
+    ) -> BatchResponse:
+        """
+        Queue every recording as a background job and return the job ids
+
+        Args:
+            uploads: Uploaded recordings
+            paths: Manifest paths of recordings on the server
+            language: Optional language code for every recording
+
+        Returns:
+            BatchResponse with one queued item per recording
+        """
+        self._validate(uploads, paths)
+        resolved = self.resolve_paths(paths)
+
+        started = time.perf_counter()
+        items = []
+        for upload in uploads:
+            job = await self.job_service.submit(upload, language=language)
+            items.append(BatchItemResponse(source=upload.filename, status=job.status, job_id=job.job_id))
+        for source, path in zip(paths, resolved):
+            job = await self.job_service.submit_path(path, language=language)
+            items.append(BatchItemResponse(source=source, status=job.status, job_id=job.job_id))
+
+        self.logger.info(f"Queued batch of {len(items)} recordings as jobs")
+        return BatchResponse(
+            items=items,
+            queued=len(items),
+            elapsed_seconds=round(time.perf_counter() - started, 3)
+        )
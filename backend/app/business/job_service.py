@@ -0,0 +1,224 @@
+"""Background job processing for transcription requests"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from app.business.analysis_router import PRIORITY_BATCH
+from app.business.transcription_service import TranscriptionBusinessService, UPLOAD_CHUNK_SIZE
+from app.storage.job_store import JobStore
+from app.models.schemas import JobResponse, TranscriptionResponse
+from app.utils.logger import setup_logger
+from app.utils.rate_limiter import RateLimitExceededError
+
+
+class TranscriptionJobService:
+    """Queues uploads as jobs and runs them on a pool of async workers"""
+
+    def __init__(
+        self,
+        transcription_service: TranscriptionBusinessService,
+        job_store: JobStore,
+        spool_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            transcription_service: Service that runs the pipeline for each job
+            job_store: Persistent job queue
+            spool_dir: Where uploads wait for a worker. Defaults to JOB_SPOOL_DIR.
+            workers: Number of concurrent jobs. Defaults to JOB_WORKERS.
+            poll_interval: Seconds between queue checks when idle. Defaults to JOB_POLL_INTERVAL.
+        """
+        self.transcription_service = transcription_service
+        self.job_store = job_store
+        self.spool_dir = spool_dir or os.getenv("JOB_SPOOL_DIR", "data/jobs")
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.poll_interval = poll_interval or float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+        # Upper bound on a provider's retry_after, so one bad header can't park a job for hours
+        self.max_requeue_delay = float(os.getenv("JOB_MAX_REQUEUE_DELAY", "300"))
+        # Must stay well under the store's JOB_STALE_SECONDS, or live jobs get requeued
+        self.heartbeat_interval = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+        self.logger = setup_logger("jobs")
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def submit(self, file: UploadFile, language: Optional[str] = None) -> JobResponse:
+        """
+        Save an upload and queue it for processing
+
+        Args:
+            file: Uploaded audio file
+            language: Optional language code
+
+        Returns:
+            JobResponse for the queued job
+        """
+        Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+        audio_path, content_hash = await self.transcription_service.ingest_upload(file, directory=self.spool_dir)
+
+        loop = asyncio.get_running_loop()
+        job = await loop.run_in_executor(
+            None, self.job_store.create, file.filename, audio_path, language, content_hash
+        )
+        self.logger.info(f"Queued job {job['id']} for {file.filename}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return self._to_response(job)
+
+    def _spool_copy(self, source_path: str) -> Tuple[str, str]:
+        """Copy a server-side recording into the spool, hashing it on the way"""
+        file_ext = os.path.splitext(source_path)[1].lower()
+        hasher = hashlib.sha256()
+        with open(source_path, "rb") as source, \
+                tempfile.NamedTemporaryFile(delete=False, suffix=file_ext, dir=self.spool_dir) as spooled:
+            try:
+                while True:
+                    chunk = source.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    spooled.write(chunk)
+            except BaseException:
+                spooled.close()
+                os.unlink(spooled.name)
+                raise
+        return spooled.name, hasher.hexdigest()
+
+    async def submit_path(self, source_path: str, language: Optional[str] = None) -> JobResponse:
+        """
+        Queue a recording that is already on the server
+
+        The file is copied into the spool - workers delete spooled audio when a
+        job finishes, and the original must be left alone.
+
+        Args:
+            source_path: Path to the recording
+            language: Optional language code
+
+        Returns:
+            JobResponse for the queued job
+        """
+        self.transcription_service.validate_filename(source_path)
+        Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+
+        loop = asyncio.get_running_loop()
+        audio_path, content_hash = await loop.run_in_executor(None, self._spool_copy, source_path)
+        job = await loop.run_in_executor(
+            None, self.job_store.create, os.path.basename(source_path), audio_path, language, content_hash
+        )
+        self.logger.info(f"Queued job {job['id']} for {source_path}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return self._to_response(job)
+
+    async def get(self, job_id: str) -> Optional[JobResponse]:
+        """
+        Get job status, and the result once completed
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            JobResponse, or None if the job does not exist
+        """
+        loop = asyncio.get_running_loop()
+        job = await loop.run_in_executor(None, self.job_store.get, job_id)
+        return self._to_response(job) if job is not None else None
+
+    def start(self) -> None:
+        """Requeue abandoned jobs and start the workers and heartbeat (needs a running loop)"""
+        requeued = self.job_store.requeue_interrupted()
+        if requeued:
+            self.logger.info(f"Requeued {requeued} interrupted job(s)")
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        self.logger.info(f"Started {self.workers} job worker(s)")
+    
+    async def stop(self) -> None:
+        """Stop the workers and put the jobs they were running back in the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+        loop = asyncio.get_running_loop()
+        released = await loop.run_in_executor(None, self.job_store.release)
+        if released:
+            self.logger.info(f"Requeued {released} job(s) cut off by shutdown")
+    
+    async def _heartbeat(self) -> None:
+        """Keep this process's jobs claimed and pick up jobs other processes abandoned"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await loop.run_in_executor(None, self.job_store.heartbeat)
+            requeued = await loop.run_in_executor(None, self.job_store.requeue_interrupted)
+            if requeued:
+                self.logger.warning(f"Requeued {requeued} job(s) whose worker stopped responding")
+                self._wakeup.set()
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            job = await loop.run_in_executor(None, self.job_store.claim_next)
+            if job is None:
+                # Sleep until a submit wakes us, polling in case another process queued work
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_job(job)
+
+    async def _run_job(self, job: Dict) -> None:
+        loop = asyncio.get_running_loop()
+        self.logger.info(f"Running job {job['id']}")
+        try:
+            result = await self.transcription_service.process_audio_path(
+                job["audio_path"], language=job["language"], content_hash=job["content_hash"],
+                filename=job["filename"],
+                # Nobody is waiting on a job - let routing send it to the cheap backend
+                priority=PRIORITY_BATCH
+            )
+        except RateLimitExceededError as e:
+            # The provider is saturated, not the job broken - requeue it to run once the
+            # limit resets, leaving this worker free for other jobs in the meantime. The
+            # store fails it instead once it has used up JOB_MAX_REQUEUES.
+            delay = e.retry_after if e.retry_after is not None else self.poll_interval
+            delay = min(max(delay, 0.0), self.max_requeue_delay)
+            if await loop.run_in_executor(None, self.job_store.requeue, job["id"], delay):
+                self.logger.warning(f"Job {job['id']} rate limited, requeued for {delay:.1f}s from now: {str(e)}")
+                return
+            self.logger.error(f"Job {job['id']} failed: {str(e)}")
+            await loop.run_in_executor(None, self.job_store.fail, job["id"], str(e))
+        except Exception as e:
+            # CancelledError is not caught: the job stays running and keeps its audio for requeue
+            self.logger.error(f"Job {job['id']} failed: {str(e)}")
+            await loop.run_in_executor(None, self.job_store.fail, job["id"], str(e))
+        else:
+            await loop.run_in_executor(None, self.job_store.complete, job["id"], result.model_dump_json())
+            self.logger.info(f"Job {job['id']} completed")
+
+        if os.path.exists(job["audio_path"]):
+            os.unlink(job["audio_path"])
+
+    def _to_response(self, job: Dict) -> JobResponse:
+        return JobResponse(
+            job_id=job["id"],
+            status=job["status"],
+            filename=job["filename"],
+            language=job["language"],
+            created_at=datetime.fromtimestamp(job["created_at"], tz=timezone.utc),
+            updated_at=datetime.fromtimestamp(job["updated_at"], tz=timezone.utc),
+            result=TranscriptionResponse.model_validate_json(job["result"]) if job["result"] else None,
+            error=job["error"]
+        )
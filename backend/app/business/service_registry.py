@@ -0,0 +1,239 @@
+"""Process-wide registry of pooled service singletons"""
+import os
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.business.transcription_service import TranscriptionBusinessService
+from app.business.job_service import TranscriptionJobService
+from app.business.batch_service import BatchTranscriptionService
+from app.services.whisper_service import WhisperService
+from app.services.analysis_backend import AnalysisBackend
+from app.services.groq_service import GroqService
+from app.services.local_llm_service import LocalLLMService
+from app.services.local_whisper_service import LocalWhisperService
+from app.services.transcription_backend import TranscriptionBackend
+from app.services.word_export_service import WordExportService
+from app.storage.analysis_cache import AnalysisCache
+from app.storage.meeting_store import MeetingStore
+from app.storage.result_cache import ResultCache
+from app.storage.job_store import JobStore
+from app.utils.concurrency import shutdown_executors
+from app.utils.logger import setup_logger
+
+
+class ServiceRegistry:
+    """Builds services once per worker and shares their HTTP connection pools"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._http_clients: List[httpx.Client] = []
+        self._transcription_service: Optional[TranscriptionBusinessService] = None
+        self._word_export_service: Optional[WordExportService] = None
+        self._result_cache: Optional[ResultCache] = None
+        self._meeting_store: Optional[MeetingStore] = None
+        self._analysis_cache: Optional[AnalysisCache] = None
+        self._job_service: Optional[TranscriptionJobService] = None
+        self._batch_service: Optional[BatchTranscriptionService] = None
+        self.logger = setup_logger("registry")
+
+    def _create_http_client(self, name: str) -> httpx.Client:
+        """
+        Create a keep-alive HTTP client shared by every request to one provider
+
+        Args:
+            name: Provider name, used for logging
+
+        Returns:
+            httpx.Client with configured pool limits
+        """
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        )
+        timeout = httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "600")), connect=5.0)
+        client = httpx.Client(limits=limits, timeout=timeout)
+        self._http_clients.append(client)
+        self.logger.info(
+            f"Created {name} connection pool "
+            f"(max_connections={limits.max_connections}, "
+            f"max_keepalive={limits.max_keepalive_connections})"
+        )
+        return client
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Shared result cache, or None when RESULT_CACHE_ENABLED is false"""
+        if self._result_cache is None and os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true":
+            with self._lock:
+                if self._result_cache is None:
+                    self._result_cache = ResultCache()
+        return self._result_cache
+    
+    @property
+    def analysis_cache(self) -> Optional[AnalysisCache]:
+        """Shared analysis cache, or None when ANALYSIS_CACHE_ENABLED is false"""
+        if self._analysis_cache is None and os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true":
+            with self._lock:
+                if self._analysis_cache is None:
+                    self._analysis_cache = AnalysisCache()
+        return self._analysis_cache
+    
+    @property
+    def meeting_store(self) -> Optional[MeetingStore]:
+        """Shared meeting store, or None when MEETING_STORE_ENABLED is false"""
+        if self._meeting_store is None and os.getenv("MEETING_STORE_ENABLED", "true").lower() == "true":
+            with self._lock:
+                if self._meeting_store is None:
+                    self._meeting_store = MeetingStore()
+        return self._meeting_store
+
+    def _create_local_backends(self) -> Dict[str, TranscriptionBackend]:
+        """
+        Create the local transcription backend when LOCAL_WHISPER_ENABLED is true
+        
+        Returns:
+            Backends by name; empty if disabled or faster-whisper is not installed
+        """
+        if os.getenv("LOCAL_WHISPER_ENABLED", "false").lower() != "true":
+            return {}
+        try:
+            backend = LocalWhisperService()
+        except ValueError as e:
+            self.logger.warning(f"Local transcription backend not available: {str(e)}")
+            return {}
+        self.logger.info(f"Local transcription backend enabled ({backend.model}, {backend.cpu_threads} threads)")
+        return {backend.name: backend}
+    
+    def _create_local_analysis_backends(self) -> Dict[str, AnalysisBackend]:
+        """
+        Create the local LLM analysis backend when LOCAL_LLM_ENABLED is true
+        
+        Returns:
+            Backends by name; empty if disabled
+        """
+        if os.getenv("LOCAL_LLM_ENABLED", "false").lower() != "true":
+            return {}
+        backend = LocalLLMService(
+            http_client=self._create_http_client("local_llm"), analysis_cache=self.analysis_cache
+        )
+        self.logger.info(f"Local analysis backend enabled ({backend.model} at {backend.base_url})")
+        return {backend.name: backend}
+    
+    @property
+    def transcription_service(self) -> TranscriptionBusinessService:
+        """Shared transcription service, created on first use"""
+        if self._transcription_service is None:
+            with self._lock:
+                if self._transcription_service is None:
+                    first_client = len(self._http_clients)
+                    try:
+                        whisper_service = WhisperService(http_client=self._create_http_client("openai"))
+                        groq_service = GroqService(
+                            http_client=self._create_http_client("groq"), analysis_cache=self.analysis_cache
+                        )
+                        self._transcription_service = TranscriptionBusinessService(
+                            whisper_service=whisper_service,
+                            groq_service=groq_service,
+                            result_cache=self.result_cache,
+                            meeting_store=self.meeting_store,
+                            transcription_backends=self._create_local_backends(),
+                            analysis_backends=self._create_local_analysis_backends()
+                        )
+                    except Exception:
+                        # Nothing was cached, so the next request builds new pools - close these
+                        for client in self._http_clients[first_client:]:
+                            client.close()
+                        del self._http_clients[first_client:]
+                        raise
+        return self._transcription_service
+
+    @property
+    def word_export_service(self) -> WordExportService:
+        """Shared Word export service, created on first use"""
+        if self._word_export_service is None:
+            with self._lock:
+                if self._word_export_service is None:
+                    self._word_export_service = WordExportService()
+        return self._word_export_service
+
+    @property
+    def job_service(self) -> TranscriptionJobService:
+        """Shared background job service, created on first use"""
+        if self._job_service is None:
+            with self._lock:
+                if self._job_service is None:
+                    self._job_service = TranscriptionJobService(
+                        transcription_service=self.transcription_service,
+                        job_store=JobStore()
+                    )
+        return self._job_service
+
+    @property
+    def batch_service(self) -> BatchTranscriptionService:
+        """Shared batch service, created on first use"""
+        if self._batch_service is None:
+            with self._lock:
+                if self._batch_service is None:
+                    self._batch_service = BatchTranscriptionService(
+                        transcription_service=self.transcription_service,
+                        job_service=self.job_service
+                    )
+        return self._batch_service
+
+    def startup(self) -> None:
+        """Eagerly build services so connection setup happens once per worker"""
+        try:
+            self.transcription_service
+        except ValueError as e:
+            # Missing API keys - keep the API up and fail on first use instead
+            self.logger.warning(f"Transcription service not initialized: {str(e)}")
+        self.word_export_service
+
+    def start_job_workers(self) -> None:
+        """Start background job workers (call from a running event loop)"""
+        try:
+            self.job_service.start()
+        except ValueError as e:
+            self.logger.warning(f"Job workers not started: {str(e)}")
+
+    async def stop_job_workers(self) -> None:
+        """Stop background job workers before shutting down"""
+        if self._job_service is not None:
+            await self._job_service.stop()
+
+    def shutdown(self) -> None:
+        """Close connection pools and worker threads"""
+        with self._lock:
+            http_clients = self._http_clients
+            self._http_clients = []
+            result_cache = self._result_cache
+            meeting_store = self._meeting_store
+            analysis_cache = self._analysis_cache
+            job_service = self._job_service
+            self._job_service = None
+            self._batch_service = None
+            self._transcription_service = None
+            self._word_export_service = None
+            self._result_cache = None
+            self._meeting_store = None
+            self._analysis_cache = None
+
+        shutdown_executors(wait=True)
+        for client in http_clients:
+            client.close()
+        if result_cache is not None:
+            result_cache.close()
+        if meeting_store is not None:
+            meeting_store.close()
+        if analysis_cache is not None:
+            analysis_cache.close()
+        if job_service is not None:
+            job_service.job_store.close()
+        self.logger.info(f"Closed {len(http_clients)} connection pool(s)")
+
+
+# Global instance
+service_registry = ServiceRegistry()
@@ -1,80 +1,899 @@
 """Business logic layer for transcription processing"""
+import asyncio
+import hashlib
 import os
 import tempfile
-from typing import Optional
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastapi import UploadFile
 
 from app.services.whisper_service import WhisperService
+from app.services.transcription_backend import TranscriptionBackend
+from app.services.analysis_backend import AnalysisBackend, estimate_tokens, split_transcript
 from app.services.groq_service import GroqService
-from app.models.schemas import TranscriptionResponse, ActionItem
+from app.services.audio_chunker import (
+    AudioChunk, AudioChunker, TranscriptStitcher, count_words, stitch_segments, stitch_transcripts
+)
+from app.services.audio_preprocessor import AudioPreprocessor
+from app.business.analysis_router import AnalysisRouter, PRIORITY_INTERACTIVE
+from app.storage.meeting_store import MeetingStore
+from app.storage.result_cache import ResultCache
+from app.models.schemas import TranscriptionResponse, ActionItem, AudioPreprocessing, Segment, StageTimings
+from app.models.transcript import TranscriptSegment, segments_text
+from app.utils.logger import setup_logger
+from app.utils.rate_limiter import RateLimitExceededError
+from app.utils.transcript_diff import project_edit
+
+# Size of each read from the upload stream
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Progress callback: receives an event name and a JSON-serializable payload
+ProgressCallback = Callable[[str, Dict], Awaitable[None]]
+
+
+async def emit_progress(on_progress: Optional[ProgressCallback], event: str, data: Dict) -> None:
+    """Send a progress event if a callback is registered"""
+    if on_progress is not None:
+        await on_progress(event, data)
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size"""
 
 
 class TranscriptionBusinessService:
     """Business logic for orchestrating transcription and analysis"""
     
-    def __init__(self):
-        self.whisper_service = WhisperService()
-        self.groq_service = GroqService()
+    def __init__(
+        self,
+        whisper_service: Optional[WhisperService] = None,
+        groq_service: Optional[GroqService] = None,
+        audio_chunker: Optional[AudioChunker] = None,
+        result_cache: Optional[ResultCache] = None,
+        transcription_backends: Optional[Dict[str, TranscriptionBackend]] = None,
+        analysis_backends: Optional[Dict[str, AnalysisBackend]] = None,
+        audio_preprocessor: Optional[AudioPreprocessor] = None,
+        meeting_store: Optional[MeetingStore] = None
+    ):
+        """
+        Args:
+            whisper_service: Optional shared WhisperService. Created if not provided.
+            groq_service: Optional shared GroqService. Created if not provided.
+            audio_chunker: Optional AudioChunker. Created from environment settings if not provided.
+            result_cache: Optional cache of results by audio content. No caching if not provided.
+            transcription_backends: Optional extra backends by name (e.g., 'local'), alongside
+                the 'openai' WhisperService
+            analysis_backends: Optional extra analysis backends by name (e.g., 'local'),
+                alongside the hosted 'groq' GroqService
+            audio_preprocessor: Optional AudioPreprocessor. Created from environment settings
+                if not provided; only runs when AUDIO_PREPROCESS_ENABLED is true.
+            meeting_store: Optional store every processed meeting is saved to. Nothing is
+                saved if not provided.
+        """
+        self.whisper_service = whisper_service or WhisperService()
+        self.transcription_backends: Dict[str, TranscriptionBackend] = {
+            self.whisper_service.name: self.whisper_service,
+            **(transcription_backends or {})
+        }
+        # Backend used when a request does not choose one
+        self.default_backend = os.getenv("TRANSCRIPTION_BACKEND", self.whisper_service.name)
+        self.groq_service = groq_service or GroqService()
+        self.analysis_router = AnalysisRouter(
+            {self.groq_service.name: self.groq_service, **(analysis_backends or {})},
+            hosted=self.groq_service.name
+        )
+        self.audio_chunker = audio_chunker or AudioChunker()
+        self.audio_preprocessor = audio_preprocessor or AudioPreprocessor()
+        self.result_cache = result_cache
+        self.meeting_store = meeting_store
+        self.max_upload_bytes = int(os.getenv("MAX_UPLOAD_SIZE_MB", "500")) * 1024 * 1024
+        # Start analyzing early transcript segments while later chunks are transcribed
+        self.pipeline_enabled = os.getenv("PIPELINE_ENABLED", "true").lower() == "true"
+        # Transcribed chunks allowed to wait for analysis before transcription pauses
+        self.pipeline_queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+        self.logger = setup_logger("pipeline")
     
-    async def process_audio_file(self, file: UploadFile, language: Optional[str] = None) -> TranscriptionResponse:
+    def get_backend(self, name: Optional[str] = None) -> TranscriptionBackend:
         """
-        Process audio file: transcribe and analyze
+        Look up a transcription backend
+        
+        Args:
+            name: Backend name (e.g., 'openai', 'local'). Defaults to TRANSCRIPTION_BACKEND.
+        
+        Returns:
+            The matching TranscriptionBackend
+        """
+        name = name or self.default_backend
+        backend = self.transcription_backends.get(name)
+        if backend is None:
+            available = ", ".join(sorted(self.transcription_backends))
+            raise ValueError(f"Unknown transcription backend: {name}. Available: {available}")
+        return backend
+    
+    def validate_backends(self, backend: Optional[str] = None, analysis_backend: Optional[str] = None) -> None:
+        """
+        Check backend names before any work is done
+        
+        Args:
+            backend: Optional transcription backend name
+            analysis_backend: Optional analysis backend name
+        """
+        self.get_backend(backend)
+        if analysis_backend:
+            self.analysis_router.get(analysis_backend)
+    
+    async def _save_upload(self, file: UploadFile, destination, hasher=None) -> int:
+        """
+        Stream an upload to disk chunk by chunk, enforcing the size limit as it goes
+        
+        Only the upload reads run on the event loop. Hashing and writing each
+        chunk happen on the executor, overlapped with reading the next one.
         
         Args:
             file: Uploaded audio file
-            language: Optional language code (e.g., 'he' for Hebrew, 'en' for English)
+            destination: Open binary file to write to
+            hasher: Optional hashlib object updated with every chunk
         
         Returns:
-            TranscriptionResponse with all extracted information
+            Number of bytes written
+        """
+        loop = asyncio.get_running_loop()
+        bytes_written = 0
+        # Write of the previous chunk, still running while the next one is read
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if pending is not None:
+                    await pending
+                    pending = None
+                if not chunk:
+                    break
+                bytes_written += len(chunk)
+                if bytes_written > self.max_upload_bytes:
+                    raise FileTooLargeError(
+                        f"File too large. Maximum size is {self.max_upload_bytes // (1024 * 1024)} MB."
+                    )
+                pending = loop.run_in_executor(None, self._write_chunk, destination, hasher, chunk)
+        finally:
+            # Never leave a write running on a file the caller is about to close
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+        return bytes_written
+    
+    @staticmethod
+    def _write_chunk(destination, hasher, chunk: bytes) -> None:
+        """Hash and write one upload chunk (blocking, runs on the executor)"""
+        if hasher is not None:
+            hasher.update(chunk)
+        destination.write(chunk)
+    
+    async def _transcribe_chunk(
+        self,
+        backend: TranscriptionBackend,
+        chunk: AudioChunk,
+        index: int,
+        total: int,
+        language: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        segments: Optional[Dict[int, List[TranscriptSegment]]] = None
+    ) -> str:
+        """
+        Transcribe one chunk and report it with a chunk_transcribed event
+        
+        When a segments dict is given, the chunk is transcribed with timing and
+        its segments, moved onto the original timeline, are stored under index.
+        """
+        if segments is None:
+            text = await backend.transcribe_audio(chunk.path, language=language)
+        else:
+            chunk_segments = [
+                TranscriptSegment(
+                    chunk.original_time(segment.start),
+                    chunk.original_time(segment.end, at_end=True) if segment.end is not None else chunk.end,
+                    segment.text,
+                    segment.confidence
+                )
+                for segment in await backend.transcribe_segments(chunk.path, language=language)
+            ]
+            segments[index] = chunk_segments
+            text = segments_text(chunk_segments)
+        await emit_progress(on_progress, "chunk_transcribed", {
+            "index": index,
+            "total": total,
+            "start": chunk.start,
+            "end": chunk.end,
+            "text": text
+        })
+        return text
+    
+    async def _transcribe_chunks(
+        self,
+        backend: TranscriptionBackend,
+        chunks: List[AudioChunk],
+        language: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        segments: Optional[Dict[int, List[TranscriptSegment]]] = None
+    ) -> str:
+        """
+        Transcribe chunks in parallel and stitch the results
+        
+        Chunk calls share the backend's thread pool, so its max_concurrency bounds
+        how many run at once.
+        """
+        texts = await asyncio.gather(*(
+            self._transcribe_chunk(backend, chunk, index, len(chunks), language, on_progress, segments)
+            for index, chunk in enumerate(chunks)
+        ))
+        return texts[0] if len(texts) == 1 else stitch_transcripts(texts)
+    
+    def _split_audio(
+        self,
+        audio_file_path: str,
+        work_dir: str
+    ) -> Tuple[List[AudioChunk], Optional[AudioPreprocessing]]:
         """
-        # Validate file type
-        if not file.filename:
+        Preprocess a recording (when enabled) and split it into chunks for upload
+        
+        Preprocessed chunks keep their start/end on the original timeline, even
+        when silences inside the recording were skipped. The
+        original file is used instead if preprocessing fails or does not make
+        the upload smaller.
+        
+        Args:
+            audio_file_path: Path to the audio file
+            work_dir: Directory for converted audio and chunk files
+        
+        Returns:
+            Tuple of (chunks in timeline order, preprocessing report or None if disabled)
+        """
+        if not self.audio_preprocessor.enabled:
+            return self.audio_chunker.split(audio_file_path, work_dir, self.audio_preprocessor.decode), None
+        
+        original_bytes = os.path.getsize(audio_file_path)
+        try:
+            prepared = self.audio_preprocessor.prepare(audio_file_path, work_dir)
+            chunks = [
+                AudioChunk(
+                    path=self.audio_preprocessor.encode(chunk.path),
+                    start=prepared.to_original(chunk.start),
+                    end=prepared.to_original(chunk.end, at_end=True) if chunk.end is not None else None,
+                    timeline=lambda seconds, at_end, offset=chunk.start: prepared.to_original(offset + seconds, at_end)
+                )
+                for chunk in self.audio_chunker.split(prepared.path, work_dir)
+            ]
+        except Exception as e:
+            self.logger.warning(f"Audio preprocessing failed, uploading the original: {str(e)}")
+            return self.audio_chunker.split(audio_file_path, work_dir, self.audio_preprocessor.decode), None
+        
+        uploaded_bytes = sum(os.path.getsize(chunk.path) for chunk in chunks)
+        if uploaded_bytes >= original_bytes:
+            chunks = self.audio_chunker.split(audio_file_path, work_dir, self.audio_preprocessor.decode)
+            report = AudioPreprocessing(
+                codec="original",
+                original_bytes=original_bytes,
+                uploaded_bytes=original_bytes,
+                bytes_saved=0,
+                original_seconds=round(prepared.original_seconds, 3),
+                skipped_seconds=0.0
+            )
+        else:
+            report = AudioPreprocessing(
+                codec=self.audio_preprocessor.codec,
+                original_bytes=original_bytes,
+                uploaded_bytes=uploaded_bytes,
+                bytes_saved=original_bytes - uploaded_bytes,
+                original_seconds=round(prepared.original_seconds, 3),
+                skipped_seconds=round(prepared.original_seconds - prepared.seconds, 3),
+                speech_regions=len(prepared.regions)
+            )
+        self.audio_preprocessor.record(
+            report.original_bytes, report.uploaded_bytes, report.original_seconds, report.skipped_seconds
+        )
+        self.logger.info(
+            f"Preprocessed audio: {report.original_bytes} -> {report.uploaded_bytes} bytes "
+            f"({report.bytes_saved} saved, {report.codec}), {report.skipped_seconds}s of "
+            f"{report.original_seconds}s skipped as silence ({report.speech_regions} speech regions)"
+        )
+        return chunks, report
+    
+    async def _transcribe_and_analyze(
+        self,
+        backend: TranscriptionBackend,
+        audio_file_path: str,
+        language: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        analysis_backend: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        with_segments: bool = False,
+        analysis_parts: Optional[List[Dict]] = None
+    ) -> Tuple[str, Dict, StageTimings, AnalysisBackend, Optional[AudioPreprocessing], Optional[List[TranscriptSegment]]]:
+        """
+        Transcribe and analyze a recording, overlapping the two stages for long meetings
+        
+        Chunk transcripts flow through a bounded queue to a consumer that stitches
+        them. Once the transcript is long enough to need map-reduce analysis, text
+        no later chunk can change is cut into segments and analyzed right away.
+        When the queue is full, no new chunks are sent to Whisper until analysis
+        catches up. Short recordings run the two stages one after the other.
+        
+        Sequential runs route the analysis once the transcript size is known;
+        the pipeline has to pick a backend before the size is known.
+        
+        Args:
+            backend: Transcription backend for the audio chunks
+            audio_file_path: Path to the audio file
+            language: Optional language code
+            on_progress: Optional callback for pipeline progress events
+            analysis_backend: Optional analysis backend name; routed if None
+            priority: Routing priority (interactive or batch)
+            with_segments: Transcribe with timing and return the stitched segments
+            analysis_parts: Optional list filled with the map-stage analysis of each transcript segment
+        
+        Returns:
+            Tuple of (transcription, analysis dict, stage timings, analysis backend used,
+            preprocessing report or None, segments or None)
+        """
+        started = time.perf_counter()
+        marks: Dict[str, float] = {}
+        
+        with tempfile.TemporaryDirectory(prefix="chunks_") as chunk_dir:
+            # Converting and splitting copy audio on disk - keep them off the event loop
+            loop = asyncio.get_running_loop()
+            chunks, preprocessing = await loop.run_in_executor(None, self._split_audio, audio_file_path, chunk_dir)
+            marks["preprocessed"] = time.perf_counter()
+            if preprocessing is not None:
+                await emit_progress(on_progress, "audio_preprocessed", preprocessing.model_dump())
+            
+            chunk_segments: Optional[Dict[int, List[TranscriptSegment]]] = {} if with_segments else None
+            if len(chunks) == 1 or not self.pipeline_enabled:
+                transcription = await self._transcribe_chunks(backend, chunks, language, on_progress, chunk_segments)
+                marks["transcribed"] = marks["analysis_started"] = time.perf_counter()
+                await emit_progress(on_progress, "transcription_complete", {"transcription": transcription})
+                await emit_progress(on_progress, "analysis_started", {"characters": len(transcription)})
+                analyzer = self.analysis_router.select(
+                    analysis_backend, priority=priority, tokens=estimate_tokens(transcription)
+                )
+                analysis = await analyzer.analyze_transcription(
+                    transcription, language=language, on_progress=on_progress, parts=analysis_parts
+                )
+            else:
+                analyzer = self.analysis_router.select(analysis_backend, priority=priority)
+                transcription, analysis = await self._run_pipeline(
+                    backend, analyzer, chunks, language, on_progress, marks, chunk_segments, analysis_parts
+                )
+        
+        segments = None
+        if chunk_segments is not None:
+            segments = stitch_segments(chunks, [chunk_segments.get(index, []) for index in range(len(chunks))])
+        
+        finished = time.perf_counter()
+        timings = StageTimings(
+            transcription_seconds=round(marks["transcribed"] - started, 3),
+            analysis_seconds=round(finished - marks["analysis_started"], 3),
+            overlap_seconds=round(max(0.0, marks["transcribed"] - marks["analysis_started"]), 3),
+            preprocessing_seconds=round(marks["preprocessed"] - started, 3),
+            total_seconds=round(finished - started, 3)
+        )
+        self.logger.info(
+            f"Stage timings: transcription {timings.transcription_seconds}s, "
+            f"analysis {timings.analysis_seconds}s, overlap {timings.overlap_seconds}s, "
+            f"total {timings.total_seconds}s, analysis backend {analyzer.name}"
+        )
+        return transcription, analysis, timings, analyzer, preprocessing, segments
+    
+    async def _run_pipeline(
+        self,
+        backend: TranscriptionBackend,
+        analyzer: AnalysisBackend,
+        chunks: List[AudioChunk],
+        language: Optional[str],
+        on_progress: Optional[ProgressCallback],
+        marks: Dict[str, float],
+        segments: Optional[Dict[int, List[TranscriptSegment]]] = None,
+        analysis_parts: Optional[List[Dict]] = None
+    ) -> Tuple[str, Dict]:
+        """Producer/consumer pipeline between chunk transcription and analysis"""
+        transcripts: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        window = max(1, backend.max_concurrency)
+        
+        async def produce() -> None:
+            # Keep up to `window` chunks in flight and hand them on in timeline order
+            in_flight = deque()
+            try:
+                for index, chunk in enumerate(chunks):
+                    in_flight.append(asyncio.create_task(
+                        self._transcribe_chunk(backend, chunk, index, len(chunks), language, on_progress, segments)
+                    ))
+                    if len(in_flight) >= window:
+                        await transcripts.put(await in_flight.popleft())
+                while in_flight:
+                    await transcripts.put(await in_flight.popleft())
+                await transcripts.put(None)
+            except Exception as e:
+                await transcripts.put(e)
+            finally:
+                for task in in_flight:
+                    task.cancel()
+        
+        stitcher = TranscriptStitcher()
+        
+        async def next_transcript() -> bool:
+            """Stitch the next chunk transcript; False once transcription has finished"""
+            item = await transcripts.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is None:
+                marks["transcribed"] = time.perf_counter()
+                await emit_progress(on_progress, "transcription_complete", {"transcription": stitcher.text})
+                return False
+            stitcher.add(item)
+            return True
+        
+        async def stable_segments() -> AsyncIterator[str]:
+            # Cut segments from text no later chunk can change, leaving a partial
+            # segment behind to grow; flush everything once transcription ends
+            analyzed = 0
+            more = True
+            while True:
+                end = stitcher.stable_word_count if more else stitcher.word_count
+                pending = stitcher.slice(analyzed, end)
+                if not more or estimate_tokens(pending) >= analyzer.segment_tokens:
+                    segments = split_transcript(pending, analyzer.segment_tokens)
+                    if more:
+                        # Keep the last, possibly short, segment for the next round
+                        analyzed = end - count_words(segments[-1])
+                        segments = segments[:-1]
+                    for segment in segments:
+                        if "analysis_started" not in marks:
+                            marks["analysis_started"] = time.perf_counter()
+                            await emit_progress(on_progress, "analysis_started", {"characters": len(segment)})
+                        yield segment
+                if not more:
+                    return
+                more = await next_transcript()
+        
+        producer = asyncio.create_task(produce())
+        try:
+            # Wait until the transcript is known to need map-reduce before analyzing
+            more = True
+            while more and estimate_tokens(stitcher.text) <= analyzer.single_shot_max_tokens:
+                more = await next_transcript()
+            
+            if not more:
+                transcription = stitcher.text
+                marks["analysis_started"] = time.perf_counter()
+                await emit_progress(on_progress, "analysis_started", {"characters": len(transcription)})
+                analysis = await analyzer.analyze_transcription(
+                    transcription, language=language, on_progress=on_progress, parts=analysis_parts
+                )
+                return transcription, analysis
+            
+            self.logger.info("Transcript exceeds single-shot limit, analyzing segments during transcription")
+            analysis = await analyzer.analyze_segment_stream(
+                stable_segments(), language=language, on_progress=on_progress, parts=analysis_parts
+            )
+            return stitcher.text, analysis
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+    
+    def validate_filename(self, filename: Optional[str]) -> str:
+        """
+        Check that a recording has a supported file type
+        
+        Args:
+            filename: Upload filename or path
+        
+        Returns:
+            The lower-case file extension
+        """
+        if not filename:
             raise ValueError("Filename is required")
         
-        file_ext = os.path.splitext(file.filename)[1].lower()
+        file_ext = os.path.splitext(filename)[1].lower()
         if file_ext not in ['.mp3', '.wav']:
             raise ValueError(f"Unsupported file type: {file_ext}. Only .mp3 and .wav are supported.")
+        return file_ext
+    
+    async def ingest_upload(self, file: UploadFile, directory: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Validate an upload and stream it to disk, hashing it on the way
         
-        # Save uploaded file temporarily
-        temp_file = None
+        Args:
+            file: Uploaded audio file
+            directory: Directory to save into. Defaults to the system temp directory.
+        
+        Returns:
+            Tuple of (saved file path, SHA-256 hex digest of the content)
+        """
+        file_ext = self.validate_filename(file.filename)
+        
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext, dir=directory)
         try:
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-            
-            # Write uploaded content to temp file
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.flush()
+            # Stream uploaded content without holding it all in memory,
+            # hashing it on the way for the result cache
+            hasher = hashlib.sha256()
+            await self._save_upload(file, temp_file, hasher)
             temp_file.close()
-            
-            # Transcribe audio with language parameter
-            transcription = await self.whisper_service.transcribe_audio(temp_file.name, language=language)
-            
-            # Analyze transcription with language awareness
-            analysis = await self.groq_service.analyze_transcription(transcription, language=language)
-            
-            # Convert action items to ActionItem objects
-            action_items = [
-                ActionItem(
-                    task=item.get("task", ""),
-                    assignee=item.get("assignee", "Unassigned"),
-                    deadline=item.get("deadline")
-                )
-                for item in analysis.get("action_items", [])
+            return temp_file.name, hasher.hexdigest()
+        except BaseException:
+            # Close first - an aborted upload leaves it open
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+    
+    async def process_audio_path(
+        self,
+        audio_file_path: str,
+        language: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        backend: Optional[str] = None,
+        analysis_backend: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        with_segments: bool = False,
+        filename: Optional[str] = None
+    ) -> TranscriptionResponse:
+        """
+        Transcribe and analyze an audio file already on disk
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'he' for Hebrew, 'en' for English)
+            content_hash: SHA-256 of the file content, used as the result cache key
+            on_progress: Optional callback for pipeline progress events
+            backend: Optional transcription backend name. Defaults to TRANSCRIPTION_BACKEND.
+            analysis_backend: Optional analysis backend name (e.g., 'groq', 'local'). Routed if None.
+            priority: Routing priority - 'interactive' (default) or 'batch'
+            with_segments: Include timed segments in the response. Segments are
+                always kept in the meeting store and result cache.
+            filename: Original upload filename, stored with the meeting
+        
+        Returns:
+            TranscriptionResponse with all extracted information; meeting_id is set
+            when a meeting store is configured
+        """
+        transcription_backend = self.get_backend(backend)
+        # A backend pinned per request or by ANALYSIS_BACKEND is the only one that can answer
+        pinned = analysis_backend or self.analysis_router.default_backend
+        if pinned:
+            candidates = [self.analysis_router.get(pinned)]
+        else:
+            candidates = list(self.analysis_router.backends.values())
+        
+        # Return a cached result for audio we have already processed, by any
+        # analysis backend routing could pick
+        loop = asyncio.get_running_loop()
+        use_cache = self.result_cache is not None and bool(content_hash)
+        if use_cache:
+            for candidate in candidates:
+                cache_key = self._result_key(content_hash, language, transcription_backend, candidate)
+                cached = await loop.run_in_executor(None, self.result_cache.get, cache_key, with_segments)
+                # A result cached without segments cannot answer a request for them
+                if cached is None or (with_segments and cached.segments is None):
+                    continue
+                return await self._reuse_cached(cached, cache_key, filename, language, with_segments)
+        
+        # Transcribe (chunked for long meetings) and analyze with language awareness. Stored
+        # and cached meetings keep their segments whether or not this request wants them;
+        # they stay TranscriptSegments there, and Segment models are built only for a
+        # response that includes them.
+        analysis_parts: Optional[List[Dict]] = [] if self.meeting_store is not None else None
+        transcription, analysis, timings, analyzer, preprocessing, segments = await self._transcribe_and_analyze(
+            transcription_backend, audio_file_path, language=language, on_progress=on_progress,
+            analysis_backend=analysis_backend, priority=priority,
+            with_segments=with_segments or use_cache or self.meeting_store is not None,
+            analysis_parts=analysis_parts
+        )
+        
+        result = self._build_response(
+            transcription,
+            analysis,
+            timings=timings,
+            preprocessing=preprocessing,
+            segments=[Segment(**segment.to_dict()) for segment in segments] if with_segments else None
+        )
+        
+        for section in ("summary", "participants", "decisions", "action_items"):
+            await emit_progress(on_progress, "section", {
+                "name": section,
+                "value": result.model_dump(include={section})[section]
+            })
+        
+        result = await self._save_meeting(result, filename, language, analysis_parts, segments)
+        if use_cache:
+            cache_key = self._result_key(content_hash, language, transcription_backend, analyzer)
+            # Timings and upload sizes describe this run, not later cache hits
+            cached = result.model_copy(update={"timings": None, "preprocessing": None})
+            await loop.run_in_executor(None, self.result_cache.put, cache_key, cached, segments)
+        
+        return result
+    
+    def _result_key(
+        self,
+        content_hash: str,
+        language: Optional[str],
+        transcription_backend: TranscriptionBackend,
+        analyzer: AnalysisBackend
+    ) -> str:
+        """
+        Result cache key for audio processed with the current models, prompts and audio settings
+        
+        Editing a prompt file or changing the preprocessing, VAD or chunking
+        settings makes earlier results unreachable, as the analysis cache does
+        for prompts.
+        """
+        settings = "|".join([
+            analyzer.prompt_version, self.audio_preprocessor.cache_version, self.audio_chunker.cache_version
+        ])
+        return ResultCache.make_key(
+            content_hash, language, transcription_backend.model, analyzer.model,
+            hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+        )
+    
+    async def _reuse_cached(
+        self,
+        cached: TranscriptionResponse,
+        cache_key: str,
+        filename: Optional[str],
+        language: Optional[str],
+        with_segments: bool
+    ) -> TranscriptionResponse:
+        """
+        Turn a result cache hit into a response without storing the meeting twice
+        
+        The hit points at the meeting saved when the audio was first processed;
+        that meeting is returned as stored. If it has been deleted since, the
+        cached result is saved as a new meeting and the cache entry repointed.
+        The cached result carries segments only if with_segments is set.
+        """
+        loop = asyncio.get_running_loop()
+        if self.meeting_store is None:
+            return cached
+        if cached.meeting_id is not None:
+            meeting = await loop.run_in_executor(None, self.meeting_store.get, cached.meeting_id, with_segments)
+            if meeting is not None:
+                return meeting["result"].model_copy(update={"timings": None, "preprocessing": None})
+        # Store the segments the response left out straight from the cache entry
+        segments = None if with_segments else await loop.run_in_executor(None, self.result_cache.segments, cache_key)
+        result = await self._save_meeting(cached, filename, language, segments=segments)
+        await loop.run_in_executor(None, self.result_cache.set_meeting, cache_key, result.meeting_id)
+        return result
+    
+    @staticmethod
+    def _build_response(transcription: str, analysis: Dict, **fields) -> TranscriptionResponse:
+        """Turn an analysis dict into a TranscriptionResponse; extra fields are passed through"""
+        # Convert action items to ActionItem objects
+        action_items = [
+            ActionItem(
+                task=item.get("task", ""),
+                assignee=item.get("assignee", "Unassigned"),
+                deadline=item.get("deadline")
+            )
+            for item in analysis.get("action_items", [])
+        ]
+        
+        return TranscriptionResponse(
+            transcription=transcription,
+            summary=analysis.get("summary", ""),
+            participants=analysis.get("participants", []),
+            decisions=analysis.get("decisions", []),
+            action_items=action_items,
+            **fields
+        )
+    
+    async def _save_meeting(
+        self,
+        result: TranscriptionResponse,
+        filename: Optional[str],
+        language: Optional[str],
+        analysis_parts: Optional[List[Dict]] = None,
+        segments: Optional[List[TranscriptSegment]] = None
+    ) -> TranscriptionResponse:
+        """
+        Save a result to the meeting store, if any, and return it with its meeting_id
+        
+        Segments, when given, are stored instead of the result's own.
+        """
+        if self.meeting_store is None:
+            return result
+        loop = asyncio.get_running_loop()
+        meeting = await loop.run_in_executor(
+            None, self.meeting_store.save, result, filename, language, analysis_parts or None, segments
+        )
+        return result.model_copy(update={"meeting_id": meeting["id"]})
+    
+    async def reanalyze_meeting(
+        self,
+        meeting_id: str,
+        transcription: str,
+        analysis_backend: Optional[str] = None
+    ) -> Optional[Tuple[TranscriptionResponse, int, int]]:
+        """
+        Refresh a stored meeting's analysis after its transcript was edited
+        
+        The edit is diffed word by word against the transcript segments the
+        meeting was analyzed in. Segments whose words are unchanged keep their
+        stored map-stage analysis; only the others are sent to the model, and
+        the reduce step is redone. Timed segments get the edited words too.
+        Meetings stored without segment analyses are split the way
+        analyze_transcription would split them, so unchanged segments can
+        still come from the analysis cache.
+        
+        Without an explicit backend the meeting is re-analyzed by the backend
+        that produced its stored analyses. Stored analyses from a different
+        backend or model are not reused, so one reduce never mixes models.
+        
+        Args:
+            meeting_id: Stored meeting to update
+            transcription: Edited transcript
+            analysis_backend: Optional analysis backend name. Defaults to the one
+                the meeting was analyzed with, routed if that is unknown.
+        
+        Returns:
+            Tuple of (updated result with meeting_id, segments re-analyzed, total segments),
+            or None if the meeting does not exist
+        
+        Raises:
+            ValueError: If there is no meeting store or the transcript is empty
+        """
+        if self.meeting_store is None:
+            raise ValueError("Meeting store is disabled")
+        if not transcription.strip():
+            raise ValueError("Transcription is empty")
+        
+        loop = asyncio.get_running_loop()
+        meeting = await loop.run_in_executor(None, self.meeting_store.get, meeting_id, True)
+        if meeting is None:
+            return None
+        stored = meeting["result"]
+        language = meeting["language"]
+        parts = await loop.run_in_executor(None, self.meeting_store.parts, meeting_id)
+        stored_analyzer = parts[0]["analyzer"] if parts else None
+        if analysis_backend is None and stored_analyzer in self.analysis_router.backends:
+            analysis_backend = stored_analyzer
+        analyzer = self.analysis_router.select(
+            analysis_backend, priority=PRIORITY_INTERACTIVE, tokens=estimate_tokens(transcription)
+        )
+        if any((part["analyzer"], part["model"]) != (analyzer.name, analyzer.model) for part in parts):
+            # Another model's map-stage results would be mixed into this one's reduce
+            self.logger.info(f"Meeting {meeting_id} was analyzed by another model, re-analyzing all segments")
+            parts = []
+        
+        if parts:
+            units = [part["text"] for part in parts]
+        elif estimate_tokens(stored.transcription) <= analyzer.single_shot_max_tokens:
+            units = [stored.transcription]
+        else:
+            units = split_transcript(stored.transcription, analyzer.segment_tokens)
+        # Diffing a long transcript is CPU work - keep it off the event loop
+        texts = await loop.run_in_executor(None, project_edit, units, transcription)
+        previous = [
+            part["analysis"] if text.split() == part["text"].split() else None
+            for part, text in zip(parts, texts)
+        ] if parts else [None] * len(texts)
+        # Segments whose words were all deleted drop out
+        kept = [index for index, text in enumerate(texts) if text]
+        texts = [texts[index] for index in kept]
+        previous = [previous[index] for index in kept]
+        
+        analysis, new_parts = await analyzer.reanalyze_parts(texts, previous, language)
+        
+        segments = stored.segments
+        if segments:
+            edited = await loop.run_in_executor(
+                None, project_edit, [segment.text for segment in segments], transcription
+            )
+            segments = [
+                segment if text.split() == segment.text.split() else segment.model_copy(update={"text": text})
+                for segment, text in zip(segments, edited)
             ]
-            
-            # Build response
-            return TranscriptionResponse(
-                transcription=transcription,
-                summary=analysis.get("summary", ""),
-                participants=analysis.get("participants", []),
-                decisions=analysis.get("decisions", []),
-                action_items=action_items
+        
+        result = self._build_response(transcription, analysis, segments=segments, meeting_id=meeting_id)
+        await loop.run_in_executor(None, self.meeting_store.update, meeting_id, result, new_parts)
+        reanalyzed = sum(1 for partial in previous if partial is None)
+        self.logger.info(f"Meeting {meeting_id} re-analyzed: {reanalyzed} of {len(texts)} segments changed")
+        return result, reanalyzed, len(texts)
+    
+    async def stream_audio_path(
+        self,
+        audio_file_path: str,
+        language: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        backend: Optional[str] = None,
+        analysis_backend: Optional[str] = None,
+        with_segments: bool = False,
+        filename: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Run the pipeline on a saved upload, yielding progress events as they happen
+        
+        The file is deleted once processing ends. If the consumer stops iterating
+        (e.g., the client disconnected), processing is cancelled.
+        
+        Args:
+            audio_file_path: Path to the saved upload
+            language: Optional language code
+            content_hash: SHA-256 of the file content, used as the result cache key
+            backend: Optional transcription backend name
+            analysis_backend: Optional analysis backend name
+            with_segments: Include timed segments in the result
+            filename: Original upload filename, stored with the meeting
+        
+        Yields:
+            (event name, payload) tuples, ending with a result or error event
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def on_progress(event: str, data: Dict) -> None:
+            await events.put((event, data))
+        
+        async def run() -> None:
+            try:
+                result = await self.process_audio_path(
+                    audio_file_path, language=language, content_hash=content_hash,
+                    on_progress=on_progress, backend=backend, analysis_backend=analysis_backend,
+                    with_segments=with_segments, filename=filename
+                )
+                await events.put(("result", result.model_dump()))
+            except RateLimitExceededError as e:
+                await events.put(("error", {"detail": f"Processing error: {str(e)}", "retry_after": e.retry_after}))
+            except Exception as e:
+                await events.put(("error", {"detail": f"Processing error: {str(e)}"}))
+            finally:
+                await events.put(None)
+        
+        task = asyncio.create_task(run())
+        try:
+            yield "upload_received", {"bytes": os.path.getsize(audio_file_path)}
+            while True:
+                item = await events.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            if os.path.exists(audio_file_path):
+                os.unlink(audio_file_path)
+    
+    async def process_audio_file(
+        self,
+        file: UploadFile,
+        language: Optional[str] = None,
+        backend: Optional[str] = None,
+        analysis_backend: Optional[str] = None,
+        with_segments: bool = False
+    ) -> TranscriptionResponse:
+        """
+        Process audio file: transcribe and analyze
+        
+        Args:
+            file: Uploaded audio file
+            language: Optional language code (e.g., 'he' for Hebrew, 'en' for English)
+            backend: Optional transcription backend name (e.g., 'openai', 'local')
+            analysis_backend: Optional analysis backend name (e.g., 'groq', 'local')
+            with_segments: Include timed segments in the response
+        
+        Returns:
+            TranscriptionResponse with all extracted information
+        """
+        # Reject unknown backends before saving the upload
+        self.validate_backends(backend, analysis_backend)
+        
+        # Save uploaded file temporarily
+        audio_file_path, content_hash = await self.ingest_upload(file)
+        try:
+            return await self.process_audio_path(
+                audio_file_path, language=language, content_hash=content_hash,
+                backend=backend, analysis_backend=analysis_backend, with_segments=with_segments,
+                filename=file.filename
             )
-            
         finally:
             # Clean up temporary file
-            if temp_file and os.path.exists(temp_file.name):
-                os.unlink(temp_file.name)
-
+            if os.path.exists(audio_file_path):
+                os.unlink(audio_file_path)
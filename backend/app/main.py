@@ -1,4 +1,5 @@
 """FastAPI application entry point"""
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -13,13 +14,26 @@ else:
     print(f"Warning: .env file not found at {env_path}")
     print("Make sure to create a .env file with OPENAI_API_KEY and GROQ_API_KEY")
 
-from app.api.routes import transcription, health
+from app.api.routes import transcription, health, jobs, meetings
+from app.business.service_registry import service_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared services on startup and release their pools on shutdown"""
+    service_registry.startup()
+    service_registry.start_job_workers()
+    yield
+    await service_registry.stop_job_workers()
+    service_registry.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Meeting Transcription & Summarization API",
     description="API for transcribing audio meetings and generating summaries",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,6 +48,8 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router)
 app.include_router(transcription.router)
+app.include_router(jobs.router)
+app.include_router(meetings.router)
 
 
 @app.get("/")
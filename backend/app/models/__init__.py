@@ -1,2 +1,2 @@
-# Models package - Pydantic schemas for data validation
+# Models package - Pydantic schemas for data validation and compact in-memory models
 
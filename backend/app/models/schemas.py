@@ -1,4 +1,5 @@
 """Pydantic schemas for request/response validation"""
+from datetime import datetime
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -10,6 +11,34 @@ class ActionItem(BaseModel):
     deadline: Optional[str] = None
 
 
+class StageTimings(BaseModel):
+    """Wall-clock seconds spent in each pipeline stage"""
+    transcription_seconds: float
+    analysis_seconds: float
+    overlap_seconds: float = 0.0  # Time both stages were running at once
+    preprocessing_seconds: float = 0.0  # Part of transcription_seconds spent preparing the audio
+    total_seconds: float
+
+
+class Segment(BaseModel):
+    """A timed stretch of the transcript"""
+    start: float  # Seconds from the start of the recording
+    end: Optional[float] = None  # None when the backend gave no timing
+    text: str
+    confidence: Optional[float] = None  # 0-1, from the model's token probabilities
+
+
+class AudioPreprocessing(BaseModel):
+    """What audio preprocessing did to one recording before upload"""
+    codec: str  # Codec uploaded, or 'original' when the original file was smaller
+    original_bytes: int
+    uploaded_bytes: int  # Total size of the uploaded chunks
+    bytes_saved: int
+    original_seconds: float
+    skipped_seconds: float  # Silence not sent for transcription
+    speech_regions: int = 1  # Stretches of the recording that were sent
+
+
 class TranscriptionResponse(BaseModel):
     """Response schema for transcription endpoint"""
     transcription: str
@@ -17,6 +46,10 @@ class TranscriptionResponse(BaseModel):
     participants: List[str]
     decisions: List[str]
     action_items: List[ActionItem]
+    timings: Optional[StageTimings] = None
+    preprocessing: Optional[AudioPreprocessing] = None
+    segments: Optional[List[Segment]] = None  # Only filled in when requested
+    meeting_id: Optional[str] = None  # Id in the meeting store, when the meeting was saved
 
 
 class ExportRequest(BaseModel):
@@ -27,4 +60,100 @@ class ExportRequest(BaseModel):
     decisions: List[str]
     action_items: List[ActionItem]
     filename: Optional[str] = "meeting_transcription"
+    segments: Optional[List[Segment]] = None  # Timestamps for subtitle and JSON-lines exports
+
+
+class JobResponse(BaseModel):
+    """Response schema for background transcription jobs"""
+    job_id: str
+    status: str  # queued, running, completed, failed
+    filename: str
+    language: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[TranscriptionResponse] = None
+    error: Optional[str] = None
+
+
+class MeetingSummary(BaseModel):
+    """One meeting in a meeting list"""
+    meeting_id: str
+    filename: Optional[str] = None
+    language: Optional[str] = None
+    created_at: datetime
+    summary: str
+    participants: List[str]
+    action_item_count: int
+    segment_count: Optional[int] = None  # None when stored without segments
+
+
+class MeetingListResponse(BaseModel):
+    """A page of stored meetings, newest first"""
+    items: List[MeetingSummary]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+
+
+class MeetingResponse(BaseModel):
+    """A stored meeting with its full result"""
+    meeting_id: str
+    filename: Optional[str] = None
+    language: Optional[str] = None
+    created_at: datetime
+    result: TranscriptionResponse
+
+
+class ReanalyzeRequest(BaseModel):
+    """Edited transcript of a stored meeting"""
+    transcription: str
+
+
+class ReanalyzeResponse(BaseModel):
+    """A stored meeting after its edited transcript was re-analyzed"""
+    meeting_id: str
+    result: TranscriptionResponse
+    reanalyzed_segments: int  # Transcript segments sent to the model again
+    total_segments: int  # Transcript segments the analysis is made of
+
+
+class SegmentPage(BaseModel):
+    """A page of a stored meeting's segments"""
+    items: List[Segment]
+    total: int
+    next_offset: Optional[int] = None  # None on the last page
+
+
+class SearchHit(BaseModel):
+    """One meeting matching a search"""
+    meeting_id: str
+    filename: Optional[str] = None
+    language: Optional[str] = None
+    created_at: datetime
+    summary: str
+    score: float  # BM25 relevance; higher is better
+    snippet: str  # Best matching passage, matches wrapped in <mark></mark>
+
+
+class SearchResponse(BaseModel):
+    """A page of search results, best match first"""
+    items: List[SearchHit]
+    total: int
+    next_offset: Optional[int] = None  # None on the last page
+
+
+class BatchItemResponse(BaseModel):
+    """Outcome for one recording in a batch"""
+    source: str  # Upload filename or manifest path
+    status: str  # completed, failed, queued
+    job_id: Optional[str] = None
+    result: Optional[TranscriptionResponse] = None
+    error: Optional[str] = None
+
 
+class BatchResponse(BaseModel):
+    """Response schema for batch transcription"""
+    items: List[BatchItemResponse]
+    completed: int = 0
+    failed: int = 0
+    queued: int = 0
+    concurrency: Optional[int] = None  # Recordings processed at once; None when queued as jobs
+    elapsed_seconds: float
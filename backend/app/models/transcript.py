@@ -0,0 +1,53 @@
+"""Compact in-memory transcript segments"""
+import math
+from typing import Dict, Iterable, Optional
+
+
+class TranscriptSegment:
+    """
+    One timed stretch of a transcript
+
+    Long meetings produce thousands of these, so they use __slots__ instead of
+    a per-instance dict or a Pydantic model; they are converted to the API
+    schema only when a response asks for segments.
+    """
+
+    __slots__ = ("start", "end", "text", "confidence")
+
+    def __init__(self, start: float, end: Optional[float], text: str, confidence: Optional[float] = None):
+        """
+        Args:
+            start: Seconds from the start of the recording
+            end: Seconds from the start of the recording, or None if unknown
+            text: Transcribed text
+            confidence: Probability-like score in [0, 1], or None if the backend gives none
+        """
+        self.start = start
+        self.end = end
+        self.text = text
+        self.confidence = confidence
+
+    def to_dict(self) -> Dict:
+        return {"start": self.start, "end": self.end, "text": self.text, "confidence": self.confidence}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TranscriptSegment):
+            return NotImplemented
+        return (self.start, self.end, self.text, self.confidence) == (
+            other.start, other.end, other.text, other.confidence
+        )
+
+    def __repr__(self) -> str:
+        return f"TranscriptSegment({self.start!r}, {self.end!r}, {self.text!r}, {self.confidence!r})"
+
+
+def confidence_from_logprob(avg_logprob: Optional[float]) -> Optional[float]:
+    """Turn Whisper's average token log-probability into a [0, 1] score"""
+    if avg_logprob is None:
+        return None
+    return round(min(1.0, math.exp(avg_logprob)), 3)
+
+
+def segments_text(segments: Iterable[TranscriptSegment]) -> str:
+    """Join segment texts into a plain transcript"""
+    return " ".join(text for text in (segment.text.strip() for segment in segments) if text)
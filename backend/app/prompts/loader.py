@@ -1,4 +1,5 @@
 """Prompt loader utility for loading prompts from files"""
+import hashlib
 from pathlib import Path
 from typing import Optional
 
@@ -10,6 +11,29 @@ class PromptLoader:
         self.prompts_dir = Path(__file__).parent
         self._cache = {}
     
+    def _entry(self, prompt_name: str) -> tuple:
+        """Cached (mtime, content, version) for a prompt, re-read when the file changes"""
+        prompt_path = self.prompts_dir / f"{prompt_name}.txt"
+        
+        try:
+            mtime = prompt_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
+        
+        # Check cache first - a stat per call picks up edits without a restart
+        entry = self._cache.get(prompt_name)
+        if entry is not None and entry[0] == mtime:
+            return entry
+        
+        with open(prompt_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        
+        # Cache the prompt
+        entry = (mtime, content, hashlib.sha256(content.encode("utf-8")).hexdigest()[:16])
+        self._cache[prompt_name] = entry
+        
+        return entry
+    
     def load(self, prompt_name: str) -> str:
         """
         Load a prompt from a text file
@@ -20,23 +44,19 @@ class PromptLoader:
         Returns:
             Prompt content as string
         """
-        # Check cache first
-        if prompt_name in self._cache:
-            return self._cache[prompt_name]
-        
-        # Load from file
-        prompt_path = self.prompts_dir / f"{prompt_name}.txt"
-        
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
-        
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
+        return self._entry(prompt_name)[1]
+    
+    def version(self, prompt_name: str) -> str:
+        """
+        Short hash of a prompt file's current contents
         
-        # Cache the prompt
-        self._cache[prompt_name] = content
+        Args:
+            prompt_name: Name of the prompt file (without .txt extension)
         
-        return content
+        Returns:
+            Version string that changes whenever the file's contents do
+        """
+        return self._entry(prompt_name)[2]
     
     def get_language_instruction(self, language: Optional[str] = None) -> str:
         """
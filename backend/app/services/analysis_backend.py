@@ -0,0 +1,571 @@
+"""Shared meeting analysis logic for OpenAI-compatible chat completion backends"""
+import asyncio
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logger import log_payload
+from app.utils.rate_limiter import RateLimitExceededError, RateLimitScheduler
+from app.prompts.loader import prompt_loader
+from app.storage.analysis_cache import AnalysisCache
+
+# Conservative chars-per-token estimate (Hebrew tokenizes denser than English)
+CHARS_PER_TOKEN = 3
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used to size LLM requests"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_transcript(transcription: str, max_tokens: int) -> List[str]:
+    """
+    Split a transcript into token-bounded segments on sentence boundaries
+    
+    Args:
+        transcription: Full transcript text
+        max_tokens: Maximum estimated tokens per segment
+    
+    Returns:
+        List of segments in order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    segments = []
+    current = []
+    current_chars = 0
+    
+    for sentence in _SENTENCE_BOUNDARY.split(transcription):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        # A single run-on sentence longer than a segment is split on words
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                segments.append(' '.join(current))
+                current, current_chars = [], 0
+            segments.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and current_chars + len(sentence) + 1 > max_chars:
+            segments.append(' '.join(current))
+            current, current_chars = [], 0
+        current.append(sentence)
+        current_chars += len(sentence) + 1
+    
+    if current:
+        segments.append(' '.join(current))
+    return segments
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    """Total tokens a chat completion reports using, if it does"""
+    total = getattr(getattr(response, "usage", None), "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+def _dedupe_key(text: str) -> str:
+    """Case- and punctuation-insensitive key for de-duplicating extracted items"""
+    return re.sub(r'[\W_]+', ' ', str(text)).strip().casefold()
+
+
+class AnalysisBackend:
+    """
+    Meeting analysis over any OpenAI-compatible chat completions client
+    
+    Subclasses set up the provider: client, model, token limits, the bounded
+    executor whose size is max_concurrency, and the provider's rate limiter.
+    Prompting, single-shot vs map-reduce, merging and JSON handling are shared.
+    """
+    
+    # Registry key used to select the backend (e.g., 'groq', 'local')
+    name: str = ""
+    # Prefix for errors raised by this backend
+    error_label: str = "Analysis error"
+    
+    client: Any
+    model: str
+    temperature: float
+    single_shot_max_tokens: int
+    segment_tokens: int
+    max_concurrency: int
+    executor: ThreadPoolExecutor
+    # Shared per provider: paces calls within its budgets and retries rejected ones
+    rate_limiter: RateLimitScheduler
+    logger: logging.Logger
+    # Upper bound on tokens generated per completion
+    max_output_tokens: int = 4000
+    # Completion requests currently running or queued on the executor
+    in_flight: int = 0
+    # Optional cache of analyses by normalized text, prompt, model and temperature
+    analysis_cache: Optional[AnalysisCache] = None
+    
+    @property
+    def prompt_version(self) -> str:
+        """Versions of the analysis and reduce prompts, for result cache keys"""
+        return f"{prompt_loader.version('meeting_analysis')}/{prompt_loader.version('meeting_reduce')}"
+    
+    @property
+    def load(self) -> float:
+        """Requests in flight per worker; 1.0 or more means new requests queue"""
+        return self.in_flight / max(1, self.max_concurrency)
+    
+    def _get_system_prompt(self, language: Optional[str] = None) -> str:
+        """Get the system prompt for meeting analysis"""
+        # Load base prompt from file
+        base_prompt = prompt_loader.load("meeting_analysis")
+        
+        # Add language-specific instruction prefix if needed
+        lang_instruction = prompt_loader.get_language_instruction(language)
+        
+        return f"{lang_instruction}{base_prompt}"
+    
+    def _create_completion(self, messages: List[Dict]):
+        """Blocking chat completion call - runs on the backend's thread pool"""
+        # Try to use JSON mode if supported, otherwise rely on prompt engineering
+        try:
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_output_tokens,
+                response_format={"type": "json_object"}
+            )
+        except TypeError:
+            # If response_format is not supported, try without it
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_output_tokens
+            )
+    
+    async def _complete_json(self, messages: List[Dict]) -> Dict:
+        """
+        Run a chat completion off the event loop and parse its JSON content
+        
+        Args:
+            messages: Chat messages
+        
+        Returns:
+            Parsed JSON object (best effort)
+        """
+        # Budget the prompt plus the most the completion may generate;
+        # the difference is settled from the reported usage afterwards
+        tokens = sum(estimate_tokens(message["content"]) for message in messages) + self.max_output_tokens
+        
+        # The blocking client call runs off the event loop, paced by the provider's rate limiter
+        self.in_flight += 1
+        try:
+            response = await self.rate_limiter.run(
+                self.executor, self._create_completion, messages,
+                tokens=tokens, count_tokens=_usage_tokens
+            )
+        finally:
+            self.in_flight -= 1
+        
+        content = response.choices[0].message.content
+        
+        # Parse JSON response
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            # If response format doesn't enforce JSON, try to extract JSON from text
+            self.logger.warning("Failed to parse JSON directly, attempting extraction")
+            return self._extract_json_from_text(content)
+    
+    async def _cache_lookup(
+        self,
+        kind: str,
+        text: str,
+        language: Optional[str],
+        prompt_name: str
+    ) -> Tuple[Optional[Tuple[str, str]], Optional[Dict]]:
+        """
+        Look up an analysis in the cache
+        
+        Args:
+            kind: What is being analyzed ('transcript', 'segment' or 'reduce')
+            text: Text sent to the model
+            language: Optional language code
+            prompt_name: System prompt file used
+        
+        Returns:
+            Tuple of (version and key to store the result under, or None without a cache;
+            cached analysis or None on a miss)
+        """
+        if self.analysis_cache is None:
+            return None, None
+        version = prompt_loader.version(prompt_name)
+        key = AnalysisCache.make_key(
+            kind, text, prompt_loader.get_language_instruction(language),
+            prompt_loader.load(prompt_name), self.model, self.temperature
+        )
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.analysis_cache.get, prompt_name, version, key)
+        if cached is not None:
+            self.logger.debug(f"Analysis cache hit ({kind}, {len(text)} characters)")
+        return (version, key), cached
+    
+    async def _cache_store(self, prompt_name: str, entry: Optional[Tuple[str, str]], result: Dict) -> None:
+        """Store an analysis under the version and key from _cache_lookup"""
+        if entry is None:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.analysis_cache.put, prompt_name, *entry, result)
+    
+    async def _analyze_text(self, transcription: str, language: Optional[str] = None, part: str = "") -> Dict:
+        """
+        Single analysis request for a transcript or one segment of it
+        
+        Cached by normalized text; the part label is left out of the key, so a
+        segment that reappears at another position is still a hit.
+        """
+        entry, cached = await self._cache_lookup(
+            "segment" if part else "transcript", transcription, language, "meeting_analysis"
+        )
+        if cached is not None:
+            return cached
+        
+        if part:
+            user_prompt = (
+                f"TRANSCRIPTION ({part}):\n{transcription}\n\n"
+                "This is one part of a longer meeting. Analyze only this part and provide the requested information in JSON format."
+            )
+        else:
+            user_prompt = f"TRANSCRIPTION:\n{transcription}\n\nAnalyze this transcription and provide the requested information in JSON format."
+        
+        messages = [
+            {"role": "system", "content": self._get_system_prompt(language)},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        result = await self._complete_json(messages)
+        
+        # Validate and normalize response structure
+        normalized = self._normalize_response(result)
+        await self._cache_store("meeting_analysis", entry, normalized)
+        return normalized
+    
+    async def analyze_segment(
+        self,
+        segment: str,
+        language: Optional[str] = None,
+        index: int = 0,
+        total: Optional[int] = 1
+    ) -> Dict:
+        """
+        Map step: analyze one segment of a long transcript
+        
+        Args:
+            segment: Segment text
+            language: Optional language code
+            index: Zero-based segment position
+            total: Number of segments in the transcript, or None while it is still being transcribed
+        
+        Returns:
+            Normalized partial analysis for the segment
+        """
+        part = f"part {index + 1} of {total}" if total else f"part {index + 1}"
+        self.logger.debug(f"Analyzing segment {part} ({len(segment)} characters)")
+        return await self._analyze_text(segment, language, part=part)
+    
+    async def reduce_analyses(self, partials: List[Dict], language: Optional[str] = None) -> Dict:
+        """
+        Reduce step: merge segment analyses into one meeting analysis
+        
+        Lists are merged and de-duplicated locally; only the summaries go back
+        to the model, so the reduce request stays small.
+        
+        Args:
+            partials: Normalized analyses in transcript order
+            language: Optional language code
+        
+        Returns:
+            Normalized analysis for the whole meeting
+        """
+        merged = self._merge_partials(partials)
+        
+        summaries = [partial["summary"] for partial in partials if partial.get("summary")]
+        if len(summaries) > 1:
+            numbered = "\n\n".join(f"PART {i}:\n{summary}" for i, summary in enumerate(summaries, 1))
+            entry, result = await self._cache_lookup("reduce", numbered, language, "meeting_reduce")
+            if result is None:
+                messages = [
+                    {"role": "system", "content": self._get_reduce_prompt(language)},
+                    {"role": "user", "content": f"PARTIAL SUMMARIES:\n{numbered}"}
+                ]
+                result = {"summary": (await self._complete_json(messages)).get("summary")}
+                await self._cache_store("meeting_reduce", entry, result)
+            merged["summary"] = result.get("summary") or "\n\n".join(summaries)
+        else:
+            merged["summary"] = summaries[0] if summaries else ""
+        
+        return merged
+    
+    def _get_reduce_prompt(self, language: Optional[str] = None) -> str:
+        """Get the system prompt for merging partial summaries"""
+        base_prompt = prompt_loader.load("meeting_reduce")
+        lang_instruction = prompt_loader.get_language_instruction(language)
+        return f"{lang_instruction}{base_prompt}"
+    
+    def _merge_partials(self, partials: List[Dict]) -> Dict:
+        """Merge participants, decisions and action items, dropping duplicates"""
+        participants = {}
+        decisions = {}
+        action_items = {}
+        
+        for partial in partials:
+            for participant in partial.get("participants", []):
+                participants.setdefault(_dedupe_key(participant), participant)
+            for decision in partial.get("decisions", []):
+                decisions.setdefault(_dedupe_key(decision), decision)
+            for item in partial.get("action_items", []):
+                if not isinstance(item, dict):
+                    continue
+                key = _dedupe_key(item.get("task", ""))
+                existing = action_items.get(key)
+                if existing is None:
+                    action_items[key] = dict(item)
+                    continue
+                # Later segments may name the owner or deadline of an earlier task
+                if existing.get("assignee", "Unassigned") == "Unassigned" and item.get("assignee"):
+                    existing["assignee"] = item["assignee"]
+                if not existing.get("deadline") and item.get("deadline"):
+                    existing["deadline"] = item["deadline"]
+        
+        return {
+            "summary": "",
+            "participants": list(participants.values()),
+            "decisions": list(decisions.values()),
+            "action_items": list(action_items.values())
+        }
+    
+    async def analyze_transcription(
+        self,
+        transcription: str,
+        language: Optional[str] = None,
+        on_progress: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+        parts: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Analyze transcription and extract meeting insights
+        
+        Args:
+            transcription: The transcribed meeting text
+            language: Optional language code for language-aware analysis
+            on_progress: Optional callback, sent an analysis_segment event per map-stage result
+            parts: Optional list filled with {'text', 'analysis', 'analyzer', 'model'} per map-stage segment
+                (the whole transcript when it is analyzed in one request), for reanalyze_parts
+        
+        Returns:
+            Dictionary with summary, participants, decisions, and action_items
+        """
+        try:
+            self.logger.debug(
+                f"Starting {self.name} analysis of transcription ({len(transcription)} characters, "
+                f"model: {self.model}, language: {language or 'auto-detect'})"
+            )
+            
+            if estimate_tokens(transcription) <= self.single_shot_max_tokens:
+                mode = "single-shot"
+                normalized_result = await self._analyze_text(transcription, language)
+                partials = [normalized_result]
+                segments = [transcription]
+            else:
+                segments = split_transcript(transcription, self.segment_tokens)
+                mode = f"map-reduce ({len(segments)} segments)"
+                self.logger.info(f"Transcription exceeds single-shot limit, using {mode}")
+                
+                async def map_segment(index, segment):
+                    partial = await self.analyze_segment(segment, language, index, len(segments))
+                    if on_progress is not None:
+                        await on_progress("analysis_segment", {
+                            "index": index,
+                            "total": len(segments),
+                            "analysis": partial
+                        })
+                    return partial
+                
+                partials = await asyncio.gather(
+                    *(map_segment(index, segment) for index, segment in enumerate(segments))
+                )
+                normalized_result = await self.reduce_analyses(list(partials), language)
+            
+            if parts is not None:
+                parts.extend(self._parts(segments, partials))
+            self._log_analysis(normalized_result, mode)
+            
+            return normalized_result
+            
+        except Exception as e:
+            error_msg = f"{self.error_label}: {str(e)}"
+            self.logger.error(f"ANALYSIS FAILED: {error_msg} (transcription length: {len(transcription)} characters)")
+            raise self._provider_error(e, error_msg)
+    
+    async def analyze_segment_stream(
+        self,
+        segments: AsyncIterator[str],
+        language: Optional[str] = None,
+        on_progress: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+        parts: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Map-reduce analysis over segments that arrive while the transcript is still being produced
+        
+        Each segment is sent to the map stage as soon as it arrives, so analysis of
+        early segments overlaps transcription of later audio. At most
+        GROQ_MAX_CONCURRENCY segments are in flight; beyond that the stream is not
+        read until one finishes. The reduce step runs once the segment stream ends.
+        
+        Args:
+            segments: Transcript segments in order
+            language: Optional language code for language-aware analysis
+            on_progress: Optional callback, sent an analysis_segment event per map-stage result
+            parts: Optional list filled with {'text', 'analysis', 'analyzer', 'model'} per segment,
+                for reanalyze_parts
+        
+        Returns:
+            Dictionary with summary, participants, decisions, and action_items
+        """
+        tasks: List[asyncio.Task] = []
+        texts: List[str] = []
+        
+        async def map_segment(index, segment):
+            partial = await self.analyze_segment(segment, language, index, total=None)
+            if on_progress is not None:
+                await on_progress("analysis_segment", {"index": index, "total": None, "analysis": partial})
+            return partial
+        
+        try:
+            self.logger.debug(
+                f"Starting pipelined {self.name} analysis of transcription "
+                f"(model: {self.model}, language: {language or 'auto-detect'})"
+            )
+            
+            # Errors from the segment source propagate as they are
+            async for segment in segments:
+                running = [task for task in tasks if not task.done()]
+                if len(running) >= self.max_concurrency:
+                    # Stop pulling segments until a map call finishes, which backs up the producer
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.done() and task.exception() is not None for task in tasks):
+                    break  # A map call failed - stop early and report it below
+                tasks.append(asyncio.create_task(map_segment(len(tasks), segment)))
+                texts.append(segment)
+            
+            try:
+                partials = await asyncio.gather(*tasks)
+                normalized_result = await self.reduce_analyses(list(partials), language)
+            except Exception as e:
+                error_msg = f"{self.error_label}: {str(e)}"
+                self.logger.error(f"ANALYSIS FAILED: {error_msg}")
+                raise self._provider_error(e, error_msg)
+            
+            if parts is not None:
+                parts.extend(self._parts(texts, partials))
+            self._log_analysis(normalized_result, f"pipelined map-reduce ({len(tasks)} segments)")
+            return normalized_result
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def reanalyze_parts(
+        self,
+        texts: List[str],
+        previous: List[Optional[Dict]],
+        language: Optional[str] = None
+    ) -> Tuple[Dict, List[Dict]]:
+        """
+        Incremental analysis after a transcript edit
+        
+        Only segments without a previous analysis go through the map step; the
+        reduce step then runs over all of them, as in analyze_transcription.
+        A single segment is analyzed as a whole transcript, with no reduce.
+        
+        Args:
+            texts: Segment texts in transcript order
+            previous: Stored analysis of each segment whose text is unchanged, else None
+            language: Optional language code for language-aware analysis
+        
+        Returns:
+            Tuple of (analysis for the whole meeting, {'text', 'analysis', 'analyzer', 'model'} per segment)
+        """
+        changed = sum(1 for partial in previous if partial is None)
+        try:
+            if len(texts) == 1:
+                partials = [previous[0] or await self._analyze_text(texts[0], language)]
+                normalized_result = partials[0]
+            else:
+                async def map_segment(index, segment, partial):
+                    if partial is not None:
+                        return partial
+                    return await self.analyze_segment(segment, language, index, len(texts))
+                
+                partials = list(await asyncio.gather(
+                    *(map_segment(index, *pair) for index, pair in enumerate(zip(texts, previous)))
+                ))
+                normalized_result = await self.reduce_analyses(partials, language)
+        except Exception as e:
+            error_msg = f"{self.error_label}: {str(e)}"
+            self.logger.error(f"REANALYSIS FAILED: {error_msg}")
+            raise self._provider_error(e, error_msg)
+        
+        self._log_analysis(normalized_result, f"incremental ({changed} of {len(texts)} segments re-analyzed)")
+        return normalized_result, self._parts(texts, partials)
+    
+    def _parts(self, texts: List[str], partials: List[Dict]) -> List[Dict]:
+        """Map-stage results for the meeting store, tagged with the backend and model that produced them"""
+        return [
+            {"text": text, "analysis": partial, "analyzer": self.name, "model": self.model}
+            for text, partial in zip(texts, partials)
+        ]
+    
+    def _provider_error(self, error: Exception, message: str) -> Exception:
+        """Error to raise for a failed analysis; rate limiting keeps its type for the API layer"""
+        if isinstance(error, RateLimitExceededError):
+            return RateLimitExceededError(message, error.retry_after)
+        return Exception(message)
+    
+    def _log_analysis(self, result: Dict, mode: str) -> None:
+        """Log a finished analysis; the full JSON is truncated or stored per LOG_PAYLOAD_MODE"""
+        self.logger.info(
+            f"{self.name.upper()} ANALYSIS RESULT - model: {self.model}, temperature: {self.temperature}, mode: {mode}, "
+            f"participants: {len(result.get('participants', []))}, "
+            f"decisions: {len(result.get('decisions', []))}, "
+            f"action items: {len(result.get('action_items', []))}"
+        )
+        if self.logger.isEnabledFor(logging.INFO):
+            log_payload(self.logger, "Analysis JSON", json.dumps(result, indent=2, ensure_ascii=False))
+    
+    def _extract_json_from_text(self, text: str) -> Dict:
+        """Extract JSON from text response if not properly formatted"""
+        # Try to find JSON object in the text
+        json_match = re.search(r'\{.*\}', text, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group())
+            except json.JSONDecodeError:
+                pass
+        
+        # Fallback: return empty structure
+        return {
+            "summary": text[:500] if text else "Unable to generate summary",
+            "participants": [],
+            "decisions": [],
+            "action_items": []
+        }
+    
+    def _normalize_response(self, response: Dict) -> Dict:
+        """Normalize response to ensure all required fields exist"""
+        return {
+            "summary": response.get("summary", ""),
+            "participants": response.get("participants", []),
+            "decisions": response.get("decisions", []),
+            "action_items": response.get("action_items", [])
+        }
+
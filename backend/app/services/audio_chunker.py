@@ -0,0 +1,423 @@
+"""Audio chunking for long recordings and transcript stitching"""
+import difflib
+import mmap
+import os
+import re
+import unicodedata
+import wave
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from app.models.transcript import TranscriptSegment
+from app.utils.logger import setup_logger
+
+# MPEG audio frame tables (Layer III only)
+_MP3_BITRATES = {
+    "mpeg1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "mpeg2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    "mpeg1": [44100, 48000, 32000],
+    "mpeg2": [22050, 24000, 16000],
+    "mpeg2.5": [11025, 12000, 8000],
+}
+
+_WORD_NORMALIZE = re.compile(r"[^\w]+", re.UNICODE)
+
+# Scripts written without spaces between words (Thai, Lao, Myanmar, Khmer, kana, Han),
+# whose transcripts are aligned character by character
+_UNSPACED = "\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# Combining marks in those scripts stay with the character they modify
+_UNSPACED_MARKS = "".join(
+    chr(code)
+    for start, end in ((0x0E00, 0x0EFF), (0x1000, 0x109F), (0x1780, 0x17FF), (0x3040, 0x30FF))
+    for code in range(start, end + 1)
+    if unicodedata.category(chr(code)).startswith("M")
+)
+_WORD = re.compile(rf"[{_UNSPACED}][{_UNSPACED_MARKS}]*|[^\s{_UNSPACED}]+")
+_UNSPACED_CHAR = re.compile(rf"[{_UNSPACED}]")
+
+
+class AudioChunk(NamedTuple):
+    """A window of the original recording, written to its own file"""
+    path: str
+    start: float  # Seconds from the start of the original recording
+    end: Optional[float]  # None when the duration is unknown
+    # Maps (seconds into the chunk, at_end) to the original timeline when silence was cut out
+    timeline: Optional[Callable[[float, bool], float]] = None
+    
+    def original_time(self, seconds: float, at_end: bool = False) -> float:
+        """Convert seconds into this chunk's audio to seconds into the original recording"""
+        if self.timeline is not None:
+            return self.timeline(seconds, at_end)
+        return self.start + seconds
+
+
+class AudioChunker:
+    """Splits long recordings into overlapping fixed windows"""
+
+    def __init__(
+        self,
+        chunk_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        max_chunk_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            chunk_seconds: Target window length. Defaults to AUDIO_CHUNK_SECONDS.
+            overlap_seconds: Audio shared by neighbouring windows. Defaults to AUDIO_CHUNK_OVERLAP_SECONDS.
+            max_chunk_bytes: Provider upload limit per chunk. Defaults to AUDIO_CHUNK_MAX_MB.
+        """
+        self.chunk_seconds = chunk_seconds or float(os.getenv("AUDIO_CHUNK_SECONDS", "600"))
+        self.overlap_seconds = (
+            overlap_seconds if overlap_seconds is not None
+            else float(os.getenv("AUDIO_CHUNK_OVERLAP_SECONDS", "5"))
+        )
+        self.max_chunk_bytes = max_chunk_bytes or int(float(os.getenv("AUDIO_CHUNK_MAX_MB", "24")) * 1024 * 1024)
+        self.logger = setup_logger("chunker")
+
+    @property
+    def cache_version(self) -> str:
+        """Settings that change the transcript, for result cache keys"""
+        return f"chunk={self.chunk_seconds}/{self.overlap_seconds}/{self.max_chunk_bytes}"
+
+    def split(
+        self,
+        audio_file_path: str,
+        output_dir: str,
+        decode: Optional[Callable[[str, str], object]] = None
+    ) -> List[AudioChunk]:
+        """
+        Split an audio file into overlapping windows
+
+        Files that are short enough are returned as a single chunk pointing at
+        the original file. A file over the chunk size limit that cannot be
+        parsed (float or WAVE_FORMAT_EXTENSIBLE WAV, other formats) is converted
+        with decode and the PCM WAV split instead; without a decoder, or if
+        decoding fails, it is returned whole with a warning.
+
+        Args:
+            audio_file_path: Path to the audio file (mp3/wav)
+            output_dir: Directory to write chunk files to
+            decode: Optional function writing the recording at its first path as
+                PCM WAV to its second (e.g. AudioPreprocessor.decode)
+
+        Returns:
+            List of AudioChunk in timeline order
+        """
+        file_ext = os.path.splitext(audio_file_path)[1].lower()
+        try:
+            if file_ext == ".wav":
+                chunks = self._split_wav(audio_file_path, output_dir)
+            elif file_ext == ".mp3":
+                chunks = self._split_mp3(audio_file_path, output_dir)
+            else:
+                chunks = []
+        except (wave.Error, EOFError, ValueError):
+            chunks = []
+        if not chunks and os.path.getsize(audio_file_path) > self.max_chunk_bytes:
+            # Only files the parsers could not read end up here - a parsed file this
+            # large is always cut into several windows
+            chunks = self._split_decoded(audio_file_path, output_dir, decode)
+
+        return chunks or [AudioChunk(path=audio_file_path, start=0.0, end=None)]
+
+    def _split_decoded(
+        self,
+        audio_file_path: str,
+        output_dir: str,
+        decode: Optional[Callable[[str, str], object]]
+    ) -> List[AudioChunk]:
+        """Convert an unparsed file to PCM WAV and split that, or warn that it goes whole"""
+        size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+        limit_mb = self.max_chunk_bytes / (1024 * 1024)
+        if decode is not None:
+            decoded_path = os.path.join(output_dir, "decoded.wav")
+            try:
+                decode(audio_file_path, decoded_path)
+                chunks = self._split_wav(decoded_path, output_dir)
+                return chunks or [AudioChunk(path=decoded_path, start=0.0, end=None)]
+            except Exception as e:
+                self.logger.warning(f"Could not decode {os.path.basename(audio_file_path)} for splitting: {str(e)}")
+        self.logger.warning(
+            f"{os.path.basename(audio_file_path)} ({size_mb:.1f} MB) is over the {limit_mb:.1f} MB chunk limit "
+            f"but its format cannot be split; uploading it whole"
+        )
+        return []
+
+    def _windows(self, duration: float, bytes_per_second: float) -> List[Tuple[float, float]]:
+        """Compute (start, end) windows in seconds covering the whole duration"""
+        window = self.chunk_seconds
+        if bytes_per_second > 0:
+            window = min(window, self.max_chunk_bytes / bytes_per_second)
+        if duration <= window:
+            return [(0.0, duration)]
+
+        overlap = min(self.overlap_seconds, window / 2)
+        step = window - overlap
+        windows = []
+        start = 0.0
+        while start < duration:
+            end = min(start + window, duration)
+            windows.append((start, end))
+            if end >= duration:
+                break
+            start += step
+        return windows
+
+    def _split_wav(self, audio_file_path: str, output_dir: str) -> List[AudioChunk]:
+        """Split a PCM WAV file on sample boundaries"""
+        with wave.open(audio_file_path, "rb") as source:
+            params = source.getparams()
+            frame_rate = source.getframerate()
+            frame_size = source.getsampwidth() * source.getnchannels()
+            duration = source.getnframes() / frame_rate
+            windows = self._windows(duration, frame_rate * frame_size)
+            if len(windows) == 1:
+                return []
+
+            chunks = []
+            for index, (start, end) in enumerate(windows):
+                start_frame = int(start * frame_rate)
+                end_frame = int(end * frame_rate)
+                source.setpos(start_frame)
+                chunk_path = os.path.join(output_dir, f"chunk_{index:04d}.wav")
+                with wave.open(chunk_path, "wb") as target:
+                    target.setparams(params)
+                    target.writeframes(source.readframes(end_frame - start_frame))
+                chunks.append(AudioChunk(path=chunk_path, start=start, end=end))
+            return chunks
+
+    def _split_mp3(self, audio_file_path: str, output_dir: str) -> List[AudioChunk]:
+        """Split an MP3 file on frame boundaries"""
+        with open(audio_file_path, "rb") as source:
+            if os.fstat(source.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                frames = _scan_mp3_frames(data)
+                if not frames:
+                    return []
+
+                # Frame start times, plus an end marker, so windows map to byte offsets
+                times = []
+                elapsed = 0.0
+                for _, frame_duration in frames:
+                    times.append(elapsed)
+                    elapsed += frame_duration
+                audio_bytes = data.size() - frames[0][0]
+                windows = self._windows(elapsed, audio_bytes / elapsed if elapsed else 0)
+                if len(windows) == 1:
+                    return []
+
+                chunks = []
+                first_frame = 0
+                for index, (start, end) in enumerate(windows):
+                    while first_frame < len(frames) - 1 and times[first_frame + 1] <= start:
+                        first_frame += 1
+                    last_frame = first_frame
+                    while last_frame < len(frames) and times[last_frame] < end:
+                        last_frame += 1
+                    start_offset = frames[first_frame][0]
+                    end_offset = frames[last_frame][0] if last_frame < len(frames) else data.size()
+
+                    chunk_path = os.path.join(output_dir, f"chunk_{index:04d}.mp3")
+                    with open(chunk_path, "wb") as target:
+                        target.write(data[start_offset:end_offset])
+                    chunks.append(AudioChunk(path=chunk_path, start=times[first_frame], end=min(end, elapsed)))
+                return chunks
+
+
+def _parse_mp3_header(data, offset: int) -> Optional[Tuple[int, float]]:
+    """
+    Parse an MPEG Layer III frame header
+
+    Returns:
+        (frame length in bytes, frame duration in seconds), or None if not a valid header
+    """
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2 = data[offset], data[offset + 1], data[offset + 2]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    if version_bits == 0x01 or layer_bits != 0x01:  # Reserved version, or not Layer III
+        return None
+    version = {0x03: "mpeg1", 0x02: "mpeg2", 0x00: "mpeg2.5"}[version_bits]
+
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES["mpeg1" if version == "mpeg1" else "mpeg2"][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    samples_per_frame = 1152 if version == "mpeg1" else 576
+    frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return frame_length, samples_per_frame / sample_rate
+
+
+def _scan_mp3_frames(data) -> List[Tuple[int, float]]:
+    """
+    Find all MP3 audio frames
+
+    Returns:
+        List of (byte offset, duration in seconds) per frame
+    """
+    offset = 0
+    # Skip ID3v2 tag (10-byte header with a synchsafe size)
+    if len(data) >= 10 and data[0:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size
+
+    frames = []
+    end = len(data)
+    while offset < end - 4:
+        header = _parse_mp3_header(data, offset)
+        if header is None:
+            # Lost sync - resume at the next possible frame header
+            offset = data.find(b"\xff", offset + 1)
+            if offset == -1:
+                break
+            continue
+        frame_length, frame_duration = header
+        frames.append((offset, frame_duration))
+        offset += frame_length
+    return frames
+
+
+def _normalize_word(word: str) -> str:
+    """Lowercase a word and drop punctuation so overlaps match across chunks"""
+    return _WORD_NORMALIZE.sub("", word).lower()
+
+
+def count_words(text: str) -> int:
+    """Number of words in text as TranscriptStitcher counts them (characters, in unspaced scripts)"""
+    return len(_WORD.findall(text))
+
+
+class TranscriptStitcher:
+    """
+    Joins chunk transcripts one at a time, removing text repeated in the overlapping audio
+
+    The tail of the text so far is aligned against the head of the next chunk;
+    the longest run of matching words marks where the overlap is cut. Only the
+    last max_overlap_words words can still be cut, so everything before them is
+    final and can be handed on while later chunks are still being transcribed.
+
+    The transcript is kept as the chunks' own text, cut at word offsets, so line
+    breaks and spacing survive. In scripts written without spaces each
+    character counts as a word.
+    """
+
+    def __init__(self, max_overlap_words: int = 60, min_match_words: int = 3):
+        """
+        Args:
+            max_overlap_words: How many words at each boundary to search for the overlap
+            min_match_words: Shortest word run accepted as an overlap
+        """
+        self.max_overlap_words = max_overlap_words
+        self.min_match_words = min_match_words
+        self._text = ""
+        # (start, end) character offsets of each word in _text
+        self._spans: List[Tuple[int, int]] = []
+
+    def add(self, text: str) -> None:
+        """Append the next chunk transcript in timeline order"""
+        text = text.strip()
+        next_spans = [match.span() for match in _WORD.finditer(text)]
+        if not next_spans:
+            return
+        if not self._spans:
+            self._text, self._spans = text, next_spans
+            return
+
+        tail_start = max(0, len(self._spans) - self.max_overlap_words)
+        tail = [_normalize_word(self._text[start:end]) for start, end in self._spans[tail_start:]]
+        head = [_normalize_word(text[start:end]) for start, end in next_spans[:self.max_overlap_words]]
+        match = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(
+            0, len(tail), 0, len(head)
+        )
+        if match.size >= self.min_match_words:
+            kept = tail_start + match.a
+            cut = self._spans[kept][0]
+            skipped = next_spans[match.b][0]
+            self._text = self._text[:cut] + text[skipped:]
+            self._spans = self._spans[:kept] + [
+                (start - skipped + cut, end - skipped + cut) for start, end in next_spans[match.b:]
+            ]
+        else:
+            # No space between two characters of an unspaced script
+            unspaced = _UNSPACED_CHAR.match(self._text[-1]) and _UNSPACED_CHAR.match(text[0])
+            offset = len(self._text) + (0 if unspaced else 1)
+            self._text = self._text + ("" if unspaced else " ") + text
+            self._spans = self._spans + [(start + offset, end + offset) for start, end in next_spans]
+
+    @property
+    def word_count(self) -> int:
+        """Number of words stitched so far"""
+        return len(self._spans)
+
+    @property
+    def stable_word_count(self) -> int:
+        """Number of leading words no later chunk can change"""
+        return max(0, len(self._spans) - self.max_overlap_words)
+
+    def slice(self, start: int, end: int) -> str:
+        """Transcript text from word start up to word end, as transcribed"""
+        if start >= end:
+            return ""
+        return self._text[self._spans[start][0]:self._spans[end - 1][1]]
+
+    @property
+    def text(self) -> str:
+        """Stitched transcript so far"""
+        return self._text
+
+
+def _overlap_cut(earlier: AudioChunk, later: AudioChunk) -> float:
+    """Time splitting the audio two neighbouring chunks share"""
+    if earlier.end is None or earlier.end <= later.start:
+        return later.start
+    return (later.start + earlier.end) / 2
+
+
+def stitch_segments(chunks: List[AudioChunk], segments: List[List[TranscriptSegment]]) -> List[TranscriptSegment]:
+    """
+    Join chunk segments, keeping one copy of speech from the overlapping audio
+    
+    Where two chunks overlap, segments starting before the middle of the
+    overlap come from the earlier chunk and the rest from the later one.
+    
+    Args:
+        chunks: Chunks in timeline order
+        segments: Each chunk's segments, already on the original timeline
+    
+    Returns:
+        Segments for the whole recording in timeline order
+    """
+    stitched: List[TranscriptSegment] = []
+    for index, (chunk, chunk_segments) in enumerate(zip(chunks, segments)):
+        lower = _overlap_cut(chunks[index - 1], chunk) if index > 0 else float("-inf")
+        upper = _overlap_cut(chunk, chunks[index + 1]) if index + 1 < len(chunks) else float("inf")
+        stitched.extend(segment for segment in chunk_segments if lower <= segment.start < upper)
+    return stitched
+
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int = 60, min_match_words: int = 3) -> str:
+    """
+    Join chunk transcripts, removing text repeated in the overlapping audio
+
+    Args:
+        texts: Chunk transcripts in timeline order
+        max_overlap_words: How many words at each boundary to search for the overlap
+        min_match_words: Shortest word run accepted as an overlap
+
+    Returns:
+        Stitched transcript
+    """
+    stitcher = TranscriptStitcher(max_overlap_words, min_match_words)
+    for text in texts:
+        stitcher.add(text)
+    return stitcher.text
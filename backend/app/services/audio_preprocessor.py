@@ -0,0 +1,438 @@
+"""Audio preprocessing before transcription: downmix, resample, trim silence, re-encode"""
+import os
+import threading
+import wave
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.services.voice_activity import FRAME_SECONDS, SpeechRegion, VoiceActivityDetector, frame_levels
+from app.utils.logger import setup_logger
+
+try:
+    import av
+except ImportError:  # Optional: decoding MP3/compressed WAV and encoding FLAC/Opus/MP3
+    av = None
+
+# Output codecs: (PyAV encoder, file extension); 'wav' is 16-bit PCM written with NumPy
+CODECS = {
+    "wav": (None, ".wav"),
+    "flac": ("flac", ".flac"),
+    "opus": ("libopus", ".ogg"),
+    "mp3": ("libmp3lame", ".mp3"),
+}
+
+# Source seconds decoded per block - bounds memory for long recordings
+_BLOCK_SECONDS = 10
+# Length of the anti-aliasing filter used when downsampling (odd, so it has a center tap)
+_FILTER_TAPS = 31
+
+
+class PreparedAudio(NamedTuple):
+    """A recording converted to mono PCM WAV at the transcription sample rate"""
+    path: str
+    regions: List[SpeechRegion]  # Parts of the original kept, in order; the file plays them back to back
+    original_seconds: float
+    
+    @property
+    def seconds(self) -> float:
+        """Duration of the prepared file"""
+        return sum(region.end - region.start for region in self.regions)
+    
+    def to_original(self, seconds: float, at_end: bool = False) -> float:
+        """
+        Map a time in the prepared file back to the original recording
+        
+        Args:
+            seconds: Time in the prepared file
+            at_end: Whether the time ends a span; a time exactly at a join then maps
+                to the end of the earlier region instead of the start of the next
+        
+        Returns:
+            Seconds from the start of the original recording
+        """
+        position = 0.0
+        for region in self.regions:
+            length = region.end - region.start
+            if seconds < position + length or (at_end and seconds <= position + length):
+                return region.start + max(0.0, seconds - position)
+            position += length
+        return self.regions[-1].end
+
+
+def _lowpass_kernel(cutoff: float, taps: int = _FILTER_TAPS) -> np.ndarray:
+    """Hamming-windowed sinc low-pass filter; cutoff in cycles per sample (< 0.5)"""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+class _StreamResampler:
+    """
+    Resamples a mono signal block by block
+
+    Downsampling low-passes first so content above the new Nyquist frequency
+    does not alias into the speech band, then interpolates linearly. Filter and
+    interpolation state carry across blocks, so the output does not depend on
+    how the input was split.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self.step = source_rate / target_rate
+        self.kernel = _lowpass_kernel(0.5 * target_rate / source_rate) if target_rate < source_rate else None
+        # Unfiltered samples carried into the next block; starts with half a
+        # filter of zeros so filtered sample i lines up with source sample i
+        half = (_FILTER_TAPS - 1) // 2
+        self.history = np.zeros(half if self.kernel is not None else 0, dtype=np.float32)
+        self.last = np.zeros(1, dtype=np.float32)  # Last filtered sample of the previous block
+        self.filtered = 0  # Filtered samples produced so far
+        self.next_output = 0  # Index of the next output sample
+
+    def _interpolate(self, filtered: np.ndarray) -> np.ndarray:
+        if filtered.size == 0:
+            return filtered
+        # Source positions covered: the previous block's last sample, then this block
+        first = self.filtered - 1
+        self.filtered += filtered.size
+        last_position = self.filtered - 1
+        count = int(np.floor(last_position / self.step)) + 1 - self.next_output
+        if count <= 0:
+            self.last = filtered[-1:]
+            return np.zeros(0, dtype=np.float32)
+        positions = (self.next_output + np.arange(count)) * self.step
+        self.next_output += count
+        values = np.concatenate([self.last, filtered])
+        self.last = filtered[-1:]
+        return np.interp(positions, np.arange(first, last_position + 1), values).astype(np.float32)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next block of source samples"""
+        if self.step == 1:
+            return block
+        if self.kernel is None:
+            return self._interpolate(block)
+        samples = np.concatenate([self.history, block])
+        if samples.size < _FILTER_TAPS:
+            self.history = samples
+            return np.zeros(0, dtype=np.float32)
+        self.history = samples[-(_FILTER_TAPS - 1):]
+        return self._interpolate(np.convolve(samples, self.kernel, mode="valid").astype(np.float32))
+
+    def flush(self) -> np.ndarray:
+        """Resample whatever the filter is still holding"""
+        if self.kernel is None or self.step == 1:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros((_FILTER_TAPS - 1) // 2, dtype=np.float32))
+
+
+def _pcm_to_float(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Decode interleaved PCM bytes to a mono float32 signal in [-1, 1]"""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        # Place the 3 bytes in the top of an int32 so the sign bit carries over
+        padded = np.zeros((raw.shape[0], 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        samples = padded.view("<i4").reshape(-1).astype(np.float32) / 2 ** 31
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2 ** 31
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def _float_to_pcm16(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class AudioPreprocessor:
+    """
+    Shrinks recordings before they are uploaded for transcription
+
+    Audio is downmixed to mono, resampled to 16 kHz (all Whisper uses) and
+    leading/trailing silence is trimmed - or, with voice activity detection,
+    every long silence - producing a PCM WAV that the chunker can split. Each
+    chunk is then re-encoded to a compact codec. PCM WAV input is handled with
+    NumPy alone; MP3 input and non-WAV output codecs need PyAV.
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[int] = None,
+        codec: Optional[str] = None,
+        silence_threshold_db: Optional[float] = None,
+        pad_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            sample_rate: Output sample rate. Defaults to AUDIO_PREPROCESS_SAMPLE_RATE.
+            codec: Output codec (wav, flac, opus, mp3). Defaults to AUDIO_PREPROCESS_CODEC.
+            silence_threshold_db: Level (dBFS) below which audio counts as silence.
+                Defaults to AUDIO_PREPROCESS_SILENCE_DB.
+            pad_seconds: Audio kept on each side of the trimmed speech. Defaults to
+                AUDIO_PREPROCESS_PAD_SECONDS.
+        """
+        # Skip every silence the detector finds, not just leading/trailing silence
+        self.vad = VoiceActivityDetector() if os.getenv("AUDIO_VAD_ENABLED", "false").lower() == "true" else None
+        self.enabled = os.getenv("AUDIO_PREPROCESS_ENABLED", "false").lower() == "true" or self.vad is not None
+        self.sample_rate = sample_rate or int(os.getenv("AUDIO_PREPROCESS_SAMPLE_RATE", "16000"))
+        self.silence_threshold_db = (
+            silence_threshold_db if silence_threshold_db is not None
+            else float(os.getenv("AUDIO_PREPROCESS_SILENCE_DB", "-45"))
+        )
+        self.pad_seconds = (
+            pad_seconds if pad_seconds is not None
+            else float(os.getenv("AUDIO_PREPROCESS_PAD_SECONDS", "0.3"))
+        )
+        self.bitrate = int(float(os.getenv("AUDIO_PREPROCESS_BITRATE_KBPS", "32")) * 1000)
+        self.logger = setup_logger("preprocess")
+        self._totals = {
+            "recordings": 0,
+            "original_bytes": 0,
+            "uploaded_bytes": 0,
+            "original_seconds": 0.0,
+            "skipped_seconds": 0.0
+        }
+        self._totals_lock = threading.Lock()
+
+        codec = (codec or os.getenv("AUDIO_PREPROCESS_CODEC", "opus")).lower()
+        if codec not in CODECS:
+            raise ValueError(f"Unknown audio codec: {codec}. Available: {', '.join(sorted(CODECS))}")
+        if CODECS[codec][0] is not None and av is None:
+            self.logger.warning(f"PyAV is not installed (pip install av) - writing WAV instead of {codec}")
+            codec = "wav"
+        self.codec = codec
+
+    @property
+    def cache_version(self) -> str:
+        """Settings that change the audio sent for transcription, for result cache keys"""
+        if not self.enabled:
+            return "preprocess=off"
+        vad = self.vad.cache_version if self.vad is not None else "vad=off"
+        return (
+            f"preprocess={self.codec}/{self.sample_rate}/{self.bitrate}/"
+            f"{self.silence_threshold_db}/{self.pad_seconds}:{vad}"
+        )
+
+    def _wav_blocks(self, audio_file_path: str) -> Iterator[Tuple[np.ndarray, int]]:
+        """Decode a PCM WAV file to mono float blocks at its own sample rate"""
+        with wave.open(audio_file_path, "rb") as source:
+            channels = source.getnchannels()
+            sample_width = source.getsampwidth()
+            rate = source.getframerate()
+            while True:
+                data = source.readframes(rate * _BLOCK_SECONDS)
+                if not data:
+                    break
+                yield _pcm_to_float(data, sample_width, channels), rate
+
+    def _av_blocks(self, audio_file_path: str) -> Iterator[Tuple[np.ndarray, int]]:
+        """Decode any format FFmpeg reads to mono float blocks at the output sample rate"""
+        with av.open(audio_file_path) as container:
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=self.sample_rate)
+            for frame in container.decode(stream):
+                for resampled in resampler.resample(frame):
+                    yield resampled.to_ndarray().reshape(-1), self.sample_rate
+            for resampled in resampler.resample(None):
+                yield resampled.to_ndarray().reshape(-1), self.sample_rate
+
+    def _blocks(self, audio_file_path: str) -> Iterator[Tuple[np.ndarray, int]]:
+        try:
+            with wave.open(audio_file_path, "rb"):
+                pass
+        except (wave.Error, EOFError):
+            # Not PCM WAV (MP3, float or extensible WAV) - only PyAV can read it
+            if av is None:
+                raise ValueError("Decoding this format needs PyAV (pip install av)")
+            return self._av_blocks(audio_file_path)
+        return self._wav_blocks(audio_file_path)
+
+    def decode(self, audio_file_path: str, output_path: str) -> int:
+        """
+        Convert a recording to mono 16-bit PCM WAV at the output sample rate
+
+        Used by the chunker for WAV files the wave module cannot read (float or
+        WAVE_FORMAT_EXTENSIBLE), which would otherwise be uploaded unsplit.
+
+        Args:
+            audio_file_path: Recording in any format _blocks can read
+            output_path: Where to write the WAV
+
+        Returns:
+            Number of samples written
+
+        Raises:
+            ValueError: If the format needs PyAV and it is not installed
+        """
+        return self._decode(audio_file_path, output_path)[0]
+
+    def _decode(self, audio_file_path: str, output_path: str) -> Tuple[int, np.ndarray]:
+        """
+        Write the recording as mono 16-bit PCM at the output rate and measure its level
+
+        Returns:
+            (samples written, level in dBFS of each detector frame)
+        """
+        frame_length = int(self.sample_rate * FRAME_SECONDS)
+        levels: List[np.ndarray] = []
+        pending = np.zeros(0, dtype=np.float32)
+        written = 0
+        resampler = None
+
+        with wave.open(output_path, "wb") as target:
+            target.setnchannels(1)
+            target.setsampwidth(2)
+            target.setframerate(self.sample_rate)
+
+            def write(samples: np.ndarray) -> None:
+                nonlocal pending, written
+                target.writeframes(_float_to_pcm16(samples))
+                written += samples.size
+                pending = np.concatenate([pending, samples])
+                whole_frames = pending.size // frame_length * frame_length
+                if whole_frames:
+                    levels.append(frame_levels(pending[:whole_frames], self.sample_rate))
+                    pending = pending[whole_frames:]
+
+            for block, rate in self._blocks(audio_file_path):
+                if resampler is None:
+                    resampler = _StreamResampler(rate, self.sample_rate)
+                write(resampler.process(block))
+            if resampler is not None:
+                write(resampler.flush())
+            if pending.size:
+                levels.append(frame_levels(pending, self.sample_rate))
+        
+        return written, np.concatenate(levels) if levels else np.zeros(0)
+
+    def speech_bounds(self, levels: np.ndarray, total_samples: int) -> Tuple[int, int]:
+        """
+        Find the span from the first to the last frame above the silence threshold
+
+        Args:
+            levels: Level in dBFS of each detector frame
+            total_samples: Length of the signal the levels were measured on
+
+        Returns:
+            (start, end) sample indices, padded; the whole signal if no frame is loud enough
+        """
+        loud = np.flatnonzero(levels > self.silence_threshold_db)
+        if loud.size == 0:
+            return 0, total_samples
+        frame_length = int(self.sample_rate * FRAME_SECONDS)
+        pad = int(self.pad_seconds * self.sample_rate)
+        start = max(0, int(loud[0]) * frame_length - pad)
+        end = min(total_samples, (int(loud[-1]) + 1) * frame_length + pad)
+        return start, end
+
+    def _speech_spans(self, levels: np.ndarray, total_samples: int) -> List[Tuple[int, int]]:
+        """(start, end) sample ranges of the original to keep"""
+        if self.vad is None:
+            return [self.speech_bounds(levels, total_samples)]
+        spans = [
+            (round(region.start * self.sample_rate), min(total_samples, round(region.end * self.sample_rate)))
+            for region in self.vad.detect_levels(levels, FRAME_SECONDS)
+        ]
+        # Nothing sounded like speech - send it all and let the transcriber decide
+        return spans or [(0, total_samples)]
+    
+    def prepare(self, audio_file_path: str, output_dir: str) -> PreparedAudio:
+        """
+        Convert a recording to mono PCM WAV at the output sample rate, without its silences
+
+        Args:
+            audio_file_path: Path to the original recording
+            output_dir: Directory to write the converted file to
+
+        Returns:
+            PreparedAudio pointing at the converted file
+        """
+        decoded_path = os.path.join(output_dir, "decoded.wav")
+        total, levels = self._decode(audio_file_path, decoded_path)
+        if total == 0:
+            raise ValueError("Recording contains no audio")
+        spans = self._speech_spans(levels, total)
+        
+        prepared_path = decoded_path
+        if spans != [(0, total)]:
+            prepared_path = os.path.join(output_dir, "prepared.wav")
+            with wave.open(decoded_path, "rb") as source, wave.open(prepared_path, "wb") as target:
+                target.setparams(source.getparams())
+                for start, end in spans:
+                    source.setpos(start)
+                    remaining = end - start
+                    while remaining > 0:
+                        data = source.readframes(min(remaining, self.sample_rate * _BLOCK_SECONDS))
+                        target.writeframes(data)
+                        remaining -= len(data) // 2
+            os.unlink(decoded_path)
+        
+        return PreparedAudio(
+            path=prepared_path,
+            regions=[SpeechRegion(start / self.sample_rate, end / self.sample_rate) for start, end in spans],
+            original_seconds=total / self.sample_rate
+        )
+    
+    def record(self, original_bytes: int, uploaded_bytes: int, original_seconds: float, skipped_seconds: float) -> None:
+        """Add one preprocessed recording to the running totals"""
+        with self._totals_lock:
+            self._totals["recordings"] += 1
+            self._totals["original_bytes"] += original_bytes
+            self._totals["uploaded_bytes"] += uploaded_bytes
+            self._totals["original_seconds"] += original_seconds
+            self._totals["skipped_seconds"] += skipped_seconds
+    
+    def stats(self) -> Dict:
+        """
+        Totals across every recording preprocessed by this process
+        
+        Returns:
+            Dict with recordings, bytes before/after upload, bytes saved, and
+            seconds of audio seen and skipped
+        """
+        with self._totals_lock:
+            totals = dict(self._totals)
+        totals["bytes_saved"] = totals["original_bytes"] - totals["uploaded_bytes"]
+        totals["original_seconds"] = round(totals["original_seconds"], 3)
+        totals["skipped_seconds"] = round(totals["skipped_seconds"], 3)
+        return totals
+
+    def encode(self, wav_path: str) -> str:
+        """
+        Re-encode a mono 16-bit PCM WAV file with the configured codec
+
+        Args:
+            wav_path: WAV file written by prepare (or a chunk of it)
+
+        Returns:
+            Path to the encoded file, which replaces wav_path; wav_path itself when the codec is 'wav'
+        """
+        encoder, extension = CODECS[self.codec]
+        if encoder is None:
+            return wav_path
+        output_path = os.path.splitext(wav_path)[0] + extension
+        with wave.open(wav_path, "rb") as source, av.open(output_path, "w") as container:
+            rate = source.getframerate()
+            stream = container.add_stream(encoder, rate=rate, layout="mono")
+            if self.codec != "flac":
+                stream.bit_rate = self.bitrate
+            while True:
+                data = source.readframes(rate * _BLOCK_SECONDS)
+                if not data:
+                    break
+                frame = av.AudioFrame.from_ndarray(
+                    np.frombuffer(data, dtype="<i2").reshape(1, -1), format="s16", layout="mono"
+                )
+                frame.sample_rate = rate
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+        os.unlink(wav_path)
+        return output_path
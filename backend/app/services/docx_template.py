@@ -0,0 +1,197 @@
+"""Precompiled .docx template: paragraph XML streamed straight into the zip"""
+import io
+import re
+import threading
+import zipfile
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt
+
+DOCUMENT_PART = "word/document.xml"
+
+# Bytes of paragraph XML gathered before each write to the compressor
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Stand-in text whose <w:t> marks where content goes in a compiled paragraph
+_SENTINEL = "DOCX-TEMPLATE-TEXT"
+
+# Characters lxml refuses in text; python-docx raises ValueError on them, and so does the template
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+_RUN_BREAKS = re.compile(r"([\t\r\n])")
+
+
+class Block(NamedTuple):
+    """One paragraph of an export, independent of how it is rendered"""
+    kind: str  # Key of PARAGRAPH_KINDS
+    text: str
+    rtl: bool = False
+
+
+def _add_title(doc, text: str):
+    paragraph = doc.add_heading(text, 0)
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    return paragraph
+
+
+def _add_meta(doc, text: str):
+    paragraph = doc.add_paragraph(text)
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    paragraph.runs[0].font.size = Pt(10)
+    return paragraph
+
+
+# How python-docx builds each kind of paragraph
+PARAGRAPH_KINDS: Dict[str, Callable] = {
+    "title": _add_title,
+    "meta": _add_meta,
+    "heading": lambda doc, text: doc.add_heading(text, level=1),
+    "body": lambda doc, text: doc.add_paragraph(text),
+    "bullet": lambda doc, text: doc.add_paragraph(text, style='List Bullet'),
+    "bullet2": lambda doc, text: doc.add_paragraph(text, style='List Bullet 2'),
+}
+
+
+def set_rtl_paragraph(paragraph) -> None:
+    """
+    Set paragraph direction to RTL (Right-to-Left)
+
+    Args:
+        paragraph: docx paragraph object
+    """
+    pPr = paragraph._element.get_or_add_pPr()
+    bidi = OxmlElement('w:bidi')
+    bidi.set(qn('w:val'), '1')
+    pPr.append(bidi)
+    # Also set right alignment for RTL text
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+
+def build_document(blocks: Iterable[Block]):
+    """
+    Build a document node by node with python-docx
+
+    Args:
+        blocks: Paragraphs in order
+
+    Returns:
+        docx Document
+    """
+    doc = Document()
+    for block in blocks:
+        paragraph = PARAGRAPH_KINDS[block.kind](doc, block.text)
+        if block.rtl:
+            set_rtl_paragraph(paragraph)
+    return doc
+
+
+def _run_content(text: str) -> str:
+    """Inner XML of a run holding text, as python-docx writes it"""
+    if _INVALID_XML.search(text):
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters"
+        )
+    parts = []
+    for piece in _RUN_BREAKS.split(text) if ("\t" in text or "\n" in text or "\r" in text) else [text]:
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+            parts.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+class DocxTemplate:
+    """
+    A .docx split into precompiled pieces
+
+    Compiling renders one sample paragraph of every kind and direction through
+    python-docx, then keeps the XML around its text, the document.xml head and
+    tail, and every other part of the package already zipped. Rendering copies
+    the zipped parts and streams document.xml through the compressor paragraph
+    by paragraph, so no element tree is built and the output matches
+    build_document byte for byte.
+    """
+
+    def __init__(self):
+        samples = [Block(kind, _SENTINEL, rtl) for kind in PARAGRAPH_KINDS for rtl in (False, True)]
+        sample = io.BytesIO()
+        build_document(samples).save(sample)
+
+        with zipfile.ZipFile(sample) as package:
+            document_xml = package.read(DOCUMENT_PART).decode("utf-8")
+            static = io.BytesIO()
+            with zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED) as parts:
+                for info in package.infolist():
+                    if info.filename != DOCUMENT_PART:
+                        parts.writestr(info, package.read(info.filename))
+        # Every render starts from a copy of these bytes and appends document.xml
+        self.static_parts = static.getvalue()
+
+        body_start = document_xml.index("<w:body>") + len("<w:body>")
+        body_end = document_xml.index("<w:sectPr")
+        self.head = document_xml[:body_start]
+        self.tail = document_xml[body_end:]
+
+        paragraphs = re.findall(r"<w:p\b.*?</w:p>", document_xml[body_start:body_end], re.S)
+        # (kind, rtl) -> (paragraph start, run start, run end + paragraph end)
+        self.fragments: Dict[Tuple[str, bool], Tuple[str, str, str]] = {}
+        for block, paragraph in zip(samples, paragraphs):
+            before, after = paragraph.split(f"<w:t>{_SENTINEL}</w:t>")
+            run_start = before.rindex("<w:r>")
+            self.fragments[(block.kind, block.rtl)] = (before[:run_start], before[run_start:], after)
+
+    def paragraph_xml(self, block: Block) -> str:
+        """XML of one paragraph; empty text has no run, as with python-docx"""
+        paragraph_start, run_start, end = self.fragments[(block.kind, block.rtl)]
+        if not block.text:
+            # lxml self-closes a paragraph with no properties either
+            return "<w:p/>" if paragraph_start == "<w:p>" else paragraph_start + "</w:p>"
+        return paragraph_start + run_start + _run_content(block.text) + end
+
+    def render(self, blocks: Iterable[Block]) -> io.BytesIO:
+        """
+        Render paragraphs into a complete .docx
+
+        Args:
+            blocks: Paragraphs in order; consumed as they are written
+
+        Returns:
+            BytesIO positioned at the start of the document
+        """
+        file_stream = io.BytesIO(self.static_parts)
+        file_stream.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(file_stream, "a", zipfile.ZIP_DEFLATED) as package:
+            with package.open(DOCUMENT_PART, "w") as document:
+                pending: List[str] = [self.head]
+                pending_size = len(self.head)
+                for block in blocks:
+                    xml = self.paragraph_xml(block)
+                    pending.append(xml)
+                    pending_size += len(xml)
+                    if pending_size >= WRITE_BUFFER_SIZE:
+                        document.write("".join(pending).encode("utf-8"))
+                        pending, pending_size = [], 0
+                pending.append(self.tail)
+                document.write("".join(pending).encode("utf-8"))
+        file_stream.seek(0)
+        return file_stream
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_docx_template() -> DocxTemplate:
+    """Shared template, compiled on first use"""
+    global _template
+    with _template_lock:
+        if _template is None:
+            _template = DocxTemplate()
+        return _template
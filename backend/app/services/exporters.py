@@ -0,0 +1,391 @@
+"""Streaming text exporters: Markdown, HTML, SRT, WebVTT and JSON lines"""
+import html
+import json
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.models.schemas import ActionItem, Segment
+from app.services.word_export_service import EXPORT_CHUNK_SIZE
+from app.utils.text_direction import is_rtl, rtl_flags
+
+TITLE = "Meeting Transcription & Summary"
+
+# Transcript lines classified per call to rtl_flags while streaming
+DIRECTION_BATCH = 1024
+
+# Speaking rate used to time subtitle cues that have no timestamps
+WORDS_PER_SECOND = 2.5
+MIN_CUE_SECONDS = 1.0
+
+_LINES = re.compile(r"[^\r\n]+")
+
+
+class ExportDocument(NamedTuple):
+    """Content of an export, whatever its format"""
+    transcription: str
+    summary: str
+    participants: List[str]
+    decisions: List[str]
+    action_items: List[ActionItem]
+    segments: Optional[Sequence[Segment]] = None  # Timed transcript, when known
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Non-blank lines of a text, found one at a time instead of splitting it up front"""
+    found = False
+    for match in _LINES.finditer(text):
+        line = match.group()
+        if line.strip():
+            found = True
+            yield line
+    if not found and text:
+        yield text
+
+
+def with_direction(texts: Iterable[str], batch_size: int = DIRECTION_BATCH) -> Iterator[Tuple[str, bool]]:
+    """
+    Pair texts with their direction, classifying them a batch at a time
+
+    Args:
+        texts: Paragraphs in order; consumed lazily
+        batch_size: Texts per call to rtl_flags
+
+    Yields:
+        (text, True if right-to-left)
+    """
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, batch_size))
+        if not batch:
+            return
+        yield from zip(batch, rtl_flags(batch))
+
+
+def encode_chunks(pieces: Iterable[str], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Gather text pieces into UTF-8 chunks of about chunk_size characters
+
+    Args:
+        pieces: Output of an exporter, in order
+        chunk_size: Characters gathered before each chunk is sent
+
+    Yields:
+        Encoded chunks
+    """
+    pending: List[str] = []
+    pending_size = 0
+    for piece in pieces:
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= chunk_size:
+            yield "".join(pending).encode("utf-8")
+            pending, pending_size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def _generated() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _estimated_seconds(text: str) -> float:
+    return max(MIN_CUE_SECONDS, len(text.split()) / WORDS_PER_SECOND)
+
+
+def iter_cues(document: ExportDocument) -> Iterator[Tuple[float, float, str]]:
+    """
+    Timed cues for subtitles
+
+    Segments keep their timestamps; a segment without an end runs until the
+    next one starts (or for as long as its words take to say, if it is the
+    last). Without segments, transcript lines are timed back to back at
+    WORDS_PER_SECOND.
+
+    Args:
+        document: Export content
+
+    Yields:
+        (start, end, text) in seconds, skipping blank segments
+    """
+    if document.segments is None:
+        start = 0.0
+        for line in iter_lines(document.transcription):
+            end = start + _estimated_seconds(line)
+            yield start, end, line.strip()
+            start = end
+        return
+
+    # Hold one segment back so an open end can be closed by the next start
+    previous: Optional[Segment] = None
+    for segment in document.segments:
+        if not segment.text.strip():
+            continue
+        if previous is not None:
+            yield previous.start, previous.end if previous.end is not None else segment.start, previous.text.strip()
+        previous = segment
+    if previous is not None:
+        end = previous.end if previous.end is not None else previous.start + _estimated_seconds(previous.text)
+        yield previous.start, end, previous.text.strip()
+
+
+class Exporter(ABC):
+    """
+    A lightweight export format
+
+    Implementations yield the document piece by piece as it is written, so a
+    long meeting is never held in memory as one string.
+    """
+
+    # Registry key used to select the format (e.g., 'markdown', 'srt')
+    name: str = ""
+    media_type: str = "text/plain; charset=utf-8"
+    # File extension of downloads, without the dot
+    extension: str = "txt"
+    # Whether the output uses timed segments, so callers know to load them
+    uses_segments: bool = False
+
+    @abstractmethod
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        """
+        Write a document
+
+        Args:
+            document: Export content
+
+        Yields:
+            Consecutive pieces of the output
+        """
+
+    def stream(self, document: ExportDocument) -> Iterator[bytes]:
+        """The output of write, encoded in chunks for a streaming response"""
+        return encode_chunks(self.write(document))
+
+
+class MarkdownExporter(Exporter):
+    """The Word document's sections as Markdown"""
+
+    name = "markdown"
+    media_type = "text/markdown; charset=utf-8"
+    extension = "md"
+
+    # Emphasis, code, links, inline HTML, entities, tables and strikethrough
+    _INLINE_SPECIAL = re.compile(r"([\\`*_\[\]<>&|~])")
+    # Headings, quotes, bullets and setext underlines, once leading spaces are gone
+    _BLOCK_MARKER = re.compile(r"^([#>+=-])")
+    # Ordered lists: the punctuation is escaped, since a backslash before a digit is literal
+    _ORDERED_MARKER = re.compile(r"^(\d+)([.)])")
+
+    def _line(self, line: str) -> str:
+        line = self._INLINE_SPECIAL.sub(r"\\\1", line.strip())
+        line = self._ORDERED_MARKER.sub(r"\1\\\2", line)
+        return self._BLOCK_MARKER.sub(r"\\\1", line)
+
+    def _text(self, text: str) -> str:
+        """One paragraph, with line breaks kept and Markdown syntax in the text escaped"""
+        return "  \n".join(self._line(line) for line in text.splitlines())
+
+    def _list(self, items: List[str], empty: str) -> Iterator[str]:
+        if not items:
+            yield f"{empty}\n\n"
+            return
+        for item in items:
+            yield f"- {self._text(item)}\n"
+        yield "\n"
+
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        yield f"# {TITLE}\n\n_Generated: {_generated()}_\n\n"
+        yield f"## Summary\n\n{self._text(document.summary)}\n\n"
+        yield "## Participants\n\n"
+        yield from self._list(document.participants, "No participants identified.")
+        yield "## Decisions\n\n"
+        yield from self._list(document.decisions, "No decisions recorded.")
+        yield "## Action Items\n\n"
+        if document.action_items:
+            for item in document.action_items:
+                yield f"- **Task:** {self._text(item.task)}\n  - Assignee: {self._text(item.assignee)}\n"
+                if item.deadline:
+                    yield f"  - Deadline: {self._text(item.deadline)}\n"
+            yield "\n"
+        else:
+            yield "No action items identified.\n\n"
+        yield "## Full Transcription\n\n"
+        for line in iter_lines(document.transcription):
+            yield f"{self._text(line)}\n\n"
+
+
+class HtmlExporter(Exporter):
+    """A standalone HTML page with each paragraph laid out in its own direction"""
+
+    name = "html"
+    media_type = "text/html; charset=utf-8"
+    extension = "html"
+
+    @staticmethod
+    def _element(tag: str, text: str, rtl: bool) -> str:
+        direction = "rtl" if rtl else "ltr"
+        lines = "<br>".join(html.escape(line) for line in text.splitlines())
+        return f'<{tag} dir="{direction}">{lines}</{tag}>\n'
+
+    def _list(self, items: List[str], empty: str) -> Iterator[str]:
+        if not items:
+            yield f"<p>{empty}</p>\n"
+            return
+        yield "<ul>\n"
+        for item, rtl in with_direction(items):
+            yield self._element("li", item, rtl)
+        yield "</ul>\n"
+
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        yield (
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{html.escape(TITLE)}</title>\n</head>\n<body>\n"
+            f"<h1>{html.escape(TITLE)}</h1>\n<p><small>Generated: {_generated()}</small></p>\n"
+        )
+        yield "<h2>Summary</h2>\n"
+        yield self._element("p", document.summary, is_rtl(document.summary))
+        yield "<h2>Participants</h2>\n"
+        yield from self._list(document.participants, "No participants identified.")
+        yield "<h2>Decisions</h2>\n"
+        yield from self._list(document.decisions, "No decisions recorded.")
+        yield "<h2>Action Items</h2>\n"
+        if document.action_items:
+            yield "<ul>\n"
+            tasks = [item.task for item in document.action_items]
+            for item, (_, rtl) in zip(document.action_items, with_direction(tasks)):
+                # An item's lines follow its task, not the English labels
+                details = f"Assignee: {item.assignee}" + (f"\nDeadline: {item.deadline}" if item.deadline else "")
+                yield self._element("li", f"Task: {item.task}\n{details}", rtl)
+            yield "</ul>\n"
+        else:
+            yield "<p>No action items identified.</p>\n"
+        yield "<h2>Full Transcription</h2>\n"
+        for line, rtl in with_direction(iter_lines(document.transcription)):
+            yield self._element("p", line, rtl)
+        yield "</body>\n</html>\n"
+
+
+class SubtitleExporter(Exporter):
+    """Subtitle cues from segment timestamps, or estimated ones without them"""
+
+    uses_segments = True
+
+    @staticmethod
+    def _timestamp(seconds: float, separator: str) -> str:
+        milliseconds = round(max(seconds, 0.0) * 1000)
+        hours, milliseconds = divmod(milliseconds, 3_600_000)
+        minutes, milliseconds = divmod(milliseconds, 60_000)
+        seconds, milliseconds = divmod(milliseconds, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+    @staticmethod
+    def _cue_text(text: str) -> str:
+        # A blank line would end the cue early
+        return "\n".join(line for line in text.splitlines() if line.strip())
+
+
+class SrtExporter(SubtitleExporter):
+    """SubRip subtitles"""
+
+    name = "srt"
+    media_type = "application/x-subrip; charset=utf-8"
+    extension = "srt"
+
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        for index, (start, end, text) in enumerate(iter_cues(document), start=1):
+            yield (
+                f"{index}\n{self._timestamp(start, ',')} --> {self._timestamp(end, ',')}\n"
+                f"{self._cue_text(text)}\n\n"
+            )
+
+
+class VttExporter(SubtitleExporter):
+    """WebVTT subtitles"""
+
+    name = "vtt"
+    media_type = "text/vtt; charset=utf-8"
+    extension = "vtt"
+
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        for start, end, text in iter_cues(document):
+            # Cue text is markup: escape it, and '-->' may not appear in it
+            text = html.escape(self._cue_text(text), quote=False).replace("--&gt;", "-&gt;")
+            yield f"{self._timestamp(start, '.')} --> {self._timestamp(end, '.')}\n{text}\n\n"
+
+
+class JsonLinesExporter(Exporter):
+    """
+    One JSON object per line: the meeting's analysis first, then its transcript
+
+    The transcript is a 'segment' record per timed segment, or a 'line'
+    record per transcript line when there are no segments.
+    """
+
+    name = "jsonl"
+    media_type = "application/x-ndjson"
+    extension = "jsonl"
+    uses_segments = True
+
+    @staticmethod
+    def _record(record: Dict) -> str:
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def write(self, document: ExportDocument) -> Iterator[str]:
+        yield self._record({
+            "type": "meeting",
+            "generated": _generated(),
+            "summary": document.summary,
+            "participants": document.participants,
+            "decisions": document.decisions,
+            "action_items": [item.model_dump() for item in document.action_items]
+        })
+        if document.segments is not None:
+            for segment in document.segments:
+                yield self._record({"type": "segment", **segment.model_dump()})
+        else:
+            for line in iter_lines(document.transcription):
+                yield self._record({"type": "line", "text": line})
+
+
+# Format name -> exporter; POST /api/export?format=<name> picks one (docx is served by WordExportService)
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(exporter: Exporter) -> Exporter:
+    """
+    Make a format available to the export endpoints
+
+    Args:
+        exporter: Exporter to register under its name; replaces one with the same name
+
+    Returns:
+        The exporter
+    """
+    EXPORTERS[exporter.name] = exporter
+    return exporter
+
+
+def get_exporter(name: str) -> Exporter:
+    """
+    Look up a registered exporter
+
+    Args:
+        name: Format name (e.g., 'markdown', 'vtt')
+
+    Returns:
+        The exporter
+
+    Raises:
+        ValueError: If no exporter has that name
+    """
+    exporter = EXPORTERS.get(name)
+    if exporter is None:
+        raise ValueError(f"Unknown export format: {name} (expected one of docx, {', '.join(EXPORTERS)})")
+    return exporter
+
+
+for _exporter in (MarkdownExporter(), HtmlExporter(), SrtExporter(), VttExporter(), JsonLinesExporter()):
+    register_exporter(_exporter)
@@ -0,0 +1,48 @@
+"""Meeting analysis with a local OpenAI-compatible LLM server (e.g., llama.cpp)"""
+import os
+from typing import Optional
+
+import httpx
+from openai import OpenAI
+
+from app.services.analysis_backend import AnalysisBackend
+from app.storage.analysis_cache import AnalysisCache
+from app.utils.concurrency import get_executor
+from app.utils.logger import get_ai_logger
+from app.utils.rate_limiter import rate_limiter_from_env
+
+
+class LocalLLMService(AnalysisBackend):
+    """Service for analyzing meetings with a model served on local CPUs"""
+
+    name = "local"
+    error_label = "Local LLM error"
+
+    def __init__(self, http_client: Optional[httpx.Client] = None, analysis_cache: Optional[AnalysisCache] = None):
+        """
+        Args:
+            http_client: Optional shared HTTP client (connection pool) for the local server
+            analysis_cache: Optional cache of analyses; identical transcripts are not re-analyzed
+        """
+        # llama.cpp's server and tools/local_llm_stub.py both speak the OpenAI chat API
+        self.base_url = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:8080/v1")
+        self.client = OpenAI(
+            base_url=self.base_url,
+            # Local servers ignore the key, but the client requires one
+            api_key=os.getenv("LOCAL_LLM_API_KEY", "local"),
+            http_client=http_client,
+            max_retries=0
+        )
+        self.model = os.getenv("LOCAL_LLM_MODEL", "llama-3.2-3b-instruct-q4_k_m")
+        self.temperature = 0.3
+        # Small local models have short context windows - split transcripts sooner
+        self.single_shot_max_tokens = int(os.getenv("LOCAL_LLM_SINGLE_SHOT_MAX_TOKENS", "6000"))
+        self.segment_tokens = int(os.getenv("LOCAL_LLM_SEGMENT_TOKENS", "3000"))
+        self.max_output_tokens = int(os.getenv("LOCAL_LLM_MAX_OUTPUT_TOKENS", "2000"))
+        # Requests sent to the server at once; match its parallel slots (llama.cpp --parallel)
+        self.max_concurrency = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", "2"))
+        self.executor = get_executor("local_llm", self.max_concurrency)
+        # No budgets by default; retries cover a busy server (llama.cpp answers 503 when all slots are taken)
+        self.rate_limiter = rate_limiter_from_env("local_llm", "LOCAL_LLM")
+        self.analysis_cache = analysis_cache
+        self.logger = get_ai_logger("local_llm")
@@ -0,0 +1,141 @@
+"""Local CPU transcription with faster-whisper (CTranslate2)"""
+import asyncio
+import os
+import threading
+from typing import List, Optional
+
+from app.models.transcript import TranscriptSegment, confidence_from_logprob
+from app.services.transcription_backend import TranscriptionBackend
+from app.utils.concurrency import get_executor
+from app.utils.logger import get_ai_logger, log_payload
+
+try:
+    from faster_whisper import WhisperModel
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:  # faster-whisper < 1.1
+        BatchedInferencePipeline = None
+except ImportError:
+    WhisperModel = None
+    BatchedInferencePipeline = None
+
+
+class LocalWhisperService(TranscriptionBackend):
+    """Service for transcribing on this machine's CPU with a quantized Whisper model"""
+
+    name = "local"
+
+    def __init__(self):
+        if WhisperModel is None:
+            raise ValueError("faster-whisper is not installed (pip install faster-whisper)")
+        self.model_size = os.getenv("LOCAL_WHISPER_MODEL", "small")
+        self.compute_type = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+        # Threads used by one transcription; 0 lets CTranslate2 decide
+        self.cpu_threads = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", str(os.cpu_count() or 4)))
+        # Audio segments decoded together in one forward pass (1 disables batching)
+        self.batch_size = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", "8"))
+        self.beam_size = int(os.getenv("LOCAL_WHISPER_BEAM_SIZE", "1"))
+        self.model = f"faster-whisper-{self.model_size}-{self.compute_type}"
+        # Chunks transcribed at once; each already uses cpu_threads cores
+        self.max_concurrency = int(os.getenv("LOCAL_WHISPER_MAX_CONCURRENCY", "1"))
+        self.executor = get_executor("local_whisper", self.max_concurrency)
+        self.logger = get_ai_logger("local_whisper")
+        self._model = None
+        self._pipeline = None
+        self._load_lock = threading.Lock()
+
+    def _load_model(self):
+        """Load the model on first use - it takes seconds and hundreds of MB"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self.logger.info(
+                        f"Loading {self.model_size} model ({self.compute_type}, {self.cpu_threads} threads)"
+                    )
+                    model = WhisperModel(
+                        self.model_size,
+                        device="cpu",
+                        compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads
+                    )
+                    if BatchedInferencePipeline is not None and self.batch_size > 1:
+                        self._pipeline = BatchedInferencePipeline(model=model)
+                    self._model = model
+        return self._pipeline or self._model
+
+    def _decode(self, audio_file_path: str, language: Optional[str] = None):
+        """Start local inference; segments are decoded lazily as the generator is consumed"""
+        engine = self._load_model()
+        options = {"language": language, "beam_size": self.beam_size}
+        if engine is self._pipeline:
+            options["batch_size"] = self.batch_size
+        segments, _ = engine.transcribe(audio_file_path, **options)
+        return segments
+    
+    def _run_transcription(self, audio_file_path: str, language: Optional[str] = None) -> str:
+        """Blocking local inference - runs on the local_whisper thread pool"""
+        segments = self._decode(audio_file_path, language)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+    
+    def _run_segments(self, audio_file_path: str, language: Optional[str] = None) -> List[TranscriptSegment]:
+        """Blocking local inference keeping segment timing - runs on the local_whisper thread pool"""
+        return [
+            TranscriptSegment(
+                segment.start, segment.end, segment.text.strip(), confidence_from_logprob(segment.avg_logprob)
+            )
+            for segment in self._decode(audio_file_path, language)
+        ]
+
+    async def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> str:
+        """
+        Transcribe audio file with the local model
+
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'en', 'he'). If None, auto-detect.
+
+        Returns:
+            Transcribed text as string
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            transcription_text = await loop.run_in_executor(
+                self.executor, self._run_transcription, audio_file_path, language
+            )
+
+            self.logger.info(
+                f"LOCAL TRANSCRIPTION RESULT - file: {audio_file_path}, model: {self.model}, "
+                f"language: {language or 'auto-detect'}, length: {len(transcription_text)} characters"
+            )
+            log_payload(self.logger, "Transcription", transcription_text)
+
+            return transcription_text
+
+        except Exception as e:
+            error_msg = f"Local transcription error: {str(e)}"
+            self.logger.error(f"TRANSCRIPTION FAILED: {error_msg} (file: {audio_file_path})")
+            raise Exception(error_msg)
+    
+    async def transcribe_segments(self, audio_file_path: str, language: Optional[str] = None) -> List[TranscriptSegment]:
+        """
+        Transcribe audio file with the local model, keeping segment timing and confidence
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'en', 'he'). If None, auto-detect.
+        
+        Returns:
+            Segments with times in seconds from the start of the file
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            segments = await loop.run_in_executor(self.executor, self._run_segments, audio_file_path, language)
+            self.logger.info(
+                f"LOCAL TRANSCRIPTION RESULT - file: {audio_file_path}, model: {self.model}, "
+                f"language: {language or 'auto-detect'}, segments: {len(segments)}"
+            )
+            return segments
+        except Exception as e:
+            error_msg = f"Local transcription error: {str(e)}"
+            self.logger.error(f"TRANSCRIPTION FAILED: {error_msg} (file: {audio_file_path})")
+            raise Exception(error_msg)
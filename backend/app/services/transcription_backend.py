@@ -0,0 +1,51 @@
+"""Common interface for speech-to-text backends"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.models.transcript import TranscriptSegment
+
+
+class TranscriptionBackend(ABC):
+    """
+    A speech-to-text engine the business layer can transcribe chunks with
+
+    Implementations run their blocking work on their own bounded pool and
+    expose its size as max_concurrency, which the pipeline uses to decide how
+    many chunks to keep in flight.
+    """
+
+    # Registry key used to select the backend (e.g., 'openai', 'local')
+    name: str = ""
+    # Model identifier; part of the result cache key
+    model: str = ""
+    max_concurrency: int = 1
+
+    @abstractmethod
+    async def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> str:
+        """
+        Transcribe an audio file
+
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'en', 'he'). If None, auto-detect.
+
+        Returns:
+            Transcribed text as string
+        """
+
+    async def transcribe_segments(self, audio_file_path: str, language: Optional[str] = None) -> List[TranscriptSegment]:
+        """
+        Transcribe an audio file into timed segments
+
+        Backends without timing information return the whole text as one
+        segment with an unknown end.
+
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'en', 'he'). If None, auto-detect.
+
+        Returns:
+            Segments with times in seconds from the start of the file
+        """
+        text = await self.transcribe_audio(audio_file_path, language=language)
+        return [TranscriptSegment(0.0, None, text)] if text else []
@@ -0,0 +1,148 @@
+"""Energy-based voice activity detection, vectorized with NumPy"""
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Detector frame length
+FRAME_SECONDS = 0.01
+
+
+class SpeechRegion(NamedTuple):
+    """A stretch of the original recording that contains speech"""
+    start: float  # Seconds
+    end: float
+
+
+def frame_levels(samples: np.ndarray, sample_rate: int, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """
+    RMS level of each frame of a signal, in dBFS
+
+    Args:
+        samples: Mono signal in [-1, 1]
+        sample_rate: Samples per second
+        frame_seconds: Frame length; a partial last frame is measured on its own
+
+    Returns:
+        One level per frame
+    """
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    frames = samples.size // frame_length
+    squares = samples.astype(np.float64) ** 2
+    rms = np.sqrt(squares[:frames * frame_length].reshape(frames, frame_length).mean(axis=1))
+    if samples.size > frames * frame_length:
+        rms = np.append(rms, np.sqrt(squares[frames * frame_length:].mean()))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) indices of each run of True values"""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _merge_close(starts: np.ndarray, ends: np.ndarray, min_gap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Join runs separated by fewer than min_gap frames"""
+    if starts.size == 0:
+        return starts, ends
+    new_group = np.concatenate([[True], starts[1:] - ends[:-1] >= min_gap])
+    # A run ends its group when the next run starts a new one, or it is the last run
+    return starts[new_group], ends[np.concatenate([new_group[1:], [True]])]
+
+
+class VoiceActivityDetector:
+    """
+    Finds speech in a recording from frame energy
+
+    A frame is speech when its level is margin_db above the noise floor (the
+    10th percentile level) or within speech_range_db of the loud level (95th
+    percentile) - the second rule keeps quieter speakers in recordings with no
+    real silence - and never when it is below threshold_db. Pauses shorter
+    than min_silence_seconds stay inside a region, bursts shorter than
+    min_speech_seconds (clicks, bumps) are dropped, and each region is padded
+    so word onsets and endings are kept.
+    """
+
+    def __init__(
+        self,
+        threshold_db: Optional[float] = None,
+        margin_db: Optional[float] = None,
+        min_speech_seconds: Optional[float] = None,
+        min_silence_seconds: Optional[float] = None,
+        pad_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            threshold_db: Lowest level (dBFS) counted as speech. Defaults to AUDIO_VAD_THRESHOLD_DB.
+            margin_db: How far above the noise floor speech must be. Defaults to AUDIO_VAD_MARGIN_DB.
+            min_speech_seconds: Shortest sound kept. Defaults to AUDIO_VAD_MIN_SPEECH_SECONDS.
+            min_silence_seconds: Shortest pause skipped. Defaults to AUDIO_VAD_MIN_SILENCE_SECONDS.
+            pad_seconds: Audio kept on each side of a region. Defaults to AUDIO_VAD_PAD_SECONDS.
+        """
+        def setting(value: Optional[float], name: str, default: str) -> float:
+            return value if value is not None else float(os.getenv(name, default))
+
+        self.threshold_db = setting(threshold_db, "AUDIO_VAD_THRESHOLD_DB", "-45")
+        self.margin_db = setting(margin_db, "AUDIO_VAD_MARGIN_DB", "12")
+        self.speech_range_db = float(os.getenv("AUDIO_VAD_SPEECH_RANGE_DB", "20"))
+        self.min_speech_seconds = setting(min_speech_seconds, "AUDIO_VAD_MIN_SPEECH_SECONDS", "0.2")
+        self.min_silence_seconds = setting(min_silence_seconds, "AUDIO_VAD_MIN_SILENCE_SECONDS", "1.0")
+        self.pad_seconds = setting(pad_seconds, "AUDIO_VAD_PAD_SECONDS", "0.3")
+
+    @property
+    def cache_version(self) -> str:
+        """Settings that change which audio is kept, for result cache keys"""
+        return (
+            f"vad={self.threshold_db}/{self.margin_db}/{self.speech_range_db}/"
+            f"{self.min_speech_seconds}/{self.min_silence_seconds}/{self.pad_seconds}"
+        )
+
+    def threshold(self, levels: np.ndarray) -> float:
+        """Speech threshold (dBFS) for a recording with the given frame levels"""
+        noise_floor, loud = np.percentile(levels, [10, 95])
+        return max(self.threshold_db, min(noise_floor + self.margin_db, loud - self.speech_range_db))
+
+    def detect_levels(self, levels: np.ndarray, frame_seconds: float = FRAME_SECONDS) -> List[SpeechRegion]:
+        """
+        Find speech regions from frame levels
+
+        Args:
+            levels: Level in dBFS of each frame
+            frame_seconds: Frame length
+
+        Returns:
+            Speech regions in timeline order; empty if nothing is loud enough
+        """
+        if levels.size == 0:
+            return []
+        starts, ends = _runs(levels > self.threshold(levels))
+        starts, ends = _merge_close(starts, ends, int(round(self.min_silence_seconds / frame_seconds)))
+
+        long_enough = ends - starts >= int(round(self.min_speech_seconds / frame_seconds))
+        starts, ends = starts[long_enough], ends[long_enough]
+
+        pad = int(round(self.pad_seconds / frame_seconds))
+        starts = np.maximum(starts - pad, 0)
+        ends = np.minimum(ends + pad, levels.size)
+        starts, ends = _merge_close(starts, ends, 1)
+        return [
+            SpeechRegion(float(start * frame_seconds), float(end * frame_seconds))
+            for start, end in zip(starts, ends)
+        ]
+
+    def detect(self, samples: np.ndarray, sample_rate: int) -> List[SpeechRegion]:
+        """
+        Find speech regions in a signal
+
+        Args:
+            samples: Mono signal in [-1, 1]
+            sample_rate: Samples per second
+
+        Returns:
+            Speech regions in seconds, clipped to the signal length
+        """
+        duration = samples.size / sample_rate
+        return [
+            SpeechRegion(start, min(end, duration))
+            for start, end in self.detect_levels(frame_levels(samples, sample_rate))
+        ]
@@ -1,24 +1,57 @@
 """Whisper API service for audio transcription"""
 import os
-from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
+import httpx
 from openai import OpenAI
 
-from app.utils.logger import get_ai_logger
+from app.models.transcript import TranscriptSegment, confidence_from_logprob
+from app.services.transcription_backend import TranscriptionBackend
+from app.utils.concurrency import get_executor
+from app.utils.logger import get_ai_logger, log_payload
+from app.utils.rate_limiter import RateLimitExceededError, rate_limiter_from_env
 
 
-class WhisperService:
+def _field(item: Any, key: str) -> Any:
+    """Read a field from a verbose_json segment, which the SDK may leave as a dict"""
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+class WhisperService(TranscriptionBackend):
     """Service for handling Whisper API transcription"""
     
-    def __init__(self):
+    name = "openai"
+    
+    def __init__(self, http_client: Optional[httpx.Client] = None):
+        """
+        Args:
+            http_client: Optional shared HTTP client (connection pool) for the OpenAI client
+        """
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=api_key)
+        # Retries are left to the rate limiter, which shares backoff across all callers
+        self.client = OpenAI(api_key=api_key, http_client=http_client, max_retries=0)
         self.model = "whisper-1"
+        # Max number of Whisper calls in flight across the whole process
+        self.max_concurrency = int(os.getenv("WHISPER_MAX_CONCURRENCY", "4"))
+        self.executor = get_executor("whisper", self.max_concurrency)
+        # OPENAI_REQUESTS_PER_MINUTE budget (audio endpoints are limited by requests)
+        self.rate_limiter = rate_limiter_from_env("openai", "OPENAI")
         self.logger = get_ai_logger("whisper")
     
+    def _create_transcription(self, audio_file_path: str, language: Optional[str] = None, verbose: bool = False):
+        """Blocking Whisper API call - runs on the shared whisper thread pool"""
+        # verbose_json adds per-segment timing; only asked for when segments are wanted
+        options = {"response_format": "verbose_json"} if verbose else {}
+        with open(audio_file_path, "rb") as audio_file:
+            return self.client.audio.transcriptions.create(
+                model=self.model,
+                file=audio_file,
+                language=language,
+                **options
+            )
+    
     async def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> str:
         """
         Transcribe audio file using Whisper API
@@ -30,39 +63,62 @@ class WhisperService:
         Returns:
             Transcribed text as string
         """
+        transcript = await self._transcribe(audio_file_path, language)
+        return transcript.text
+    
+    async def transcribe_segments(self, audio_file_path: str, language: Optional[str] = None) -> List[TranscriptSegment]:
+        """
+        Transcribe audio file using Whisper API, keeping segment timing and confidence
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (e.g., 'en', 'es'). If None, auto-detect.
+        
+        Returns:
+            Segments with times in seconds from the start of the file
+        """
+        transcript = await self._transcribe(audio_file_path, language, verbose=True)
+        segments = [
+            TranscriptSegment(
+                float(_field(item, "start") or 0.0),
+                _field(item, "end"),
+                (_field(item, "text") or "").strip(),
+                confidence_from_logprob(_field(item, "avg_logprob"))
+            )
+            for item in (_field(transcript, "segments") or [])
+        ]
+        if not segments and transcript.text:
+            segments = [TranscriptSegment(0.0, _field(transcript, "duration"), transcript.text)]
+        return segments
+    
+    async def _transcribe(self, audio_file_path: str, language: Optional[str] = None, verbose: bool = False):
+        """Run one Whisper call through the rate limiter, logging and wrapping errors"""
         try:
-            self.logger.info(f"Starting transcription for file: {audio_file_path}")
-            self.logger.info(f"Model: {self.model}, Language: {language or 'auto-detect'}")
+            self.logger.debug(
+                f"Starting transcription for file: {audio_file_path} "
+                f"(model: {self.model}, language: {language or 'auto-detect'})"
+            )
+            
+            # The blocking client call runs off the event loop, paced by the OpenAI rate limiter
+            transcript = await self.rate_limiter.run(
+                self.executor, self._create_transcription, audio_file_path, language, verbose
+            )
+            
+            transcription_text = transcript.text
+            
+            # One summary line; the transcript itself is truncated or stored per LOG_PAYLOAD_MODE
+            self.logger.info(
+                f"WHISPER TRANSCRIPTION RESULT - file: {audio_file_path}, model: {self.model}, "
+                f"language: {language or 'auto-detect'}, length: {len(transcription_text)} characters"
+            )
+            log_payload(self.logger, "Transcription", transcription_text)
+            
+            return transcript
             
-            with open(audio_file_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    language=language
-                )
-                
-                transcription_text = transcript.text
-                
-                # Log transcription result
-                self.logger.info("=" * 80)
-                self.logger.info("WHISPER TRANSCRIPTION RESULT")
-                self.logger.info("=" * 80)
-                self.logger.info(f"Timestamp: {datetime.now().isoformat()}")
-                self.logger.info(f"Audio File: {audio_file_path}")
-                self.logger.info(f"Model: {self.model}")
-                self.logger.info(f"Language: {language or 'auto-detect'}")
-                self.logger.info("-" * 80)
-                self.logger.info("TRANSCRIPTION:")
-                self.logger.info("-" * 80)
-                self.logger.info(transcription_text)
-                self.logger.info("=" * 80)
-                self.logger.info(f"Transcription length: {len(transcription_text)} characters")
-                self.logger.info("=" * 80)
-                
-                return transcription_text
         except Exception as e:
             error_msg = f"Whisper API error: {str(e)}"
-            self.logger.error(f"TRANSCRIPTION FAILED: {error_msg}")
-            self.logger.error(f"File: {audio_file_path}")
+            self.logger.error(f"TRANSCRIPTION FAILED: {error_msg} (file: {audio_file_path})")
+            if isinstance(e, RateLimitExceededError):
+                raise RateLimitExceededError(error_msg, e.retry_after)
             raise Exception(error_msg)
 
@@ -1,40 +1,82 @@
 """Word document export service"""
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 from datetime import datetime
 import io
+import os
 
 from app.models.schemas import ActionItem
+from app.services.docx_template import Block, build_document, get_docx_template, set_rtl_paragraph
+from app.utils.concurrency import get_executor
+from app.utils.text_direction import is_rtl, rtl_flags
+
+# Size of each piece of a finished document sent to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def get_export_executor() -> ThreadPoolExecutor:
+    """
+    Shared pool that builds Word documents off the event loop
+    
+    Its size (WORD_EXPORT_MAX_CONCURRENCY) caps how many documents are generated
+    at once; further exports wait for a free worker.
+    
+    Returns:
+        ThreadPoolExecutor for document generation
+    """
+    return get_executor("word_export", int(os.getenv("WORD_EXPORT_MAX_CONCURRENCY", "2")))
+
+
+def iter_document_chunks(file_stream: io.BytesIO, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a finished document in fixed-size pieces for a streaming response
+    
+    Args:
+        file_stream: Document bytes, positioned at the start
+        chunk_size: Bytes per piece
+    
+    Yields:
+        Consecutive pieces of the document
+    """
+    try:
+        while True:
+            chunk = file_stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_stream.close()
+
+
+# Ways to produce the .docx: streamed from a precompiled template, or built node by node
+EXPORT_MODES = ("template", "python-docx")
 
 
 class WordExportService:
     """Service for generating Word documents"""
     
+    def __init__(self, mode: Optional[str] = None):
+        """
+        Args:
+            mode: 'template' streams precompiled paragraph XML into the .docx; 'python-docx'
+                builds the document node by node. Both give the same document.
+                Defaults to WORD_EXPORT_MODE ('template').
+        """
+        self.mode = mode or os.getenv("WORD_EXPORT_MODE", "template")
+        if self.mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown Word export mode: {self.mode} (expected one of {', '.join(EXPORT_MODES)})")
+    
     def _is_rtl_text(self, text: str) -> bool:
         """
-        Check if text contains significant RTL characters (Hebrew, Arabic)
+        Check if text should be laid out right-to-left (Hebrew, Arabic)
         
         Args:
             text: Text to check
         
         Returns:
-            True if text contains >30% RTL characters
+            True if at least 30% of its letters are right-to-left (see app.utils.text_direction)
         """
-        if not text:
-            return False
-        
-        rtl_chars = 0
-        # Hebrew Unicode range: U+0590 to U+05FF
-        # Arabic Unicode range: U+0600 to U+06FF
-        for char in text:
-            if ('\u0590' <= char <= '\u05FF') or ('\u0600' <= char <= '\u06FF'):
-                rtl_chars += 1
-        
-        return rtl_chars > len(text) * 0.3  # >30% RTL characters
+        return is_rtl(text)
     
     def _set_rtl_paragraph(self, paragraph):
         """
@@ -43,103 +85,105 @@ class WordExportService:
         Args:
             paragraph: docx paragraph object
         """
-        pPr = paragraph._element.get_or_add_pPr()
-        bidi = OxmlElement('w:bidi')
-        bidi.set(qn('w:val'), '1')
-        pPr.append(bidi)
-        # Also set right alignment for RTL text
-        paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        set_rtl_paragraph(paragraph)
     
-    def create_document(
+    def _block(self, kind: str, text: str, rtl: Optional[bool] = None) -> Block:
+        """A paragraph laid out in the direction of its own text, unless given"""
+        return Block(kind, text, self._is_rtl_text(text) if rtl is None else rtl)
+    
+    def _blocks(
         self,
         transcription: str,
         summary: str,
         participants: List[str],
         decisions: List[str],
-        action_items: List[ActionItem],
-        filename: Optional[str] = "meeting_transcription"
-    ) -> io.BytesIO:
+        action_items: List[ActionItem]
+    ) -> Iterator[Block]:
         """
-        Create a Word document with meeting transcription and analysis
-        
-        Args:
-            transcription: Full transcription text
-            summary: Meeting summary
-            participants: List of participants
-            decisions: List of decisions
-            action_items: List of action items
-            filename: Base filename (without extension)
+        Paragraphs of the document in order
         
-        Returns:
-            BytesIO object containing the Word document
+        Each paragraph gets its own direction, so mixed Hebrew/English
+        meetings render each part the right way round. Transcript lines become
+        separate paragraphs, classified together in one pass.
         """
-        doc = Document()
-        
-        # Detect if content is RTL (Hebrew/Arabic)
-        is_rtl = self._is_rtl_text(transcription + summary)
-        
         # Title
-        title = doc.add_heading('Meeting Transcription & Summary', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        yield Block("title", 'Meeting Transcription & Summary')
         
         # Metadata
-        meta_para = doc.add_paragraph(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-        meta_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        meta_para.runs[0].font.size = Pt(10)
-        doc.add_paragraph()  # Spacing
+        yield Block("meta", f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
+        yield Block("body", "")  # Spacing
         
         # Summary Section
-        doc.add_heading('Summary', level=1)
-        summary_para = doc.add_paragraph(summary)
-        if is_rtl:
-            self._set_rtl_paragraph(summary_para)
-        doc.add_paragraph()  # Spacing
+        yield Block("heading", 'Summary')
+        yield self._block("body", summary)
+        yield Block("body", "")  # Spacing
         
         # Participants Section
-        doc.add_heading('Participants', level=1)
+        yield Block("heading", 'Participants')
         if participants:
             for participant in participants:
-                p = doc.add_paragraph(participant, style='List Bullet')
-                if is_rtl:
-                    self._set_rtl_paragraph(p)
+                yield self._block("bullet", participant)
         else:
-            doc.add_paragraph('No participants identified.')
-        doc.add_paragraph()  # Spacing
+            yield Block("body", 'No participants identified.')
+        yield Block("body", "")  # Spacing
         
         # Decisions Section
-        doc.add_heading('Decisions', level=1)
+        yield Block("heading", 'Decisions')
         if decisions:
             for decision in decisions:
-                p = doc.add_paragraph(decision, style='List Bullet')
-                if is_rtl:
-                    self._set_rtl_paragraph(p)
+                yield self._block("bullet", decision)
         else:
-            doc.add_paragraph('No decisions recorded.')
-        doc.add_paragraph()  # Spacing
+            yield Block("body", 'No decisions recorded.')
+        yield Block("body", "")  # Spacing
         
         # Action Items Section
-        doc.add_heading('Action Items', level=1)
+        yield Block("heading", 'Action Items')
         if action_items:
             for item in action_items:
-                task_para = doc.add_paragraph(f'Task: {item.task}', style='List Bullet')
-                if is_rtl:
-                    self._set_rtl_paragraph(task_para)
-                assignee_para = doc.add_paragraph(f'  Assignee: {item.assignee}', style='List Bullet 2')
-                if is_rtl:
-                    self._set_rtl_paragraph(assignee_para)
+                # An item's lines follow its task, not the English labels
+                item_rtl = self._is_rtl_text(item.task)
+                yield Block("bullet", f'Task: {item.task}', item_rtl)
+                yield Block("bullet2", f'  Assignee: {item.assignee}', item_rtl)
                 if item.deadline:
-                    deadline_para = doc.add_paragraph(f'  Deadline: {item.deadline}', style='List Bullet 2')
-                    if is_rtl:
-                        self._set_rtl_paragraph(deadline_para)
+                    yield Block("bullet2", f'  Deadline: {item.deadline}', item_rtl)
         else:
-            doc.add_paragraph('No action items identified.')
-        doc.add_paragraph()  # Spacing
+            yield Block("body", 'No action items identified.')
+        yield Block("body", "")  # Spacing
         
         # Full Transcription Section
-        doc.add_heading('Full Transcription', level=1)
-        transcription_para = doc.add_paragraph(transcription)
-        if is_rtl:
-            self._set_rtl_paragraph(transcription_para)
+        yield Block("heading", 'Full Transcription')
+        lines = [line for line in transcription.splitlines() if line.strip()] or [transcription]
+        for line, line_rtl in zip(lines, rtl_flags(lines)):
+            yield Block("body", line, line_rtl)
+    
+    def create_document(
+        self,
+        transcription: str,
+        summary: str,
+        participants: List[str],
+        decisions: List[str],
+        action_items: List[ActionItem],
+        filename: Optional[str] = "meeting_transcription"
+    ) -> io.BytesIO:
+        """
+        Create a Word document with meeting transcription and analysis
+        
+        Args:
+            transcription: Full transcription text
+            summary: Meeting summary
+            participants: List of participants
+            decisions: List of decisions
+            action_items: List of action items
+            filename: Base filename (without extension)
+        
+        Returns:
+            BytesIO object containing the Word document
+        """
+        blocks = self._blocks(transcription, summary, participants, decisions, action_items)
+        if self.mode == "template":
+            return get_docx_template().render(blocks)
+        
+        doc = build_document(blocks)
         
         # Save to BytesIO
         file_stream = io.BytesIO()
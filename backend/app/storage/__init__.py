@@ -0,0 +1 @@
+# Storage package - Persistent SQLite-backed stores
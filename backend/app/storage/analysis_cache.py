@@ -0,0 +1,218 @@
+"""Two-tier cache of LLM analysis results keyed by normalized transcript and prompt"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def normalize_transcript(text: str) -> str:
+    """Canonical form of a transcript for cache keys: NFC, single spaces, trimmed"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+class AnalysisCache:
+    """
+    Analysis results in a bounded in-memory LRU, backed by SQLite
+
+    Hits in memory cost a dict lookup; misses fall through to the disk tier,
+    which survives restarts and is promoted into memory on a hit. Entries are
+    tagged with the version of the prompt file that produced them, and the
+    first lookup under a new version deletes every entry from older ones, so
+    editing a prompt invalidates its results without a restart.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Args:
+            db_path: SQLite file. Defaults to ANALYSIS_CACHE_PATH.
+            memory_bytes: Approximate size of results kept in memory (JSON length).
+                Defaults to ANALYSIS_CACHE_MEMORY_MB.
+            max_entries: Entries kept on disk before evicting least recently used.
+                Defaults to ANALYSIS_CACHE_MAX_ENTRIES.
+        """
+        self.db_path = db_path or os.getenv("ANALYSIS_CACHE_PATH", "data/analysis_cache.db")
+        self.memory_bytes = memory_bytes or int(float(os.getenv("ANALYSIS_CACHE_MEMORY_MB", "16")) * 1024 * 1024)
+        self.max_entries = max_entries or int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "10000"))
+        self.stats_counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "invalidated": 0}
+        self._memory: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()  # key -> (prompt version, JSON)
+        self._memory_used = 0
+        # Latest version seen for each prompt
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analyses (
+                cache_key TEXT PRIMARY KEY,
+                prompt_name TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                result TEXT NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_last_accessed ON analyses (last_accessed)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_prompt ON analyses (prompt_name, prompt_version)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        text: str,
+        language_instruction: str,
+        prompt: str,
+        model: str,
+        temperature: float
+    ) -> str:
+        """
+        Build a cache key from everything that changes an analysis
+
+        Args:
+            kind: What was asked for (e.g., 'transcript', 'segment', 'reduce')
+            text: Text sent for analysis; normalized before hashing
+            language_instruction: Language prefix from prompt_loader
+            prompt: System prompt file contents
+            model: Model name
+            temperature: Sampling temperature
+
+        Returns:
+            SHA-256 hex digest
+        """
+        material = json.dumps(
+            [kind, normalize_transcript(text), language_instruction, prompt, model, temperature],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _check_version(self, prompt_name: str, prompt_version: str) -> None:
+        """Drop entries made with an older version of a prompt (call with the lock held)"""
+        known = self._versions.get(prompt_name)
+        if known == prompt_version:
+            return
+        self._versions[prompt_name] = prompt_version
+        cursor = self._conn.execute(
+            "DELETE FROM analyses WHERE prompt_name = ? AND prompt_version != ?", (prompt_name, prompt_version)
+        )
+        self._conn.commit()
+        prefix = f"{prompt_name}:"
+        stale = [
+            key for key, (version, _) in self._memory.items()
+            if version != prompt_version and key.startswith(prefix)
+        ]
+        for key in stale:
+            self._memory_used -= len(self._memory.pop(key)[1])
+        self.stats_counters["invalidated"] += max(cursor.rowcount, len(stale))
+
+    def _remember(self, key: str, prompt_version: str, result_json: str) -> None:
+        """Put an entry in the memory tier, evicting least recently used ones (call with the lock held)"""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous[1])
+        if len(result_json) > self.memory_bytes:
+            return
+        self._memory[key] = (prompt_version, result_json)
+        self._memory_used += len(result_json)
+        while self._memory_used > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    def get(self, prompt_name: str, prompt_version: str, key: str) -> Optional[Dict]:
+        """
+        Look up a cached analysis
+
+        Args:
+            prompt_name: Prompt file the analysis used (e.g., 'meeting_analysis')
+            prompt_version: Version of that prompt file (see PromptLoader.version)
+            key: Cache key from make_key
+
+        Returns:
+            Cached analysis, or None on a miss
+        """
+        key = f"{prompt_name}:{key}"
+        with self._lock:
+            self._check_version(prompt_name, prompt_version)
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats_counters["memory_hits"] += 1
+                return json.loads(entry[1])
+            row = self._conn.execute("SELECT result FROM analyses WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats_counters["misses"] += 1
+                return None
+            self._conn.execute("UPDATE analyses SET last_accessed = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+            self._remember(key, prompt_version, row[0])
+            self.stats_counters["disk_hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, prompt_name: str, prompt_version: str, key: str, result: Dict) -> None:
+        """
+        Store an analysis in both tiers, evicting least recently used disk entries
+
+        Args:
+            prompt_name: Prompt file the analysis used
+            prompt_version: Version of that prompt file
+            key: Cache key from make_key
+            result: Normalized analysis
+        """
+        key = f"{prompt_name}:{key}"
+        result_json = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._check_version(prompt_name, prompt_version)
+            self._remember(key, prompt_version, result_json)
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO analyses (cache_key, prompt_name, prompt_version, result, last_accessed)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, prompt_name, prompt_version, result_json, time.time())
+            )
+            self._conn.execute(
+                """
+                DELETE FROM analyses WHERE cache_key IN (
+                    SELECT cache_key FROM analyses ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size of each tier"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            counters = dict(self.stats_counters)
+            memory_entries = len(self._memory)
+            memory_used = self._memory_used
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_used,
+            "max_memory_bytes": self.memory_bytes,
+            "disk_entries": entries,
+            "max_entries": self.max_entries
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,289 @@
+"""Persistent queue of transcription jobs"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+# Job lifecycle states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobStore:
+    """SQLite-backed job queue that survives restarts"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        stale_after: Optional[float] = None,
+        max_requeues: Optional[int] = None
+    ):
+        """
+        Args:
+            db_path: SQLite file. Defaults to JOB_DB_PATH.
+            stale_after: Seconds without a heartbeat before a running job counts
+                as abandoned. Defaults to JOB_STALE_SECONDS.
+            max_requeues: Times a job goes back in the queue, after a rate limit or
+                an abandoned run, before it is failed. Defaults to JOB_MAX_REQUEUES.
+        """
+        self.db_path = db_path or os.getenv("JOB_DB_PATH", "data/jobs.db")
+        self.stale_after = stale_after if stale_after is not None else float(os.getenv("JOB_STALE_SECONDS", "60"))
+        self.max_requeues = max_requeues if max_requeues is not None else int(os.getenv("JOB_MAX_REQUEUES", "3"))
+        # Several processes may share the database - running jobs are tagged with their claimer
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                language TEXT,
+                audio_path TEXT NOT NULL,
+                content_hash TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                owner TEXT,
+                heartbeat_at REAL,
+                not_before REAL,
+                requeues INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # Databases created before jobs had owners, retry times and requeue counts
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (
+            ("owner", "TEXT"), ("heartbeat_at", "REAL"), ("not_before", "REAL"),
+            ("requeues", "INTEGER NOT NULL DEFAULT 0")
+        ):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+        self._conn.commit()
+
+    def create(
+        self,
+        filename: str,
+        audio_path: str,
+        language: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict:
+        """
+        Enqueue a new job
+
+        Args:
+            filename: Original upload filename
+            audio_path: Where the uploaded audio was saved
+            language: Optional language code
+            content_hash: SHA-256 of the audio, for the result cache
+
+        Returns:
+            The new job record
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (id, status, filename, language, audio_path, content_hash, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, JOB_QUEUED, filename, language, audio_path, content_hash, now, now)
+            )
+            self._conn.commit()
+        # Built locally - a worker may already have claimed the job by the time we could re-read it
+        return {
+            "id": job_id,
+            "status": JOB_QUEUED,
+            "filename": filename,
+            "language": language,
+            "audio_path": audio_path,
+            "content_hash": content_hash,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "owner": None,
+            "heartbeat_at": None,
+            "not_before": None,
+            "requeues": 0
+        }
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Look up a job
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job record as a dict, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def claim_next(self) -> Optional[Dict]:
+        """
+        Take the oldest queued job that is due and mark it running under this store's owner
+        
+        The status check is part of the UPDATE, so when another process claims
+        the same job first this one sees no row changed and moves on.
+        
+        Returns:
+            The claimed job record, or None if no queued job is due
+        """
+        with self._lock:
+            while True:
+                now = time.time()
+                row = self._conn.execute(
+                    """
+                    SELECT id FROM jobs WHERE status = ? AND (not_before IS NULL OR not_before <= ?)
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (JOB_QUEUED, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                cursor = self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, owner = ?, heartbeat_at = ?, updated_at = ?
+                    WHERE id = ? AND status = ?
+                    """,
+                    (JOB_RUNNING, self.owner, now, now, row["id"], JOB_QUEUED)
+                )
+                self._conn.commit()
+                if cursor.rowcount == 1:
+                    break
+        return self.get(row["id"])
+    
+    def heartbeat(self) -> int:
+        """
+        Mark this store's running jobs as still alive
+        
+        Returns:
+            Number of jobs touched
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?",
+                (time.time(), self.owner, JOB_RUNNING)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def complete(self, job_id: str, result_json: str) -> None:
+        """Mark a job completed with its serialized TranscriptionResponse"""
+        self._finish(job_id, JOB_COMPLETED, result=result_json)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed with an error message"""
+        self._finish(job_id, JOB_FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def requeue(self, job_id: str, delay: float = 0.0) -> bool:
+        """
+        Put a running job back in the queue, keeping its audio
+        
+        The requeue count is checked and incremented in the same UPDATE, so
+        the limit holds however many processes requeue the job.
+        
+        Args:
+            job_id: Job identifier
+            delay: Seconds before claim_next hands the job out again
+        
+        Returns:
+            True if requeued, False if the job has used up its requeues
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, owner = NULL, heartbeat_at = NULL, not_before = ?, updated_at = ?,
+                    requeues = requeues + 1
+                WHERE id = ? AND requeues < ?
+                """,
+                (JOB_QUEUED, now + delay if delay > 0 else None, now, job_id, self.max_requeues)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+    
+    def requeue_interrupted(self) -> int:
+        """
+        Put running jobs whose worker stopped sending heartbeats back in the queue
+        
+        Jobs another live process is working on keep their claim. A job that
+        keeps taking its worker down is failed once it has used up its
+        requeues, and its audio removed, instead of crashing workers forever.
+        
+        Returns:
+            Number of jobs requeued
+        """
+        now = time.time()
+        with self._lock:
+            exhausted = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, owner = NULL, heartbeat_at = NULL, updated_at = ?
+                WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?) AND requeues >= ?
+                RETURNING audio_path
+                """,
+                (
+                    JOB_FAILED, f"Worker stopped responding on every one of {self.max_requeues + 1} attempts",
+                    now, JOB_RUNNING, now - self.stale_after, self.max_requeues
+                )
+            ).fetchall()
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, owner = NULL, heartbeat_at = NULL, updated_at = ?, requeues = requeues + 1
+                WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+                """,
+                (JOB_QUEUED, now, JOB_RUNNING, now - self.stale_after)
+            )
+            self._conn.commit()
+        for row in exhausted:
+            if os.path.exists(row["audio_path"]):
+                os.unlink(row["audio_path"])
+        return cursor.rowcount
+    
+    def release(self) -> int:
+        """
+        Put the jobs this store is running back in the queue, on shutdown
+        
+        Returns:
+            Number of jobs requeued
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, owner = NULL, heartbeat_at = NULL, updated_at = ?
+                WHERE status = ? AND owner = ?
+                """,
+                (JOB_QUEUED, time.time(), JOB_RUNNING, self.owner)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,568 @@
+"""Persistent store of processed meetings, with full-text search"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.schemas import ActionItem, Segment, TranscriptionResponse
+from app.models.transcript import TranscriptSegment
+
+# Relative weight of a match in each indexed column, for BM25 ranking
+SEARCH_WEIGHTS = {"transcription": 1.0, "summary": 3.0, "decisions": 4.0, "action_items": 2.0}
+
+# Quoted phrase, or a run of non-space characters
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def make_cursor(created_at: float, meeting_id: str) -> str:
+    """Opaque list cursor pointing just past a meeting"""
+    return f"{created_at!r}:{meeting_id}"
+
+
+def parse_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Split a cursor from make_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, separator, meeting_id = cursor.partition(":")
+    try:
+        if not separator or not meeting_id:
+            raise ValueError
+        return float(created_at), meeting_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def to_fts_query(text: str) -> str:
+    """
+    Turn a user search string into an FTS5 query that cannot be a syntax error
+    
+    Words must all match, in any column; "quoted text" matches as a phrase and
+    a trailing * (e.g. budg*) matches as a prefix. FTS5 operators typed by the
+    user are searched for as plain words.
+    
+    Args:
+        text: Search string as typed
+    
+    Returns:
+        FTS5 MATCH expression
+    
+    Raises:
+        ValueError: If the string has nothing to search for
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(text):
+        term = phrase if phrase else word
+        prefix = not phrase and len(term) > 1 and term.endswith("*")
+        term = term.rstrip("*") if prefix else term
+        # Drop characters the tokenizer would ignore anyway, so "decided," still matches
+        if not re.search(r"\w", term):
+            continue
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError("Search query is empty")
+    return " ".join(terms)
+
+
+class MeetingStore:
+    """
+    SQLite store of meetings with their segments, decisions and action items
+
+    Child rows are keyed by (meeting_id, position), so loading one meeting's
+    rows in order and paging through its segments are primary-key range
+    scans. Meetings are listed newest first with keyset pagination on the
+    (created_at, id) index, so a page costs the same at any depth.
+    
+    An FTS5 index over each meeting's transcript, summary, decisions and
+    action items is written in the same transaction as the meeting, so search
+    is up to date as soon as save() returns.
+    
+    The map-stage analysis of each transcript segment is kept alongside, so an
+    edited transcript only needs its changed segments analyzed again.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite file. Defaults to MEETING_DB_PATH.
+        """
+        self.db_path = db_path or os.getenv("MEETING_DB_PATH", "data/meetings.db")
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meetings (
+                id TEXT PRIMARY KEY,
+                filename TEXT,
+                language TEXT,
+                transcription TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                segment_count INTEGER,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_meetings_created ON meetings (created_at, id);
+
+            CREATE TABLE IF NOT EXISTS participants (
+                meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (meeting_id, position)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_participants_name ON participants (name, meeting_id);
+
+            CREATE TABLE IF NOT EXISTS segments (
+                meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                start REAL NOT NULL,
+                end REAL,
+                text TEXT NOT NULL,
+                confidence REAL,
+                PRIMARY KEY (meeting_id, position)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS decisions (
+                meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (meeting_id, position)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS action_items (
+                meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                task TEXT NOT NULL,
+                assignee TEXT NOT NULL,
+                deadline TEXT,
+                PRIMARY KEY (meeting_id, position)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_action_items_assignee ON action_items (assignee, meeting_id);
+            
+            CREATE TABLE IF NOT EXISTS analysis_parts (
+                meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                analyzer TEXT,
+                model TEXT,
+                PRIMARY KEY (meeting_id, position)
+            ) WITHOUT ROWID;
+            """
+        )
+        # Databases created before parts recorded the backend that produced them
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(analysis_parts)")}
+        for column in ("analyzer", "model"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE analysis_parts ADD COLUMN {column} TEXT")
+        search_columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(meeting_search)")}
+        if search_columns and "meeting_id" not in search_columns:
+            # Older indexes matched meetings by their implicit rowid, which VACUUM may renumber
+            self._conn.execute("DROP TABLE meeting_search")
+        if "meeting_id" not in search_columns:
+            # Rows carry the meeting id (stored, not indexed); the index keeps its own copy of the text for snippets.
+            # Prefix indexes keep budg* from merging the posting lists of every word it expands to.
+            self._conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE meeting_search USING fts5 (
+                    {', '.join(SEARCH_WEIGHTS)}, meeting_id UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'
+                )
+                """
+            )
+            # meeting_id never matches, so its weight does not matter
+            self._conn.execute(
+                "INSERT INTO meeting_search (meeting_search, rank) VALUES ('rank', ?)",
+                (f"bm25({', '.join(str(weight) for weight in SEARCH_WEIGHTS.values())}, 0.0)",)
+            )
+            self._index_existing()
+        self._conn.commit()
+    
+    def _index_existing(self) -> None:
+        """Index meetings stored before the search index existed"""
+        self._conn.execute(
+            """
+            INSERT INTO meeting_search (transcription, summary, decisions, action_items, meeting_id)
+            SELECT transcription, summary,
+                (SELECT group_concat(text, char(10)) FROM decisions WHERE meeting_id = meetings.id),
+                (SELECT group_concat(task || ' (' || assignee || ')', char(10))
+                    FROM action_items WHERE meeting_id = meetings.id),
+                id
+            FROM meetings
+            """
+        )
+
+    def _insert_rows(
+        self,
+        meeting_id: str,
+        result: TranscriptionResponse,
+        parts: Optional[List[Dict]],
+        segments: Optional[Sequence[TranscriptSegment]] = None
+    ) -> None:
+        """Write a meeting's search row and child rows (call inside a transaction)"""
+        if segments is None:
+            segments = result.segments or []
+        self._conn.execute(
+            """
+            INSERT INTO meeting_search (transcription, summary, decisions, action_items, meeting_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                result.transcription,
+                result.summary,
+                "\n".join(result.decisions),
+                "\n".join(f"{item.task} ({item.assignee})" for item in result.action_items),
+                meeting_id
+            )
+        )
+        self._conn.executemany(
+            "INSERT INTO participants (meeting_id, position, name) VALUES (?, ?, ?)",
+            ((meeting_id, position, name) for position, name in enumerate(result.participants))
+        )
+        self._conn.executemany(
+            "INSERT INTO decisions (meeting_id, position, text) VALUES (?, ?, ?)",
+            ((meeting_id, position, text) for position, text in enumerate(result.decisions))
+        )
+        self._conn.executemany(
+            "INSERT INTO action_items (meeting_id, position, task, assignee, deadline) VALUES (?, ?, ?, ?, ?)",
+            (
+                (meeting_id, position, item.task, item.assignee, item.deadline)
+                for position, item in enumerate(result.action_items)
+            )
+        )
+        self._conn.executemany(
+            "INSERT INTO segments (meeting_id, position, start, end, text, confidence) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (meeting_id, position, segment.start, segment.end, segment.text, segment.confidence)
+                for position, segment in enumerate(segments)
+            )
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO analysis_parts (meeting_id, position, text, analysis, analyzer, model)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    meeting_id, position, part["text"], json.dumps(part["analysis"], ensure_ascii=False),
+                    part.get("analyzer"), part.get("model")
+                )
+                for position, part in enumerate(parts or [])
+            )
+        )
+    
+    def save(
+        self,
+        result: TranscriptionResponse,
+        filename: Optional[str] = None,
+        language: Optional[str] = None,
+        parts: Optional[List[Dict]] = None,
+        segments: Optional[Sequence[TranscriptSegment]] = None
+    ) -> Dict:
+        """
+        Store a processed meeting
+        
+        Args:
+            result: Transcription and analysis to store
+            filename: Original upload filename
+            language: Language code the meeting was processed with
+            parts: Map-stage analyses ({'text', 'analysis', 'analyzer', 'model'}) in
+                transcript order, if known
+            segments: Timed segments, when result does not carry them - the
+                pipeline's TranscriptSegments are stored without building models
+        
+        Returns:
+            Meeting record without its child rows (id, filename, language, created_at, ...)
+        """
+        meeting_id = uuid.uuid4().hex
+        now = time.time()
+        if segments is None:
+            segments = result.segments
+        segment_count = len(segments) if segments is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO meetings (id, filename, language, transcription, summary, segment_count, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (meeting_id, filename, language, result.transcription, result.summary, segment_count, now)
+            )
+            self._insert_rows(meeting_id, result, parts, segments)
+        return {
+            "id": meeting_id,
+            "filename": filename,
+            "language": language,
+            "created_at": now,
+            "segment_count": segment_count
+        }
+
+    def update(self, meeting_id: str, result: TranscriptionResponse, parts: Optional[List[Dict]] = None) -> bool:
+        """
+        Replace a meeting's transcript and analysis, keeping its id, filename and creation time
+        
+        Args:
+            meeting_id: Meeting identifier
+            result: New transcription and analysis
+            parts: New map-stage analyses in transcript order, if known
+        
+        Returns:
+            True if the meeting existed
+        """
+        segment_count = len(result.segments) if result.segments is not None else None
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE meetings SET transcription = ?, summary = ?, segment_count = ? WHERE id = ?",
+                (result.transcription, result.summary, segment_count, meeting_id)
+            )
+            if cursor.rowcount == 0:
+                return False
+            for table in ("meeting_search", "participants", "decisions", "action_items", "segments", "analysis_parts"):
+                self._conn.execute(f"DELETE FROM {table} WHERE meeting_id = ?", (meeting_id,))
+            self._insert_rows(meeting_id, result, parts)
+        return True
+    
+    def parts(self, meeting_id: str) -> List[Dict]:
+        """
+        Load a meeting's map-stage analyses
+        
+        Returns:
+            {'text', 'analysis', 'analyzer', 'model'} per transcript segment in order;
+            empty if none were stored. analyzer and model are None for parts stored
+            before they were recorded.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT text, analysis, analyzer, model FROM analysis_parts
+                WHERE meeting_id = ? ORDER BY position
+                """,
+                (meeting_id,)
+            ).fetchall()
+        return [
+            {
+                "text": row["text"],
+                "analysis": json.loads(row["analysis"]),
+                "analyzer": row["analyzer"],
+                "model": row["model"]
+            }
+            for row in rows
+        ]
+    
+    def get(self, meeting_id: str, with_segments: bool = True) -> Optional[Dict]:
+        """
+        Load a meeting with its analysis
+
+        Args:
+            meeting_id: Meeting identifier
+            with_segments: Load the segments too (None if the meeting was stored without them)
+
+        Returns:
+            Meeting record with a 'result' TranscriptionResponse, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            participants = self._conn.execute(
+                "SELECT name FROM participants WHERE meeting_id = ? ORDER BY position", (meeting_id,)
+            ).fetchall()
+            decisions = self._conn.execute(
+                "SELECT text FROM decisions WHERE meeting_id = ? ORDER BY position", (meeting_id,)
+            ).fetchall()
+            action_items = self._conn.execute(
+                "SELECT task, assignee, deadline FROM action_items WHERE meeting_id = ? ORDER BY position",
+                (meeting_id,)
+            ).fetchall()
+            segments = None
+            if with_segments and row["segment_count"] is not None:
+                segments = self._conn.execute(
+                    "SELECT start, end, text, confidence FROM segments WHERE meeting_id = ? ORDER BY position",
+                    (meeting_id,)
+                ).fetchall()
+
+        meeting = dict(row)
+        transcription = meeting.pop("transcription")
+        summary = meeting.pop("summary")
+        meeting["result"] = TranscriptionResponse(
+            transcription=transcription,
+            summary=summary,
+            participants=[participant["name"] for participant in participants],
+            decisions=[decision["text"] for decision in decisions],
+            action_items=[ActionItem(**dict(item)) for item in action_items],
+            segments=[Segment(**dict(segment)) for segment in segments] if segments is not None else None,
+            meeting_id=meeting_id
+        )
+        return meeting
+
+    def list(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        participant: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        List meetings, newest first
+
+        Args:
+            limit: Page size
+            cursor: next_cursor from the previous page, or None for the first page
+            participant: Only meetings with this participant
+
+        Returns:
+            Tuple of (meeting records with participants, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        conditions, params = [], []
+        if cursor is not None:
+            created_at, meeting_id = parse_cursor(cursor)
+            conditions.append("(created_at, id) < (?, ?)")
+            params += [created_at, meeting_id]
+        if participant is not None:
+            conditions.append("id IN (SELECT meeting_id FROM participants WHERE name = ?)")
+            params.append(participant)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT id, filename, language, summary, segment_count, created_at,
+                    (SELECT COUNT(*) FROM action_items WHERE meeting_id = meetings.id) AS action_item_count
+                FROM meetings {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+                """,
+                (*params, limit + 1)
+            ).fetchall()
+            page = [dict(row) for row in rows[:limit]]
+            participants: Dict[str, List[str]] = {meeting["id"]: [] for meeting in page}
+            if page:
+                for row in self._conn.execute(
+                    f"""
+                    SELECT meeting_id, name FROM participants
+                    WHERE meeting_id IN ({', '.join('?' * len(page))})
+                    ORDER BY meeting_id, position
+                    """,
+                    list(participants)
+                ):
+                    participants[row["meeting_id"]].append(row["name"])
+
+        for meeting in page:
+            meeting["participants"] = participants[meeting["id"]]
+        next_cursor = make_cursor(page[-1]["created_at"], page[-1]["id"]) if len(rows) > limit else None
+        return page, next_cursor
+
+    def segments(self, meeting_id: str, offset: int = 0, limit: int = 100) -> Optional[Tuple[List[Segment], int]]:
+        """
+        Page through a meeting's segments
+
+        Args:
+            meeting_id: Meeting identifier
+            offset: Index of the first segment
+            limit: Page size
+
+        Returns:
+            Tuple of (segments in timeline order, total segments), or None if the
+            meeting does not exist or was stored without segments
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment_count FROM meetings WHERE id = ?", (meeting_id,)
+            ).fetchone()
+            if row is None or row["segment_count"] is None:
+                return None
+            # A primary-key range, not OFFSET - deep pages do not rescan earlier rows
+            rows = self._conn.execute(
+                """
+                SELECT start, end, text, confidence FROM segments
+                WHERE meeting_id = ? AND position >= ?
+                ORDER BY position LIMIT ?
+                """,
+                (meeting_id, offset, limit)
+            ).fetchall()
+        return [Segment(**dict(segment)) for segment in rows], row["segment_count"]
+
+    def delete(self, meeting_id: str) -> bool:
+        """
+        Delete a meeting and its child rows
+
+        Returns:
+            True if the meeting existed
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM meeting_search WHERE meeting_id = ?", (meeting_id,))
+            cursor = self._conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+        return cursor.rowcount > 0
+    
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Find meetings matching a search string, best match first
+        
+        Matches are ranked with BM25, weighting decisions and summaries above
+        the raw transcript (SEARCH_WEIGHTS).
+        
+        Args:
+            query: Search string (see to_fts_query)
+            limit: Page size
+            offset: Number of ranked results to skip
+        
+        Returns:
+            Tuple of (hits with meeting fields, score and snippet, total matches)
+        
+        Raises:
+            ValueError: If the query has nothing to search for
+        """
+        match = to_fts_query(query)
+        with self._lock:
+            # Rank every match once, counting them in the same pass, then build
+            # snippets only for the rows on this page
+            rows = self._conn.execute(
+                """
+                WITH page AS (
+                    SELECT rowid, meeting_id, rank, COUNT(*) OVER () AS total
+                    FROM meeting_search WHERE meeting_search MATCH :match
+                    ORDER BY rank LIMIT :limit OFFSET :offset
+                )
+                SELECT meetings.id, meetings.filename, meetings.language, meetings.summary,
+                    meetings.created_at, -page.rank AS score, page.total,
+                    snippet(meeting_search, -1, '<mark>', '</mark>', '...', 16) AS snippet
+                FROM page
+                JOIN meeting_search ON meeting_search.rowid = page.rowid
+                JOIN meetings ON meetings.id = page.meeting_id
+                WHERE meeting_search MATCH :match
+                ORDER BY page.rank
+                """,
+                {"match": match, "limit": limit, "offset": offset}
+            ).fetchall()
+            if rows:
+                total = rows[0]["total"]
+            else:
+                # Past the last page - count separately
+                total = self._conn.execute(
+                    "SELECT COUNT(*) FROM meeting_search WHERE meeting_search MATCH ?", (match,)
+                ).fetchone()[0]
+        hits = [dict(row) for row in rows]
+        for hit in hits:
+            del hit["total"]
+        return hits, total
+
+    def count(self) -> int:
+        """Number of stored meetings"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
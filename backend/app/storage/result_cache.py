@@ -0,0 +1,190 @@
+"""Persistent cache of transcription results keyed by audio content"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from app.models.schemas import TranscriptionResponse
+from app.models.transcript import TranscriptSegment
+
+
+class ResultCache:
+    """SQLite-backed TranscriptionResponse cache with LRU and TTL eviction"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            db_path: SQLite file. Defaults to RESULT_CACHE_PATH.
+            max_entries: Entries kept before evicting least recently used. Defaults to RESULT_CACHE_MAX_ENTRIES.
+            ttl_seconds: Entry lifetime. Defaults to RESULT_CACHE_TTL_HOURS.
+        """
+        self.db_path = db_path or os.getenv("RESULT_CACHE_PATH", "data/result_cache.db")
+        self.max_entries = max_entries or int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("RESULT_CACHE_TTL_HOURS", "720")) * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_accessed ON results (last_accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content_hash: str, language: Optional[str], *models: str) -> str:
+        """
+        Build a cache key from the audio hash and everything that changes the result
+
+        Args:
+            content_hash: SHA-256 hex digest of the audio bytes
+            language: Language code, or None for auto-detect
+            models: Model names used by the pipeline, and versions of any prompts
+                and settings that change its output
+
+        Returns:
+            Cache key string
+        """
+        return ":".join([content_hash, language or "auto", *models])
+
+    def get(self, key: str, with_segments: bool = True) -> Optional[TranscriptionResponse]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key
+            with_segments: Include timed segments; without them no Segment models are built
+
+        Returns:
+            Cached TranscriptionResponse, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM results WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM results WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE results SET last_accessed = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        if with_segments:
+            return TranscriptionResponse.model_validate_json(row[0])
+        payload = json.loads(row[0])
+        payload["segments"] = None
+        return TranscriptionResponse.model_validate(payload)
+
+    def segments(self, key: str) -> Optional[List[TranscriptSegment]]:
+        """
+        Read a cached result's timed segments without touching hit counters
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Segments, or None if the entry is missing or has none
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT json_extract(response, '$.segments') FROM results WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return [
+            TranscriptSegment(item["start"], item["end"], item["text"], item.get("confidence"))
+            for item in json.loads(row[0])
+        ]
+
+    def put(
+        self,
+        key: str,
+        response: TranscriptionResponse,
+        segments: Optional[Sequence[TranscriptSegment]] = None
+    ) -> None:
+        """
+        Store a result, evicting expired and least recently used entries
+
+        Args:
+            key: Cache key from make_key
+            response: Result to cache
+            segments: Timed segments, when response does not carry them - they are
+                serialized directly instead of through Segment models
+        """
+        if segments is None:
+            serialized = response.model_dump_json()
+        else:
+            payload = response.model_dump(mode="json")
+            payload["segments"] = [segment.to_dict() for segment in segments]
+            serialized = json.dumps(payload, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (cache_key, response, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now)
+            )
+            self._conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                """
+                DELETE FROM results WHERE cache_key IN (
+                    SELECT cache_key FROM results ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def set_meeting(self, key: str, meeting_id: str) -> None:
+        """
+        Point a cached result at the stored meeting it was saved as
+
+        Args:
+            key: Cache key from make_key
+            meeting_id: Meeting store id
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE results SET response = json_set(response, '$.meeting_id', ?) WHERE cache_key = ?",
+                (meeting_id, key)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
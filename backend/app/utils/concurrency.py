@@ -0,0 +1,59 @@
+"""Shared bounded thread pools for offloading blocking work from the event loop"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from app.utils.logger import setup_logger
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+# Pools replaced after a size change; their holders keep using them until shutdown
+_retired: List[ThreadPoolExecutor] = []
+_lock = threading.Lock()
+logger = setup_logger("concurrency")
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Get a process-wide thread pool shared by every caller using the same name
+
+    The pool size doubles as the concurrency limit for the blocking calls it runs,
+    so all service instances of one kind share a single cap. Asking for a
+    different size gives new callers a pool of that size; the old pool is not
+    shut down, since services built earlier still submit to it.
+
+    Args:
+        name: Pool name (e.g., 'whisper', 'groq')
+        max_workers: Maximum number of concurrent worker threads
+
+    Returns:
+        ThreadPoolExecutor for the given name
+    """
+    max_workers = max(1, max_workers)
+    with _lock:
+        executor = _executors.get(name)
+        if executor is not None and executor._max_workers != max_workers:
+            logger.warning(
+                f"Pool '{name}' resized from {executor._max_workers} to {max_workers} workers; "
+                f"services created earlier keep the old pool"
+            )
+            _retired.append(executor)
+            executor = None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = executor
+        return executor
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Shut down all shared thread pools
+
+    Args:
+        wait: Whether to block until running work has finished
+    """
+    with _lock:
+        executors = list(_executors.values()) + _retired
+        _executors.clear()
+        _retired.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -1,27 +1,96 @@
 """Logging configuration for the application"""
+import atexit
 import logging
-from datetime import datetime
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
+# Payload modes for large AI results (transcripts, analysis JSON)
+PAYLOAD_TRUNCATE = "truncate"  # Log a preview only
+PAYLOAD_FILE = "file"  # Log a preview; write the full payload to a separate file
+PAYLOAD_FULL = "full"  # Log the full payload inline
 
-def setup_logger(name: str, log_file: str = None) -> logging.Logger:
+# Every logger feeds one queue, drained by one listener thread that hands each
+# record to the handlers of the logger that queued it
+_log_queue: queue.Queue = queue.Queue(-1)
+_routes: Dict[str, Tuple[logging.Handler, ...]] = {}
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _RoutedQueueHandler(QueueHandler):
+    """Queues records tagged with the logger whose handlers should write them"""
+    
+    def __init__(self, route: str):
+        super().__init__(_log_queue)
+        self.route = route
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # prepare() copies the record, so a parent logger's handler tags its own copy
+        record = super().prepare(record)
+        record.log_route = self.route
+        return record
+
+
+class _RouteHandler(logging.Handler):
+    """Listener-side handler passing each record to its logger's file and console handlers"""
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in _routes.get(getattr(record, "log_route", None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+
+def _build_file_handler(log_path: Path, formatter: logging.Formatter) -> RotatingFileHandler:
+    """Size-rotated log file, configured by LOG_MAX_BYTES and LOG_BACKUP_COUNT"""
+    handler = RotatingFileHandler(
+        log_path,
+        maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+        encoding='utf-8',
+        delay=True
+    )
+    handler.setFormatter(formatter)
+    return handler
+
+
+def _attach_queue(logger: logging.Logger, *handlers: logging.Handler) -> None:
+    """Route a logger through the shared queue so handler I/O runs on the background thread"""
+    global _listener
+    with _listener_lock:
+        _routes[logger.name] = handlers
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _RouteHandler())
+            _listener.start()
+    logger.addHandler(_RoutedQueueHandler(logger.name))
+
+
+def setup_logger(name: str, log_file: str = None, level: Optional[str] = None) -> logging.Logger:
     """
     Set up a logger with file and console handlers
     
+    Records are queued and written by a background listener thread, so logging
+    never blocks the caller on disk or console I/O. The log file rotates by size.
+    
     Args:
         name: Logger name
-        log_file: Optional log file path. If None, uses default location
+        log_file: Optional log file name. If None, uses '<name>.log'
+        level: Optional level name (e.g., 'DEBUG'). Defaults to LOG_LEVEL.
     
     Returns:
         Configured logger instance
     """
     # Create logs directory if it doesn't exist
-    logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
+    logs_dir = Path(os.getenv("LOG_DIR", "logs"))
+    logs_dir.mkdir(parents=True, exist_ok=True)
     
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
     
     # Avoid duplicate handlers if logger already exists
     if logger.handlers:
@@ -37,25 +106,14 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
         '%(levelname)s - %(message)s'
     )
     
-    # File handler - write to log file
-    if log_file:
-        log_path = logs_dir / log_file
-    else:
-        # Default: use service name with date
-        log_path = logs_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    file_handler = logging.FileHandler(log_path, encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(detailed_formatter)
+    # File handler - write to log file, rotated by size
+    file_handler = _build_file_handler(logs_dir / (log_file or f"{name}.log"), detailed_formatter)
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    _attach_queue(logger, file_handler, console_handler)
     
     return logger
 
@@ -70,6 +128,70 @@ def get_ai_logger(service_name: str) -> logging.Logger:
     Returns:
         Configured logger for AI results
     """
-    log_file = f"ai_{service_name}_{datetime.now().strftime('%Y%m%d')}.log"
-    return setup_logger(f"ai.{service_name}", log_file)
+    return setup_logger(f"ai.{service_name}", f"ai_{service_name}.log")
+
+
+def _get_payload_logger(logger: logging.Logger) -> logging.Logger:
+    """File-only logger holding full payloads for LOG_PAYLOAD_MODE=file"""
+    payload_logger = logging.getLogger(f"{logger.name}.payloads")
+    if payload_logger.handlers:
+        return payload_logger
+    
+    payload_logger.setLevel(logging.DEBUG)
+    payload_logger.propagate = False
+    logs_dir = Path(os.getenv("LOG_DIR", "logs"))
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    file_handler = _build_file_handler(
+        logs_dir / f"{logger.name.replace('.', '_')}_payloads.log",
+        logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    )
+    _attach_queue(payload_logger, file_handler)
+    return payload_logger
+
+
+def log_payload(logger: logging.Logger, title: str, payload: str, level: int = logging.INFO) -> None:
+    """
+    Log a large payload according to LOG_PAYLOAD_MODE
+    
+    Args:
+        logger: Logger to write the entry to
+        title: Short description of the payload (e.g., 'Transcription')
+        payload: Full payload text
+        level: Level for the main log entry
+    """
+    if not logger.isEnabledFor(level):
+        return
+    
+    mode = os.getenv("LOG_PAYLOAD_MODE", PAYLOAD_TRUNCATE).lower()
+    max_chars = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))
+    
+    if mode == PAYLOAD_FULL or len(payload) <= max_chars:
+        logger.log(level, f"{title}:\n{payload}")
+        return
+    
+    preview = f"{title} ({len(payload)} characters, truncated):\n{payload[:max_chars]}..."
+    if mode == PAYLOAD_FILE:
+        _get_payload_logger(logger).info(f"{title}:\n{payload}")
+        preview += " [full payload in payload log]"
+    logger.log(level, preview)
+
+
+def _stop_listener() -> None:
+    """Write out queued records and stop the background listener thread"""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def flush_logs() -> None:
+    """Block until every queued log record has been written"""
+    with _listener_lock:
+        running = _listener is not None
+    if running:
+        # The listener marks each record done once its handlers have written it
+        _log_queue.join()
+
 
+atexit.register(_stop_listener)
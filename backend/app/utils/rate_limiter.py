@@ -0,0 +1,335 @@
+"""Provider rate limiting: request/token budgets, retries with backoff, Retry-After"""
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.utils.logger import setup_logger
+
+# Status codes worth retrying: timeout, conflict, rate limit, server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a provider keeps rate limiting a call after all retries"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Seconds the caller should wait before trying again, if known
+        self.retry_after = retry_after
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether the provider rejected the call for exceeding its rate limit"""
+    return _status_code(error) == 429
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed provider call may succeed if sent again"""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    # SDK connection and timeout errors wrap the underlying httpx error
+    return isinstance(error, httpx.TransportError) or isinstance(error.__cause__, httpx.TransportError)
+
+
+def provider_counted(error: Exception) -> bool:
+    """
+    Whether a failed call reached the provider's usage accounting
+
+    Calls that never got a response, and server errors that report no usage,
+    did not draw on the provider's budget.
+    """
+    status = _status_code(error)
+    if status is None:
+        return False
+    if status >= 500:
+        body = getattr(error, "body", None)
+        return isinstance(body, dict) and body.get("usage") is not None
+    return True
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the provider's requested wait from a failed call's response headers
+
+    Args:
+        error: Exception raised by an OpenAI/Groq client call
+
+    Returns:
+        Seconds to wait, or None if the response did not say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        # HTTP-date form
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _TokenBucket:
+    """Per-minute budget that refills continuously; reservations may run it negative"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` from the budget and return seconds until it is covered"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single call larger than the whole budget waits for a full bucket, not forever
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimitScheduler:
+    """
+    Paces calls to one provider and retries the ones it rejects
+
+    Every call reserves a request and its estimated tokens from per-minute
+    budgets (RPM/TPM) and sleeps until they are covered, so bursts queue up
+    instead of hitting the provider's limit. Rejected calls are retried with
+    exponential backoff and full jitter; a 429's Retry-After pauses every
+    caller sharing the scheduler, not just the one that got it. Reservations
+    are made under a thread lock, so one scheduler can serve any event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        """
+        Args:
+            name: Provider name, used for logging
+            requests_per_minute: Request budget; 0 disables it
+            tokens_per_minute: Token budget; 0 disables it
+            max_retries: Retries per call after the first attempt
+            base_delay: Backoff before the first retry, doubled on each one (seconds)
+            max_delay: Upper bound on one backoff (seconds)
+        """
+        self.name = name
+        self.settings = (requests_per_minute, tokens_per_minute, max_retries, base_delay, max_delay)
+        self.requests = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "waited_seconds": 0.0}
+        self.logger = setup_logger(f"ratelimit.{name}")
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve budget for one call; returns how long the call must wait"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.reserve(tokens, now))
+            self.stats["calls"] += 1
+            self.stats["waited_seconds"] += wait
+            return wait
+
+    def refund(self, requests: int, tokens: int) -> None:
+        """Return a reservation the provider never drew on"""
+        with self._lock:
+            if self.requests is not None and requests:
+                self.requests.refund(requests)
+            if self.tokens is not None and tokens:
+                self.tokens.refund(tokens)
+
+    def settle(self, reserved_tokens: int, used_tokens: Optional[int]) -> None:
+        """Return over-estimated tokens to the budget (or take the shortfall)"""
+        if self.tokens is None or used_tokens is None:
+            return
+        with self._lock:
+            self.tokens.refund(reserved_tokens - used_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every call on this scheduler for the given time"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries from many callers from arriving together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def run(
+        self,
+        executor: Optional[Executor],
+        func: Callable[..., Any],
+        *args: Any,
+        tokens: int = 0,
+        count_tokens: Optional[Callable[[Any], Optional[int]]] = None
+    ) -> Any:
+        """
+        Run a blocking provider call on an executor within the budgets, retrying failures
+
+        The token estimate is reserved once per call, not per attempt; every
+        attempt takes a request. An attempt that fails before the provider
+        counted it gives its request back, and so do the tokens if the call
+        then gives up.
+
+        Args:
+            executor: Thread pool for the call
+            func: Blocking function making the provider call
+            *args: Arguments for func
+            tokens: Estimated tokens the call will use (prompt plus completion)
+            count_tokens: Optional function reading actual token usage from the result
+
+        Returns:
+            The call's result
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            # Retries reuse the first attempt's token reservation
+            wait = self._reserve(tokens if attempt == 0 else 0)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # A 429 seen by another caller while we waited holds us back too
+            paused = self._paused_until - time.monotonic()
+            while paused > 0:
+                await asyncio.sleep(paused)
+                paused = self._paused_until - time.monotonic()
+            try:
+                result = await loop.run_in_executor(executor, func, *args)
+            except Exception as e:
+                retrying = is_retryable(e) and attempt < self.max_retries
+                if not provider_counted(e):
+                    # Nothing was drawn on: give back the request, and the tokens
+                    # unless a retry still holds them
+                    self.refund(1, 0 if retrying else tokens)
+                if not is_retryable(e):
+                    raise
+                rate_limited = is_rate_limited(e)
+                retry_after = retry_after_seconds(e)
+                if rate_limited:
+                    self.stats["rate_limited"] += 1
+                if attempt >= self.max_retries:
+                    if rate_limited:
+                        raise RateLimitExceededError(
+                            f"{self.name} rate limit exceeded after {attempt + 1} attempts", retry_after
+                        ) from e
+                    raise
+                delay = min(self.max_delay, retry_after) if retry_after is not None else self._backoff(attempt)
+                if rate_limited:
+                    # The whole budget is exhausted - stop everyone, not just this call
+                    self.pause(delay)
+                self.stats["retries"] += 1
+                self.logger.warning(
+                    f"{self.name} call failed ({type(e).__name__}: {str(e)[:200]}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            if count_tokens is not None:
+                try:
+                    self.settle(tokens, count_tokens(result))
+                except Exception:
+                    pass
+            return result
+
+
+_schedulers: Dict[str, RateLimitScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    name: str,
+    requests_per_minute: float = 0,
+    tokens_per_minute: float = 0,
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0
+) -> RateLimitScheduler:
+    """
+    Get the process-wide scheduler for a provider, shared by every caller using the same name
+
+    Budgets belong to an API key, not to a service instance, so every client
+    of one provider must draw from the same scheduler.
+
+    Args:
+        name: Provider name (e.g., 'openai', 'groq')
+        requests_per_minute: Request budget; 0 disables it
+        tokens_per_minute: Token budget; 0 disables it
+        max_retries: Retries per call after the first attempt
+        base_delay: Initial backoff (seconds)
+        max_delay: Maximum backoff (seconds)
+
+    Returns:
+        RateLimitScheduler for the given name
+    """
+    settings = (requests_per_minute, tokens_per_minute, max_retries, base_delay, max_delay)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None or scheduler.settings != settings:
+            # New provider, or its limits were reconfigured
+            scheduler = RateLimitScheduler(name, *settings)
+            _schedulers[name] = scheduler
+        return scheduler
+
+
+def rate_limiter_from_env(name: str, env_prefix: str) -> RateLimitScheduler:
+    """
+    Get a provider's scheduler configured from the environment
+
+    Budgets come from <PREFIX>_REQUESTS_PER_MINUTE and <PREFIX>_TOKENS_PER_MINUTE
+    (0 or unset: no budget, only retries). Retry behaviour is shared by all
+    providers: PROVIDER_MAX_RETRIES, PROVIDER_RETRY_BASE_DELAY, PROVIDER_RETRY_MAX_DELAY.
+
+    Args:
+        name: Provider name (e.g., 'groq')
+        env_prefix: Environment variable prefix (e.g., 'GROQ')
+
+    Returns:
+        RateLimitScheduler for the provider
+    """
+    return get_rate_limiter(
+        name,
+        requests_per_minute=float(os.getenv(f"{env_prefix}_REQUESTS_PER_MINUTE", "0")),
+        tokens_per_minute=float(os.getenv(f"{env_prefix}_TOKENS_PER_MINUTE", "0")),
+        max_retries=int(os.getenv("PROVIDER_MAX_RETRIES", "5")),
+        base_delay=float(os.getenv("PROVIDER_RETRY_BASE_DELAY", "1.0")),
+        max_delay=float(os.getenv("PROVIDER_RETRY_MAX_DELAY", "60"))
+    )
@@ -0,0 +1,66 @@
+"""Map an edited transcript back onto the pieces of the original"""
+from difflib import SequenceMatcher
+from typing import List
+
+
+def project_edit(units: List[str], edited: str) -> List[str]:
+    """
+    Split an edited transcript into the same pieces as the original
+
+    The original is the concatenation of `units` (timed segments, analysis
+    segments, ...). Words are diffed against it, and every word of the edit
+    goes to the unit that held the word it matches or replaces; inserted words
+    join the unit before them. Units nobody touched come back with the same
+    words, so callers can tell which ones changed.
+
+    Args:
+        units: Original pieces in order
+        edited: Edited transcript
+
+    Returns:
+        Edited text of each unit, words joined by single spaces ('' if all its words were deleted)
+    """
+    if not units:
+        return []
+    old_words: List[str] = []
+    owners: List[int] = []
+    for index, unit in enumerate(units):
+        words = unit.split()
+        old_words.extend(words)
+        owners.extend([index] * len(words))
+    new_words = edited.split()
+    assigned: List[List[str]] = [[] for _ in units]
+    if not old_words:
+        assigned[0] = new_words
+        return [" ".join(words) for words in assigned]
+
+    # Most edits are local: skip the untouched head and tail before diffing,
+    # which keeps a long transcript with one correction cheap
+    limit = min(len(old_words), len(new_words))
+    prefix = 0
+    while prefix < limit and old_words[prefix] == new_words[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_words[-1 - suffix] == new_words[-1 - suffix]:
+        suffix += 1
+
+    opcodes = [("equal", 0, prefix, 0, prefix)]
+    matcher = SequenceMatcher(
+        None, old_words[prefix:len(old_words) - suffix], new_words[prefix:len(new_words) - suffix]
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    opcodes.append(("equal", len(old_words) - suffix, len(old_words), len(new_words) - suffix, len(new_words)))
+
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "delete":
+            continue
+        for j in range(j1, j2):
+            if i1 == i2:
+                # Insertion: attach to the preceding word's unit (the first unit at the very start)
+                owner = owners[i1 - 1] if i1 > 0 else owners[0]
+            else:
+                # Equal or replaced: spread the new words evenly over the old ones
+                owner = owners[i1 + (j - j1) * (i2 - i1) // (j2 - j1)]
+            assigned[owner].append(new_words[j])
+    return [" ".join(words) for words in assigned]
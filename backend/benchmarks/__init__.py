@@ -0,0 +1,7 @@
+# Benchmarks package - Standalone performance scripts (not part of the test suite)
+import os
+import tempfile
+
+# Loggers the benchmarks create (one per provider, pipeline, pool...) write to a
+# throwaway directory, not the source tree - as tests/conftest.py does
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="meeting_benchmarks_logs_"))
@@ -0,0 +1,84 @@
+"""Benchmark batch throughput against the N / concurrency x per-file ideal
+
+Runs 50 short recordings from a manifest through BatchTranscriptionService at
+several concurrency levels. The Whisper and Groq API calls are replaced with
+fixed sleeps on their real thread pools, so the numbers show scheduling
+overhead rather than provider speed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_batch
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-dummy")
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy")
+# Provider pools large enough that the batch limit is the only cap
+os.environ["WHISPER_MAX_CONCURRENCY"] = "16"
+os.environ["GROQ_MAX_CONCURRENCY"] = "16"
+os.environ["BATCH_MAX_CONCURRENCY"] = "16"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.business.batch_service import BatchTranscriptionService
+from app.business.transcription_service import TranscriptionBusinessService
+from app.services.groq_service import GroqService
+from app.services.whisper_service import WhisperService
+
+FILES = 50
+# Simulated provider latency per recording
+TRANSCRIPTION_SECONDS = 0.15
+ANALYSIS_SECONDS = 0.05
+CONCURRENCY_LEVELS = [1, 2, 5, 10]
+
+
+def _fake_transcription(**kwargs):
+    time.sleep(TRANSCRIPTION_SECONDS)
+    return Mock(text="Alice said the plan is on track.")
+
+
+def _fake_completion(**kwargs):
+    time.sleep(ANALYSIS_SECONDS)
+    content = json.dumps({"summary": "Summary", "participants": [], "decisions": [], "action_items": []})
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+
+async def _run(manifest_root: str, paths, concurrency: int) -> float:
+    whisper_service = WhisperService()
+    groq_service = GroqService()
+    service = TranscriptionBusinessService(whisper_service=whisper_service, groq_service=groq_service)
+    batch = BatchTranscriptionService(service, job_service=None, manifest_root=manifest_root)
+    with patch.object(whisper_service.client.audio.transcriptions, "create", side_effect=_fake_transcription), \
+            patch.object(groq_service.client.chat.completions, "create", side_effect=_fake_completion):
+        result = await batch.run([], paths, concurrency=concurrency)
+    assert result.completed == FILES, result.items[0].error
+    return result.elapsed_seconds
+
+
+def main():
+    per_file = TRANSCRIPTION_SECONDS + ANALYSIS_SECONDS
+    with tempfile.TemporaryDirectory() as manifest_root:
+        paths = []
+        for i in range(FILES):
+            path = f"meeting_{i:02d}.mp3"
+            with open(os.path.join(manifest_root, path), "wb") as f:
+                f.write(f"recording {i}".encode())
+            paths.append(path)
+
+        print("=" * 80)
+        print(f"BATCH OF {FILES} RECORDINGS - {per_file:.2f}s SIMULATED PROVIDER TIME EACH")
+        print("=" * 80)
+        print(f"{'Concurrency':>11} {'Wall clock (s)':>16} {'Ideal (s)':>11} {'Efficiency':>11}")
+        print("-" * 80)
+        for concurrency in CONCURRENCY_LEVELS:
+            elapsed = asyncio.run(_run(manifest_root, paths, concurrency))
+            ideal = FILES / concurrency * per_file
+            print(f"{concurrency:>11} {elapsed:>16.2f} {ideal:>11.2f} {ideal / elapsed:>10.0%}")
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark wall-clock time of chunked transcription against worker count
+
+Simulates a 2-hour meeting as a low-sample-rate WAV and replaces the Whisper
+API call with a sleep proportional to the chunk's audio duration, so the
+numbers show pipeline scaling rather than provider speed. The recording runs
+through the production pipeline (_transcribe_and_analyze) with an instant
+analysis call, and its transcription stage time is reported.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_chunked_transcription [workers ...]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import wave
+from unittest.mock import Mock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-dummy")
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy")
+
+from app.business.transcription_service import TranscriptionBusinessService
+from app.services.audio_chunker import AudioChunker
+from app.services.whisper_service import WhisperService
+
+MEETING_SECONDS = 2 * 60 * 60
+FRAME_RATE = 1000
+# Simulated provider latency: 0.1s per minute of audio
+SECONDS_PER_AUDIO_SECOND = 0.1 / 60
+
+
+def _write_meeting(path: str) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(FRAME_RATE)
+        wav.writeframes(b"\x80" * FRAME_RATE * MEETING_SECONDS)
+
+
+def _fake_create(**kwargs):
+    audio_file = kwargs["file"]
+    with wave.open(audio_file, "rb") as wav:
+        duration = wav.getnframes() / wav.getframerate()
+    time.sleep(duration * SECONDS_PER_AUDIO_SECOND)
+    return Mock(text="words " * int(duration / 10))
+
+
+def _fake_completion(**kwargs):
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = json.dumps({"summary": "Summary"})
+    return response
+
+
+async def _run(audio_path: str, workers: int) -> float:
+    os.environ["WHISPER_MAX_CONCURRENCY"] = str(workers)
+    whisper_service = WhisperService()
+    service = TranscriptionBusinessService(
+        whisper_service=whisper_service,
+        audio_chunker=AudioChunker(chunk_seconds=600, overlap_seconds=5)
+    )
+    with patch.object(whisper_service.client.audio.transcriptions, "create", side_effect=_fake_create), \
+         patch.object(service.groq_service.client.chat.completions, "create", side_effect=_fake_completion):
+        _, _, timings, *_ = await service._transcribe_and_analyze(service.get_backend(), audio_path)
+        return timings.transcription_seconds
+
+
+def main(worker_counts):
+    with tempfile.TemporaryDirectory() as work_dir:
+        audio_path = os.path.join(work_dir, "meeting.wav")
+        _write_meeting(audio_path)
+
+        print("=" * 80)
+        print("CHUNKED TRANSCRIPTION - 2 HOUR MEETING, 10 MINUTE CHUNKS")
+        print("=" * 80)
+        print(f"{'Workers':>8} {'Transcription (s)':>18} {'Speedup':>9}")
+        print("-" * 80)
+        baseline = None
+        for workers in worker_counts:
+            elapsed = asyncio.run(_run(audio_path, workers))
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>18.2f} {baseline / elapsed:>8.1f}x")
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 2, 4, 8])
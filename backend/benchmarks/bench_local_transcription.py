@@ -0,0 +1,101 @@
+"""Benchmark real-time factor of the local CPU transcription backend
+
+Real-time factor (RTF) is processing time divided by audio duration; below 1.0
+the backend keeps up with live audio. Each configuration transcribes the same
+file with LocalWhisperService, after a warm-up run that loads the model.
+
+Requires faster-whisper. Without an audio file, a synthetic 60-second 16 kHz
+WAV of tones is used, which exercises the encoder and decoder but says nothing
+about accuracy - pass a real meeting recording for representative numbers.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_local_transcription [audio.wav] [--model small] [--threads 1 2 4 8]
+"""
+import argparse
+import asyncio
+import math
+import os
+import struct
+import tempfile
+import time
+import wave
+
+from app.services import local_whisper_service
+from app.services.local_whisper_service import LocalWhisperService
+
+SYNTHETIC_SECONDS = 60
+SAMPLE_RATE = 16000
+
+
+def _write_synthetic(path: str) -> None:
+    # Alternating tones and pauses, 16-bit mono
+    frames = bytearray()
+    for i in range(SYNTHETIC_SECONDS * SAMPLE_RATE):
+        second = i // SAMPLE_RATE
+        value = 0 if second % 3 == 2 else int(8000 * math.sin(2 * math.pi * (200 + 50 * (second % 5)) * i / SAMPLE_RATE))
+        frames += struct.pack("<h", value)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(frames))
+
+
+def _duration(path: str) -> float:
+    # faster-whisper decodes with PyAV, which reads any format we accept
+    from faster_whisper.audio import decode_audio
+    return len(decode_audio(path, sampling_rate=SAMPLE_RATE)) / SAMPLE_RATE
+
+
+async def _run(path: str, model: str, compute_type: str, threads: int, batch_size: int) -> float:
+    os.environ.update({
+        "LOCAL_WHISPER_MODEL": model,
+        "LOCAL_WHISPER_COMPUTE_TYPE": compute_type,
+        "LOCAL_WHISPER_CPU_THREADS": str(threads),
+        "LOCAL_WHISPER_BATCH_SIZE": str(batch_size),
+    })
+    service = LocalWhisperService()
+    await service.transcribe_audio(path, language="en")  # Warm-up: loads the model
+    start = time.perf_counter()
+    await service.transcribe_audio(path, language="en")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", nargs="?", help="Audio file to transcribe (default: synthetic WAV)")
+    parser.add_argument("--model", default="small", help="faster-whisper model size")
+    parser.add_argument("--compute-types", nargs="+", default=["int8"], help="e.g. int8 float32")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4, os.cpu_count() or 4])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8])
+    args = parser.parse_args()
+
+    if local_whisper_service.WhisperModel is None:
+        raise SystemExit("faster-whisper is not installed (pip install faster-whisper)")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = args.audio
+        if path is None:
+            path = os.path.join(work_dir, "synthetic.wav")
+            _write_synthetic(path)
+        duration = _duration(path)
+
+        print("=" * 80)
+        print(f"LOCAL TRANSCRIPTION - {args.model} model, {duration:.0f}s of audio, {os.cpu_count()} CPUs")
+        print("=" * 80)
+        print(f"{'Compute':<9} {'Threads':>8} {'Batch':>6} {'Wall clock (s)':>16} {'RTF':>7} {'x realtime':>11}")
+        print("-" * 80)
+        for compute_type in args.compute_types:
+            for threads in sorted(set(args.threads)):
+                for batch_size in args.batch_sizes:
+                    elapsed = asyncio.run(_run(path, args.model, compute_type, threads, batch_size))
+                    rtf = elapsed / duration
+                    print(
+                        f"{compute_type:<9} {threads:>8} {batch_size:>6} {elapsed:>16.2f} "
+                        f"{rtf:>7.3f} {1 / rtf:>10.1f}x"
+                    )
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark caller-side cost of logging a large AI result
+
+Compares the previous setup (synchronous FileHandler + console, full transcript
+inline) with the queued setup from app.utils.logger in each payload mode. Only
+the time spent in the calling thread is measured - that is what the event loop
+pays per request.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_logging
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from unittest.mock import patch
+
+from app.utils.logger import setup_logger, log_payload, flush_logs
+
+TRANSCRIPT_CHARS = 200_000
+REPEATS = 20
+
+
+def _sync_logger(log_dir: str) -> logging.Logger:
+    logger = logging.getLogger(f"bench.sync.{uuid.uuid4().hex}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(logging.FileHandler(os.path.join(log_dir, "sync.log"), encoding="utf-8"))
+    logger.addHandler(logging.StreamHandler(sys.stderr))
+    return logger
+
+
+def _time(log_once) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        log_once()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    transcript = ("word " * (TRANSCRIPT_CHARS // 5))[:TRANSCRIPT_CHARS]
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull, \
+            patch.object(sys, "stderr", devnull):
+        sync_logger = _sync_logger(log_dir)
+        results = [("sync, full inline", _time(lambda: sync_logger.info(transcript)))]
+
+        for mode in ("full", "truncate", "file"):
+            with patch.dict(os.environ, {"LOG_DIR": log_dir, "LOG_PAYLOAD_MODE": mode}):
+                logger = setup_logger(f"bench.queued.{uuid.uuid4().hex}")
+                results.append((f"queued, {mode}", _time(lambda: log_payload(logger, "Transcription", transcript))))
+        flush_logs()
+
+    print("=" * 80)
+    print(f"LOGGING A {TRANSCRIPT_CHARS:,}-CHARACTER TRANSCRIPT - CALLER-SIDE TIME")
+    print("=" * 80)
+    print(f"{'Setup':<24} {'ms per call':>12}")
+    print("-" * 80)
+    for label, elapsed in results:
+        print(f"{label:<24} {elapsed:>12.3f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark end-to-end latency with and without transcription/analysis pipelining
+
+Simulates a 2-hour meeting as a low-sample-rate WAV and replaces the Whisper and
+Groq API calls with sleeps (Whisper proportional to audio duration, Groq fixed
+per request), so the numbers show stage overlap rather than provider speed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_pipeline
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+import wave
+from unittest.mock import Mock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-dummy")
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy")
+
+from app.business.transcription_service import TranscriptionBusinessService
+from app.services.audio_chunker import AudioChunker
+from app.services.groq_service import GroqService
+from app.services.whisper_service import WhisperService
+
+MEETING_SECONDS = 2 * 60 * 60
+FRAME_RATE = 1000
+# Simulated provider latency: 0.1s per minute of audio, 0.5s per analysis request
+SECONDS_PER_AUDIO_SECOND = 0.1 / 60
+SECONDS_PER_COMPLETION = 0.5
+
+
+def _write_meeting(path: str) -> None:
+    # Every sample in second N has value N (mod 256), so chunk text is position-specific
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(FRAME_RATE)
+        for second in range(MEETING_SECONDS):
+            wav.writeframes(bytes([second % 256]) * FRAME_RATE)
+
+
+def _fake_transcription(**kwargs):
+    with wave.open(kwargs["file"], "rb") as wav:
+        samples = wav.readframes(wav.getnframes())
+    time.sleep(len(samples) / FRAME_RATE * SECONDS_PER_AUDIO_SECOND)
+    text = " ".join(
+        f"w{samples[i]} said the plan is on track."
+        for i in range(0, len(samples) - FRAME_RATE + 1, FRAME_RATE)
+    )
+    return Mock(text=text)
+
+
+def _fake_completion(**kwargs):
+    time.sleep(SECONDS_PER_COMPLETION)
+    content = json.dumps({"summary": "Summary", "participants": [], "decisions": [], "action_items": []})
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+
+async def _run(audio_path: str, pipelined: bool):
+    os.environ["PIPELINE_ENABLED"] = "true" if pipelined else "false"
+    whisper_service = WhisperService()
+    groq_service = GroqService()
+    service = TranscriptionBusinessService(
+        whisper_service=whisper_service,
+        groq_service=groq_service,
+        audio_chunker=AudioChunker(chunk_seconds=600, overlap_seconds=5)
+    )
+    with patch.object(whisper_service.client.audio.transcriptions, "create", side_effect=_fake_transcription), \
+            patch.object(groq_service.client.chat.completions, "create", side_effect=_fake_completion):
+        result = await service.process_audio_path(audio_path)
+    return result.timings
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work_dir:
+        audio_path = os.path.join(work_dir, "meeting.wav")
+        _write_meeting(audio_path)
+
+        print("=" * 80)
+        print("TRANSCRIPTION + ANALYSIS - 2 HOUR MEETING, 10 MINUTE CHUNKS")
+        print("=" * 80)
+        print(f"{'Mode':<12} {'Transcribe (s)':>15} {'Analyze (s)':>12} {'Overlap (s)':>12} {'Total (s)':>10}")
+        print("-" * 80)
+        for pipelined in (False, True):
+            timings = asyncio.run(_run(audio_path, pipelined))
+            mode = "pipelined" if pipelined else "sequential"
+            print(
+                f"{mode:<12} {timings.transcription_seconds:>15.2f} {timings.analysis_seconds:>12.2f} "
+                f"{timings.overlap_seconds:>12.2f} {timings.total_seconds:>10.2f}"
+            )
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark throughput and 429s against a rate-limited provider
+
+A simulated provider enforces a requests-per-minute limit with a token bucket
+and answers 429 with Retry-After when it is exceeded. A burst of calls is sent
+through RateLimitScheduler with no retries, with retries only, and with retries
+plus a local budget set to the provider's limit. Provider calls are otherwise
+instant, so the limit is the only bottleneck.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import os
+import threading
+import time
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+import httpx
+import openai
+
+from app.utils.rate_limiter import RateLimitScheduler
+
+PROVIDER_RPM = 1200
+CALLS = 1500
+CONCURRENCY = 64
+
+
+class _SimulatedProvider:
+    """Token bucket of PROVIDER_RPM requests, refilled continuously"""
+
+    def __init__(self):
+        self.level = PROVIDER_RPM
+        self.rate = PROVIDER_RPM / 60
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.rejected = 0
+
+    def call(self):
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(PROVIDER_RPM, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.level >= 1:
+                self.level -= 1
+                return "ok"
+            self.rejected += 1
+            wait_ms = (1 - self.level) / self.rate * 1000
+        response = httpx.Response(
+            429, headers={"retry-after-ms": f"{wait_ms:.0f}"}, request=httpx.Request("POST", "https://provider.test")
+        )
+        raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+async def _run(scheduler: RateLimitScheduler):
+    provider = _SimulatedProvider()
+    limit = asyncio.Semaphore(CONCURRENCY)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with limit:
+            try:
+                await scheduler.run(None, provider.call)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(CALLS)))
+    return time.perf_counter() - start, provider.rejected, failures
+
+
+def main():
+    configurations = [
+        ("no retries", RateLimitScheduler("bench", max_retries=0)),
+        ("retries + Retry-After", RateLimitScheduler("bench", max_retries=8, base_delay=0.5)),
+        ("retries + RPM budget", RateLimitScheduler("bench", requests_per_minute=PROVIDER_RPM, max_retries=8, base_delay=0.5)),
+    ]
+    # The first PROVIDER_RPM calls fit the provider's full bucket; the rest arrive at its refill rate
+    ideal = (CALLS - PROVIDER_RPM) / (PROVIDER_RPM / 60)
+
+    print("=" * 80)
+    print(f"{CALLS} CALLS, {CONCURRENCY} CONCURRENT, PROVIDER LIMIT {PROVIDER_RPM} RPM (ideal {ideal:.1f}s)")
+    print("=" * 80)
+    print(f"{'Scheduler':<24} {'Wall clock (s)':>15} {'Succeeded':>10} {'Failed':>8} {'429s':>8}")
+    print("-" * 80)
+    for label, scheduler in configurations:
+        elapsed, rejected, failures = asyncio.run(_run(scheduler))
+        print(f"{label:<24} {elapsed:>15.2f} {CALLS - failures:>10} {failures:>8} {rejected:>8}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
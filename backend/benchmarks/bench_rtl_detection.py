@@ -0,0 +1,93 @@
+"""Benchmark RTL detection on multi-megabyte transcripts
+
+Compares the per-character Python loop WordExportService used to run over
+transcription + summary (copying the transcript to concatenate them) with
+app.utils.text_direction: one NumPy table lookup per code point. Regex and
+str.translate counters are timed too, as the obvious pure-Python
+alternatives. Per-paragraph detection classifies every transcript line, as
+the Word export now does for mixed Hebrew/English meetings.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_rtl_detection
+"""
+import os
+import re
+import statistics
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.utils.text_direction import is_rtl, rtl_flags
+
+SIZES_MB = [1, 4, 16]
+RUNS = 5
+
+HEBREW_LINE = "שלום לכולם, היום נדבר על ה-roadmap של הרבעון ועל מועד השחרור."
+ENGLISH_LINE = "Thanks everyone, let's go over the release checklist for Friday."
+SUMMARY = "הצוות סקר את מפת הדרכים וקבע את מועד השחרור."
+
+_RTL_CHARACTERS = re.compile("[\u0590-\u08FF\uFB1D-\uFDFF\uFE70-\uFEFF]")
+_DROP_RTL = {codepoint: None for codepoint in range(0x0590, 0x0900)}
+
+
+def legacy_is_rtl(text: str) -> bool:
+    """The previous WordExportService._is_rtl_text"""
+    if not text:
+        return False
+    rtl_chars = 0
+    for char in text:
+        if ('\u0590' <= char <= '\u05FF') or ('\u0600' <= char <= '\u06FF'):
+            rtl_chars += 1
+    return rtl_chars > len(text) * 0.3
+
+
+def regex_is_rtl(text: str) -> bool:
+    return len(_RTL_CHARACTERS.findall(text)) > len(text) * 0.3
+
+
+def translate_is_rtl(text: str) -> bool:
+    return len(text) - len(text.translate(_DROP_RTL)) > len(text) * 0.3
+
+
+def _transcript(megabytes: int) -> str:
+    """Mixed transcript, three Hebrew lines to every English one, of about `megabytes` of UTF-8"""
+    block = "\n".join([HEBREW_LINE, HEBREW_LINE, ENGLISH_LINE, HEBREW_LINE]) + "\n"
+    return block * (megabytes * 1024 * 1024 // len(block.encode("utf-8")))
+
+
+def _time_ms(func) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print("=" * 84)
+    print(f"RTL DETECTION, median of {RUNS} runs")
+    print("=" * 84)
+    print(f"{'Transcript':<12} {'Method':<36} {'Time (ms)':>12} {'Speedup':>10}")
+    print("-" * 84)
+    for megabytes in SIZES_MB:
+        transcript = _transcript(megabytes)
+        lines = transcript.splitlines()
+        legacy_ms = _time_ms(lambda: legacy_is_rtl(transcript + SUMMARY))
+        rows = [
+            ("Python loop (previous, one flag)", legacy_ms),
+            ("regex findall (one flag)", _time_ms(lambda: regex_is_rtl(transcript))),
+            ("str.translate (one flag)", _time_ms(lambda: translate_is_rtl(transcript))),
+            ("NumPy is_rtl (one flag)", _time_ms(lambda: is_rtl(transcript))),
+            (f"NumPy rtl_flags ({len(lines)} paragraphs)", _time_ms(lambda: rtl_flags(lines))),
+        ]
+        label = f"{megabytes} MB"
+        for method, elapsed in rows:
+            print(f"{label:<12} {method:<36} {elapsed:>12.1f} {legacy_ms / elapsed:>9.1f}x")
+            label = ""
+        print("-" * 84)
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark full-text search latency over 10k stored meetings
+
+Fills a MeetingStore with synthetic meetings (a few hundred words of
+transcript each, drawn from a Zipf-like vocabulary so some words are in
+almost every meeting and others in a handful) and times GET /api/search's
+store query for common, rare, multi-word, phrase, prefix and deep-page
+searches. A LIKE scan over the transcripts is timed for comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.models.schemas import ActionItem, TranscriptionResponse
+from app.storage.meeting_store import MeetingStore
+
+MEETINGS = 10_000
+TRANSCRIPT_WORDS = 400
+VOCABULARY = 5_000
+RUNS = 30
+TARGET_MS = 100
+
+QUERIES = [
+    ("common word", "w1", 0),
+    ("rare word", "w4200", 0),
+    ("two words", "w3 w250", 0),
+    ("phrase", '"w1 w2"', 0),
+    ("prefix", "w42*", 0),
+    ("decision text", "decided w7", 0),
+    ("deep page (offset 500)", "w1", 500),
+]
+
+
+def _meeting(rng: random.Random, words: list, weights: list) -> TranscriptionResponse:
+    transcript = " ".join(rng.choices(words, weights, k=TRANSCRIPT_WORDS))
+    topic = " ".join(rng.choices(words, weights, k=5))
+    return TranscriptionResponse(
+        transcription=transcript,
+        summary=f"Meeting about {topic}",
+        participants=["Alice", "Bob"],
+        decisions=[f"We decided to {' '.join(rng.choices(words, weights, k=4))}" for _ in range(2)],
+        action_items=[ActionItem(task=" ".join(rng.choices(words, weights, k=4)), assignee="Alice")]
+    )
+
+
+def _time_ms(func, runs: int = RUNS) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    rng = random.Random(0)
+    words = [f"w{rank}" for rank in range(1, VOCABULARY + 1)]
+    weights = [1 / rank for rank in range(1, VOCABULARY + 1)]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = MeetingStore(db_path=os.path.join(work_dir, "meetings.db"))
+        start = time.perf_counter()
+        for _ in range(MEETINGS):
+            store.save(_meeting(rng, words, weights), filename="meeting.mp3", language="en")
+        insert_seconds = time.perf_counter() - start
+
+        print("=" * 80)
+        print(f"{MEETINGS} MEETINGS x {TRANSCRIPT_WORDS} WORDS, indexed in {insert_seconds:.1f}s "
+              f"({insert_seconds / MEETINGS * 1000:.2f} ms per meeting, index updated on save)")
+        print("=" * 80)
+        print(f"{'Query':<26} {'Matches':>8} {'Median (ms)':>12} {'p95 (ms)':>10} {'< ' + str(TARGET_MS) + ' ms':>8}")
+        print("-" * 80)
+        for label, query, offset in QUERIES:
+            _, total = store.search(query, limit=20, offset=offset)
+            timings = sorted(_time_ms(lambda: store.search(query, limit=20, offset=offset)))
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{label:<26} {total:>8} {statistics.median(timings):>12.2f} {p95:>10.2f} "
+                  f"{'yes' if p95 < TARGET_MS else 'NO':>8}")
+        print("-" * 80)
+        scan = sorted(_time_ms(lambda: store._conn.execute(
+            "SELECT id FROM meetings WHERE transcription LIKE ? LIMIT 20 OFFSET 500", ("% w4200 %",)
+        ).fetchall(), runs=5))
+        print(f"{'LIKE scan (rare word)':<26} {'':>8} {statistics.median(scan):>12.2f}")
+        print("=" * 80)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
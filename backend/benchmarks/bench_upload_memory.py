@@ -0,0 +1,93 @@
+"""Benchmark peak RSS of upload ingestion against file size
+
+Compares the old approach (read the whole upload into memory) with the
+streaming copy used by TranscriptionBusinessService. Each measurement runs
+in a fresh subprocess so ru_maxrss reflects only that run.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_upload_memory [size_mb ...]
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from starlette.datastructures import UploadFile
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-dummy")
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy")
+os.environ.setdefault("MAX_UPLOAD_SIZE_MB", "100000")
+
+from app.business.transcription_service import TranscriptionBusinessService
+
+
+class _StubWhisper:
+    async def transcribe_audio(self, audio_file_path, language=None):
+        return "stub transcription"
+
+
+class _StubGroq:
+    async def analyze_transcription(self, transcription, language=None):
+        return {"summary": "stub", "participants": [], "decisions": [], "action_items": []}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _make_upload(size_mb: int) -> UploadFile:
+    """Build an UploadFile backed by an on-disk spool, like Starlette does for big uploads"""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = os.urandom(1024 * 1024)
+    for _ in range(size_mb):
+        spool.write(block)
+    spool.seek(0)
+    return UploadFile(file=spool, filename="meeting.wav")
+
+
+async def _run_buffered(upload: UploadFile) -> None:
+    """Baseline: the pre-streaming implementation"""
+    with tempfile.NamedTemporaryFile(suffix=".wav") as temp_file:
+        content = await upload.read()
+        temp_file.write(content)
+        temp_file.flush()
+
+
+async def _run_streaming(upload: UploadFile) -> None:
+    service = TranscriptionBusinessService(whisper_service=_StubWhisper(), groq_service=_StubGroq())
+    await service.process_audio_file(upload)
+
+
+def _child(mode: str, size_mb: int) -> None:
+    upload = _make_upload(size_mb)
+    baseline = _peak_rss_mb()
+    runner = _run_buffered if mode == "buffered" else _run_streaming
+    asyncio.run(runner(upload))
+    print(f"{baseline:.1f} {_peak_rss_mb():.1f}")
+
+
+def main(sizes):
+    print("=" * 80)
+    print("UPLOAD INGESTION - PEAK RSS vs FILE SIZE")
+    print("=" * 80)
+    print(f"{'Size (MB)':>10} {'Mode':>10} {'Peak RSS (MB)':>15} {'Growth (MB)':>13}")
+    print("-" * 80)
+    for size_mb in sizes:
+        for mode in ("buffered", "streaming"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_upload_memory", "--child", mode, str(size_mb)],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            baseline, peak = float(output[0]), float(output[1])
+            print(f"{size_mb:>10} {mode:>10} {peak:>15.1f} {peak - baseline:>13.1f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [16, 64, 256])
@@ -0,0 +1,88 @@
+"""Benchmark Word export on 100k+ word transcripts
+
+Renders the same meeting with both WordExportService modes: 'python-docx'
+builds an element tree node by node and serializes it, 'template' streams
+precompiled paragraph XML straight into the zip. Both produce the same
+document.xml, which is checked before timing.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_word_export
+"""
+import os
+import re
+import statistics
+import time
+import zipfile
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.models.schemas import ActionItem
+from app.services.word_export_service import WordExportService
+
+# Runs finish seconds apart, so the generation time is masked before comparing
+_GENERATED = re.compile(rb"Generated: [0-9: -]+")
+
+WORD_COUNTS = [100_000, 250_000]
+RUNS = 3
+
+HEBREW_LINE = "שלום לכולם, היום נדבר על ה-roadmap של הרבעון ועל מועד השחרור."
+ENGLISH_LINE = "Thanks everyone, let's go over the release checklist for Friday & the <beta> notes."
+
+
+def _meeting(words: int) -> dict:
+    """Mixed Hebrew/English meeting whose transcript has about `words` words"""
+    block = [HEBREW_LINE, ENGLISH_LINE, HEBREW_LINE, ENGLISH_LINE]
+    block_words = sum(len(line.split()) for line in block)
+    transcription = "\n".join(block * (words // block_words))
+    return {
+        "transcription": transcription,
+        "summary": "הצוות סקר את מפת הדרכים.\nThe team reviewed the roadmap.",
+        "participants": ["דני", "Alice", "Bob"],
+        "decisions": ["נשחרר ביום שישי", "Freeze the API on Wednesday"],
+        "action_items": [
+            ActionItem(task="לעדכן את התיעוד", assignee="Alice", deadline="2024-01-15"),
+            ActionItem(task="Prepare the release notes", assignee="Bob"),
+        ],
+    }
+
+
+def _time(service: WordExportService, meeting: dict):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        document = service.create_document(**meeting)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), document
+
+
+def main():
+    modes = {mode: WordExportService(mode=mode) for mode in ("python-docx", "template")}
+    # Compile the template outside the timed runs, as a running server has
+    modes["template"].create_document(**_meeting(0))
+
+    print("=" * 78)
+    print(f"WORD EXPORT, median of {RUNS} runs")
+    print("=" * 78)
+    print(f"{'Transcript':<16} {'Mode':<14} {'Time (s)':>10} {'Size (KB)':>12} {'Speedup':>10}")
+    print("-" * 78)
+    for words in WORD_COUNTS:
+        meeting = _meeting(words)
+        results = {mode: _time(service, meeting) for mode, service in modes.items()}
+        documents = {
+            mode: _GENERATED.sub(b"", zipfile.ZipFile(document).read("word/document.xml"))
+            for mode, (_, document) in results.items()
+        }
+        assert documents["template"] == documents["python-docx"], "modes produced different documents"
+
+        baseline = results["python-docx"][0]
+        label = f"{words:,} words"
+        for mode, (elapsed, document) in results.items():
+            size_kb = len(document.getvalue()) / 1024
+            print(f"{label:<16} {mode:<14} {elapsed:>10.2f} {size_kb:>12.0f} {baseline / elapsed:>9.1f}x")
+            label = ""
+        print("-" * 78)
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
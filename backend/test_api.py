@@ -2,6 +2,7 @@
 import requests
 import json
 import sys
+import time
 from pathlib import Path
 
 
@@ -87,6 +88,43 @@ def test_transcribe_api(audio_file_path: str, api_url: str = "http://localhost:8
         return None
 
 
+def test_jobs_api(audio_file_path: str, api_url: str = "http://localhost:8000", poll_interval: float = 2.0):
+    """
+    Test the background job API: submit the file, then poll until the job finishes
+    
+    Args:
+        audio_file_path: Path to the MP3/WAV file
+        api_url: Base URL of the API
+        poll_interval: Seconds between status checks
+    """
+    file_path = Path(audio_file_path)
+    if not file_path.exists():
+        print(f"Error: File not found: {audio_file_path}")
+        return None
+    
+    with open(file_path, 'rb') as audio_file:
+        files = {'file': (file_path.name, audio_file, 'audio/mpeg')}
+        response = requests.post(f"{api_url}/api/jobs", files=files, timeout=60)
+    
+    if response.status_code != 202:
+        print(f"Error: {response.status_code}")
+        print(response.text)
+        return None
+    
+    job_id = response.json()["job_id"]
+    print(f"Queued job: {job_id}")
+    
+    while True:
+        job = requests.get(f"{api_url}/api/jobs/{job_id}", timeout=30).json()
+        print(f"Status: {job['status']}")
+        if job["status"] == "completed":
+            return job["result"]
+        if job["status"] == "failed":
+            print(f"Error: {job['error']}")
+            return None
+        time.sleep(poll_interval)
+
+
 def test_export_api(result: dict, api_url: str = "http://localhost:8000"):
     """
     Test the export API to generate a Word document
@@ -124,12 +162,15 @@ def test_export_api(result: dict, api_url: str = "http://localhost:8000"):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python test_api.py <path_to_audio_file>")
+        print("Usage: python test_api.py <path_to_audio_file> [--jobs]")
         print("Example: python test_api.py test_meeting.mp3")
         sys.exit(1)
     
     audio_file = sys.argv[1]
-    result = test_transcribe_api(audio_file)
+    if "--jobs" in sys.argv[2:]:
+        result = test_jobs_api(audio_file)
+    else:
+        result = test_transcribe_api(audio_file)
     
     if result:
         # Ask if user wants to export
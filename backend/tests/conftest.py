@@ -9,6 +9,16 @@ from fastapi.testclient import TestClient
 # These will be mocked/overridden in actual tests
 os.environ.setdefault("OPENAI_API_KEY", "test-key-dummy")
 os.environ.setdefault("GROQ_API_KEY", "test-key-dummy")
+# Keep tests from sharing results through the on-disk cache; cache tests opt in explicitly
+os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+# Job queue and spooled uploads go to a throwaway directory
+_test_data_dir = tempfile.mkdtemp(prefix="meeting_tests_")
+os.environ.setdefault("JOB_DB_PATH", os.path.join(_test_data_dir, "jobs.db"))
+os.environ.setdefault("JOB_SPOOL_DIR", os.path.join(_test_data_dir, "jobs"))
+os.environ.setdefault("MEETING_DB_PATH", os.path.join(_test_data_dir, "meetings.db"))
+# Loggers created by tests (one per rate-limited test provider) must not litter the source tree
+os.environ.setdefault("LOG_DIR", os.path.join(_test_data_dir, "logs"))
 
 from app.main import app
 from app.services.whisper_service import WhisperService
@@ -91,7 +101,8 @@ def mock_upload_file():
     """Mock FastAPI UploadFile"""
     mock_file = Mock()
     mock_file.filename = "test_audio.mp3"
-    mock_file.read = AsyncMock(return_value=b'fake audio content')
+    # Chunked reads: content, then EOF
+    mock_file.read = AsyncMock(side_effect=[b'fake audio content', b''])
     mock_file.content_type = "audio/mpeg"
     return mock_file
 
@@ -1,7 +1,11 @@
 """Tests for API layer (routes)"""
 import pytest
 import json
-from unittest.mock import AsyncMock, Mock
+import os
+import time
+import asyncio
+import httpx
+from unittest.mock import AsyncMock, Mock, patch
 from io import BytesIO
 
 from app.models.schemas import ActionItem
@@ -24,6 +28,92 @@ class TestTranscriptionRoutes:
         assert "message" in response.json()
         assert "version" in response.json()
     
+    def test_lifespan_manages_service_registry(self):
+        """Test that services are shared during the app lifespan and released after"""
+        from fastapi.testclient import TestClient
+        from app.business.service_registry import service_registry
+        from app.main import app
+        
+        with TestClient(app) as lifespan_client:
+            assert lifespan_client.get("/health").status_code == 200
+            assert get_transcription_service() is get_transcription_service()
+            http_clients = list(service_registry._http_clients)
+        
+        assert all(client.is_closed for client in http_clients)
+    
+    def test_cache_stats_endpoint(self, client, tmp_path):
+        """Test that cache counters are exposed"""
+        from app.api.routes.transcription import get_result_cache
+        from app.storage.result_cache import ResultCache
+        from app.main import app
+        
+        cache = ResultCache(db_path=str(tmp_path / "cache.db"))
+        cache.get("missing")
+        app.dependency_overrides[get_result_cache] = lambda: cache
+        
+        try:
+            response = client.get("/api/cache/stats")
+            assert response.status_code == 200
+            assert response.json()["enabled"] is True
+            assert response.json()["misses"] == 1
+        finally:
+            app.dependency_overrides.clear()
+        
+        app.dependency_overrides[get_result_cache] = lambda: None
+        try:
+            assert client.get("/api/cache/stats").json() == {"enabled": False}
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_analysis_cache_stats_endpoint(self, client, tmp_path):
+        """Test that analysis cache counters are exposed"""
+        from app.api.routes.transcription import get_analysis_cache
+        from app.storage.analysis_cache import AnalysisCache
+        from app.main import app
+        
+        cache = AnalysisCache(db_path=str(tmp_path / "analysis.db"))
+        cache.put("meeting_analysis", "v1", "key", {"summary": "Summary"})
+        cache.get("meeting_analysis", "v1", "key")
+        app.dependency_overrides[get_analysis_cache] = lambda: cache
+        
+        try:
+            response = client.get("/api/cache/analysis/stats")
+            assert response.status_code == 200
+            assert response.json()["enabled"] is True
+            assert response.json()["memory_hits"] == 1
+            assert response.json()["disk_entries"] == 1
+        finally:
+            app.dependency_overrides.clear()
+        
+        app.dependency_overrides[get_analysis_cache] = lambda: None
+        try:
+            assert client.get("/api/cache/analysis/stats").json() == {"enabled": False}
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_preprocessing_stats_endpoint(self, client):
+        """Test that bytes saved and seconds skipped are totalled across recordings"""
+        from app.services.audio_preprocessor import AudioPreprocessor
+        from app.main import app
+        
+        preprocessor = AudioPreprocessor(codec="wav")
+        service = Mock(audio_preprocessor=preprocessor)
+        app.dependency_overrides[get_transcription_service] = lambda: service
+        try:
+            preprocessor.enabled = False
+            assert client.get("/api/preprocessing/stats").json() == {"enabled": False}
+            
+            preprocessor.enabled = True
+            preprocessor.record(1000, 400, 60.0, 15.5)
+            preprocessor.record(500, 100, 30.0, 4.5)
+            stats = client.get("/api/preprocessing/stats").json()
+            assert stats["recordings"] == 2
+            assert stats["bytes_saved"] == 1000
+            assert stats["skipped_seconds"] == 20.0
+            assert stats["vad"] is False
+        finally:
+            app.dependency_overrides.clear()
+    
     def test_transcribe_endpoint_success(self, client):
         """Test successful transcription endpoint"""
         from app.models.schemas import TranscriptionResponse
@@ -62,6 +152,64 @@ class TestTranscriptionRoutes:
             # Clean up override
             app.dependency_overrides.clear()
     
+    def test_transcribe_endpoint_rate_limited(self, client):
+        """Test that an exhausted provider rate limit is a 429 with Retry-After, not a 500"""
+        from app.business.transcription_service import TranscriptionBusinessService
+        from app.utils.rate_limiter import RateLimitExceededError
+        from app.main import app
+        
+        mock_service = Mock(spec=TranscriptionBusinessService)
+        mock_service.process_audio_file = AsyncMock(
+            side_effect=RateLimitExceededError("Groq API error: groq rate limit exceeded", retry_after=12.5)
+        )
+        app.dependency_overrides[get_transcription_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.mp3", b"fake audio content", "audio/mpeg")}
+            response = client.post("/api/transcribe", files=files)
+            
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "13"
+            assert "rate limit" in response.json()["detail"]
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_transcribe_endpoint_backend_selection(self, client):
+        """Test that backend query parameters reach the service, and unknown ones are 400"""
+        from app.models.schemas import TranscriptionResponse
+        from app.business.transcription_service import TranscriptionBusinessService
+        from app.main import app
+        
+        mock_result = TranscriptionResponse(
+            transcription="Local transcription",
+            summary="",
+            participants=[],
+            decisions=[],
+            action_items=[]
+        )
+        mock_service = Mock(spec=TranscriptionBusinessService)
+        mock_service.process_audio_file = AsyncMock(return_value=mock_result)
+        mock_service.validate_backends = Mock(side_effect=ValueError("Unknown transcription backend: gpu"))
+        app.dependency_overrides[get_transcription_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.mp3", b"fake audio content", "audio/mpeg")}
+            response = client.post("/api/transcribe?backend=local&analysis_backend=local", files=files)
+            assert response.status_code == 200
+            assert mock_service.process_audio_file.call_args.kwargs["backend"] == "local"
+            assert mock_service.process_audio_file.call_args.kwargs["analysis_backend"] == "local"
+            assert mock_service.process_audio_file.call_args.kwargs["with_segments"] is False
+            
+            response = client.post("/api/transcribe?segments=true", files=files)
+            assert response.status_code == 200
+            assert mock_service.process_audio_file.call_args.kwargs["with_segments"] is True
+            
+            response = client.post("/api/transcribe/stream?backend=gpu", files=files)
+            assert response.status_code == 400
+            assert "Unknown transcription backend" in response.json()["detail"]
+        finally:
+            app.dependency_overrides.clear()
+    
     def test_transcribe_endpoint_no_file(self, client):
         """Test transcription endpoint without file"""
         response = client.post("/api/transcribe")
@@ -84,6 +232,23 @@ class TestTranscriptionRoutes:
         finally:
             app.dependency_overrides.clear()
     
+    def test_transcribe_endpoint_file_too_large(self, client):
+        """Test transcription endpoint rejects oversized uploads with 413"""
+        from app.business.transcription_service import TranscriptionBusinessService, FileTooLargeError
+        from app.main import app
+        
+        mock_service = Mock(spec=TranscriptionBusinessService)
+        mock_service.process_audio_file = AsyncMock(side_effect=FileTooLargeError("File too large"))
+        
+        app.dependency_overrides[get_transcription_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.mp3", b"content", "audio/mpeg")}
+            response = client.post("/api/transcribe", files=files)
+            assert response.status_code == 413
+        finally:
+            app.dependency_overrides.clear()
+    
     def test_transcribe_endpoint_processing_error(self, client):
         """Test transcription endpoint with processing error"""
         from app.business.transcription_service import TranscriptionBusinessService
@@ -218,4 +383,605 @@ class TestTranscriptionRoutes:
             assert response.status_code == 500
         finally:
             app.dependency_overrides.clear()
+    
+    def test_export_post_text_formats(self, client):
+        """Test streaming exports in the registered text formats, and 400 for unknown ones"""
+        payload = {
+            "transcription": "Alice opened.\nשלום לכולם",
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": [],
+            "action_items": [],
+            "filename": "test_meeting",
+            "segments": [
+                {"start": 0.0, "end": 2.5, "text": "Alice opened."},
+                {"start": 2.5, "text": "שלום לכולם"}
+            ]
+        }
+        
+        markdown = client.post("/api/export", params={"format": "markdown"}, json=payload)
+        srt = client.post("/api/export", params={"format": "srt"}, json=payload)
+        
+        assert markdown.status_code == 200
+        assert markdown.headers["content-type"].startswith("text/markdown")
+        assert 'filename="test_meeting.md"' in markdown.headers["content-disposition"]
+        assert "## Full Transcription\n\nAlice opened.\n\nשלום לכולם\n\n" in markdown.text
+        assert srt.text.startswith("1\n00:00:00,000 --> 00:00:02,500\nAlice opened.\n\n2\n00:00:02,500 --> ")
+        response = client.post("/api/export", params={"format": "pdf"}, json=payload)
+        assert response.status_code == 400
+        assert "Unknown export format" in response.json()["detail"]
+
+
+
+def parse_sse(body: str):
+    """Parse a Server-Sent Events body into (event, data) tuples"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestStreamingRoutes:
+    """Tests for the Server-Sent Events transcription route"""
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    def test_transcribe_stream_emits_events(self, client):
+        """Test that the stream carries stage events and ends with the result"""
+        from app.business.transcription_service import TranscriptionBusinessService
+        from app.main import app
+        
+        service = TranscriptionBusinessService()
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Test transcription")
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Test summary",
+            "participants": ["Alice"],
+            "decisions": [],
+            "action_items": []
+        })
+        app.dependency_overrides[get_transcription_service] = lambda: service
+        
+        try:
+            files = {"file": ("test.mp3", b"fake audio content", "audio/mpeg")}
+            response = client.post("/api/transcribe/stream", files=files)
+            
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.text)
+            assert [name for name, _ in events] == [
+                "upload_received", "chunk_transcribed", "transcription_complete", "analysis_started",
+                "section", "section", "section", "section", "result"
+            ]
+            assert events[1][1]["text"] == "Test transcription"
+            assert events[-1][1]["summary"] == "Test summary"
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_transcribe_stream_invalid_file_type(self, client):
+        """Test that validation errors are returned before streaming starts"""
+        from app.business.transcription_service import TranscriptionBusinessService
+        from app.main import app
+        
+        mock_service = Mock(spec=TranscriptionBusinessService)
+        mock_service.ingest_upload = AsyncMock(side_effect=ValueError("Unsupported file type"))
+        app.dependency_overrides[get_transcription_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.txt", b"content", "text/plain")}
+            assert client.post("/api/transcribe/stream", files=files).status_code == 400
+        finally:
+            app.dependency_overrides.clear()
+    
+    @pytest.mark.asyncio
+    async def test_transcribe_stream_removes_upload_if_never_read(self, tmp_path, mock_upload_file):
+        """Test that the saved upload is deleted even when the body is never iterated"""
+        from app.api.routes.transcription import transcribe_audio_stream
+        from app.business.transcription_service import TranscriptionBusinessService
+        
+        saved = tmp_path / "upload.mp3"
+        saved.write_bytes(b"fake audio content")
+        mock_service = Mock(spec=TranscriptionBusinessService)
+        mock_service.ingest_upload = AsyncMock(return_value=(str(saved), "hash"))
+        
+        response = await transcribe_audio_stream(
+            file=mock_upload_file, language=None, backend=None, analysis_backend=None,
+            segments=False, transcription_service=mock_service
+        )
+        # What Starlette runs after the response, also when the client disconnected first
+        await response.background()
+        
+        assert not saved.exists()
+        mock_service.stream_audio_path.assert_not_called()
+
+
+class TestConcurrentUploads:
+    """Load tests for concurrent uploads and exports"""
+    
+    @patch.dict(os.environ, {
+        "OPENAI_API_KEY": "test-key",
+        "GROQ_API_KEY": "test-key",
+        "WHISPER_MAX_CONCURRENCY": "8",
+        "GROQ_MAX_CONCURRENCY": "8"
+    })
+    @pytest.mark.asyncio
+    async def test_concurrent_uploads_overlap(self):
+        """Test that N concurrent uploads overlap and /health stays responsive"""
+        from app.business.transcription_service import TranscriptionBusinessService
+        from app.main import app
+        
+        api_delay = 0.3
+        uploads = 6
+        service = TranscriptionBusinessService()
+        
+        def slow_transcription(**kwargs):
+            time.sleep(api_delay)
+            return Mock(text="Test transcription")
+        
+        def slow_completion(**kwargs):
+            time.sleep(api_delay)
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps({"summary": "Test summary"})
+            return response
+        
+        app.dependency_overrides[get_transcription_service] = lambda: service
+        
+        try:
+            with patch.object(service.whisper_service.client.audio.transcriptions, 'create', side_effect=slow_transcription), \
+                 patch.object(service.groq_service.client.chat.completions, 'create', side_effect=slow_completion):
+                async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+                    async def upload(i):
+                        files = {"file": (f"meeting_{i}.mp3", b"fake audio content", "audio/mpeg")}
+                        return await async_client.post("/api/transcribe", files=files)
+                    
+                    async def health_latency():
+                        await asyncio.sleep(api_delay / 3)  # Let the uploads reach the API calls
+                        start = time.perf_counter()
+                        response = await async_client.get("/health")
+                        assert response.status_code == 200
+                        return time.perf_counter() - start
+                    
+                    start = time.perf_counter()
+                    *responses, health_elapsed = await asyncio.gather(
+                        *(upload(i) for i in range(uploads)), health_latency()
+                    )
+                    elapsed = time.perf_counter() - start
+            
+            assert all(response.status_code == 200 for response in responses)
+            # Serial processing would take uploads * 2 * api_delay (3.6s)
+            assert elapsed < uploads * 2 * api_delay / 2
+            assert health_elapsed < api_delay
+        finally:
+            app.dependency_overrides.clear()
+    
+    @patch.dict(os.environ, {"WORD_EXPORT_MAX_CONCURRENCY": "2"})
+    @pytest.mark.asyncio
+    async def test_concurrent_exports_capped_and_off_event_loop(self):
+        """Test that exports run on the capped pool while the API stays responsive"""
+        import threading
+        from app.services.word_export_service import WordExportService
+        from app.main import app
+        
+        build_delay = 0.3
+        exports = 4
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+        document = b"PK" + b"x" * (200 * 1024)
+        
+        def slow_create_document(**kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(build_delay)
+            with lock:
+                running -= 1
+            return BytesIO(document)
+        
+        mock_service = Mock(spec=WordExportService)
+        mock_service.create_document = Mock(side_effect=slow_create_document)
+        app.dependency_overrides[get_word_export_service] = lambda: mock_service
+        
+        payload = {
+            "transcription": "Test",
+            "summary": "Summary",
+            "participants": [],
+            "decisions": [],
+            "action_items": []
+        }
+        
+        try:
+            async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+                async def health_latency():
+                    await asyncio.sleep(build_delay / 3)  # Let the exports start building
+                    start = time.perf_counter()
+                    response = await async_client.get("/health")
+                    assert response.status_code == 200
+                    return time.perf_counter() - start
+                
+                *responses, health_elapsed = await asyncio.gather(
+                    *(async_client.post("/api/export", json=payload) for _ in range(exports)),
+                    health_latency()
+                )
+            
+            assert all(response.status_code == 200 for response in responses)
+            assert all(response.content == document for response in responses)
+            assert responses[0].headers["content-length"] == str(len(document))
+            assert peak == 2
+            assert health_elapsed < build_delay
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestJobRoutes:
+    """Tests for background job API routes"""
+    
+    def test_create_job_returns_job_id(self, client):
+        """Test that POST /api/jobs returns 202 with a job id"""
+        from datetime import datetime
+        from app.api.routes.jobs import get_job_service
+        from app.business.job_service import TranscriptionJobService
+        from app.models.schemas import JobResponse
+        from app.main import app
+        
+        now = datetime.now()
+        mock_service = Mock(spec=TranscriptionJobService)
+        mock_service.submit = AsyncMock(return_value=JobResponse(
+            job_id="abc123", status="queued", filename="test.mp3", created_at=now, updated_at=now
+        ))
+        app.dependency_overrides[get_job_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.mp3", b"fake audio content", "audio/mpeg")}
+            response = client.post("/api/jobs", files=files, params={"language": "he"})
+            
+            assert response.status_code == 202
+            assert response.json()["job_id"] == "abc123"
+            assert response.json()["status"] == "queued"
+            assert mock_service.submit.call_args.kwargs["language"] == "he"
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_create_job_invalid_file_type(self, client):
+        """Test that validation errors surface as 400"""
+        from app.api.routes.jobs import get_job_service
+        from app.business.job_service import TranscriptionJobService
+        from app.main import app
+        
+        mock_service = Mock(spec=TranscriptionJobService)
+        mock_service.submit = AsyncMock(side_effect=ValueError("Unsupported file type"))
+        app.dependency_overrides[get_job_service] = lambda: mock_service
+        
+        try:
+            files = {"file": ("test.txt", b"content", "text/plain")}
+            assert client.post("/api/jobs", files=files).status_code == 400
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_get_job_completed(self, client, sample_transcription_data):
+        """Test that GET /api/jobs/{id} includes the result once completed"""
+        from datetime import datetime
+        from app.api.routes.jobs import get_job_service
+        from app.business.job_service import TranscriptionJobService
+        from app.models.schemas import JobResponse, TranscriptionResponse
+        from app.main import app
+        
+        now = datetime.now()
+        mock_service = Mock(spec=TranscriptionJobService)
+        mock_service.get = AsyncMock(return_value=JobResponse(
+            job_id="abc123", status="completed", filename="test.mp3", created_at=now, updated_at=now,
+            result=TranscriptionResponse(**sample_transcription_data)
+        ))
+        app.dependency_overrides[get_job_service] = lambda: mock_service
+        
+        try:
+            response = client.get("/api/jobs/abc123")
+            assert response.status_code == 200
+            assert response.json()["result"]["summary"] == sample_transcription_data["summary"]
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_get_job_not_found(self, client):
+        """Test that unknown job ids return 404"""
+        from app.api.routes.jobs import get_job_service
+        from app.business.job_service import TranscriptionJobService
+        from app.main import app
+        
+        mock_service = Mock(spec=TranscriptionJobService)
+        mock_service.get = AsyncMock(return_value=None)
+        app.dependency_overrides[get_job_service] = lambda: mock_service
+        
+        try:
+            assert client.get("/api/jobs/missing").status_code == 404
+        finally:
+            app.dependency_overrides.clear()
+
+
+class TestBatchRoutes:
+    """Tests for the batch transcription route"""
+    
+    def make_batch_service(self):
+        from app.business.batch_service import BatchTranscriptionService
+        from app.models.schemas import BatchResponse, BatchItemResponse
+        
+        mock_service = Mock(spec=BatchTranscriptionService)
+        mock_service.submit = AsyncMock(return_value=BatchResponse(
+            items=[BatchItemResponse(source="a.mp3", status="queued", job_id="job1")],
+            queued=1, elapsed_seconds=0.01
+        ))
+        mock_service.run = AsyncMock(return_value=BatchResponse(
+            items=[BatchItemResponse(source="a.mp3", status="failed", error="Whisper API error")],
+            failed=1, concurrency=2, elapsed_seconds=0.5
+        ))
+        return mock_service
+    
+    def test_batch_queues_jobs_by_default(self, client):
+        """Test that uploads and manifest paths are queued as jobs"""
+        from app.api.routes.transcription import get_batch_service
+        from app.main import app
+        
+        mock_service = self.make_batch_service()
+        app.dependency_overrides[get_batch_service] = lambda: mock_service
+        
+        try:
+            files = [
+                ("files", ("a.mp3", b"audio a", "audio/mpeg")),
+                ("files", ("b.wav", b"audio b", "audio/wav"))
+            ]
+            response = client.post(
+                "/api/transcribe/batch", files=files, data={"manifest": '["nightly/c.mp3"]'}
+            )
+            
+            assert response.status_code == 200
+            assert response.json()["items"][0]["job_id"] == "job1"
+            uploads, paths = mock_service.submit.call_args.args
+            assert [upload.filename for upload in uploads] == ["a.mp3", "b.wav"]
+            assert paths == ["nightly/c.mp3"]
+            mock_service.run.assert_not_called()
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_batch_wait_returns_results(self, client):
+        """Test that wait=true runs the batch with the requested concurrency"""
+        from app.api.routes.transcription import get_batch_service
+        from app.main import app
+        
+        mock_service = self.make_batch_service()
+        app.dependency_overrides[get_batch_service] = lambda: mock_service
+        
+        try:
+            response = client.post(
+                "/api/transcribe/batch",
+                params={"wait": "true", "concurrency": 2, "language": "he"},
+                data={"manifest": '{"paths": ["a.mp3"]}'}
+            )
+            
+            assert response.status_code == 200
+            assert response.json()["failed"] == 1
+            assert mock_service.run.call_args.kwargs["concurrency"] == 2
+            assert mock_service.run.call_args.kwargs["language"] == "he"
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_batch_invalid_manifest_is_400(self, client):
+        """Test that malformed manifests and validation errors surface as 400"""
+        from app.api.routes.transcription import get_batch_service
+        from app.main import app
+        
+        mock_service = self.make_batch_service()
+        mock_service.submit = AsyncMock(side_effect=ValueError("Batch is empty: send files or a manifest"))
+        app.dependency_overrides[get_batch_service] = lambda: mock_service
+        
+        try:
+            assert client.post("/api/transcribe/batch", data={"manifest": "not json"}).status_code == 400
+            response = client.post("/api/transcribe/batch", data={"manifest": "[]"})
+            assert response.status_code == 400
+            assert "Batch is empty" in response.json()["detail"]
+        finally:
+            app.dependency_overrides.clear()
+
 
+class TestMeetingRoutes:
+    """Tests for stored meeting API routes"""
+    
+    @pytest.fixture
+    def meeting_store(self, tmp_path):
+        from app.api.routes.meetings import get_meeting_store
+        from app.storage.meeting_store import MeetingStore
+        from app.main import app
+        
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        app.dependency_overrides[get_meeting_store] = lambda: store
+        yield store
+        app.dependency_overrides.clear()
+        store.close()
+    
+    def save_meeting(self, store, summary="Test summary", segments=None):
+        from app.models.schemas import TranscriptionResponse
+        return store.save(TranscriptionResponse(
+            transcription="Test transcription",
+            summary=summary,
+            participants=["Alice"],
+            decisions=["Decision 1"],
+            action_items=[ActionItem(task="Task 1", assignee="Alice")],
+            segments=segments
+        ), filename="standup.mp3", language="en")
+    
+    def test_get_meeting(self, client, meeting_store):
+        """Test fetching a stored meeting, and 404 for unknown ids"""
+        meeting = self.save_meeting(meeting_store)
+        
+        response = client.get(f"/api/meetings/{meeting['id']}")
+        
+        assert response.status_code == 200
+        assert response.json()["meeting_id"] == meeting["id"]
+        assert response.json()["filename"] == "standup.mp3"
+        assert response.json()["result"]["summary"] == "Test summary"
+        assert response.json()["result"]["meeting_id"] == meeting["id"]
+        assert client.get("/api/meetings/missing").status_code == 404
+    
+    def test_list_meetings_paginates(self, client, meeting_store):
+        """Test that next_cursor walks every meeting and bad cursors are 400"""
+        ids = {self.save_meeting(meeting_store, f"Meeting {i}")["id"] for i in range(5)}
+        
+        first = client.get("/api/meetings", params={"limit": 3}).json()
+        second = client.get("/api/meetings", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+        
+        assert len(first["items"]) == 3
+        assert second["next_cursor"] is None
+        assert {item["meeting_id"] for item in first["items"] + second["items"]} == ids
+        assert first["items"][0]["participants"] == ["Alice"]
+        assert first["items"][0]["action_item_count"] == 1
+        assert client.get("/api/meetings", params={"cursor": "garbage"}).status_code == 400
+        assert client.get("/api/meetings", params={"limit": 0}).status_code == 422
+    
+    def test_meeting_segments_page(self, client, meeting_store):
+        """Test paging through a meeting's segments"""
+        from app.models.schemas import Segment
+        segments = [Segment(start=float(i), end=i + 1.0, text=f"w{i}") for i in range(5)]
+        meeting = self.save_meeting(meeting_store, segments=segments)
+        
+        page = client.get(f"/api/meetings/{meeting['id']}/segments", params={"limit": 3}).json()
+        last = client.get(f"/api/meetings/{meeting['id']}/segments", params={"offset": page["next_offset"]}).json()
+        
+        assert [item["text"] for item in page["items"]] == ["w0", "w1", "w2"]
+        assert page["total"] == 5
+        assert [item["text"] for item in last["items"]] == ["w3", "w4"]
+        assert last["next_offset"] is None
+        plain = self.save_meeting(meeting_store)
+        assert client.get(f"/api/meetings/{plain['id']}/segments").status_code == 404
+    
+    def test_export_meeting_by_id(self, client, meeting_store):
+        """Test that a stored meeting exports without posting the transcript back"""
+        from app.services.word_export_service import WordExportService
+        from app.main import app
+        
+        meeting = self.save_meeting(meeting_store)
+        mock_service = Mock(spec=WordExportService)
+        mock_service.create_document = Mock(return_value=BytesIO(b'fake docx content'))
+        app.dependency_overrides[get_word_export_service] = lambda: mock_service
+        
+        response = client.get(f"/api/meetings/{meeting['id']}/export")
+        
+        assert response.status_code == 200
+        assert response.content == b'fake docx content'
+        assert 'filename="standup.docx"' in response.headers["content-disposition"]
+        assert mock_service.create_document.call_args.kwargs["transcription"] == "Test transcription"
+        assert client.get("/api/meetings/missing/export").status_code == 404
+    
+    def test_export_meeting_with_hebrew_filename(self, client, meeting_store):
+        """Test that non-Latin upload names survive into Content-Disposition"""
+        from app.models.schemas import TranscriptionResponse
+        from app.services.word_export_service import WordExportService
+        from app.main import app
+        
+        meeting = meeting_store.save(TranscriptionResponse(
+            transcription="שלום", summary="", participants=[], decisions=[], action_items=[]
+        ), filename='פגישה "שבועית".mp3', language="he")
+        mock_service = Mock(spec=WordExportService)
+        mock_service.create_document = Mock(return_value=BytesIO(b'fake docx content'))
+        app.dependency_overrides[get_word_export_service] = lambda: mock_service
+        
+        docx = client.get(f"/api/meetings/{meeting['id']}/export")
+        markdown = client.get(f"/api/meetings/{meeting['id']}/export", params={"format": "markdown"})
+        
+        assert docx.status_code == 200 and markdown.status_code == 200
+        encoded = "%D7%A4%D7%92%D7%99%D7%A9%D7%94%20%D7%A9%D7%91%D7%95%D7%A2%D7%99%D7%AA"
+        assert docx.headers["content-disposition"] == (
+            f"attachment; filename=\"_____ ______.docx\"; filename*=UTF-8''{encoded}.docx"
+        )
+        assert markdown.headers["content-disposition"].endswith(f"filename*=UTF-8''{encoded}.md")
+    
+    def test_export_meeting_as_subtitles(self, client, meeting_store):
+        """Test that stored segments' timestamps are used for subtitle exports"""
+        from app.models.schemas import Segment
+        segments = [Segment(start=0.0, end=1.5, text="Hello"), Segment(start=61.25, end=63.0, text="Bye")]
+        meeting = self.save_meeting(meeting_store, segments=segments)
+        
+        response = client.get(f"/api/meetings/{meeting['id']}/export", params={"format": "vtt"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/vtt")
+        assert 'filename="standup.vtt"' in response.headers["content-disposition"]
+        assert response.text == (
+            "WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello\n\n00:01:01.250 --> 00:01:03.000\nBye\n\n"
+        )
+        assert client.get(f"/api/meetings/{meeting['id']}/export", params={"format": "pdf"}).status_code == 400
+        assert client.get("/api/meetings/missing/export", params={"format": "vtt"}).status_code == 404
+    
+    def test_reanalyze_meeting(self, client, meeting_store):
+        """Test re-analysis of an edited transcript and its error mapping"""
+        from app.main import app
+        from app.models.schemas import TranscriptionResponse
+        from app.utils.rate_limiter import RateLimitExceededError
+        
+        meeting = self.save_meeting(meeting_store)
+        service = Mock()
+        service.meeting_store = meeting_store
+        service.reanalyze_meeting = AsyncMock(return_value=(TranscriptionResponse(
+            transcription="Edited transcription",
+            summary="Edited summary",
+            participants=["Alice"],
+            decisions=[],
+            action_items=[],
+            meeting_id=meeting["id"]
+        ), 1, 3))
+        app.dependency_overrides[get_transcription_service] = lambda: service
+        url = f"/api/meetings/{meeting['id']}/reanalyze"
+        
+        response = client.post(url, json={"transcription": "Edited transcription"}, params={"analysis_backend": "local"})
+        
+        assert response.status_code == 200
+        assert response.json()["meeting_id"] == meeting["id"]
+        assert response.json()["result"]["summary"] == "Edited summary"
+        assert (response.json()["reanalyzed_segments"], response.json()["total_segments"]) == (1, 3)
+        service.reanalyze_meeting.assert_called_once_with(meeting["id"], "Edited transcription", "local")
+        
+        service.reanalyze_meeting = AsyncMock(return_value=None)
+        assert client.post("/api/meetings/missing/reanalyze", json={"transcription": "x"}).status_code == 404
+        service.reanalyze_meeting = AsyncMock(side_effect=ValueError("Transcription is empty"))
+        assert client.post(url, json={"transcription": " "}).status_code == 400
+        service.reanalyze_meeting = AsyncMock(side_effect=RateLimitExceededError("Rate limited", 7))
+        response = client.post(url, json={"transcription": "x"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        service.meeting_store = None
+        assert client.post(url, json={"transcription": "x"}).status_code == 503
+    
+    def test_delete_meeting(self, client, meeting_store):
+        """Test deleting a meeting"""
+        meeting = self.save_meeting(meeting_store)
+        
+        assert client.delete(f"/api/meetings/{meeting['id']}").status_code == 204
+        assert client.get(f"/api/meetings/{meeting['id']}").status_code == 404
+        assert client.delete(f"/api/meetings/{meeting['id']}").status_code == 404
+    
+    def test_search_meetings(self, client, meeting_store):
+        """Test ranked, paginated search with snippets"""
+        for i in range(3):
+            self.save_meeting(meeting_store, f"Budget review {i}")
+        self.save_meeting(meeting_store, "Hiring plan")
+        
+        first = client.get("/api/search", params={"q": "budget", "limit": 2}).json()
+        last = client.get("/api/search", params={"q": "budget", "limit": 2, "offset": first["next_offset"]}).json()
+        
+        assert first["total"] == 3
+        assert len(first["items"]) == 2
+        assert "<mark>Budget</mark>" in first["items"][0]["snippet"]
+        assert first["items"][0]["score"] >= first["items"][1]["score"]
+        assert len(last["items"]) == 1
+        assert last["next_offset"] is None
+        assert client.get("/api/search", params={"q": ";;"}).status_code == 400
+        assert client.get("/api/search").status_code == 422
+    
+    def test_meeting_store_disabled(self, client):
+        """Test that meeting routes report a disabled store as 503"""
+        from app.api.routes.meetings import get_meeting_store
+        from app.main import app
+        
+        app.dependency_overrides[get_meeting_store] = lambda: None
+        try:
+            assert client.get("/api/meetings").status_code == 503
+        finally:
+            app.dependency_overrides.clear()
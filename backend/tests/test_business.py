@@ -1,10 +1,25 @@
 """Tests for business logic layer"""
+import asyncio
+import json
 import pytest
 import os
 from unittest.mock import Mock, patch, AsyncMock
 
 from app.business.transcription_service import TranscriptionBusinessService
-from app.models.schemas import ActionItem
+from app.business.service_registry import ServiceRegistry
+from app.business.job_service import TranscriptionJobService
+from app.business.batch_service import BatchTranscriptionService, parse_manifest
+from app.business.analysis_router import AnalysisRouter, PRIORITY_BATCH
+from app.storage.job_store import JobStore
+from app.models.schemas import TranscriptionResponse
+from app.services.audio_chunker import AudioChunker
+from app.services.audio_preprocessor import AudioPreprocessor
+from app.services.voice_activity import VoiceActivityDetector
+from app.services.transcription_backend import TranscriptionBackend
+from app.services.analysis_backend import AnalysisBackend
+from tests.test_services import write_second_marker_wav, fake_transcribe_wav, write_tone_wav, synthetic_speech
+from app.models.schemas import ActionItem, Segment
+from app.models.transcript import TranscriptSegment
 
 
 class TestTranscriptionBusinessService:
@@ -17,6 +32,15 @@ class TestTranscriptionBusinessService:
         assert service.whisper_service is not None
         assert service.groq_service is not None
     
+    def test_init_with_injected_services(self, mock_whisper_service, mock_groq_service):
+        """Test that shared services are used instead of building new clients"""
+        service = TranscriptionBusinessService(
+            whisper_service=mock_whisper_service,
+            groq_service=mock_groq_service
+        )
+        assert service.whisper_service is mock_whisper_service
+        assert service.groq_service is mock_groq_service
+    
     @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
     @pytest.mark.asyncio
     async def test_process_audio_file_success(self, mock_upload_file):
@@ -81,7 +105,7 @@ class TestTranscriptionBusinessService:
         
         mock_file = Mock()
         mock_file.filename = "test.mp3"
-        mock_file.read = AsyncMock(return_value=b'fake audio')
+        mock_file.read = AsyncMock(side_effect=[b'fake audio', b''])
         
         service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
         service.groq_service.analyze_transcription = AsyncMock(return_value={
@@ -102,7 +126,7 @@ class TestTranscriptionBusinessService:
         
         mock_file = Mock()
         mock_file.filename = "test.wav"
-        mock_file.read = AsyncMock(return_value=b'fake audio')
+        mock_file.read = AsyncMock(side_effect=[b'fake audio', b''])
         
         service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
         service.groq_service.analyze_transcription = AsyncMock(return_value={
@@ -170,4 +194,1454 @@ class TestTranscriptionBusinessService:
         # Verify temp file was cleaned up
         import os
         assert not os.path.exists(temp_file_path)
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_process_audio_file_streams_in_chunks(self):
+        """Test that uploads are copied to disk chunk by chunk"""
+        from app.business.transcription_service import UPLOAD_CHUNK_SIZE
+        
+        service = TranscriptionBusinessService()
+        chunks = [b'a' * UPLOAD_CHUNK_SIZE, b'b' * UPLOAD_CHUNK_SIZE, b'c' * 10, b'']
+        
+        mock_file = Mock()
+        mock_file.filename = "test.wav"
+        mock_file.read = AsyncMock(side_effect=chunks)
+        
+        saved_content = None
+        
+        async def mock_transcribe(file_path, language=None):
+            nonlocal saved_content
+            with open(file_path, 'rb') as f:
+                saved_content = f.read()
+            return "Transcription"
+        
+        service.whisper_service.transcribe_audio = mock_transcribe
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": [],
+            "decisions": [],
+            "action_items": []
+        })
+        
+        await service.process_audio_file(mock_file)
+        
+        assert saved_content == b''.join(chunks)
+        # Never asks for the whole file at once
+        for call in mock_file.read.call_args_list:
+            assert call.args == (UPLOAD_CHUNK_SIZE,)
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key", "MAX_UPLOAD_SIZE_MB": "1"})
+    @pytest.mark.asyncio
+    async def test_process_audio_file_too_large(self):
+        """Test that the size limit is enforced while streaming"""
+        from app.business.transcription_service import FileTooLargeError, UPLOAD_CHUNK_SIZE
+        
+        service = TranscriptionBusinessService()
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
+        
+        mock_file = Mock()
+        mock_file.filename = "test.mp3"
+        # Would never reach EOF - the limit must stop the read loop
+        mock_file.read = AsyncMock(return_value=b'a' * UPLOAD_CHUNK_SIZE)
+        
+        with pytest.raises(FileTooLargeError, match="File too large"):
+            await service.process_audio_file(mock_file)
+        
+        assert mock_file.read.call_count == 2
+        service.whisper_service.transcribe_audio.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_save_upload_writes_off_the_event_loop(self):
+        """Test that upload chunks are hashed and written on the executor, in order"""
+        import hashlib
+        import io
+        import threading
+        
+        service = TranscriptionBusinessService()
+        chunks = [b'a' * 10, b'b' * 10, b'c' * 5]
+        mock_file = Mock()
+        mock_file.read = AsyncMock(side_effect=chunks + [b''])
+        writer_threads = set()
+        
+        class Destination(io.BytesIO):
+            def write(self, data):
+                writer_threads.add(threading.get_ident())
+                return super().write(data)
+        
+        destination = Destination()
+        hasher = hashlib.sha256()
+        
+        assert await service._save_upload(mock_file, destination, hasher) == 25
+        assert destination.getvalue() == b''.join(chunks)
+        assert hasher.hexdigest() == hashlib.sha256(b''.join(chunks)).hexdigest()
+        assert threading.get_ident() not in writer_threads
+
+
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_process_long_audio_transcribes_chunks_in_parallel(self, tmp_path):
+        """Test that long recordings are chunked, transcribed concurrently and stitched"""
+        import asyncio
+        import time
+        
+        audio_path = str(tmp_path / "meeting.wav")
+        write_second_marker_wav(audio_path, 120)
+        with open(audio_path, "rb") as f:
+            audio_bytes = f.read()
+        
+        service = TranscriptionBusinessService(
+            audio_chunker=AudioChunker(chunk_seconds=30, overlap_seconds=5)
+        )
+        chunk_calls = 0
+        
+        async def fake_transcribe(file_path, language=None):
+            nonlocal chunk_calls
+            chunk_calls += 1
+            await asyncio.sleep(0.2)
+            return fake_transcribe_wav(file_path)
+        
+        service.whisper_service.transcribe_audio = fake_transcribe
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": [],
+            "decisions": [],
+            "action_items": []
+        })
+        
+        mock_file = Mock()
+        mock_file.filename = "meeting.wav"
+        mock_file.read = AsyncMock(side_effect=[audio_bytes, b''])
+        
+        start = time.perf_counter()
+        result = await service.process_audio_file(mock_file)
+        elapsed = time.perf_counter() - start
+        
+        assert chunk_calls == 5
+        assert result.transcription == fake_transcribe_wav(audio_path)
+        assert elapsed < chunk_calls * 0.2 / 2  # Serial would take 1.0s
+
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_process_audio_file_result_cache(self, tmp_path):
+        """Test that re-uploading the same audio is served from the cache"""
+        import time
+        from app.storage.result_cache import ResultCache
+        
+        service = TranscriptionBusinessService(result_cache=ResultCache(db_path=str(tmp_path / "cache.db")))
+        # Cached results keep their segments, so the audio is transcribed with timing
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, 1.0, "Transcription")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": [],
+            "action_items": []
+        })
+        
+        def upload(content):
+            mock_file = Mock()
+            mock_file.filename = "meeting.mp3"
+            mock_file.read = AsyncMock(side_effect=[content, b''])
+            return mock_file
+        
+        first = await service.process_audio_file(upload(b'same audio'))
+        start = time.perf_counter()
+        second = await service.process_audio_file(upload(b'same audio'))
+        hit_elapsed = time.perf_counter() - start
+        
+        assert first.timings is not None
+        assert second == first.model_copy(update={"timings": None})  # Timings belong to the original run
+        assert hit_elapsed < 0.1
+        service.whisper_service.transcribe_segments.assert_called_once()
+        service.groq_service.analyze_transcription.assert_called_once()
+        
+        # Different audio or language is a miss
+        await service.process_audio_file(upload(b'other audio'))
+        await service.process_audio_file(upload(b'same audio'), language="he")
+        assert service.whisper_service.transcribe_segments.call_count == 3
+        assert service.result_cache.stats()["hits"] == 1
+        assert service.result_cache.stats()["misses"] == 3
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_result_cache_misses_after_prompt_or_settings_change(self, tmp_path, sample_audio_file):
+        """Test that editing a prompt or the audio settings stops serving earlier results"""
+        from app.prompts.loader import prompt_loader
+        from app.storage.result_cache import ResultCache
+        
+        service = TranscriptionBusinessService(result_cache=ResultCache(db_path=str(tmp_path / "cache.db")))
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, 1.0, "Transcription")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary", "participants": [], "decisions": [], "action_items": []
+        })
+        
+        await service.process_audio_path(sample_audio_file, content_hash="same")
+        await service.process_audio_path(sample_audio_file, content_hash="same")
+        assert service.groq_service.analyze_transcription.call_count == 1
+        
+        versions = {"meeting_analysis": "edited", "meeting_reduce": prompt_loader.version("meeting_reduce")}
+        with patch.object(prompt_loader, "version", side_effect=versions.get):
+            await service.process_audio_path(sample_audio_file, content_hash="same")
+        assert service.groq_service.analyze_transcription.call_count == 2
+        
+        service.audio_chunker.overlap_seconds += 1
+        await service.process_audio_path(sample_audio_file, content_hash="same")
+        service.audio_preprocessor.enabled = not service.audio_preprocessor.enabled
+        key_with_preprocessing = service._result_key("same", None, service.whisper_service, service.groq_service)
+        service.audio_preprocessor.enabled = not service.audio_preprocessor.enabled
+        assert key_with_preprocessing != service._result_key("same", None, service.whisper_service, service.groq_service)
+        assert service.groq_service.analyze_transcription.call_count == 3
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_processed_meetings_are_stored(self, tmp_path, mock_upload_file, sample_audio_file):
+        """Test that every processed upload is saved with its segments and returned with its meeting_id"""
+        from app.storage.meeting_store import MeetingStore
+        from app.storage.result_cache import ResultCache
+        
+        service = TranscriptionBusinessService(
+            result_cache=ResultCache(db_path=str(tmp_path / "cache.db")),
+            meeting_store=MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        )
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, 1.0, "Trans"), TranscriptSegment(1.0, 2.0, "cription")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": [],
+            "action_items": [{"task": "Send notes", "assignee": "Alice"}]
+        })
+        
+        first = await service.process_audio_file(mock_upload_file, language="en")
+        second = await service.process_audio_path(sample_audio_file, content_hash="same", filename="again.mp3")
+        third = await service.process_audio_path(sample_audio_file, content_hash="same", filename="again.mp3")
+        
+        stored = service.meeting_store.get(first.meeting_id)
+        assert stored["filename"] == mock_upload_file.filename
+        assert stored["language"] == "en"
+        assert stored["result"].action_items == first.action_items
+        # Segments are stored even though the request did not ask for them
+        assert first.segments is None
+        assert [segment.text for segment in stored["result"].segments] == ["Trans", "cription"]
+        # A cache hit returns the meeting saved for that audio instead of a copy
+        assert third.meeting_id == second.meeting_id != first.meeting_id
+        assert service.meeting_store.count() == 2
+        assert service.result_cache.stats()["hits"] == 1
+        # Each meeting is searchable as soon as it is returned
+        assert service.meeting_store.search("Send notes")[1] == 2
+        
+        # Once that meeting is deleted, the next hit stores the cached result again, segments included
+        service.meeting_store.delete(second.meeting_id)
+        fourth = await service.process_audio_path(sample_audio_file, content_hash="same", with_segments=True)
+        fifth = await service.process_audio_path(sample_audio_file, content_hash="same")
+        assert fourth.meeting_id not in {first.meeting_id, second.meeting_id}
+        assert fifth.meeting_id == fourth.meeting_id
+        assert [segment.text for segment in fourth.segments] == ["Trans", "cription"]
+        assert service.meeting_store.get(fourth.meeting_id)["result"].segments == fourth.segments
+        assert service.whisper_service.transcribe_segments.call_count == 2
+    
+    @patch.dict(os.environ, {
+        "OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key",
+        "ANALYSIS_SINGLE_SHOT_MAX_TOKENS": "50", "ANALYSIS_SEGMENT_TOKENS": "40"
+    })
+    @pytest.mark.asyncio
+    async def test_reanalyze_meeting_maps_only_edited_segments(self, tmp_path, sample_audio_file):
+        """Test that a transcript edit re-runs the map step for the touched segment and the reduce only"""
+        from app.storage.meeting_store import MeetingStore
+        
+        transcript = (
+            "Alice opened the meeting and reviewed the roadmap for the quarter. "
+            "Bob agreed to ship the release on Friday after the final review. "
+            "Carol will update the customer documentation before the launch date."
+        )
+        service = TranscriptionBusinessService(meeting_store=MeetingStore(db_path=str(tmp_path / "meetings.db")))
+        service.whisper_service.transcribe_segments = AsyncMock(return_value=[TranscriptSegment(0.0, None, transcript)])
+        
+        def fake_create(**kwargs):
+            user_prompt = kwargs["messages"][1]["content"]
+            if "PARTIAL SUMMARIES" in user_prompt:
+                payload = {"summary": "Merged summary"}
+            else:
+                name = user_prompt.split("):\n")[1].split()[0]
+                payload = {"summary": f"{name} spoke.", "participants": [name]}
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(payload)
+            return response
+        
+        client = service.groq_service.client
+        with patch.object(client.chat.completions, 'create', side_effect=fake_create) as mock_create:
+            processed = await service.process_audio_path(sample_audio_file, filename="planning.mp3")
+            segment_count = len(service.meeting_store.parts(processed.meeting_id))
+            assert segment_count > 1
+            assert mock_create.call_count == segment_count + 1
+            mock_create.reset_mock()
+            
+            edited = transcript.replace("Bob agreed", "Rob agreed")
+            result, reanalyzed, total = await service.reanalyze_meeting(processed.meeting_id, edited)
+        
+        assert (reanalyzed, total) == (1, segment_count)
+        assert mock_create.call_count == 2  # The edited segment + the reduce
+        assert "Rob agreed" in mock_create.call_args_list[0].kwargs["messages"][1]["content"]
+        assert "Rob" in result.participants and "Bob" not in result.participants
+        assert result.meeting_id == processed.meeting_id
+        
+        stored = service.meeting_store.get(processed.meeting_id)
+        assert stored["filename"] == "planning.mp3"
+        assert stored["result"].transcription == edited
+        assert stored["result"].participants == result.participants
+        assert service.meeting_store.search("Rob")[1] == 1
+        assert await service.reanalyze_meeting("missing", edited) is None
+        with pytest.raises(ValueError):
+            await service.reanalyze_meeting(processed.meeting_id, "  ")
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_reanalyze_meeting_updates_timed_segments(self, tmp_path):
+        """Test that timed segments take the edited words, and unchanged ones are left alone"""
+        from app.storage.meeting_store import MeetingStore
+        
+        service = TranscriptionBusinessService(meeting_store=MeetingStore(db_path=str(tmp_path / "meetings.db")))
+        meeting = service.meeting_store.save(TranscriptionResponse(
+            transcription="Hello Bob. We ship Friday.",
+            summary="Summary",
+            participants=["Bob"],
+            decisions=[],
+            action_items=[],
+            segments=[
+                Segment(start=0.0, end=1.0, text=" Hello Bob.", confidence=0.9),
+                Segment(start=1.0, end=2.0, text=" We ship Friday.")
+            ]
+        ))
+        service.groq_service.reanalyze_parts = AsyncMock(return_value=(
+            {"summary": "Edited", "participants": ["Rob"], "decisions": [], "action_items": []},
+            [{"text": "Hello Rob. We ship Friday.", "analysis": {"summary": "Edited"}}]
+        ))
+        
+        result, reanalyzed, total = await service.reanalyze_meeting(meeting["id"], "Hello Rob. We ship Friday.")
+        
+        texts, previous = service.groq_service.reanalyze_parts.call_args.args[:2]
+        assert texts == ["Hello Rob. We ship Friday."] and previous == [None]  # No stored parts: split afresh
+        assert (reanalyzed, total) == (1, 1)
+        assert [segment.text for segment in result.segments] == ["Hello Rob.", " We ship Friday."]
+        assert result.segments[0].confidence == 0.9
+        assert service.meeting_store.parts(meeting["id"])[0]["text"] == "Hello Rob. We ship Friday."
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_reanalyze_meeting_keeps_to_one_model(self, tmp_path):
+        """Test that stored analyses are reused only by the backend and model that produced them"""
+        from app.storage.meeting_store import MeetingStore
+        
+        hosted, local = FakeAnalysisBackend("groq"), FakeAnalysisBackend("local")
+        service = TranscriptionBusinessService(
+            groq_service=hosted, analysis_backends={"local": local},
+            meeting_store=MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        )
+        analysis = {"summary": "Edited", "participants": [], "decisions": [], "action_items": []}
+        for backend in (hosted, local):
+            backend.reanalyze_parts = AsyncMock(return_value=(analysis, []))
+        
+        def save_meeting():
+            return service.meeting_store.save(
+                TranscriptionResponse(
+                    transcription="Hello Bob. We ship Friday.", summary="Summary",
+                    participants=["Bob"], decisions=[], action_items=[]
+                ),
+                parts=[
+                    {"text": "Hello Bob.", "analysis": {"summary": "Bob"}, "analyzer": "local", "model": "fake-local"},
+                    {"text": "We ship Friday.", "analysis": {"summary": "Ship"}, "analyzer": "local", "model": "fake-local"}
+                ]
+            )["id"]
+        
+        # Routing would pick the hosted backend; the meeting's own backend is used instead
+        await service.reanalyze_meeting(save_meeting(), "Hello Rob. We ship Friday.")
+        hosted.reanalyze_parts.assert_not_called()
+        assert local.reanalyze_parts.call_args.args[1] == [None, {"summary": "Ship"}]
+        
+        # An explicit other backend re-analyzes everything
+        await service.reanalyze_meeting(save_meeting(), "Hello Rob. We ship Friday.", analysis_backend="groq")
+        assert hosted.reanalyze_parts.call_args.args[1] == [None]  # Split afresh, nothing reused
+        
+        # So does the same backend once its model has changed
+        local.model = "fake-local-v2"
+        await service.reanalyze_meeting(save_meeting(), "Hello Rob. We ship Friday.")
+        assert local.reanalyze_parts.call_args.args[1] == [None]
+
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_stream_audio_path_emits_stage_events(self, tmp_path):
+        """Test that streaming yields per-chunk text before the final result"""
+        audio_path = str(tmp_path / "meeting.wav")
+        write_second_marker_wav(audio_path, 60)
+        expected_transcript = fake_transcribe_wav(audio_path)
+        
+        service = TranscriptionBusinessService(
+            audio_chunker=AudioChunker(chunk_seconds=25, overlap_seconds=5)
+        )
+        service.whisper_service.transcribe_audio = AsyncMock(side_effect=lambda path, language=None: fake_transcribe_wav(path))
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": ["Decision 1"],
+            "action_items": [{"task": "Task 1", "assignee": "Alice", "deadline": None}]
+        })
+        
+        events = [event async for event in service.stream_audio_path(audio_path)]
+        names = [name for name, _ in events]
+        
+        assert names[0] == "upload_received"
+        assert names.count("chunk_transcribed") == 3
+        assert names.index("transcription_complete") > max(i for i, n in enumerate(names) if n == "chunk_transcribed")
+        assert names.index("analysis_started") < names.index("section")
+        assert [data["name"] for name, data in events if name == "section"] == [
+            "summary", "participants", "decisions", "action_items"
+        ]
+        assert names[-1] == "result"
+        assert events[-1][1]["transcription"] == expected_transcript
+        assert not os.path.exists(audio_path)  # Saved upload removed
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_stream_audio_path_reports_errors(self, sample_audio_file):
+        """Test that pipeline failures end the stream with an error event"""
+        service = TranscriptionBusinessService()
+        service.whisper_service.transcribe_audio = AsyncMock(side_effect=Exception("Whisper API error"))
+        
+        events = [event async for event in service.stream_audio_path(sample_audio_file)]
+        
+        assert events[-1][0] == "error"
+        assert "Whisper API error" in events[-1][1]["detail"]
+
+
+
+class FakeLocalBackend(TranscriptionBackend):
+    """In-process transcription backend for selection tests"""
+    
+    name = "local"
+    model = "fake-local"
+    max_concurrency = 2
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def transcribe_audio(self, audio_file_path, language=None):
+        self.calls.append(audio_file_path)
+        return "Local transcription"
+
+
+class TestTranscriptionBackends:
+    """Tests for choosing a transcription backend"""
+    
+    ANALYSIS = {"summary": "Summary", "participants": [], "decisions": [], "action_items": []}
+    
+    def make_service(self, **kwargs):
+        local = FakeLocalBackend()
+        service = TranscriptionBusinessService(transcription_backends={"local": local}, **kwargs)
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Cloud transcription")
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, None, "Cloud transcription")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value=self.ANALYSIS)
+        return service, local
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_backend_selected_per_request(self, mock_upload_file):
+        """Test that a request can pick the local backend"""
+        service, local = self.make_service()
+        
+        result = await service.process_audio_file(mock_upload_file, backend="local")
+        
+        assert result.transcription == "Local transcription"
+        assert len(local.calls) == 1
+        service.whisper_service.transcribe_audio.assert_not_called()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key", "TRANSCRIPTION_BACKEND": "local"})
+    @pytest.mark.asyncio
+    async def test_default_backend_from_environment(self, sample_audio_file):
+        """Test that TRANSCRIPTION_BACKEND picks the backend when the request does not"""
+        service, local = self.make_service()
+        
+        assert (await service.process_audio_path(sample_audio_file)).transcription == "Local transcription"
+        assert (await service.process_audio_path(sample_audio_file, backend="openai")).transcription == "Cloud transcription"
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_unknown_backend_rejected_before_upload(self, mock_upload_file):
+        """Test that an unknown backend is a ValueError and nothing is saved"""
+        service, _ = self.make_service()
+        service.ingest_upload = AsyncMock()
+        
+        with pytest.raises(ValueError, match="Unknown transcription backend: gpu. Available: local, openai"):
+            await service.process_audio_file(mock_upload_file, backend="gpu")
+        service.ingest_upload.assert_not_called()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_cache_key_includes_backend_model(self, tmp_path, sample_audio_file):
+        """Test that results from different backends are cached separately"""
+        from app.storage.result_cache import ResultCache
+        service, local = self.make_service(result_cache=ResultCache(db_path=str(tmp_path / "cache.db")))
+        
+        cloud = await service.process_audio_path(sample_audio_file, content_hash="same", backend="openai")
+        local_result = await service.process_audio_path(sample_audio_file, content_hash="same", backend="local")
+        
+        assert cloud.transcription == "Cloud transcription"
+        assert local_result.transcription == "Local transcription"
+
+
+class FakeAnalysisBackend(AnalysisBackend):
+    """In-process analysis backend for routing tests"""
+    
+    def __init__(self, name, max_concurrency=2, summary="Summary"):
+        self.name = name
+        self.model = f"fake-{name}"
+        self.max_concurrency = max_concurrency
+        self.single_shot_max_tokens = 12000
+        self.segment_tokens = 6000
+        self.analyze_transcription = AsyncMock(return_value={
+            "summary": summary, "participants": [], "decisions": [], "action_items": []
+        })
+
+
+class TestAnalysisRouting:
+    """Tests for routing analysis between the hosted and local backends"""
+    
+    def make_router(self):
+        hosted, local = FakeAnalysisBackend("groq"), FakeAnalysisBackend("local")
+        return AnalysisRouter({"groq": hosted, "local": local}, hosted="groq"), hosted, local
+    
+    def test_interactive_stays_on_hosted_backend(self):
+        """Test that interactive requests use the hosted model while it has capacity"""
+        router, hosted, _ = self.make_router()
+        assert router.select(tokens=100) is hosted
+    
+    def test_interactive_spills_small_transcripts_to_local(self):
+        """Test that only small transcripts move to local when the hosted backend is saturated"""
+        router, hosted, local = self.make_router()
+        hosted.in_flight = 2
+        
+        assert router.select(tokens=100) is local
+        assert router.select(tokens=router.local_max_tokens + 1) is hosted
+        # Size unknown (pipelined analysis) - stay on the fast model
+        assert router.select() is hosted
+    
+    def test_batch_prefers_local_until_saturated(self):
+        """Test that batch work runs locally and overflows to hosted when local is busy"""
+        router, hosted, local = self.make_router()
+        assert router.select(priority=PRIORITY_BATCH, tokens=50000) is local
+        
+        local.in_flight = 2
+        assert router.select(priority=PRIORITY_BATCH) is hosted
+    
+    def test_explicit_backend_and_unknown_name(self):
+        """Test that a named backend bypasses routing and unknown names are a ValueError"""
+        router, hosted, local = self.make_router()
+        local.in_flight = 10
+        assert router.select("local") is local
+        
+        with pytest.raises(ValueError, match="Unknown analysis backend: gpu. Available: groq, local"):
+            router.select("gpu")
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    def test_without_local_backend_everything_is_hosted(self):
+        """Test that routing is a no-op when only the hosted backend exists"""
+        hosted = FakeAnalysisBackend("groq")
+        router = AnalysisRouter({"groq": hosted}, hosted="groq")
+        assert router.select(priority=PRIORITY_BATCH) is hosted
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_batch_priority_analyzes_locally_and_caches_per_model(self, tmp_path, sample_audio_file):
+        """Test that batch requests run on the local backend and later requests reuse the result"""
+        from app.storage.result_cache import ResultCache
+        hosted, local = FakeAnalysisBackend("groq", summary="Hosted"), FakeAnalysisBackend("local", summary="Local")
+        service = TranscriptionBusinessService(
+            groq_service=hosted,
+            analysis_backends={"local": local},
+            result_cache=ResultCache(db_path=str(tmp_path / "cache.db"))
+        )
+        service.whisper_service.transcribe_segments = AsyncMock(return_value=[TranscriptSegment(0.0, None, "Transcript")])
+        
+        batch = await service.process_audio_path(sample_audio_file, content_hash="h", priority=PRIORITY_BATCH)
+        interactive = await service.process_audio_path(sample_audio_file, content_hash="h")
+        hosted_only = await service.process_audio_path(sample_audio_file, content_hash="h", analysis_backend="groq")
+        
+        assert batch.summary == "Local"
+        # Routed requests accept the result whichever backend produced it
+        assert interactive.summary == "Local"
+        assert hosted_only.summary == "Hosted"
+        assert local.analyze_transcription.call_count == 1
+        assert hosted.analyze_transcription.call_count == 1
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_pinned_backend_ignores_other_backends_cached_results(self, tmp_path, sample_audio_file):
+        """Test that with ANALYSIS_BACKEND set, results cached from another backend are not served"""
+        from app.storage.result_cache import ResultCache
+        hosted, local = FakeAnalysisBackend("groq", summary="Hosted"), FakeAnalysisBackend("local", summary="Local")
+        service = TranscriptionBusinessService(
+            groq_service=hosted,
+            analysis_backends={"local": local},
+            result_cache=ResultCache(db_path=str(tmp_path / "cache.db"))
+        )
+        service.whisper_service.transcribe_segments = AsyncMock(return_value=[TranscriptSegment(0.0, None, "Transcript")])
+        
+        hosted_result = await service.process_audio_path(sample_audio_file, content_hash="h", analysis_backend="groq")
+        service.analysis_router.default_backend = "local"
+        pinned = await service.process_audio_path(sample_audio_file, content_hash="h")
+        
+        assert hosted_result.summary == "Hosted"
+        assert pinned.summary == "Local"
+        assert local.analyze_transcription.call_count == 1
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_unknown_analysis_backend_rejected_before_upload(self, mock_upload_file):
+        """Test that an unknown analysis backend is a ValueError and nothing is saved"""
+        service = TranscriptionBusinessService()
+        service.ingest_upload = AsyncMock()
+        
+        with pytest.raises(ValueError, match="Unknown analysis backend: local"):
+            await service.process_audio_file(mock_upload_file, analysis_backend="local")
+        service.ingest_upload.assert_not_called()
+
+
+def make_preprocessing_service(chunk_seconds=600):
+    """Service with WAV preprocessing enabled, recording the files sent for transcription"""
+    preprocessor = AudioPreprocessor(codec="wav", pad_seconds=0)
+    preprocessor.enabled = True
+    service = TranscriptionBusinessService(
+        audio_chunker=AudioChunker(chunk_seconds=chunk_seconds, overlap_seconds=0),
+        audio_preprocessor=preprocessor
+    )
+    service.pipeline_enabled = False
+    uploads = []
+    
+    async def transcribe(file_path, language=None):
+        import wave
+        with wave.open(file_path, "rb") as wav:
+            uploads.append((wav.getnchannels(), wav.getframerate(), wav.getnframes()))
+        return "Transcription"
+    
+    service.whisper_service.transcribe_audio = AsyncMock(side_effect=transcribe)
+    service.groq_service.analyze_transcription = AsyncMock(return_value={
+        "summary": "Summary",
+        "participants": [],
+        "decisions": [],
+        "action_items": []
+    })
+    return service, uploads
+
+
+class TestAudioPreprocessingStage:
+    """Tests for preprocessing audio before transcription"""
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_preprocessed_upload_reports_bytes_saved(self, tmp_path):
+        """Test that a trimmed 16 kHz mono file is sent and the savings are reported"""
+        audio_path = str(tmp_path / "meeting.wav")
+        write_tone_wav(audio_path, [(2, 0, 0), (3, 300, 0.5), (1, 0, 0)])
+        service, uploads = make_preprocessing_service()
+        events = []
+        
+        async def on_progress(event, data):
+            events.append((event, data))
+        
+        result = await service.process_audio_path(audio_path, on_progress=on_progress)
+        
+        assert uploads == [(1, 16000, 48000)]
+        report = result.preprocessing
+        assert report.codec == "wav"
+        assert report.original_bytes == os.path.getsize(audio_path)
+        assert report.uploaded_bytes == 48000 * 2 + 44
+        assert report.bytes_saved == report.original_bytes - report.uploaded_bytes
+        assert report.original_seconds == pytest.approx(6)
+        assert report.skipped_seconds == pytest.approx(3)
+        assert ("audio_preprocessed", report.model_dump()) in events
+        assert result.timings.preprocessing_seconds > 0
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_chunks_keep_original_timeline(self, tmp_path):
+        """Test that chunk times include the trimmed leading silence"""
+        audio_path = str(tmp_path / "meeting.wav")
+        write_tone_wav(audio_path, [(5, 0, 0), (20, 300, 0.5)], frame_rate=16000, channels=1)
+        service, uploads = make_preprocessing_service(chunk_seconds=8)
+        starts = []
+        
+        async def on_progress(event, data):
+            if event == "chunk_transcribed":
+                starts.append(data["start"])
+        
+        await service.process_audio_path(audio_path, on_progress=on_progress)
+        
+        assert sorted(starts) == pytest.approx([5, 13, 21])
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_vad_skips_inner_silence(self, tmp_path):
+        """Test that only speech is transcribed and chunk times map back across the skipped gap"""
+        import wave
+        audio_path = str(tmp_path / "meeting.wav")
+        signal = synthetic_speech([(2, None), (6, -20), (20, None), (6, -20)])
+        with wave.open(audio_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes((signal * 32767).astype("<i2").tobytes())
+        service, uploads = make_preprocessing_service(chunk_seconds=4)
+        service.audio_preprocessor.vad = VoiceActivityDetector(pad_seconds=0, min_silence_seconds=1.0)
+        spans = []
+        
+        async def on_progress(event, data):
+            if event == "chunk_transcribed":
+                spans.append((data["start"], data["end"]))
+        
+        result = await service.process_audio_path(audio_path, on_progress=on_progress)
+        
+        assert sum(frames for _, _, frames in uploads) == pytest.approx(12 * 16000, abs=50)
+        # The middle chunk straddles the skipped gap, so its span covers it
+        expected = [(2, 6), (6, 30), (30, 34)]
+        assert sorted(spans) == [(pytest.approx(start, abs=0.02), pytest.approx(end, abs=0.02)) for start, end in expected]
+        assert result.preprocessing.speech_regions == 2
+        assert result.preprocessing.skipped_seconds == pytest.approx(22, abs=0.05)
+        stats = service.audio_preprocessor.stats()
+        assert stats["recordings"] == 1
+        assert stats["skipped_seconds"] == result.preprocessing.skipped_seconds
+        assert stats["bytes_saved"] == result.preprocessing.bytes_saved
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_original_sent_when_it_is_smaller(self, tmp_path):
+        """Test that preprocessing never makes the upload bigger"""
+        audio_path = str(tmp_path / "meeting.wav")
+        # Already 16 kHz mono with nothing to trim
+        write_tone_wav(audio_path, [(2, 300, 0.5)], frame_rate=16000, channels=1)
+        service, uploads = make_preprocessing_service()
+        
+        result = await service.process_audio_path(audio_path)
+        
+        assert result.preprocessing.codec == "original"
+        assert result.preprocessing.bytes_saved == 0
+        assert result.preprocessing.uploaded_bytes == os.path.getsize(audio_path)
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_undecodable_audio_is_sent_unchanged(self, sample_audio_file):
+        """Test that a preprocessing failure falls back to the original file"""
+        service, _ = make_preprocessing_service()
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
+        
+        result = await service.process_audio_path(sample_audio_file)
+        
+        assert result.preprocessing is None
+        service.whisper_service.transcribe_audio.assert_called_once_with(sample_audio_file, language=None)
+
+
+def make_pipeline_service(tmp_path, seconds=240, transcribe_delay=0.02):
+    """Service over a chunked marker WAV whose transcript needs map-reduce analysis"""
+    audio_path = str(tmp_path / "meeting.wav")
+    write_second_marker_wav(audio_path, seconds)
+    
+    service = TranscriptionBusinessService(
+        audio_chunker=AudioChunker(chunk_seconds=30, overlap_seconds=5)
+    )
+    service.pipeline_enabled = True
+    service.whisper_service.max_concurrency = 2
+    service.groq_service.single_shot_max_tokens = 50
+    service.groq_service.segment_tokens = 40
+    
+    async def transcribe(file_path, language=None):
+        import asyncio
+        await asyncio.sleep(transcribe_delay)
+        return fake_transcribe_wav(file_path)
+    
+    service.whisper_service.transcribe_audio = AsyncMock(side_effect=transcribe)
+    service.groq_service.analyze_transcription = AsyncMock()
+    service.groq_service.reduce_analyses = AsyncMock(return_value={
+        "summary": "Merged",
+        "participants": [],
+        "decisions": [],
+        "action_items": []
+    })
+    return service, audio_path
+
+
+class TestPipelining:
+    """Tests for overlapping transcription and analysis"""
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_analysis_starts_before_transcription_finishes(self, tmp_path):
+        """Test that early segments are analyzed while later chunks are transcribed"""
+        import time
+        service, audio_path = make_pipeline_service(tmp_path)
+        segments = []
+        chunk_times = []
+        segment_times = []
+        
+        async def analyze_segment(segment, language=None, index=0, total=None):
+            segment_times.append(time.perf_counter())
+            segments.append(segment)
+            return {"summary": f"Part {index}", "participants": [], "decisions": [], "action_items": []}
+        
+        async def on_progress(event, data):
+            if event == "chunk_transcribed":
+                chunk_times.append(time.perf_counter())
+        
+        service.groq_service.analyze_segment = AsyncMock(side_effect=analyze_segment)
+        
+        result = await service.process_audio_path(audio_path, on_progress=on_progress)
+        
+        assert len(chunk_times) > 5
+        assert min(segment_times) < max(chunk_times)  # Stages overlapped
+        assert " ".join(segments) == result.transcription  # No words lost or repeated
+        assert result.transcription.split()[:3] == ["w0", "w1", "w2"]
+        assert len(result.transcription.split()) == 240
+        assert result.summary == "Merged"
+        service.groq_service.analyze_transcription.assert_not_called()
+        
+        assert result.timings.overlap_seconds > 0
+        assert result.timings.total_seconds < (
+            result.timings.transcription_seconds + result.timings.analysis_seconds
+        )
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_slow_analysis_pauses_transcription(self, tmp_path):
+        """Test that a full queue stops new chunks being sent for transcription"""
+        import asyncio
+        service, audio_path = make_pipeline_service(tmp_path, transcribe_delay=0)
+        service.groq_service.max_concurrency = 1
+        service.pipeline_queue_size = 1
+        release = asyncio.Event()
+        
+        async def analyze_segment(segment, language=None, index=0, total=None):
+            await release.wait()
+            return {"summary": "", "participants": [], "decisions": [], "action_items": []}
+        
+        service.groq_service.analyze_segment = AsyncMock(side_effect=analyze_segment)
+        
+        task = asyncio.create_task(service.process_audio_path(audio_path))
+        await asyncio.sleep(0.2)
+        transcribed_while_blocked = service.whisper_service.transcribe_audio.call_count
+        release.set()
+        await asyncio.wait_for(task, timeout=5)
+        
+        total_chunks = service.whisper_service.transcribe_audio.call_count
+        assert transcribed_while_blocked < total_chunks
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_transcription_error_stops_pipeline(self, tmp_path):
+        """Test that a failed chunk fails the request instead of hanging"""
+        import asyncio
+        service, audio_path = make_pipeline_service(tmp_path)
+        calls = 0
+        
+        async def transcribe(file_path, language=None):
+            nonlocal calls
+            calls += 1
+            if calls == 6:
+                raise Exception("Whisper API error: boom")
+            return fake_transcribe_wav(file_path)
+        
+        service.whisper_service.transcribe_audio = AsyncMock(side_effect=transcribe)
+        service.groq_service.analyze_segment = AsyncMock(return_value={
+            "summary": "", "participants": [], "decisions": [], "action_items": []
+        })
+        
+        with pytest.raises(Exception, match="Whisper API error"):
+            await asyncio.wait_for(service.process_audio_path(audio_path), timeout=5)
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_short_transcript_is_analyzed_in_one_request(self, tmp_path):
+        """Test that transcripts under the single-shot limit skip segment analysis"""
+        service, audio_path = make_pipeline_service(tmp_path)
+        service.groq_service.single_shot_max_tokens = 12000
+        service.groq_service.analyze_segment = AsyncMock()
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Whole", "participants": [], "decisions": [], "action_items": []
+        })
+        
+        result = await service.process_audio_path(audio_path)
+        
+        assert result.summary == "Whole"
+        service.groq_service.analyze_segment.assert_not_called()
+        assert result.timings.overlap_seconds == 0
+
+
+async def fake_transcribe_segments(file_path, language=None):
+    """Segment-level fake transcriber: one segment per second, times relative to the chunk"""
+    words = fake_transcribe_wav(file_path).split()
+    return [TranscriptSegment(float(second), second + 1.0, word, 0.9) for second, word in enumerate(words)]
+
+
+class TestTranscriptSegmentsStage:
+    """Tests for returning timed segments"""
+    
+    ANALYSIS = {"summary": "Summary", "participants": [], "decisions": [], "action_items": []}
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_segments_stitched_across_chunks(self, tmp_path):
+        """Test that chunk segments land on the recording's timeline once each"""
+        service, audio_path = make_pipeline_service(tmp_path, seconds=120)
+        service.groq_service.single_shot_max_tokens = 12000
+        service.groq_service.analyze_transcription = AsyncMock(return_value=self.ANALYSIS)
+        service.whisper_service.transcribe_segments = AsyncMock(side_effect=fake_transcribe_segments)
+        
+        result = await service.process_audio_path(audio_path, with_segments=True)
+        
+        assert [segment.text for segment in result.segments] == [f"w{second}" for second in range(120)]
+        assert [segment.start for segment in result.segments] == [float(second) for second in range(120)]
+        assert result.segments[-1].end == 120.0
+        assert result.segments[0].confidence == 0.9
+        assert result.transcription == " ".join(f"w{second}" for second in range(120))
+        service.whisper_service.transcribe_audio.assert_not_called()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_segments_only_when_requested(self, tmp_path, sample_audio_file):
+        """Test that responses carry segments only on request while the cache always keeps them"""
+        from app.storage.result_cache import ResultCache
+        service = TranscriptionBusinessService(result_cache=ResultCache(db_path=str(tmp_path / "cache.db")))
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Hello there")
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, 1.0, "Hello"), TranscriptSegment(1.0, None, "there")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value=self.ANALYSIS)
+        
+        plain = await service.process_audio_path(sample_audio_file, content_hash="same")
+        timed = await service.process_audio_path(sample_audio_file, content_hash="same", with_segments=True)
+        
+        assert plain.segments is None
+        assert [segment.text for segment in timed.segments] == ["Hello", "there"]
+        assert timed.segments[1].end is None
+        service.whisper_service.transcribe_audio.assert_not_called()
+        service.whisper_service.transcribe_segments.assert_called_once()
+        
+        # A result cached without segments cannot answer a request for them
+        key = service._result_key("old", None, service.whisper_service, service.groq_service)
+        service.result_cache.put(key, plain)
+        assert (await service.process_audio_path(sample_audio_file, content_hash="old")).segments is None
+        assert (await service.process_audio_path(sample_audio_file, content_hash="old", with_segments=True)).segments
+        assert service.whisper_service.transcribe_segments.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_segments_stored_without_building_models(self, tmp_path, sample_audio_file):
+        """Test that stored and cached segments skip Segment models when the response leaves them out"""
+        from app.storage.meeting_store import MeetingStore
+        from app.storage.result_cache import ResultCache
+        service = TranscriptionBusinessService(
+            result_cache=ResultCache(db_path=str(tmp_path / "cache.db")),
+            meeting_store=MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        )
+        service.whisper_service.transcribe_segments = AsyncMock(
+            return_value=[TranscriptSegment(0.0, 1.0, "Hello"), TranscriptSegment(1.0, 2.0, "there")]
+        )
+        service.groq_service.analyze_transcription = AsyncMock(return_value=self.ANALYSIS)
+        
+        with patch("app.business.transcription_service.Segment") as segment_model:
+            result = await service.process_audio_path(sample_audio_file, content_hash="same")
+        segment_model.assert_not_called()
+        
+        assert result.segments is None
+        stored = service.meeting_store.get(result.meeting_id)["result"]
+        assert [segment.text for segment in stored.segments] == ["Hello", "there"]
+        key = service._result_key("same", None, service.whisper_service, service.groq_service)
+        assert service.result_cache.segments(key) == [TranscriptSegment(0.0, 1.0, "Hello"), TranscriptSegment(1.0, 2.0, "there")]
+        
+        # A hit whose meeting was deleted is stored again with the cached segments
+        service.meeting_store.delete(result.meeting_id)
+        again = await service.process_audio_path(sample_audio_file, content_hash="same")
+        assert again.segments is None
+        assert again.meeting_id != result.meeting_id
+        assert len(service.meeting_store.get(again.meeting_id)["result"].segments) == 2
+        assert service.result_cache.get(key).meeting_id == again.meeting_id
+        service.whisper_service.transcribe_segments.assert_called_once()
 
+
+def make_job_upload(name="meeting.mp3", content=b'fake audio content'):
+    mock_file = Mock()
+    mock_file.filename = name
+    mock_file.read = AsyncMock(side_effect=[content, b''])
+    return mock_file
+
+
+async def wait_for_status(job_service, job_id, statuses, timeout=5.0):
+    import asyncio
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await job_service.get(job_id)
+        if job.status in statuses or asyncio.get_running_loop().time() > deadline:
+            return job
+        await asyncio.sleep(0.02)
+
+
+class TestTranscriptionJobService:
+    """Tests for TranscriptionJobService"""
+    
+    @pytest.fixture
+    def transcription_service(self):
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"}):
+            service = TranscriptionBusinessService()
+        service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": [],
+            "action_items": []
+        })
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_submit_returns_immediately_and_completes(self, transcription_service, tmp_path):
+        """Test that jobs are queued, run in the background and store their result"""
+        import asyncio
+        
+        async def slow_transcribe(file_path, language=None):
+            await asyncio.sleep(0.3)
+            return "Transcription"
+        
+        transcription_service.whisper_service.transcribe_audio = slow_transcribe
+        job_service = TranscriptionJobService(
+            transcription_service, JobStore(db_path=str(tmp_path / "jobs.db")),
+            spool_dir=str(tmp_path / "spool"), workers=3, poll_interval=0.05
+        )
+        job_service.start()
+        try:
+            jobs = [await job_service.submit(make_job_upload(f"meeting_{i}.mp3")) for i in range(3)]
+            assert all(job.status == "queued" for job in jobs)
+            
+            start = asyncio.get_running_loop().time()
+            finished = [await wait_for_status(job_service, job.job_id, {"completed", "failed"}) for job in jobs]
+            elapsed = asyncio.get_running_loop().time() - start
+        finally:
+            await job_service.stop()
+        
+        assert all(job.status == "completed" for job in finished)
+        assert finished[0].result.summary == "Summary"
+        assert elapsed < 0.3 * 3  # Jobs ran on parallel workers
+        assert list((tmp_path / "spool").iterdir()) == []  # Spooled audio removed
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_job_is_requeued(self, transcription_service, tmp_path):
+        """Test that a job the provider rate limits goes back in the queue instead of failing"""
+        from app.utils.rate_limiter import RateLimitExceededError
+        analysis = await transcription_service.groq_service.analyze_transcription("")
+        transcription_service.groq_service.analyze_transcription = AsyncMock(side_effect=[
+            RateLimitExceededError("Groq API error: rate limit exceeded", retry_after=0.05),
+            analysis
+        ])
+        job_service = TranscriptionJobService(
+            transcription_service, JobStore(db_path=str(tmp_path / "jobs.db")),
+            spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+        )
+        job_service.start()
+        try:
+            job = await job_service.submit(make_job_upload())
+            finished = await wait_for_status(job_service, job.job_id, {"completed", "failed"})
+        finally:
+            await job_service.stop()
+        
+        assert finished.status == "completed"
+        assert transcription_service.groq_service.analyze_transcription.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_job_frees_its_worker(self, transcription_service, tmp_path):
+        """Test that a rate-limited job waits in the queue, not on the worker, with retry_after clamped"""
+        import asyncio
+        from app.utils.rate_limiter import RateLimitExceededError
+        analysis = await transcription_service.groq_service.analyze_transcription("")
+        transcription_service.groq_service.analyze_transcription = AsyncMock(side_effect=[
+            RateLimitExceededError("Groq API error: rate limit exceeded", retry_after=3600),
+            analysis,
+            analysis
+        ])
+        with patch.dict(os.environ, {"JOB_MAX_REQUEUE_DELAY": "0.3"}):
+            job_service = TranscriptionJobService(
+                transcription_service, JobStore(db_path=str(tmp_path / "jobs.db")),
+                spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+            )
+        job_service.start()
+        try:
+            limited = await job_service.submit(make_job_upload("limited.mp3"))
+            while transcription_service.groq_service.analyze_transcription.call_count == 0:
+                await asyncio.sleep(0.01)
+            await wait_for_status(job_service, limited.job_id, {"queued"})
+            other = await job_service.submit(make_job_upload("other.mp3"))
+            other_done = await wait_for_status(job_service, other.job_id, {"completed", "failed"})
+            assert (await job_service.get(limited.job_id)).status == "queued"
+            limited_done = await wait_for_status(job_service, limited.job_id, {"completed", "failed"})
+        finally:
+            await job_service.stop()
+        
+        assert other_done.status == "completed"
+        assert limited_done.status == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, transcription_service, tmp_path):
+        """Test that pipeline errors mark the job failed"""
+        transcription_service.groq_service.analyze_transcription = AsyncMock(
+            side_effect=Exception("Groq API error")
+        )
+        job_service = TranscriptionJobService(
+            transcription_service, JobStore(db_path=str(tmp_path / "jobs.db")),
+            spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+        )
+        job_service.start()
+        try:
+            job = await job_service.submit(make_job_upload())
+            finished = await wait_for_status(job_service, job.job_id, {"completed", "failed"})
+        finally:
+            await job_service.stop()
+        
+        assert finished.status == "failed"
+        assert "Groq API error" in finished.error
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_job_resumes_after_restart(self, transcription_service, tmp_path):
+        """Test that a job cut off by shutdown keeps its audio and runs on the next start"""
+        import asyncio
+        
+        db_path = str(tmp_path / "jobs.db")
+        started = asyncio.Event()
+        
+        async def hanging_transcribe(file_path, language=None):
+            started.set()
+            await asyncio.sleep(60)
+        
+        transcription_service.whisper_service.transcribe_audio = hanging_transcribe
+        job_service = TranscriptionJobService(
+            transcription_service, JobStore(db_path=db_path),
+            spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+        )
+        job_service.start()
+        job = await job_service.submit(make_job_upload())
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await job_service.stop()
+        job_service.job_store.close()
+        
+        transcription_service.whisper_service.transcribe_audio = AsyncMock(return_value="Transcription")
+        restarted = TranscriptionJobService(
+            transcription_service, JobStore(db_path=db_path),
+            spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+        )
+        restarted.start()
+        try:
+            finished = await wait_for_status(restarted, job.job_id, {"completed", "failed"})
+        finally:
+            await restarted.stop()
+        
+        assert finished.status == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_long_job_claimed(self, transcription_service, tmp_path):
+        """Test that another process does not requeue a job that is still running here"""
+        import asyncio
+        
+        db_path = str(tmp_path / "jobs.db")
+        started = asyncio.Event()
+        
+        async def slow_transcribe(file_path, language=None):
+            started.set()
+            await asyncio.sleep(0.5)
+            return "Transcription"
+        
+        transcription_service.whisper_service.transcribe_audio = slow_transcribe
+        with patch.dict(os.environ, {"JOB_HEARTBEAT_INTERVAL": "0.02"}):
+            job_service = TranscriptionJobService(
+                transcription_service, JobStore(db_path=db_path, stale_after=0.1),
+                spool_dir=str(tmp_path / "spool"), workers=1, poll_interval=0.05
+            )
+        other = JobStore(db_path=db_path, stale_after=0.1)
+        job_service.start()
+        try:
+            job = await job_service.submit(make_job_upload())
+            await asyncio.wait_for(started.wait(), timeout=5)
+            await asyncio.sleep(0.3)  # Longer than stale_after
+            assert other.requeue_interrupted() == 0
+            finished = await wait_for_status(job_service, job.job_id, {"completed", "failed"})
+        finally:
+            await job_service.stop()
+        
+        assert finished.status == "completed"
+        assert transcription_service.groq_service.analyze_transcription.call_count == 1
+
+
+class TestBatchTranscriptionService:
+    """Tests for BatchTranscriptionService"""
+    
+    PER_FILE_SECONDS = 0.2
+    
+    @pytest.fixture
+    def batch(self, tmp_path):
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"}):
+            service = TranscriptionBusinessService()
+        
+        async def transcribe(file_path, language=None):
+            await asyncio.sleep(self.PER_FILE_SECONDS)
+            if "broken" in file_path:
+                raise Exception("Whisper API error: bad audio")
+            return f"Transcript of {os.path.basename(file_path)}"
+        
+        service.whisper_service.transcribe_audio = transcribe
+        service.groq_service.analyze_transcription = AsyncMock(return_value={
+            "summary": "Summary", "participants": [], "decisions": [], "action_items": []
+        })
+        job_service = TranscriptionJobService(
+            service, JobStore(db_path=str(tmp_path / "jobs.db")), spool_dir=str(tmp_path / "spool")
+        )
+        incoming = tmp_path / "incoming"
+        incoming.mkdir()
+        with patch.dict(os.environ, {"BATCH_MAX_CONCURRENCY": "4"}):
+            return BatchTranscriptionService(service, job_service, manifest_root=str(incoming))
+    
+    def write_recordings(self, batch, names):
+        for name in names:
+            with open(os.path.join(batch.manifest_root, name), "wb") as f:
+                f.write(name.encode())
+        return list(names)
+    
+    @pytest.mark.asyncio
+    async def test_run_bounds_parallelism(self, batch):
+        """Test that N recordings take about N / concurrency times the per-file time"""
+        paths = self.write_recordings(batch, [f"meeting_{i}.mp3" for i in range(8)])
+        
+        result = await batch.run([], paths, concurrency=4)
+        
+        assert result.completed == 8 and result.failed == 0
+        assert [item.source for item in result.items] == paths
+        assert result.items[0].result.transcription == "Transcript of meeting_0.mp3"
+        # 8 files, 4 at a time: two rounds, not one (unbounded) or eight (serial)
+        assert 2 * self.PER_FILE_SECONDS <= result.elapsed_seconds < 4 * self.PER_FILE_SECONDS
+        # Manifest files are never deleted
+        assert sorted(os.listdir(batch.manifest_root)) == sorted(paths)
+    
+    @pytest.mark.asyncio
+    async def test_run_caps_requested_concurrency(self, batch):
+        """Test that callers cannot exceed BATCH_MAX_CONCURRENCY"""
+        paths = self.write_recordings(batch, ["a.mp3"])
+        assert (await batch.run([], paths, concurrency=50)).concurrency == 4
+    
+    @pytest.mark.asyncio
+    async def test_failed_recording_does_not_fail_batch(self, batch):
+        """Test that errors are reported per item"""
+        paths = self.write_recordings(batch, ["good.mp3", "broken.mp3"])
+        
+        result = await batch.run([], paths)
+        
+        assert [item.status for item in result.items] == ["completed", "failed"]
+        assert "bad audio" in result.items[1].error
+        assert result.completed == 1 and result.failed == 1
+    
+    @pytest.mark.asyncio
+    async def test_run_uploads_as_batch_priority(self, batch):
+        """Test that uploads are processed and analysis is routed as batch work"""
+        batch.transcription_service.process_audio_path = AsyncMock(
+            wraps=batch.transcription_service.process_audio_path
+        )
+        
+        result = await batch.run([make_job_upload("one.mp3"), make_job_upload("two.wav")], [])
+        
+        assert [item.source for item in result.items] == ["one.mp3", "two.wav"]
+        assert result.completed == 2
+        kwargs = batch.transcription_service.process_audio_path.call_args.kwargs
+        assert kwargs["priority"] == PRIORITY_BATCH
+    
+    @pytest.mark.asyncio
+    async def test_invalid_manifest_rejected_before_work(self, batch, tmp_path):
+        """Test that bad paths fail the whole batch with a ValueError"""
+        (tmp_path / "secret.mp3").write_bytes(b"secret")
+        self.write_recordings(batch, ["notes.txt"])
+        
+        with pytest.raises(ValueError, match="outside the batch directory"):
+            await batch.run([], ["../secret.mp3"])
+        with pytest.raises(ValueError, match="not found"):
+            await batch.run([], ["missing.mp3"])
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            await batch.run([], ["notes.txt"])
+        with pytest.raises(ValueError, match="Batch is empty"):
+            await batch.run([], [])
+    
+    def test_parse_manifest(self):
+        """Test both manifest shapes and malformed input"""
+        assert parse_manifest('["a.mp3", "b.wav"]') == ["a.mp3", "b.wav"]
+        assert parse_manifest('{"paths": ["a.mp3"]}') == ["a.mp3"]
+        with pytest.raises(ValueError):
+            parse_manifest("a.mp3")
+        with pytest.raises(ValueError):
+            parse_manifest('{"files": ["a.mp3"]}')
+    
+    @pytest.mark.asyncio
+    async def test_submit_queues_jobs_with_spooled_copies(self, batch):
+        """Test that queued manifest files are copied, so workers never delete the originals"""
+        paths = self.write_recordings(batch, ["night_1.mp3", "night_2.mp3"])
+        
+        result = await batch.submit([make_job_upload("upload.mp3")], paths)
+        
+        assert result.queued == 3
+        assert all(item.status == "queued" and item.job_id for item in result.items)
+        assert len(os.listdir(batch.job_service.spool_dir)) == 3
+        job = batch.job_service.job_store.get(result.items[1].job_id)
+        assert job["filename"] == "night_1.mp3"
+        assert not job["audio_path"].startswith(batch.manifest_root)
+        assert job["content_hash"] is not None
+
+
+class TestServiceRegistry:
+    """Tests for ServiceRegistry"""
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    def test_services_are_shared(self):
+        """Test that services and connection pools are built once per registry"""
+        registry = ServiceRegistry()
+        try:
+            first = registry.transcription_service
+            second = registry.transcription_service
+            
+            assert first is second
+            assert registry.word_export_service is registry.word_export_service
+            # One pool per provider, reused by every request
+            assert len(registry._http_clients) == 2
+            assert first.whisper_service.client._client is registry._http_clients[0]
+            assert first.groq_service.client._client is registry._http_clients[1]
+        finally:
+            registry.shutdown()
+    
+    @patch.dict(os.environ, {
+        "OPENAI_API_KEY": "test-key",
+        "GROQ_API_KEY": "test-key",
+        "HTTP_MAX_CONNECTIONS": "7",
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS": "3"
+    })
+    def test_pool_sizes_are_configurable(self):
+        """Test that pool limits come from the environment"""
+        registry = ServiceRegistry()
+        try:
+            registry.transcription_service
+            pool = registry._http_clients[0]._transport._pool
+            assert pool._max_connections == 7
+            assert pool._max_keepalive_connections == 3
+        finally:
+            registry.shutdown()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key", "LOCAL_WHISPER_ENABLED": "true"})
+    def test_local_backend_registered_when_enabled(self):
+        """Test that the local backend is added when enabled, and skipped if unavailable"""
+        from app.services import local_whisper_service
+        
+        registry = ServiceRegistry()
+        try:
+            with patch.object(local_whisper_service, "WhisperModel", Mock()):
+                backends = registry.transcription_service.transcription_backends
+            assert sorted(backends) == ["local", "openai"]
+        finally:
+            registry.shutdown()
+        
+        registry = ServiceRegistry()
+        try:
+            with patch.object(local_whisper_service, "WhisperModel", None):
+                backends = registry.transcription_service.transcription_backends
+            assert sorted(backends) == ["openai"]
+        finally:
+            registry.shutdown()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key", "LOCAL_LLM_ENABLED": "true"})
+    def test_local_analysis_backend_registered_when_enabled(self):
+        """Test that the local LLM backend is added to analysis routing with its own pool"""
+        registry = ServiceRegistry()
+        try:
+            backends = registry.transcription_service.analysis_router.backends
+            assert sorted(backends) == ["groq", "local"]
+            assert len(registry._http_clients) == 3
+        finally:
+            registry.shutdown()
+    
+    def test_result_cache_wired_when_enabled(self, tmp_path):
+        """Test that the registry shares one result cache with the transcription service"""
+        with patch.dict(os.environ, {
+            "OPENAI_API_KEY": "test-key",
+            "GROQ_API_KEY": "test-key",
+            "RESULT_CACHE_ENABLED": "true",
+            "RESULT_CACHE_PATH": str(tmp_path / "cache.db")
+        }):
+            registry = ServiceRegistry()
+            try:
+                assert registry.result_cache is not None
+                assert registry.transcription_service.result_cache is registry.result_cache
+            finally:
+                registry.shutdown()
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"})
+    def test_shutdown_closes_pools(self):
+        """Test that shutdown closes HTTP clients and resets services"""
+        registry = ServiceRegistry()
+        registry.startup()
+        service = registry.transcription_service
+        http_clients = list(registry._http_clients)
+        
+        registry.shutdown()
+        
+        assert all(client.is_closed for client in http_clients)
+        assert registry.transcription_service is not service
+        registry.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_batch_service_usable_after_shutdown(self, tmp_path, mock_upload_file):
+        """Test that shutdown drops the batch service with the job store it wraps"""
+        with patch.dict(os.environ, {
+            "OPENAI_API_KEY": "test-key",
+            "GROQ_API_KEY": "test-key",
+            "JOB_DB_PATH": str(tmp_path / "jobs.db"),
+            "JOB_SPOOL_DIR": str(tmp_path / "spool")
+        }):
+            registry = ServiceRegistry()
+            batch_service = registry.batch_service
+            registry.shutdown()
+            try:
+                assert registry.batch_service is not batch_service
+                response = await registry.batch_service.submit([mock_upload_file], [])
+                
+                assert response.items[0].status == "queued"
+                assert (await registry.job_service.get(response.items[0].job_id)).status == "queued"
+            finally:
+                registry.shutdown()
+    
+    def test_startup_without_api_keys(self):
+        """Test that missing API keys do not prevent startup"""
+        with patch.dict(os.environ, {}, clear=True):
+            registry = ServiceRegistry()
+            registry.startup()
+            
+            with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+                registry.transcription_service
+            assert registry.word_export_service is not None
+            registry.shutdown()
+    
+    def test_failed_build_closes_its_pools(self):
+        """Test that a service that fails to build does not leave connection pools behind"""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}, clear=True):
+            registry = ServiceRegistry()
+            with patch("app.business.service_registry.httpx.Client") as client_class:
+                for _ in range(3):
+                    with pytest.raises(ValueError, match="GROQ_API_KEY"):
+                        registry.transcription_service
+            
+            assert registry._http_clients == []
+            # The OpenAI and Groq pools of each attempt
+            assert client_class.return_value.close.call_count == 6
+            registry.shutdown()
@@ -2,13 +2,29 @@
 import pytest
 import os
 import json
+import time
+import asyncio
+import zipfile
+from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from io import BytesIO
 
 from app.services.whisper_service import WhisperService
+from app.services import local_whisper_service
+from app.services.local_whisper_service import LocalWhisperService
+from app.services.analysis_backend import split_transcript, estimate_tokens
 from app.services.groq_service import GroqService
-from app.services.word_export_service import WordExportService
+from app.services.local_llm_service import LocalLLMService
+from app.services.word_export_service import WordExportService, iter_document_chunks
+from app.services.audio_chunker import AudioChunk, AudioChunker, stitch_segments, stitch_transcripts
+from app.services import audio_preprocessor
+from app.services.audio_preprocessor import AudioPreprocessor, _StreamResampler, _pcm_to_float
+from app.services.voice_activity import VoiceActivityDetector, frame_levels
 from app.models.schemas import ActionItem
+from app.models.transcript import TranscriptSegment, confidence_from_logprob, segments_text
+from app.storage.analysis_cache import AnalysisCache
+from app.utils.rate_limiter import RateLimitExceededError
+from tests.test_utils import provider_error
 
 
 class TestWhisperService:
@@ -53,6 +69,178 @@ class TestWhisperService:
             
             with pytest.raises(Exception, match="Whisper API error"):
                 await service.transcribe_audio(sample_audio_file)
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "WHISPER_MAX_CONCURRENCY": "4"})
+    @pytest.mark.asyncio
+    async def test_transcribe_audio_does_not_block_event_loop(self, sample_audio_file):
+        """Test that concurrent transcriptions overlap instead of running serially"""
+        service = WhisperService()
+        
+        def slow_create(**kwargs):
+            time.sleep(0.3)
+            return Mock(text="Transcribed text")
+        
+        with patch.object(service.client.audio.transcriptions, 'create', side_effect=slow_create):
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(service.transcribe_audio(sample_audio_file) for _ in range(4))
+            )
+            elapsed = time.perf_counter() - start
+        
+        assert results == ["Transcribed text"] * 4
+        assert elapsed < 0.3 * 4 / 2  # Serial execution would take 1.2s
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "WHISPER_MAX_CONCURRENCY": "1"})
+    @pytest.mark.asyncio
+    async def test_transcribe_audio_respects_concurrency_limit(self, sample_audio_file):
+        """Test that the configured concurrency limit caps in-flight API calls"""
+        service = WhisperService()
+        in_flight = 0
+        max_in_flight = 0
+        
+        def counting_create(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            in_flight -= 1
+            return Mock(text="Transcribed text")
+        
+        with patch.object(service.client.audio.transcriptions, 'create', side_effect=counting_create):
+            await asyncio.gather(*(service.transcribe_audio(sample_audio_file) for _ in range(3)))
+        
+        assert max_in_flight == 1
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "PROVIDER_RETRY_BASE_DELAY": "0.01"})
+    @pytest.mark.asyncio
+    async def test_rate_limited_transcription_is_retried(self, sample_audio_file):
+        """Test that a 429 is retried instead of failing the transcription"""
+        service = WhisperService()
+        
+        with patch.object(service.client.audio.transcriptions, 'create') as mock_create:
+            mock_create.side_effect = [provider_error(429, {"retry-after-ms": "10"}), Mock(text="Transcribed text")]
+            
+            assert await service.transcribe_audio(sample_audio_file) == "Transcribed text"
+            assert mock_create.call_count == 2
+        assert service.client.max_retries == 0  # The SDK's own retries would double up
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "PROVIDER_MAX_RETRIES": "1"})
+    @pytest.mark.asyncio
+    async def test_rate_limit_exhausted_keeps_error_type(self, sample_audio_file):
+        """Test that running out of retries raises RateLimitExceededError with the wait"""
+        service = WhisperService()
+        
+        with patch.object(service.client.audio.transcriptions, 'create') as mock_create:
+            mock_create.side_effect = provider_error(429, {"retry-after": "0"})
+            
+            with pytest.raises(RateLimitExceededError, match="Whisper API error") as exc_info:
+                await service.transcribe_audio(sample_audio_file)
+        assert exc_info.value.retry_after == 0
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_transcribe_segments_requests_verbose_json(self, sample_audio_file):
+        """Test that segments come from verbose_json, and plain transcription does not ask for it"""
+        service = WhisperService()
+        verbose = Mock(text="Hello there. General Kenobi.", segments=[
+            {"start": 0.0, "end": 1.5, "text": " Hello there.", "avg_logprob": -0.1},
+            {"start": 1.5, "end": 3.0, "text": " General Kenobi.", "avg_logprob": None}
+        ])
+        
+        with patch.object(service.client.audio.transcriptions, 'create', return_value=verbose) as mock_create:
+            segments = await service.transcribe_segments(sample_audio_file, language="en")
+            assert mock_create.call_args.kwargs["response_format"] == "verbose_json"
+            
+            await service.transcribe_audio(sample_audio_file)
+            assert "response_format" not in mock_create.call_args.kwargs
+        
+        assert segments == [
+            TranscriptSegment(0.0, 1.5, "Hello there.", 0.905),
+            TranscriptSegment(1.5, 3.0, "General Kenobi.", None)
+        ]
+    
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_transcribe_segments_without_segments(self, sample_audio_file):
+        """Test that a response without segments becomes one segment over the whole file"""
+        service = WhisperService()
+        
+        with patch.object(service.client.audio.transcriptions, 'create') as mock_create:
+            mock_create.return_value = Mock(text="Short note", segments=None, duration=4.2)
+            segments = await service.transcribe_segments(sample_audio_file)
+        
+        assert segments == [TranscriptSegment(0.0, 4.2, "Short note")]
+
+
+class TestLocalWhisperService:
+    """Tests for LocalWhisperService"""
+    
+    def test_init_without_faster_whisper(self):
+        """Test that a missing optional dependency is reported as a ValueError"""
+        with patch.object(local_whisper_service, "WhisperModel", None):
+            with pytest.raises(ValueError, match="faster-whisper is not installed"):
+                LocalWhisperService()
+    
+    @patch.dict(os.environ, {
+        "LOCAL_WHISPER_MODEL": "base",
+        "LOCAL_WHISPER_CPU_THREADS": "3",
+        "LOCAL_WHISPER_BATCH_SIZE": "4"
+    })
+    @pytest.mark.asyncio
+    async def test_transcribe_with_batched_int8_model(self):
+        """Test that the model is loaded once, quantized, and run through the batched pipeline"""
+        model_class = Mock()
+        pipeline_class = Mock()
+        segments = [Mock(text=" Hello there. "), Mock(text=" General Kenobi. ")]
+        pipeline_class.return_value.transcribe.return_value = (iter(segments), Mock())
+        
+        with patch.object(local_whisper_service, "WhisperModel", model_class), \
+             patch.object(local_whisper_service, "BatchedInferencePipeline", pipeline_class):
+            service = LocalWhisperService()
+            result = await service.transcribe_audio("/tmp/meeting.wav", language="en")
+            pipeline_class.return_value.transcribe.return_value = (iter(segments), Mock())
+            await service.transcribe_audio("/tmp/meeting.wav")
+        
+        assert result == "Hello there. General Kenobi."
+        assert service.name == "local"
+        assert service.model == "faster-whisper-base-int8"
+        model_class.assert_called_once_with("base", device="cpu", compute_type="int8", cpu_threads=3)
+        pipeline_class.return_value.transcribe.assert_any_call(
+            "/tmp/meeting.wav", language="en", beam_size=1, batch_size=4
+        )
+    
+    @patch.dict(os.environ, {"LOCAL_WHISPER_BATCH_SIZE": "1"})
+    @pytest.mark.asyncio
+    async def test_transcribe_unbatched_and_errors(self):
+        """Test the plain model path and error wrapping"""
+        model_class = Mock()
+        model_class.return_value.transcribe.side_effect = RuntimeError("bad audio")
+        
+        with patch.object(local_whisper_service, "WhisperModel", model_class):
+            service = LocalWhisperService()
+            with pytest.raises(Exception, match="Local transcription error: bad audio"):
+                await service.transcribe_audio("/tmp/meeting.wav")
+        
+        model_class.return_value.transcribe.assert_called_once_with("/tmp/meeting.wav", language=None, beam_size=1)
+    
+    @patch.dict(os.environ, {"LOCAL_WHISPER_BATCH_SIZE": "1"})
+    @pytest.mark.asyncio
+    async def test_transcribe_segments_keeps_timing(self):
+        """Test that local segments keep their times and a confidence from avg_logprob"""
+        model_class = Mock()
+        decoded = [
+            Mock(start=0.0, end=2.0, text=" Hello there. ", avg_logprob=0.0),
+            Mock(start=2.0, end=4.5, text=" General Kenobi. ", avg_logprob=-0.5)
+        ]
+        model_class.return_value.transcribe.return_value = (iter(decoded), Mock())
+        
+        with patch.object(local_whisper_service, "WhisperModel", model_class):
+            segments = await LocalWhisperService().transcribe_segments("/tmp/meeting.wav")
+        
+        assert segments == [
+            TranscriptSegment(0.0, 2.0, "Hello there.", 1.0),
+            TranscriptSegment(2.0, 4.5, "General Kenobi.", 0.607)
+        ]
 
 
 class TestGroqService:
@@ -136,6 +324,217 @@ class TestGroqService:
             with pytest.raises(Exception, match="Groq API error"):
                 await service.analyze_transcription("Test transcription")
     
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key", "GROQ_MAX_CONCURRENCY": "4"})
+    @pytest.mark.asyncio
+    async def test_analyze_transcription_does_not_block_event_loop(self):
+        """Test that concurrent analyses overlap instead of running serially"""
+        service = GroqService()
+        
+        def slow_create(**kwargs):
+            time.sleep(0.3)
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps({"summary": "Test summary"})
+            return response
+        
+        with patch.object(service.client.chat.completions, 'create', side_effect=slow_create):
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(service.analyze_transcription("Test transcription") for _ in range(4))
+            )
+            elapsed = time.perf_counter() - start
+        
+        assert all(result["summary"] == "Test summary" for result in results)
+        assert elapsed < 0.3 * 4 / 2
+    
+    def test_split_transcript_token_bounded(self):
+        """Test that segments stay under the token budget and keep all text"""
+        transcription = " ".join(f"Sentence number {i} is here." for i in range(200))
+        
+        segments = split_transcript(transcription, max_tokens=100)
+        
+        assert len(segments) > 1
+        assert all(estimate_tokens(segment) <= 101 for segment in segments)
+        assert " ".join(segments) == transcription
+        # Cuts land on sentence boundaries
+        assert all(segment.endswith(".") for segment in segments)
+    
+    def test_split_transcript_long_sentence(self):
+        """Test that a run-on sentence longer than a segment is split on words"""
+        transcription = " ".join(["word"] * 500)
+        
+        segments = split_transcript(transcription, max_tokens=50)
+        
+        assert all(len(segment) <= 150 for segment in segments)
+        assert " ".join(segments) == transcription
+    
+    @patch.dict(os.environ, {
+        "GROQ_API_KEY": "test-key",
+        "ANALYSIS_SINGLE_SHOT_MAX_TOKENS": "50",
+        "ANALYSIS_SEGMENT_TOKENS": "40"
+    })
+    @pytest.mark.asyncio
+    async def test_analyze_transcription_map_reduce(self):
+        """Test that long transcripts are analyzed per segment and merged"""
+        service = GroqService()
+        transcription = "Alice opened the meeting and reviewed the roadmap. " * 3 + "Bob agreed to ship on Friday. " * 3
+        segment_count = len(split_transcript(transcription, 40))
+        segment_results = {
+            "part 1 of": {
+                "summary": "Roadmap review.",
+                "participants": ["Alice", "Bob"],
+                "decisions": ["Ship on Friday"],
+                "action_items": [{"task": "Write release notes", "assignee": "Unassigned", "deadline": None}]
+            },
+            "part 2 of": {
+                "summary": "Release planning.",
+                "participants": ["alice", "Carol"],
+                "decisions": ["ship on friday."],
+                "action_items": [{"task": "Write release notes.", "assignee": "Bob", "deadline": "Friday"}]
+            }
+        }
+        
+        def fake_create(**kwargs):
+            system_prompt = kwargs["messages"][0]["content"]
+            user_prompt = kwargs["messages"][1]["content"]
+            if "summaries of consecutive parts" in system_prompt:
+                payload = {"summary": "Merged summary"}
+            else:
+                part = next((key for key in segment_results if key in user_prompt), None)
+                payload = segment_results.get(part, {"summary": "More discussion."})
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(payload)
+            return response
+        
+        progress_events = []
+        
+        async def on_progress(event, data):
+            progress_events.append((event, data["index"]))
+        
+        with patch.object(service.client.chat.completions, 'create', side_effect=fake_create) as mock_create:
+            result = await service.analyze_transcription(transcription, on_progress=on_progress)
+        
+        assert segment_count > 1
+        assert sorted(progress_events) == [("analysis_segment", i) for i in range(segment_count)]
+        assert mock_create.call_count == segment_count + 1  # Map calls + one reduce call
+        assert result["summary"] == "Merged summary"
+        assert result["participants"] == ["Alice", "Bob", "Carol"]
+        assert result["decisions"] == ["Ship on Friday"]
+        assert result["action_items"] == [
+            {"task": "Write release notes", "assignee": "Bob", "deadline": "Friday"}
+        ]
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key", "ANALYSIS_SINGLE_SHOT_MAX_TOKENS": "1000"})
+    @pytest.mark.asyncio
+    async def test_analyze_transcription_single_shot_below_threshold(self):
+        """Test that short transcripts use one request"""
+        service = GroqService()
+        
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps({"summary": "Short meeting"})
+        
+        with patch.object(service.client.chat.completions, 'create', return_value=mock_response) as mock_create:
+            result = await service.analyze_transcription("A short meeting.")
+        
+        assert mock_create.call_count == 1
+        assert result["summary"] == "Short meeting"
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_analyze_segment_stream(self):
+        """Test map-reduce over segments that arrive one at a time"""
+        service = GroqService()
+        
+        async def segments():
+            for text in ["Alice opened.", "Bob agreed.", "Carol closed."]:
+                yield text
+        
+        def fake_create(**kwargs):
+            system_prompt = kwargs["messages"][0]["content"]
+            user_prompt = kwargs["messages"][1]["content"]
+            if "summaries of consecutive parts" in system_prompt:
+                payload = {"summary": "Merged summary"}
+            else:
+                name = user_prompt.split("):\n")[1].split()[0]
+                payload = {"summary": f"{name} spoke.", "participants": [name]}
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(payload)
+            return response
+        
+        with patch.object(service.client.chat.completions, 'create', side_effect=fake_create) as mock_create:
+            result = await service.analyze_segment_stream(segments())
+        
+        assert mock_create.call_count == 4  # Three map calls + one reduce call
+        map_prompts = [call.kwargs["messages"][1]["content"] for call in mock_create.call_args_list[:3]]
+        assert any("(part 1)" in prompt for prompt in map_prompts)  # Total is unknown while streaming
+        assert result["summary"] == "Merged summary"
+        assert result["participants"] == ["Alice", "Bob", "Carol"]
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_reanalyze_parts_maps_only_changed_segments(self):
+        """Test that stored segment analyses are reused and only new text reaches the map step"""
+        service = GroqService()
+        
+        async def segments():
+            for text in ["Alice opened.", "Bob agreed.", "Carol closed."]:
+                yield text
+        
+        def fake_create(**kwargs):
+            system_prompt = kwargs["messages"][0]["content"]
+            user_prompt = kwargs["messages"][1]["content"]
+            if "summaries of consecutive parts" in system_prompt:
+                payload = {"summary": "Merged summary"}
+            else:
+                name = user_prompt.split("):\n")[1].split()[0]
+                payload = {"summary": f"{name} spoke.", "participants": [name]}
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(payload)
+            return response
+        
+        parts = []
+        with patch.object(service.client.chat.completions, 'create', side_effect=fake_create) as mock_create:
+            await service.analyze_segment_stream(segments(), parts=parts)
+            assert [part["text"] for part in parts] == ["Alice opened.", "Bob agreed.", "Carol closed."]
+            mock_create.reset_mock()
+            
+            texts = ["Alice opened.", "Rob agreed.", "Carol closed."]
+            previous = [parts[0]["analysis"], None, parts[2]["analysis"]]
+            result, new_parts = await service.reanalyze_parts(texts, previous)
+        
+        assert mock_create.call_count == 2  # One map call + the reduce
+        assert "Rob agreed." in mock_create.call_args_list[0].kwargs["messages"][1]["content"]
+        assert "(part 2 of 3)" in mock_create.call_args_list[0].kwargs["messages"][1]["content"]
+        assert result["participants"] == ["Alice", "Rob", "Carol"]
+        assert [part["text"] for part in new_parts] == texts
+        assert new_parts[1]["analysis"]["participants"] == ["Rob"]
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_reanalyze_single_segment_skips_reduce(self):
+        """Test that a short transcript is re-analyzed in one request, or not at all when unchanged"""
+        service = GroqService()
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps({"summary": "Short meeting"})
+        parts = []
+        
+        with patch.object(service.client.chat.completions, 'create', return_value=response) as mock_create:
+            first = await service.analyze_transcription("Short meeting.", parts=parts)
+            unchanged, _ = await service.reanalyze_parts(["Short meeting."], [parts[0]["analysis"]])
+            assert mock_create.call_count == 1
+            
+            await service.reanalyze_parts(["Short meeting, edited."], [None])
+        
+        assert parts == [{"text": "Short meeting.", "analysis": first, "analyzer": "groq", "model": service.model}]
+        assert unchanged == first
+        assert mock_create.call_count == 2
+        assert "TRANSCRIPTION:\nShort meeting, edited." in mock_create.call_args.kwargs["messages"][1]["content"]
+    
     @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
     def test_normalize_response(self):
         """Test response normalization"""
@@ -174,6 +573,163 @@ class TestGroqService:
         result = service._extract_json_from_text(text)
         assert "summary" in result
         assert len(result["summary"]) > 0
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key", "GROQ_TOKENS_PER_MINUTE": "60000", "PROVIDER_MAX_RETRIES": "0"})
+    @pytest.mark.asyncio
+    async def test_rate_limit_surfaces_with_budget_charged(self):
+        """Test that completions draw on the token budget and 429s keep their type"""
+        service = GroqService()
+        
+        with patch.object(service.client.chat.completions, 'create') as mock_create:
+            mock_create.side_effect = provider_error(429, {"retry-after": "3"})
+            
+            with pytest.raises(RateLimitExceededError, match="Groq API error") as exc_info:
+                await service.analyze_transcription("Short meeting.")
+        
+        assert exc_info.value.retry_after == 3
+        # Prompt plus max completion tokens were reserved
+        assert service.rate_limiter.tokens.level <= 60000 - service.max_output_tokens
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_analysis_cache_skips_repeat_transcripts(self, tmp_path):
+        """Test that a re-analyzed transcript, even re-spaced, is served from the cache"""
+        service = GroqService(analysis_cache=AnalysisCache(db_path=str(tmp_path / "analysis.db")))
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps({"summary": "Cached summary"})
+        
+        with patch.object(service.client.chat.completions, 'create', return_value=response) as mock_create:
+            first = await service.analyze_transcription("Alice opened the meeting.\nBob agreed.")
+            again = await service.analyze_transcription("  Alice opened the meeting.   Bob agreed. ")
+            assert mock_create.call_count == 1
+            
+            await service.analyze_transcription("Alice opened the meeting.\nBob agreed.", language="he")
+            service.temperature = 0.7
+            await service.analyze_transcription("Alice opened the meeting.\nBob agreed.")
+            assert mock_create.call_count == 3  # Language and temperature are part of the key
+        
+        assert again == first
+        assert first["summary"] == "Cached summary"
+        assert service.analysis_cache.stats()["memory_hits"] == 1
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key", "ANALYSIS_SINGLE_SHOT_MAX_TOKENS": "50", "ANALYSIS_SEGMENT_TOKENS": "40"})
+    @pytest.mark.asyncio
+    async def test_analysis_cache_covers_map_and_reduce(self, tmp_path):
+        """Test that a repeated long transcript costs no completions, and a changed segment costs one plus the reduce"""
+        service = GroqService(analysis_cache=AnalysisCache(db_path=str(tmp_path / "analysis.db")))
+        transcription = "Alice opened the meeting and reviewed the roadmap. " * 3 + "Bob agreed to ship on Friday. " * 3
+        segment_count = len(split_transcript(transcription, 40))
+        
+        def fake_create(**kwargs):
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps({"summary": kwargs["messages"][1]["content"][:200]})
+            return response
+        
+        with patch.object(service.client.chat.completions, 'create', side_effect=fake_create) as mock_create:
+            first = await service.analyze_transcription(transcription)
+            assert mock_create.call_count == segment_count + 1
+            assert await service.analyze_transcription(transcription) == first
+            assert mock_create.call_count == segment_count + 1
+            
+            await service.analyze_transcription(transcription.replace("Friday", "Monday", 1))
+            assert mock_create.call_count == segment_count + 3
+    
+    @patch.dict(os.environ, {"GROQ_API_KEY": "test-key"})
+    @pytest.mark.asyncio
+    async def test_analysis_cache_invalidated_by_prompt_edit(self, tmp_path):
+        """Test that editing meeting_analysis.txt invalidates cached analyses without a restart"""
+        from app.prompts import loader
+        
+        prompts_dir = tmp_path / "prompts"
+        prompts_dir.mkdir()
+        for name in ("meeting_analysis", "meeting_reduce"):
+            (prompts_dir / f"{name}.txt").write_text(loader.prompt_loader.load(name), encoding="utf-8")
+        service = GroqService(analysis_cache=AnalysisCache(db_path=str(tmp_path / "analysis.db")))
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = json.dumps({"summary": "Summary"})
+        
+        with patch.object(loader, "prompt_loader", loader.PromptLoader()) as prompt_loader, \
+             patch("app.services.analysis_backend.prompt_loader", prompt_loader), \
+             patch.object(service.client.chat.completions, 'create', return_value=response) as mock_create:
+            prompt_loader.prompts_dir = prompts_dir
+            await service.analyze_transcription("Short meeting.")
+            await service.analyze_transcription("Short meeting.")
+            assert mock_create.call_count == 1
+            
+            prompt_path = prompts_dir / "meeting_analysis.txt"
+            prompt_path.write_text(prompt_path.read_text(encoding="utf-8") + "\nBe brief.", encoding="utf-8")
+            os.utime(prompt_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+            
+            await service.analyze_transcription("Short meeting.")
+            assert mock_create.call_count == 2
+            assert "Be brief." in mock_create.call_args.kwargs["messages"][0]["content"]
+        assert service.analysis_cache.stats()["invalidated"] == 1
+
+
+class TestLocalLLMService:
+    """Tests for LocalLLMService against the stand-in local server"""
+    
+    TRANSCRIPT = (
+        "Alice: Welcome everyone. Bob: We agreed to ship the beta on Friday. "
+        "Alice: Bob will update the release notes. Carol: Sounds good."
+    )
+    
+    def make_service(self, delay=0.0):
+        from fastapi.testclient import TestClient
+        from tools.local_llm_stub import create_app
+        # TestClient is an httpx.Client that sends requests straight to the stub app
+        with patch.dict(os.environ, {"LOCAL_LLM_BASE_URL": "http://testserver/v1"}):
+            return LocalLLMService(http_client=TestClient(create_app(delay=delay)))
+    
+    @pytest.mark.asyncio
+    async def test_analyze_through_openai_compatible_server(self):
+        """Test a single-shot analysis over the OpenAI chat completions API"""
+        service = self.make_service()
+        
+        result = await service.analyze_transcription(self.TRANSCRIPT, language="en")
+        
+        assert result["participants"] == ["Alice", "Bob", "Carol"]
+        assert result["decisions"] == ["Bob: We agreed to ship the beta on Friday."]
+        assert result["action_items"] == [
+            {"task": "update the release notes", "assignee": "Bob", "deadline": None}
+        ]
+        assert service.name == "local"
+        assert service.in_flight == 0
+    
+    @patch.dict(os.environ, {"LOCAL_LLM_SINGLE_SHOT_MAX_TOKENS": "20", "LOCAL_LLM_SEGMENT_TOKENS": "20"})
+    @pytest.mark.asyncio
+    async def test_long_transcript_uses_local_limits_for_map_reduce(self):
+        """Test that the smaller local context limits switch long transcripts to map-reduce"""
+        service = self.make_service()
+        
+        result = await service.analyze_transcription(self.TRANSCRIPT)
+        
+        assert service.single_shot_max_tokens == 20
+        assert result["participants"] == ["Alice", "Bob", "Carol"]
+        assert "Welcome everyone." in result["summary"]
+    
+    @pytest.mark.asyncio
+    async def test_load_counts_requests_in_flight(self):
+        """Test that load reflects requests waiting on the local server"""
+        service = self.make_service(delay=0.2)
+        
+        task = asyncio.create_task(service.analyze_transcription(self.TRANSCRIPT))
+        await asyncio.sleep(0.05)
+        assert service.load == 1 / service.max_concurrency
+        await task
+        assert service.load == 0
+    
+    @pytest.mark.asyncio
+    async def test_server_error_is_labelled(self):
+        """Test that failures are reported as local LLM errors"""
+        service = self.make_service()
+        service.client.chat.completions.create = Mock(side_effect=Exception("connection refused"))
+        
+        with pytest.raises(Exception, match="Local LLM error: connection refused"):
+            await service.analyze_transcription(self.TRANSCRIPT)
 
 
 class TestWordExportService:
@@ -232,4 +788,648 @@ class TestWordExportService:
         )
         
         assert doc_stream is not None
+    
+    def test_iter_document_chunks(self):
+        """Test that a finished document is streamed in fixed-size pieces"""
+        service = WordExportService()
+        doc_stream = service.create_document(
+            transcription="Test transcription " * 2000,
+            summary="Summary",
+            participants=["Alice"],
+            decisions=[],
+            action_items=[]
+        )
+        expected = doc_stream.getvalue()
+        
+        chunks = list(iter_document_chunks(doc_stream, chunk_size=1024))
+        
+        assert len(chunks) > 1
+        assert all(len(chunk) == 1024 for chunk in chunks[:-1])
+        assert b"".join(chunks) == expected
+        assert doc_stream.closed
+    
+    @pytest.mark.parametrize("mode", ["template", "python-docx"])
+    def test_create_document_sets_direction_per_paragraph(self, mode):
+        """Test that Hebrew paragraphs are right-to-left and English ones are not, in one document"""
+        from docx import Document
+        from docx.oxml.ns import qn
+        
+        service = WordExportService(mode=mode)
+        doc_stream = service.create_document(
+            transcription="שלום לכולם, נתחיל בסקירה.\nThanks, let's start with the review.\nמעולה, תודה.",
+            summary="The team reviewed the roadmap.",
+            participants=["דני", "Alice"],
+            decisions=["נשחרר ביום שישי"],
+            action_items=[ActionItem(task="לעדכן את התיעוד", assignee="Alice", deadline="2024-01-15")]
+        )
+        
+        paragraphs = Document(doc_stream).paragraphs
+        rtl = {
+            p.text for p in paragraphs
+            if p._element.pPr is not None and p._element.pPr.find(qn('w:bidi')) is not None
+        }
+        
+        assert rtl == {
+            "שלום לכולם, נתחיל בסקירה.",
+            "מעולה, תודה.",
+            "דני",
+            "נשחרר ביום שישי",
+            "Task: לעדכן את התיעוד",
+            "  Assignee: Alice",
+            "  Deadline: 2024-01-15"
+        }
+        assert "Thanks, let's start with the review." in {p.text for p in paragraphs}
+        assert service._is_rtl_text("שלום") and not service._is_rtl_text("Hello")
+    
+    def test_template_matches_python_docx(self):
+        """Test that the template renders exactly the package python-docx builds"""
+        from app.services.docx_template import Block, build_document, get_docx_template
+        
+        blocks = list(WordExportService()._blocks(
+            transcription="שלום לכולם\nFish & <chips> \"quoted\"\n  indented\tand tabbed\rline\n",
+            summary="First line\nsecond line  ",
+            participants=["דני", "Alice"],
+            decisions=[],
+            action_items=[ActionItem(task="לעדכן את התיעוד", assignee="Alice", deadline="2024-01-15")]
+        )) + [Block("body", ""), Block("bullet", "", True)]
+        built = BytesIO()
+        build_document(blocks).save(built)
+        
+        with zipfile.ZipFile(get_docx_template().render(blocks)) as rendered, zipfile.ZipFile(built) as expected:
+            assert sorted(rendered.namelist()) == sorted(expected.namelist())
+            for name in expected.namelist():
+                assert rendered.read(name) == expected.read(name), name
+        
+        with pytest.raises(ValueError):
+            get_docx_template().render([Block("body", "bad \x00 byte")])
+    
+    def test_export_modes(self):
+        """Test choosing the renderer, and that both give the same document"""
+        content = {
+            "transcription": "Alice opened.\nשלום",
+            "summary": "Summary",
+            "participants": ["Alice"],
+            "decisions": ["Ship it"],
+            "action_items": []
+        }
+        with patch('app.services.word_export_service.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 15, 10, 30)
+            template = WordExportService(mode="template").create_document(**content)
+            python_docx = WordExportService(mode="python-docx").create_document(**content)
+        
+        assert template.getvalue()[:2] == b"PK"
+        document_xml = zipfile.ZipFile(template).read("word/document.xml")
+        assert document_xml == zipfile.ZipFile(python_docx).read("word/document.xml")
+        with patch.dict(os.environ, {"WORD_EXPORT_MODE": "python-docx"}):
+            assert WordExportService().mode == "python-docx"
+        with pytest.raises(ValueError):
+            WordExportService(mode="pdf")
 
+
+class TestExporters:
+    """Tests for the streaming text exporters"""
+    
+    def document(self, **overrides):
+        from app.services.exporters import ExportDocument
+        content = {
+            "transcription": "Alice opened.\n\nשלום לכולם\n# not a heading",
+            "summary": "Summary",
+            "participants": ["דני", "Alice"],
+            "decisions": [],
+            "action_items": [ActionItem(task="לעדכן את התיעוד", assignee="Alice", deadline="2024-01-15")]
+        }
+        content.update(overrides)
+        return ExportDocument(**content)
+    
+    def render(self, name, document):
+        from app.services.exporters import get_exporter
+        return b"".join(get_exporter(name).stream(document)).decode("utf-8")
+    
+    def test_registry(self):
+        """Test looking up formats, and registering a new one"""
+        from app.services.exporters import EXPORTERS, Exporter, get_exporter, register_exporter
+        
+        class PlainExporter(Exporter):
+            name = "plain"
+            
+            def write(self, document):
+                yield document.transcription
+        
+        assert set(EXPORTERS) == {"markdown", "html", "srt", "vtt", "jsonl"}
+        with pytest.raises(ValueError, match="Unknown export format: pdf"):
+            get_exporter("pdf")
+        try:
+            register_exporter(PlainExporter())
+            assert self.render("plain", self.document(transcription="raw")) == "raw"
+        finally:
+            EXPORTERS.pop("plain", None)
+    
+    def test_markdown_and_html(self):
+        """Test the document sections, escaping, and per-paragraph direction in HTML"""
+        document = self.document(transcription="Fish & <chips>\nשלום לכולם\n# not a heading")
+        
+        markdown = self.render("markdown", document)
+        page = self.render("html", document)
+        
+        assert "## Decisions\n\nNo decisions recorded.\n\n" in markdown
+        assert "- **Task:** לעדכן את התיעוד\n  - Assignee: Alice\n  - Deadline: 2024-01-15\n" in markdown
+        assert markdown.endswith("Fish \\& \\<chips\\>\n\nשלום לכולם\n\n\\# not a heading\n\n")
+        assert '<li dir="rtl">דני</li>\n<li dir="ltr">Alice</li>' in page
+        assert (
+            '<li dir="rtl">Task: לעדכן את התיעוד<br>Assignee: Alice<br>Deadline: 2024-01-15</li>'
+            in page
+        )
+        assert '<p dir="ltr">Fish &amp; &lt;chips&gt;</p>\n<p dir="rtl">שלום לכולם</p>' in page
+        assert page.endswith("</body>\n</html>\n")
+    
+    def test_markdown_escapes_syntax_in_text(self):
+        """Test that list markers, links and inline HTML in the transcript stay literal"""
+        from app.services.exporters import MarkdownExporter
+        exporter = MarkdownExporter()
+        
+        assert exporter._text("2024. budget approved") == "2024\\. budget approved"
+        assert exporter._text("  - not a bullet\n=== not a heading") == "\\- not a bullet  \n\\=== not a heading"
+        assert exporter._text("see [docs](http://x) <b>now</b> a*b") == "see \\[docs\\](http://x) \\<b\\>now\\</b\\> a\\*b"
+        assert exporter._text("version 2024. ok") == "version 2024. ok"
+    
+    def test_subtitle_timing(self):
+        """Test that segment timestamps are used, open ends closed, and plain transcripts estimated"""
+        from app.models.schemas import Segment
+        segments = [
+            Segment(start=0.0, text="one"),
+            Segment(start=2.0, end=None, text="  "),
+            Segment(start=4.5, end=3725.25, text="שלום\n\nלכולם"),
+            Segment(start=3726.0, text="a b c d e")
+        ]
+        
+        srt = self.render("srt", self.document(segments=segments))
+        vtt = self.render("vtt", self.document(transcription="one two three four five\nFish --> <chips>"))
+        
+        assert srt == (
+            "1\n00:00:00,000 --> 00:00:04,500\none\n\n"
+            "2\n00:00:04,500 --> 01:02:05,250\nשלום\nלכולם\n\n"
+            "3\n01:02:06,000 --> 01:02:08,000\na b c d e\n\n"
+        )
+        assert vtt == (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:02.000\none two three four five\n\n"
+            "00:00:02.000 --> 00:00:03.200\nFish -&gt; &lt;chips&gt;\n\n"
+        )
+    
+    def test_json_lines(self):
+        """Test a meeting record followed by segment records, or line records without segments"""
+        from app.models.schemas import Segment
+        
+        with_segments = self.render("jsonl", self.document(segments=[Segment(start=1.0, end=2.0, text="שלום")]))
+        without = self.render("jsonl", self.document())
+        
+        records = [json.loads(line) for line in with_segments.splitlines()]
+        assert records[0]["type"] == "meeting"
+        assert records[0]["action_items"] == [
+            {"task": "לעדכן את התיעוד", "assignee": "Alice", "deadline": "2024-01-15"}
+        ]
+        assert records[1:] == [{"type": "segment", "start": 1.0, "end": 2.0, "text": "שלום", "confidence": None}]
+        assert "שלום" in with_segments  # Not escaped to \u sequences
+        assert [json.loads(line)["text"] for line in without.splitlines()[1:]] == [
+            "Alice opened.", "שלום לכולם", "# not a heading"
+        ]
+    
+    def test_output_is_streamed(self):
+        """Test that the first chunk is sent before the transcript has been read to the end"""
+        from app.models.schemas import Segment
+        from app.services.exporters import EXPORTERS
+        read = []
+        
+        def segments():
+            for i in range(20000):
+                read.append(i)
+                yield Segment(start=float(i), end=i + 1.0, text=f"Segment number {i} of a very long meeting")
+        
+        for name in ("srt", "vtt", "jsonl"):
+            read.clear()
+            chunks = EXPORTERS[name].stream(self.document(segments=segments()))
+            first = next(chunks)
+            assert 0 < len(read) < 20000
+            assert sum(len(chunk) for chunk in chunks) > len(first)
+            assert len(read) == 20000
+
+
+
+def write_second_marker_wav(path, seconds, frame_rate=100):
+    """Write an 8-bit mono WAV where every sample in second N has value N (mod 256)"""
+    import wave
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(frame_rate)
+        wav.writeframes(b"".join(bytes([second % 256]) * frame_rate for second in range(seconds)))
+
+
+def fake_transcribe_wav(path, frame_rate=100):
+    """Local fake transcriber: one word per whole second of audio in the chunk"""
+    import wave
+    with wave.open(path, "rb") as wav:
+        samples = wav.readframes(wav.getnframes())
+    return " ".join(f"w{samples[i]}" for i in range(0, len(samples) - frame_rate + 1, frame_rate))
+
+
+class TestAudioChunker:
+    """Tests for AudioChunker"""
+    
+    def test_short_wav_is_single_chunk(self, tmp_path):
+        """Test that recordings shorter than a window are not split"""
+        audio_path = str(tmp_path / "short.wav")
+        write_second_marker_wav(audio_path, 10)
+        
+        chunks = AudioChunker(chunk_seconds=60, overlap_seconds=2).split(audio_path, str(tmp_path))
+        
+        assert len(chunks) == 1
+        assert chunks[0].path == audio_path
+    
+    def test_wav_split_with_overlap(self, tmp_path):
+        """Test fixed windows with overlap cover the whole recording"""
+        audio_path = str(tmp_path / "long.wav")
+        write_second_marker_wav(audio_path, 100)
+        
+        chunks = AudioChunker(chunk_seconds=30, overlap_seconds=4).split(audio_path, str(tmp_path))
+        
+        assert [chunk.start for chunk in chunks] == [0, 26, 52, 78]
+        assert [chunk.end for chunk in chunks] == [30, 56, 82, 100]
+        assert fake_transcribe_wav(chunks[1].path).split()[0] == "w26"
+    
+    def test_wav_window_respects_max_chunk_bytes(self, tmp_path):
+        """Test that windows shrink to stay under the provider upload limit"""
+        audio_path = str(tmp_path / "long.wav")
+        write_second_marker_wav(audio_path, 100)
+        
+        chunks = AudioChunker(chunk_seconds=600, overlap_seconds=0, max_chunk_bytes=2000).split(
+            audio_path, str(tmp_path)
+        )
+        
+        assert len(chunks) == 5
+        assert all(os.path.getsize(chunk.path) <= 2000 + 44 for chunk in chunks)  # 44-byte WAV header
+    
+    def test_mp3_split_on_frame_boundaries(self, tmp_path):
+        """Test that MP3 chunks are whole frames and cover the stream"""
+        # MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames of 1152 samples
+        frame = b"\xff\xfb\x90\x00" + b"\x00" * 413
+        audio_path = str(tmp_path / "long.mp3")
+        with open(audio_path, "wb") as f:
+            f.write(b"ID3\x03\x00\x00\x00\x00\x00\x05" + b"\x00" * 5)  # Tiny ID3v2 tag
+            f.write(frame * 1000)  # ~26 seconds
+        
+        chunks = AudioChunker(chunk_seconds=10, overlap_seconds=1).split(audio_path, str(tmp_path))
+        
+        assert len(chunks) == 3
+        for chunk in chunks:
+            with open(chunk.path, "rb") as f:
+                content = f.read()
+            assert len(content) % 417 == 0
+            assert content[:2] == b"\xff\xfb"
+        assert chunks[1].start < chunks[0].end  # Windows overlap
+        assert chunks[-1].end == pytest.approx(1000 * 1152 / 44100)
+    
+    def test_unparseable_file_is_single_chunk(self, sample_audio_file, tmp_path):
+        """Test that files the chunker cannot parse are sent whole"""
+        chunks = AudioChunker(chunk_seconds=1).split(sample_audio_file, str(tmp_path))
+        
+        assert len(chunks) == 1
+        assert chunks[0].path == sample_audio_file
+    
+    def test_float_wav_over_limit_is_decoded_and_split(self, tmp_path):
+        """Test that a float WAV the wave module rejects is split through the decoder, not sent whole"""
+        pytest.importorskip("av")
+        import struct
+        import numpy as np
+        samples = (0.5 * np.sin(2 * np.pi * 300 * np.arange(16000 * 10) / 16000)).astype("<f4").tobytes()
+        audio_path = str(tmp_path / "float.wav")
+        with open(audio_path, "wb") as f:
+            # RIFF header with an IEEE float (format 3) fmt chunk
+            f.write(b"RIFF" + struct.pack("<I", 36 + len(samples)) + b"WAVE")
+            f.write(b"fmt " + struct.pack("<IHHIIHH", 16, 3, 1, 16000, 16000 * 4, 4, 32))
+            f.write(b"data" + struct.pack("<I", len(samples)) + samples)
+        chunker = AudioChunker(chunk_seconds=600, overlap_seconds=0, max_chunk_bytes=100000)
+        
+        whole = chunker.split(audio_path, str(tmp_path))
+        assert [chunk.path for chunk in whole] == [audio_path]
+        
+        chunks = chunker.split(audio_path, str(tmp_path), AudioPreprocessor(codec="wav").decode)
+        assert len(chunks) == 4
+        assert all(os.path.getsize(chunk.path) <= 100000 + 44 for chunk in chunks)
+        assert chunks[-1].end == pytest.approx(10)
+
+
+def write_tone_wav(path, parts, frame_rate=44100, channels=2):
+    """
+    Write a 16-bit WAV of consecutive parts, each (seconds, frequency in Hz, amplitude)
+    
+    Amplitude 0 writes silence.
+    """
+    import wave
+    import numpy as np
+    signal = np.concatenate([
+        amplitude * np.sin(2 * np.pi * frequency * np.arange(int(seconds * frame_rate)) / frame_rate)
+        for seconds, frequency, amplitude in parts
+    ])
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes((np.repeat(signal, channels) * 32767).astype("<i2").tobytes())
+
+
+def read_wav_samples(path):
+    """Read a mono 16-bit WAV as floats, with its frame rate"""
+    import wave
+    import numpy as np
+    with wave.open(path, "rb") as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2") / 32768, wav.getframerate()
+
+
+class TestAudioPreprocessor:
+    """Tests for AudioPreprocessor"""
+    
+    def test_prepare_downmixes_resamples_and_trims(self, tmp_path):
+        """Test a stereo 44.1 kHz recording becomes trimmed 16 kHz mono with its offset"""
+        import numpy as np
+        audio_path = str(tmp_path / "meeting.wav")
+        write_tone_wav(audio_path, [(3, 0, 0), (4, 300, 0.5), (2, 0, 0)])
+        
+        prepared = AudioPreprocessor(codec="wav", pad_seconds=0.25).prepare(audio_path, str(tmp_path))
+        samples, frame_rate = read_wav_samples(prepared.path)
+        
+        assert frame_rate == 16000
+        assert prepared.original_seconds == pytest.approx(9, abs=0.01)
+        assert prepared.regions[0].start == pytest.approx(2.75, abs=0.02)
+        assert prepared.seconds == pytest.approx(4.5, abs=0.02)
+        assert len(samples) == pytest.approx(4.5 * 16000, abs=200)
+        # The tone keeps its pitch and level
+        spectrum = np.abs(np.fft.rfft(samples))
+        assert np.argmax(spectrum) * frame_rate / len(samples) == pytest.approx(300, abs=1)
+        assert np.max(np.abs(samples)) == pytest.approx(0.5, abs=0.01)
+    
+    def test_downsampling_filters_out_aliasing_tones(self, tmp_path):
+        """Test that content above the new Nyquist frequency is removed, not folded down"""
+        import numpy as np
+        audio_path = str(tmp_path / "hiss.wav")
+        # 12 kHz would alias to 4 kHz at a 16 kHz sample rate
+        write_tone_wav(audio_path, [(1, 12000, 0.5)], frame_rate=48000, channels=1)
+        
+        prepared = AudioPreprocessor(codec="wav", silence_threshold_db=-200).prepare(audio_path, str(tmp_path))
+        samples, _ = read_wav_samples(prepared.path)
+        
+        assert np.sqrt(np.mean(samples[100:-100] ** 2)) < 0.01
+    
+    def test_resampler_output_does_not_depend_on_block_size(self):
+        """Test that filter and interpolation state carry across blocks"""
+        import numpy as np
+        signal = np.random.default_rng(0).uniform(-1, 1, 44100).astype(np.float32)
+        
+        def resample(block_size):
+            resampler = _StreamResampler(44100, 16000)
+            parts = [resampler.process(signal[i:i + block_size]) for i in range(0, len(signal), block_size)]
+            return np.concatenate(parts + [resampler.flush()])
+        
+        whole = resample(len(signal))
+        assert len(whole) == 16000
+        np.testing.assert_allclose(resample(1000), whole, atol=1e-5)
+        np.testing.assert_allclose(resample(7), whole, atol=1e-5)
+    
+    def test_pcm_sample_widths(self):
+        """Test 8-, 16-, 24- and 32-bit PCM decode to the same scale"""
+        import numpy as np
+        assert _pcm_to_float(bytes([255, 0]), 1, 1).tolist() == pytest.approx([127 / 128, -1.0])
+        assert _pcm_to_float(np.array([16384, -32768], "<i2").tobytes(), 2, 1).tolist() == [0.5, -1.0]
+        assert _pcm_to_float(b"\x00\x00\x40\x00\x00\x80", 3, 1).tolist() == [0.5, -1.0]
+        assert _pcm_to_float(np.array([2 ** 30, -2 ** 31], "<i4").tobytes(), 4, 1).tolist() == [0.5, -1.0]
+        # Stereo frames are averaged
+        assert _pcm_to_float(np.array([16384, 0], "<i2").tobytes(), 2, 2).tolist() == [0.25]
+    
+    def test_silent_recording_is_not_trimmed_away(self, tmp_path):
+        """Test that a recording with no sound is kept whole"""
+        audio_path = str(tmp_path / "silence.wav")
+        write_tone_wav(audio_path, [(2, 0, 0)], frame_rate=16000, channels=1)
+        
+        prepared = AudioPreprocessor(codec="wav").prepare(audio_path, str(tmp_path))
+        
+        assert prepared.regions == [(0, 2)]
+        assert prepared.seconds == pytest.approx(2)
+    
+    def test_encode_opus_is_smaller(self, tmp_path):
+        """Test re-encoding a prepared WAV to Opus"""
+        pytest.importorskip("av")
+        audio_path = str(tmp_path / "meeting.wav")
+        write_tone_wav(audio_path, [(5, 300, 0.5)])
+        preprocessor = AudioPreprocessor(codec="opus")
+        prepared = preprocessor.prepare(audio_path, str(tmp_path))
+        wav_bytes = os.path.getsize(prepared.path)
+        
+        encoded_path = preprocessor.encode(prepared.path)
+        
+        assert encoded_path.endswith(".ogg")
+        assert not os.path.exists(prepared.path)
+        assert os.path.getsize(encoded_path) < wav_bytes / 4
+    
+    def test_compressed_codec_falls_back_to_wav_without_pyav(self, sample_audio_file, tmp_path):
+        """Test that only the NumPy path is used when PyAV is not installed"""
+        with patch.object(audio_preprocessor, "av", None):
+            preprocessor = AudioPreprocessor(codec="opus")
+            assert preprocessor.codec == "wav"
+            with pytest.raises(ValueError, match="PyAV"):
+                preprocessor.prepare(sample_audio_file, str(tmp_path))
+    
+    def test_unknown_codec(self):
+        """Test that an unsupported codec is rejected"""
+        with pytest.raises(ValueError, match="Unknown audio codec"):
+            AudioPreprocessor(codec="aac")
+
+
+def synthetic_speech(parts, sample_rate=16000, noise_db=-70, seed=0):
+    """
+    Build a mono test signal of consecutive parts, each (seconds, level in dBFS or None)
+    
+    Sounding parts are a 200 Hz tone amplitude-modulated at 4 Hz, like syllables;
+    None parts are silence. Noise at noise_db runs under everything.
+    """
+    import numpy as np
+    pieces = []
+    for seconds, level_db in parts:
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        if level_db is None:
+            pieces.append(np.zeros_like(t))
+        else:
+            envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+            pieces.append(10 ** (level_db / 20) * np.sqrt(2) * envelope * np.sin(2 * np.pi * 200 * t))
+    signal = np.concatenate(pieces)
+    noise = np.random.default_rng(seed).normal(0, 10 ** (noise_db / 20), signal.size)
+    return (signal + noise).astype(np.float32)
+
+
+class TestVoiceActivityDetector:
+    """Tests for VoiceActivityDetector on synthetic signals"""
+    
+    def make_detector(self, **overrides):
+        settings = {"threshold_db": -45, "margin_db": 12, "min_speech_seconds": 0.2,
+                    "min_silence_seconds": 1.0, "pad_seconds": 0.3}
+        settings.update(overrides)
+        return VoiceActivityDetector(**settings)
+    
+    def test_finds_speech_between_silences(self):
+        """Test that each stretch of speech becomes a padded region"""
+        signal = synthetic_speech([(1, None), (2, -20), (5, None), (3, -20), (1, None)])
+        
+        regions = self.make_detector().detect(signal, 16000)
+        
+        assert len(regions) == 2
+        assert regions[0].start == pytest.approx(0.7, abs=0.03)
+        assert regions[0].end == pytest.approx(3.3, abs=0.03)
+        assert regions[1].start == pytest.approx(7.7, abs=0.03)
+        assert regions[1].end == pytest.approx(11.3, abs=0.03)
+    
+    def test_short_pauses_stay_inside_a_region(self):
+        """Test that gaps between words shorter than min_silence_seconds are not cut"""
+        signal = synthetic_speech([(1, -20), (0.6, None), (1, -20), (3, None)])
+        
+        regions = self.make_detector().detect(signal, 16000)
+        
+        assert len(regions) == 1
+        assert regions[0].end == pytest.approx(2.9, abs=0.03)
+    
+    def test_clicks_are_not_speech(self):
+        """Test that bursts shorter than min_speech_seconds are dropped"""
+        signal = synthetic_speech([(2, None), (0.05, -10), (2, None), (1, -20), (2, None)])
+        
+        regions = self.make_detector().detect(signal, 16000)
+        
+        assert len(regions) == 1
+        assert regions[0].start == pytest.approx(3.75, abs=0.03)
+    
+    def test_threshold_adapts_to_background_noise(self):
+        """Test that steady noise well below the speech level counts as silence"""
+        signal = synthetic_speech([(3, None), (2, -10), (3, None)], noise_db=-38)
+        detector = self.make_detector()
+        
+        regions = detector.detect(signal, 16000)
+        
+        assert detector.threshold(frame_levels(signal, 16000)) > -38
+        assert len(regions) == 1
+        assert regions[0].start == pytest.approx(2.7, abs=0.05)
+        assert regions[0].end == pytest.approx(5.3, abs=0.05)
+    
+    def test_continuous_speech_is_kept_whole(self):
+        """Test that quieter passages of a recording with no silence are not cut"""
+        signal = synthetic_speech([(2, -15), (2, -32), (2, -15)])
+        
+        regions = self.make_detector().detect(signal, 16000)
+        
+        assert regions == [(0, pytest.approx(6))]
+    
+    def test_silence_has_no_regions(self):
+        """Test that a recording without sound yields no speech"""
+        assert self.make_detector().detect(synthetic_speech([(3, None)]), 16000) == []
+    
+    def test_preprocessor_skips_inner_silence_and_maps_times_back(self, tmp_path):
+        """Test that only speech is kept and prepared times map to the original timeline"""
+        import wave
+        signal = synthetic_speech([(1, None), (2, -20), (5, None), (3, -20), (1, None)])
+        audio_path = str(tmp_path / "meeting.wav")
+        with wave.open(audio_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes((signal * 32767).astype("<i2").tobytes())
+        preprocessor = AudioPreprocessor(codec="wav")
+        preprocessor.vad = self.make_detector()
+        
+        prepared = preprocessor.prepare(audio_path, str(tmp_path))
+        samples, _ = read_wav_samples(prepared.path)
+        
+        assert len(prepared.regions) == 2
+        assert prepared.seconds == pytest.approx(2.6 + 3.6, abs=0.05)
+        assert len(samples) == pytest.approx(prepared.seconds * 16000, abs=1)
+        assert prepared.original_seconds - prepared.seconds == pytest.approx(5.8, abs=0.05)
+        # A time in the second region of the prepared file
+        assert prepared.to_original(3.0) == pytest.approx(7.7 + 0.4, abs=0.05)
+        # The join maps to the end of the first region, or the start of the second
+        join = prepared.regions[0].end - prepared.regions[0].start
+        assert prepared.to_original(join, at_end=True) == pytest.approx(prepared.regions[0].end)
+        assert prepared.to_original(join) == pytest.approx(prepared.regions[1].start)
+
+
+class TestStitchTranscripts:
+    """Tests for stitch_transcripts"""
+    
+    def test_stitch_removes_overlap(self):
+        """Test that words repeated in the overlap appear once"""
+        texts = ["the quick brown fox jumps", "brown fox jumps over the lazy", "over the lazy dog"]
+        assert stitch_transcripts(texts) == "the quick brown fox jumps over the lazy dog"
+    
+    def test_stitch_ignores_punctuation_and_case(self):
+        """Test that overlap matching tolerates punctuation and capitalization differences"""
+        texts = ["We agreed to ship on Friday.", "Ship on Friday, and then review"]
+        assert stitch_transcripts(texts) == "We agreed to Ship on Friday, and then review"
+    
+    def test_stitch_without_overlap_concatenates(self):
+        """Test that chunks without a common run are joined as-is"""
+        assert stitch_transcripts(["first part", "", "second part"]) == "first part second part"
+    
+    def test_stitch_keeps_line_breaks(self):
+        """Test that the chunks' own text is kept, not rebuilt from words"""
+        texts = ["Alice: we ship Friday.\nBob: and then review", "and then review  the notes.\nAlice: done"]
+        assert stitch_transcripts(texts) == "Alice: we ship Friday.\nBob: and then review  the notes.\nAlice: done"
+    
+    def test_stitch_unspaced_script(self):
+        """Test that overlaps are found and cut inside text written without spaces"""
+        texts = ["今日は会議を始めます。まず予算について", "まず予算について話しましょう。"]
+        assert stitch_transcripts(texts) == "今日は会議を始めます。まず予算について話しましょう。"
+        assert stitch_transcripts(["สวัสดีครับ", "วันนี้ประชุม"]) == "สวัสดีครับวันนี้ประชุม"
+    
+    def test_stitch_chunked_fake_transcription(self, tmp_path):
+        """Test chunk + fake transcribe + stitch reproduces the unchunked transcript"""
+        audio_path = str(tmp_path / "meeting.wav")
+        write_second_marker_wav(audio_path, 300)
+        
+        chunks = AudioChunker(chunk_seconds=45, overlap_seconds=5).split(audio_path, str(tmp_path))
+        stitched = stitch_transcripts([fake_transcribe_wav(chunk.path) for chunk in chunks])
+        
+        assert len(chunks) > 5
+        assert stitched == fake_transcribe_wav(audio_path)
+
+
+class TestTranscriptSegments:
+    """Tests for TranscriptSegment and stitch_segments"""
+    
+    def test_segment_is_compact(self):
+        """Test that segments carry no per-instance dict"""
+        segment = TranscriptSegment(1.0, 2.5, "Hello", 0.9)
+        
+        assert not hasattr(segment, "__dict__")
+        assert segment.to_dict() == {"start": 1.0, "end": 2.5, "text": "Hello", "confidence": 0.9}
+        with pytest.raises(AttributeError):
+            segment.speaker = "Alice"
+    
+    def test_confidence_and_text(self):
+        """Test confidence scaling and joining segment text"""
+        assert confidence_from_logprob(None) is None
+        assert confidence_from_logprob(0.2) == 1.0
+        assert confidence_from_logprob(-0.6931) == 0.5
+        assert segments_text([TranscriptSegment(0, 1, " a "), TranscriptSegment(1, 2, ""), TranscriptSegment(2, 3, "b")]) == "a b"
+    
+    def test_stitch_keeps_one_copy_of_overlap(self):
+        """Test that overlap segments are split at the middle of the shared audio"""
+        chunks = [AudioChunk("a.wav", 0.0, 30.0), AudioChunk("b.wav", 25.0, 55.0), AudioChunk("c.wav", 50.0, None)]
+        per_chunk = [
+            [TranscriptSegment(float(t), t + 1.0, f"w{t}") for t in range(0, 30)],
+            [TranscriptSegment(float(t), t + 1.0, f"w{t}") for t in range(25, 55)],
+            [TranscriptSegment(float(t), t + 1.0, f"w{t}") for t in range(50, 60)]
+        ]
+        
+        stitched = stitch_segments(chunks, per_chunk)
+        
+        assert [segment.text for segment in stitched] == [f"w{t}" for t in range(60)]
+    
+    def test_chunk_original_time(self):
+        """Test that chunk-relative times map through the chunk's timeline"""
+        assert AudioChunk("a.wav", 10.0, 20.0).original_time(2.5) == 12.5
+        shifted = AudioChunk("a.wav", 10.0, 20.0, timeline=lambda seconds, at_end: seconds * 2)
+        assert shifted.original_time(3.0) == 6.0
@@ -0,0 +1,525 @@
+"""Tests for storage layer"""
+import json
+import pytest
+import time
+
+from app.storage.analysis_cache import AnalysisCache, normalize_transcript
+from app.storage.result_cache import ResultCache
+from app.storage.job_store import JobStore
+from app.storage.meeting_store import MeetingStore, to_fts_query
+from app.models.schemas import TranscriptionResponse, ActionItem, Segment
+
+
+def make_response(summary: str = "Test summary") -> TranscriptionResponse:
+    return TranscriptionResponse(
+        transcription="Test transcription",
+        summary=summary,
+        participants=["Alice"],
+        decisions=["Decision 1"],
+        action_items=[ActionItem(task="Task 1", assignee="Alice", deadline="2024-01-15")]
+    )
+
+
+class TestResultCache:
+    """Tests for ResultCache"""
+    
+    def test_put_and_get(self, tmp_path):
+        """Test that a stored result round-trips and counts as a hit"""
+        cache = ResultCache(db_path=str(tmp_path / "cache.db"))
+        key = ResultCache.make_key("abc123", "he", "whisper-1", "llama")
+        
+        assert cache.get(key) is None
+        cache.put(key, make_response())
+        
+        assert cache.get(key) == make_response()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["entries"] == 1
+    
+    def test_key_includes_language_and_models(self):
+        """Test that the same audio with different settings gets different keys"""
+        keys = {
+            ResultCache.make_key("abc123", None, "whisper-1", "llama"),
+            ResultCache.make_key("abc123", "he", "whisper-1", "llama"),
+            ResultCache.make_key("abc123", None, "whisper-1", "other-model"),
+        }
+        assert len(keys) == 3
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that results survive a restart"""
+        db_path = str(tmp_path / "cache.db")
+        ResultCache(db_path=db_path).put("key", make_response())
+        
+        assert ResultCache(db_path=db_path).get("key") == make_response()
+    
+    def test_segments_kept_out_of_response_unless_asked(self, tmp_path):
+        """Test that segments given to put are cached and only returned on request"""
+        from app.models.transcript import TranscriptSegment
+        cache = ResultCache(db_path=str(tmp_path / "cache.db"))
+        segments = [TranscriptSegment(0.0, 1.5, "Hi", 0.9), TranscriptSegment(1.5, None, "there")]
+        cache.put("key", make_response(), segments)
+        
+        assert cache.get("key", with_segments=False).segments is None
+        assert [segment.text for segment in cache.get("key").segments] == ["Hi", "there"]
+        assert cache.segments("key") == segments
+        assert cache.segments("missing") is None
+        
+        cache.set_meeting("key", "m1")
+        assert cache.get("key").meeting_id == "m1"
+        assert cache.segments("key") == segments
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired entries are misses and get removed"""
+        cache = ResultCache(db_path=str(tmp_path / "cache.db"), ttl_seconds=0.05)
+        cache.put("key", make_response())
+        time.sleep(0.1)
+        
+        assert cache.get("key") is None
+        assert cache.stats()["entries"] == 0
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted first"""
+        cache = ResultCache(db_path=str(tmp_path / "cache.db"), max_entries=2)
+        cache.put("first", make_response("first"))
+        time.sleep(0.01)
+        cache.put("second", make_response("second"))
+        time.sleep(0.01)
+        cache.get("first")  # Touch - "second" is now least recently used
+        time.sleep(0.01)
+        cache.put("third", make_response("third"))
+        
+        assert cache.get("second") is None
+        assert cache.get("first").summary == "first"
+        assert cache.get("third").summary == "third"
+
+
+class TestJobStore:
+    """Tests for JobStore"""
+    
+    def test_create_and_get(self, tmp_path):
+        """Test that new jobs are queued"""
+        store = JobStore(db_path=str(tmp_path / "jobs.db"))
+        job = store.create("meeting.mp3", "/spool/meeting.mp3", language="he", content_hash="abc")
+        
+        assert job["status"] == "queued"
+        assert store.get(job["id"])["language"] == "he"
+        assert store.get("missing") is None
+    
+    def test_claim_next_is_fifo(self, tmp_path):
+        """Test that jobs are claimed oldest first and only once"""
+        store = JobStore(db_path=str(tmp_path / "jobs.db"))
+        first = store.create("first.mp3", "/spool/first.mp3")
+        time.sleep(0.01)
+        second = store.create("second.mp3", "/spool/second.mp3")
+        
+        assert store.claim_next()["id"] == first["id"]
+        assert store.claim_next()["id"] == second["id"]
+        assert store.claim_next() is None
+        assert store.get(first["id"])["status"] == "running"
+    
+    def test_complete_and_fail(self, tmp_path):
+        """Test terminal job states"""
+        store = JobStore(db_path=str(tmp_path / "jobs.db"))
+        done = store.create("done.mp3", "/spool/done.mp3")
+        broken = store.create("broken.mp3", "/spool/broken.mp3")
+        
+        store.complete(done["id"], make_response().model_dump_json())
+        store.fail(broken["id"], "Whisper API error")
+        
+        assert store.get(done["id"])["status"] == "completed"
+        assert TranscriptionResponse.model_validate_json(store.get(done["id"])["result"]) == make_response()
+        assert store.get(broken["id"])["status"] == "failed"
+        assert store.get(broken["id"])["error"] == "Whisper API error"
+    
+    def test_queue_survives_restart(self, tmp_path):
+        """Test that queued and crashed jobs are picked up by a new process once stale"""
+        db_path = str(tmp_path / "jobs.db")
+        store = JobStore(db_path=db_path)
+        interrupted = store.create("interrupted.mp3", "/spool/interrupted.mp3")
+        store.claim_next()
+        waiting = store.create("waiting.mp3", "/spool/waiting.mp3")
+        store.close()
+        
+        restarted = JobStore(db_path=db_path, stale_after=0.05)
+        assert restarted.requeue_interrupted() == 0  # Heartbeat still fresh
+        time.sleep(0.1)
+        assert restarted.requeue_interrupted() == 1
+        assert restarted.claim_next()["id"] == interrupted["id"]
+        assert restarted.claim_next()["id"] == waiting["id"]
+    
+    def test_requeue_skips_jobs_with_live_heartbeat(self, tmp_path):
+        """Test that a starting process leaves another live process's jobs alone"""
+        db_path = str(tmp_path / "jobs.db")
+        live = JobStore(db_path=db_path, stale_after=0.05)
+        job = live.create("live.mp3", "/spool/live.mp3")
+        live.claim_next()
+        other = JobStore(db_path=db_path, stale_after=0.05)
+        
+        time.sleep(0.1)
+        assert live.heartbeat() == 1
+        assert other.requeue_interrupted() == 0
+        assert other.release() == 0  # Not its job
+        assert live.release() == 1
+        assert other.claim_next()["id"] == job["id"]
+        assert other.get(job["id"])["owner"] == other.owner
+    
+    def test_claim_is_atomic_across_processes(self, tmp_path):
+        """Test that stores sharing a database never claim the same job twice"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        db_path = str(tmp_path / "jobs.db")
+        stores = [JobStore(db_path=db_path) for _ in range(4)]
+        jobs = {stores[0].create(f"job_{i}.mp3", f"/spool/job_{i}.mp3")["id"] for i in range(40)}
+        
+        def drain(store):
+            claimed = []
+            while (job := store.claim_next()) is not None:
+                claimed.append(job["id"])
+            return claimed
+        
+        with ThreadPoolExecutor(max_workers=len(stores)) as pool:
+            claimed = [job_id for batch in pool.map(drain, stores) for job_id in batch]
+        
+        assert sorted(claimed) == sorted(jobs)
+    
+    def test_requeued_job_waits_for_not_before(self, tmp_path):
+        """Test that a job requeued with a delay is skipped until it is due"""
+        store = JobStore(db_path=str(tmp_path / "jobs.db"))
+        delayed = store.create("delayed.mp3", "/spool/delayed.mp3")
+        store.claim_next()
+        store.requeue(delayed["id"], delay=0.1)
+        later = store.create("later.mp3", "/spool/later.mp3")
+        
+        assert store.claim_next()["id"] == later["id"]
+        assert store.claim_next() is None
+        time.sleep(0.15)
+        assert store.claim_next()["id"] == delayed["id"]
+    
+    def test_requeues_are_capped(self, tmp_path):
+        """Test that a job that keeps coming back is failed once it has used up its requeues"""
+        spooled = tmp_path / "crashing.mp3"
+        spooled.write_bytes(b"audio")
+        store = JobStore(db_path=str(tmp_path / "jobs.db"), stale_after=0, max_requeues=2)
+        limited = store.create("limited.mp3", "/spool/limited.mp3")
+        store.claim_next()
+        assert store.requeue(limited["id"]) and store.claim_next()["id"] == limited["id"]
+        assert store.requeue(limited["id"]) and store.claim_next()["id"] == limited["id"]
+        assert not store.requeue(limited["id"])
+        assert store.get(limited["id"])["requeues"] == 2
+        store.fail(limited["id"], "rate limited")
+        
+        # A job whose worker dies on every run is requeued by other processes the same number of times
+        crashing = store.create("crashing.mp3", str(spooled))
+        for _ in range(2):
+            store.claim_next()
+            assert JobStore(db_path=store.db_path, stale_after=0, max_requeues=2).requeue_interrupted() == 1
+        store.claim_next()
+        assert store.requeue_interrupted() == 0
+        
+        job = store.get(crashing["id"])
+        assert job["status"] == "failed"
+        assert "stopped responding" in job["error"]
+        assert not spooled.exists()
+    
+    def test_requeue_count_added_to_existing_database(self, tmp_path):
+        """Test that a jobs table from before requeue counts gets the column"""
+        import sqlite3
+        db_path = str(tmp_path / "jobs.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT NOT NULL, language TEXT,
+                audio_path TEXT NOT NULL, content_hash TEXT, result TEXT, error TEXT,
+                created_at REAL NOT NULL, updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("INSERT INTO jobs VALUES ('old', 'queued', 'old.mp3', NULL, '/spool/old.mp3', NULL, NULL, NULL, 0, 0)")
+        conn.commit()
+        conn.close()
+        
+        store = JobStore(db_path=db_path)
+        assert store.claim_next()["requeues"] == 0
+        assert store.requeue("old")
+        assert store.get("old")["requeues"] == 1
+
+
+class TestMeetingStore:
+    """Tests for MeetingStore"""
+    
+    def test_save_and_get(self, tmp_path):
+        """Test that a meeting round-trips with its child rows in order"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        result = make_response().model_copy(update={
+            "participants": ["Alice", "Bob"],
+            "decisions": ["Ship it", "Review Friday"],
+            "segments": [Segment(start=0.0, end=1.5, text="Hello", confidence=0.9), Segment(start=1.5, text="there")]
+        })
+        
+        meeting = store.save(result, filename="standup.mp3", language="en")
+        stored = store.get(meeting["id"])
+        
+        assert stored["filename"] == "standup.mp3"
+        assert stored["language"] == "en"
+        assert stored["result"] == result.model_copy(update={"meeting_id": meeting["id"]})
+        assert store.get(meeting["id"], with_segments=False)["result"].segments is None
+        assert store.get("missing") is None
+    
+    def test_segments_pages(self, tmp_path):
+        """Test paging through segments, and meetings stored without them"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        segments = [Segment(start=float(i), end=i + 1.0, text=f"w{i}") for i in range(25)]
+        timed = store.save(make_response().model_copy(update={"segments": segments}))
+        plain = store.save(make_response())
+        
+        page, total = store.segments(timed["id"], offset=20, limit=10)
+        
+        assert [segment.text for segment in page] == [f"w{i}" for i in range(20, 25)]
+        assert total == 25
+        assert store.segments(plain["id"]) is None
+        assert store.get(plain["id"])["result"].segments is None
+    
+    def test_list_is_newest_first_with_cursor(self, tmp_path):
+        """Test keyset pagination visits every meeting once, newest first"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        ids = [store.save(make_response(f"Meeting {i}"))["id"] for i in range(7)]
+        
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.list(limit=3, cursor=cursor)
+            seen += page
+            if cursor is None:
+                break
+        
+        assert sorted(meeting["id"] for meeting in seen) == sorted(ids)
+        created = [meeting["created_at"] for meeting in seen]
+        assert created == sorted(created, reverse=True)
+        assert page[-1]["participants"] == ["Alice"]
+        assert page[-1]["action_item_count"] == 1
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            store.list(cursor="garbage")
+    
+    def test_list_by_participant_and_delete(self, tmp_path):
+        """Test the participant filter and that deleting removes child rows"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        alice = store.save(make_response())
+        bob = store.save(make_response().model_copy(update={"participants": ["Bob"]}))
+        
+        page, _ = store.list(participant="Bob")
+        assert [meeting["id"] for meeting in page] == [bob["id"]]
+        
+        assert store.delete(alice["id"]) is True
+        assert store.delete(alice["id"]) is False
+        assert store.count() == 1
+        assert store._conn.execute("SELECT COUNT(*) FROM action_items").fetchone()[0] == 1
+    
+    def test_lookups_use_indexes(self, tmp_path):
+        """Test that list and child-row queries are index searches, not table scans"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        
+        def plan(sql, *params):
+            return " ".join(row[3] for row in store._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        
+        assert "idx_meetings_created" in plan(
+            "SELECT id FROM meetings WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 20", 1.0, "x"
+        )
+        assert "PRIMARY KEY" in plan(
+            "SELECT text FROM segments WHERE meeting_id = ? AND position >= ? ORDER BY position", "x", 0
+        )
+        assert "idx_participants_name" in plan("SELECT meeting_id FROM participants WHERE name = ?", "Bob")
+    
+    def test_search_ranks_and_snippets(self, tmp_path):
+        """Test that decisions outrank passing mentions and hits carry a snippet"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        mentioned = store.save(make_response().model_copy(update={
+            "transcription": "Someone mentioned the budget once while we talked about hiring and the offsite"
+        }))
+        decided = store.save(make_response().model_copy(update={
+            "decisions": ["We decided to freeze the travel budget"]
+        }))
+        store.save(make_response().model_copy(update={"transcription": "Nothing relevant here"}))
+        
+        hits, total = store.search("budget")
+        
+        assert total == 2
+        assert [hit["id"] for hit in hits] == [decided["id"], mentioned["id"]]
+        assert hits[0]["score"] > hits[1]["score"] > 0
+        assert "<mark>budget</mark>" in hits[0]["snippet"]
+        assert store.search('"travel budget"')[1] == 1
+        assert store.search("budg*")[1] == 2
+        assert store.search("Alice")[1] == 3  # Action item assignees are searchable
+    
+    def test_search_pages_and_follows_deletes(self, tmp_path):
+        """Test search pagination and that deleted meetings stop matching"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        ids = [store.save(make_response(f"Roadmap review {i}"))["id"] for i in range(5)]
+        
+        first, total = store.search("roadmap", limit=3)
+        rest, _ = store.search("roadmap", limit=3, offset=3)
+        assert total == 5
+        assert sorted(hit["id"] for hit in first + rest) == sorted(ids)
+        assert store.search("roadmap", offset=10) == ([], 5)
+        
+        store.delete(ids[0])
+        assert store.search("roadmap")[1] == 4
+    
+    def test_search_query_is_sanitized(self, tmp_path):
+        """Test that FTS5 syntax in user input cannot break the query"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        store.save(make_response("Plan AND budget: NEAR term"))
+        
+        assert to_fts_query('we decided "next quarter" budg* ,') == '"we" "decided" "next quarter" "budg"*'
+        assert store.search("AND budget: NEAR(")[1] == 1
+        assert store.search('"unclosed')[1] == 0
+        with pytest.raises(ValueError, match="empty"):
+            store.search(" ,; ")
+    
+    def test_search_index_built_for_existing_meetings(self, tmp_path):
+        """Test that a database from before the search index is indexed on open"""
+        db_path = str(tmp_path / "meetings.db")
+        store = MeetingStore(db_path=db_path)
+        meeting = store.save(make_response("Quarterly planning"))
+        store._conn.execute("DROP TABLE meeting_search")
+        store.close()
+        
+        reopened = MeetingStore(db_path=db_path)
+        assert [hit["id"] for hit in reopened.search("quarterly")[0]] == [meeting["id"]]
+        assert reopened.search("Decision")[1] == 1
+    
+    def test_search_survives_rowid_renumbering(self, tmp_path):
+        """Test that hits follow meeting ids, not the implicit rowids VACUUM may renumber"""
+        db_path = str(tmp_path / "meetings.db")
+        store = MeetingStore(db_path=db_path)
+        budget = store.save(make_response("Budget review"))
+        roadmap = store.save(make_response("Roadmap review"))
+        # What VACUUM is allowed to do to a table without an INTEGER PRIMARY KEY
+        store._conn.execute("UPDATE meetings SET rowid = -rowid")
+        store._conn.execute("UPDATE meetings SET rowid = 3 - (-rowid)")
+        store._conn.commit()
+        
+        assert [hit["id"] for hit in store.search("budget")[0]] == [budget["id"]]
+        store.delete(roadmap["id"])
+        assert store.search("roadmap")[1] == 0
+        assert [hit["id"] for hit in store.search("budget")[0]] == [budget["id"]]
+    
+    def test_rowid_search_index_is_rebuilt(self, tmp_path):
+        """Test that an index keyed on meeting rowids is replaced by one keyed on meeting ids"""
+        db_path = str(tmp_path / "meetings.db")
+        store = MeetingStore(db_path=db_path)
+        meeting = store.save(make_response("Quarterly planning"))
+        store._conn.execute("DROP TABLE meeting_search")
+        store._conn.execute("CREATE VIRTUAL TABLE meeting_search USING fts5 (transcription, summary)")
+        store._conn.execute("INSERT INTO meeting_search (rowid, transcription, summary) VALUES (42, 'stale', 'stale')")
+        store._conn.commit()
+        store.close()
+        
+        reopened = MeetingStore(db_path=db_path)
+        assert [hit["id"] for hit in reopened.search("quarterly")[0]] == [meeting["id"]]
+        assert reopened.search("stale")[1] == 0
+    
+    def test_update_replaces_analysis(self, tmp_path):
+        """Test that an update rewrites the transcript, analysis, segments, parts and search index"""
+        store = MeetingStore(db_path=str(tmp_path / "meetings.db"))
+        meeting = store.save(
+            make_response().model_copy(update={"segments": [Segment(start=0.0, end=2.0, text="Hello Bob")]}),
+            filename="standup.mp3", language="en",
+            parts=[{"text": "Hello Bob", "analysis": {"summary": "Bob said hello"}, "analyzer": "groq", "model": "llama"}]
+        )
+        assert store.parts(meeting["id"]) == [
+            {"text": "Hello Bob", "analysis": {"summary": "Bob said hello"}, "analyzer": "groq", "model": "llama"}
+        ]
+        
+        updated = TranscriptionResponse(
+            transcription="Hello Rob",
+            summary="Rob said hello",
+            participants=["Rob"],
+            decisions=[],
+            action_items=[ActionItem(task="Follow up", assignee="Rob")],
+            segments=[Segment(start=0.0, end=2.0, text="Hello Rob")]
+        )
+        assert store.update(meeting["id"], updated, parts=[{"text": "Hello Rob", "analysis": {"summary": "Rob"}}])
+        assert not store.update("missing", updated)
+        
+        stored = store.get(meeting["id"])
+        assert stored["filename"] == "standup.mp3"
+        assert stored["created_at"] == meeting["created_at"]
+        assert stored["result"].transcription == "Hello Rob"
+        assert stored["result"].participants == ["Rob"]
+        assert stored["result"].segments[0].text == "Hello Rob"
+        assert store.parts(meeting["id"])[0]["text"] == "Hello Rob"
+        assert store.parts(meeting["id"])[0]["analyzer"] is None  # Not recorded for these parts
+        assert store.search("Rob")[1] == 1
+        assert store.search("Bob")[1] == 0
+        assert store.list(participant="Rob")[0][0]["id"] == meeting["id"]
+        
+        store.delete(meeting["id"])
+        assert store.parts(meeting["id"]) == []
+
+
+class TestAnalysisCache:
+    """Tests for AnalysisCache"""
+    
+    ANALYSIS = {"summary": "Summary", "participants": ["Alice"], "decisions": [], "action_items": []}
+    
+    def test_key_normalizes_text(self):
+        """Test that whitespace and Unicode form do not change the key, but everything else does"""
+        key = AnalysisCache.make_key("transcript", "Hello  world\n", "", "prompt", "llama", 0.3)
+        
+        assert normalize_transcript(" café\n\tok ") == "café ok"
+        assert AnalysisCache.make_key("transcript", " Hello world", "", "prompt", "llama", 0.3) == key
+        assert AnalysisCache.make_key("transcript", "Hello World", "", "prompt", "llama", 0.3) != key
+        assert AnalysisCache.make_key("segment", "Hello world", "", "prompt", "llama", 0.3) != key
+        assert AnalysisCache.make_key("transcript", "Hello world", "Hebrew", "prompt", "llama", 0.3) != key
+        assert AnalysisCache.make_key("transcript", "Hello world", "", "prompt v2", "llama", 0.3) != key
+        assert AnalysisCache.make_key("transcript", "Hello world", "", "prompt", "mixtral", 0.3) != key
+        assert AnalysisCache.make_key("transcript", "Hello world", "", "prompt", "llama", 0.0) != key
+    
+    def test_memory_tier_then_disk_tier(self, tmp_path):
+        """Test that a restart is served from disk and promoted back into memory"""
+        db_path = str(tmp_path / "analysis.db")
+        cache = AnalysisCache(db_path=db_path)
+        cache.put("meeting_analysis", "v1", "key", self.ANALYSIS)
+        assert cache.get("meeting_analysis", "v1", "key") == self.ANALYSIS
+        assert cache.get("meeting_analysis", "v1", "other") is None
+        cache.close()
+        
+        restarted = AnalysisCache(db_path=db_path)
+        assert restarted.get("meeting_analysis", "v1", "key") == self.ANALYSIS
+        assert restarted.get("meeting_analysis", "v1", "key") == self.ANALYSIS
+        stats = restarted.stats()
+        assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+    
+    def test_memory_is_bounded(self, tmp_path):
+        """Test that the memory tier evicts least recently used entries past its size"""
+        entry_size = len(json.dumps(self.ANALYSIS))
+        cache = AnalysisCache(db_path=str(tmp_path / "analysis.db"), memory_bytes=entry_size * 3)
+        for i in range(5):
+            cache.put("meeting_analysis", "v1", f"key{i}", self.ANALYSIS)
+        
+        assert cache.stats()["memory_entries"] == 3
+        assert cache.stats()["memory_bytes"] <= entry_size * 3
+        assert cache.stats()["disk_entries"] == 5
+        assert cache.get("meeting_analysis", "v1", "key0") == self.ANALYSIS  # Evicted from memory, still on disk
+        assert cache.stats()["disk_hits"] == 1
+    
+    def test_disk_is_bounded(self, tmp_path):
+        """Test that the disk tier keeps at most max_entries"""
+        cache = AnalysisCache(db_path=str(tmp_path / "analysis.db"), max_entries=2)
+        for i in range(4):
+            cache.put("meeting_analysis", "v1", f"key{i}", self.ANALYSIS)
+        
+        assert cache.stats()["disk_entries"] == 2
+    
+    def test_new_prompt_version_invalidates(self, tmp_path):
+        """Test that entries from an older prompt version are dropped from both tiers"""
+        db_path = str(tmp_path / "analysis.db")
+        cache = AnalysisCache(db_path=db_path)
+        cache.put("meeting_analysis", "v1", "key", self.ANALYSIS)
+        cache.put("meeting_reduce", "r1", "key", {"summary": "Merged"})
+        
+        assert cache.get("meeting_analysis", "v2", "key") is None
+        assert cache.get("meeting_reduce", "r1", "key") == {"summary": "Merged"}
+        assert cache.stats()["invalidated"] == 1
+        cache.close()
+        assert AnalysisCache(db_path=db_path).get("meeting_analysis", "v1", "key") is None
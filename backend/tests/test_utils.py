@@ -0,0 +1,376 @@
+"""Tests for utility layer"""
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from logging.handlers import QueueHandler
+from unittest.mock import Mock, patch
+
+import httpx
+import openai
+import pytest
+
+from app.utils.logger import setup_logger, log_payload, flush_logs
+from app.utils.rate_limiter import (
+    RateLimitExceededError,
+    RateLimitScheduler,
+    is_retryable,
+    rate_limiter_from_env,
+    retry_after_seconds
+)
+from app.utils.text_direction import is_rtl, rtl_flags
+from app.utils.transcript_diff import project_edit
+
+
+def unique_name(prefix: str) -> str:
+    """Logger names are process-global - keep each test's loggers separate"""
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
+def read_log(path) -> str:
+    flush_logs()
+    return path.read_text(encoding="utf-8")
+
+
+class TestLogger:
+    """Tests for queue-based logging setup"""
+    
+    def test_logger_writes_through_queue(self, tmp_path):
+        """Test that records go through a QueueHandler and reach the log file"""
+        name = unique_name("queued")
+        with patch.dict(os.environ, {"LOG_DIR": str(tmp_path)}):
+            logger = setup_logger(name)
+        
+        assert len(logger.handlers) == 1 and isinstance(logger.handlers[0], QueueHandler)
+        logger.info("hello from the request path")
+        
+        assert "hello from the request path" in read_log(tmp_path / f"{name}.log")
+    
+    def test_log_level_from_environment(self, tmp_path):
+        """Test that LOG_LEVEL filters records before they are queued"""
+        name = unique_name("levels")
+        with patch.dict(os.environ, {"LOG_DIR": str(tmp_path), "LOG_LEVEL": "WARNING"}):
+            logger = setup_logger(name)
+        
+        logger.info("quiet")
+        logger.warning("loud")
+        
+        content = read_log(tmp_path / f"{name}.log")
+        assert "loud" in content
+        assert "quiet" not in content
+    
+    def test_log_file_rotates_by_size(self, tmp_path):
+        """Test that the log file is rotated once it reaches LOG_MAX_BYTES"""
+        name = unique_name("rotating")
+        with patch.dict(os.environ, {"LOG_DIR": str(tmp_path), "LOG_MAX_BYTES": "1000", "LOG_BACKUP_COUNT": "2"}):
+            logger = setup_logger(name)
+        
+        for i in range(100):
+            logger.info(f"line {i} " + "x" * 50)
+        flush_logs()
+        
+        log_files = sorted(path.name for path in tmp_path.iterdir())
+        assert log_files == [f"{name}.log", f"{name}.log.1", f"{name}.log.2"]
+        assert all(path.stat().st_size <= 1000 for path in tmp_path.iterdir())
+    
+    def test_loggers_share_one_listener_thread(self, tmp_path):
+        """Test that new loggers do not add threads, and records still reach their own files"""
+        names = [unique_name("shared") for _ in range(5)]
+        with patch.dict(os.environ, {"LOG_DIR": str(tmp_path)}):
+            setup_logger(names[0])
+            threads = threading.active_count()
+            loggers = [setup_logger(name) for name in names[1:]]
+        
+        assert threading.active_count() == threads
+        for logger in loggers:
+            logger.info(f"written by {logger.name}")
+        for logger in loggers:
+            assert read_log(tmp_path / f"{logger.name}.log").strip().endswith(f"written by {logger.name}")
+
+
+class TestLogPayload:
+    """Tests for payload truncation and separate storage"""
+    
+    @pytest.fixture
+    def logger_and_dir(self, tmp_path):
+        name = unique_name("payload")
+        with patch.dict(os.environ, {"LOG_DIR": str(tmp_path)}):
+            yield setup_logger(name), tmp_path
+    
+    def test_truncate_mode(self, logger_and_dir):
+        """Test that long payloads are cut to LOG_PAYLOAD_MAX_CHARS"""
+        logger, log_dir = logger_and_dir
+        payload = "a" * 50 + "b" * 50
+        
+        with patch.dict(os.environ, {"LOG_PAYLOAD_MODE": "truncate", "LOG_PAYLOAD_MAX_CHARS": "50"}):
+            log_payload(logger, "Transcription", payload)
+        
+        content = read_log(log_dir / f"{logger.name}.log")
+        assert "Transcription (100 characters, truncated)" in content
+        assert "a" * 50 in content
+        assert "b" not in content.split("truncated")[1]
+        assert not (log_dir / f"{logger.name}_payloads.log").exists()
+    
+    def test_file_mode_stores_full_payload_separately(self, logger_and_dir):
+        """Test that file mode keeps a preview inline and the full payload in its own log"""
+        logger, log_dir = logger_and_dir
+        payload = "a" * 50 + "b" * 50
+        
+        with patch.dict(os.environ, {
+            "LOG_DIR": str(log_dir), "LOG_PAYLOAD_MODE": "file", "LOG_PAYLOAD_MAX_CHARS": "50"
+        }):
+            log_payload(logger, "Transcription", payload)
+        
+        assert "full payload in payload log" in read_log(log_dir / f"{logger.name}.log")
+        assert payload in read_log(log_dir / f"{logger.name}_payloads.log")
+    
+    def test_full_mode_and_short_payloads_are_inline(self, logger_and_dir):
+        """Test that full mode, and payloads under the limit, are logged unchanged"""
+        logger, log_dir = logger_and_dir
+        
+        with patch.dict(os.environ, {"LOG_PAYLOAD_MODE": "full", "LOG_PAYLOAD_MAX_CHARS": "10"}):
+            log_payload(logger, "Analysis JSON", "x" * 100)
+        log_payload(logger, "Short", "tiny")
+        
+        content = read_log(log_dir / f"{logger.name}.log")
+        assert "x" * 100 in content
+        assert "Short:\ntiny" in content
+    
+    def test_disabled_level_skips_payload(self, logger_and_dir):
+        """Test that nothing is built or written when the level is disabled"""
+        logger, log_dir = logger_and_dir
+        logger.setLevel(logging.WARNING)
+        
+        log_payload(logger, "Transcription", "payload")
+        
+        assert not (log_dir / f"{logger.name}.log").exists()
+
+
+def provider_error(status, headers=None):
+    """An OpenAI SDK status error as raised by a real client call"""
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", "https://api.test/v1"))
+    error_class = openai.RateLimitError if status == 429 else openai.APIStatusError
+    return error_class(f"Error code: {status}", response=response, body=None)
+
+
+class TestGetExecutor:
+    """Tests for the shared thread pools"""
+    
+    def test_resize_keeps_old_pool_usable(self):
+        """Test that a size change gives a new pool without shutting down the one in use"""
+        from app.utils.concurrency import get_executor
+        name = unique_name("pool")
+        
+        first = get_executor(name, 2)
+        assert get_executor(name, 2) is first
+        resized = get_executor(name, 3)
+        
+        assert resized is not first
+        assert resized._max_workers == 3
+        assert first.submit(lambda: "still running").result(timeout=5) == "still running"
+
+
+class TestRateLimitScheduler:
+    """Tests for provider rate limiting, retries and backoff"""
+    
+    def make_scheduler(self, **kwargs):
+        kwargs.setdefault("base_delay", 0.01)
+        return RateLimitScheduler(unique_name("provider"), **kwargs)
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_honors_retry_after(self):
+        """Test that a 429 is retried after the provider's Retry-After, then succeeds"""
+        scheduler = self.make_scheduler()
+        call = Mock(side_effect=[provider_error(429, {"retry-after-ms": "200"}), "result"])
+        
+        start = time.perf_counter()
+        result = await scheduler.run(None, call)
+        
+        assert result == "result"
+        assert time.perf_counter() - start >= 0.2
+        assert scheduler.stats["rate_limited"] == 1 and scheduler.stats["retries"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_other_callers(self):
+        """Test that one caller's 429 holds back calls that start during the pause"""
+        scheduler = self.make_scheduler()
+        first = Mock(side_effect=[provider_error(429, {"retry-after": "1"}), "first"])
+        second_called_at = []
+        
+        def second():
+            second_called_at.append(time.perf_counter())
+            return "second"
+        
+        start = time.perf_counter()
+        task = asyncio.create_task(scheduler.run(None, first))
+        await asyncio.sleep(0.1)
+        assert await scheduler.run(None, second) == "second"
+        assert await task == "first"
+        assert second_called_at[0] - start >= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_with_rate_limit_error(self):
+        """Test that a provider that keeps rate limiting surfaces RateLimitExceededError"""
+        scheduler = self.make_scheduler(max_retries=2)
+        call = Mock(side_effect=provider_error(429, {"retry-after": "0"}))
+        
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            await scheduler.run(None, call)
+        
+        assert call.call_count == 3
+        assert exc_info.value.retry_after == 0
+    
+    @pytest.mark.asyncio
+    async def test_server_errors_retry_and_client_errors_do_not(self):
+        """Test that 5xx and connection errors are retried, other errors raised at once"""
+        scheduler = self.make_scheduler()
+        flaky = Mock(side_effect=[provider_error(503), httpx.ConnectError("refused"), "ok"])
+        assert await scheduler.run(None, flaky) == "ok"
+        
+        bad_request = Mock(side_effect=provider_error(400))
+        with pytest.raises(openai.APIStatusError):
+            await scheduler.run(None, bad_request)
+        assert bad_request.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_token_budget_paces_calls(self):
+        """Test that calls wait for the tokens-per-minute budget to refill"""
+        # 6000 tokens per minute refill at 100 per second
+        scheduler = self.make_scheduler(tokens_per_minute=6000)
+        
+        await scheduler.run(None, lambda: "a", tokens=6000)
+        start = time.perf_counter()
+        await scheduler.run(None, lambda: "b", tokens=50)
+        
+        assert 0.4 <= time.perf_counter() - start < 1.0
+    
+    @pytest.mark.asyncio
+    async def test_reported_usage_refunds_the_estimate(self):
+        """Test that unused estimated tokens go back to the budget"""
+        scheduler = self.make_scheduler(tokens_per_minute=6000)
+        
+        await scheduler.run(None, lambda: "a", tokens=6000, count_tokens=lambda result: 100)
+        start = time.perf_counter()
+        await scheduler.run(None, lambda: "b", tokens=50)
+        
+        assert time.perf_counter() - start < 0.1
+    
+    @pytest.mark.asyncio
+    async def test_retries_reserve_tokens_once(self):
+        """Test that retrying a call does not take its token estimate from the budget again"""
+        scheduler = self.make_scheduler(tokens_per_minute=6000)
+        call = Mock(side_effect=[provider_error(408), provider_error(409), "ok"])
+        
+        assert await scheduler.run(None, call, tokens=3000) == "ok"
+        
+        assert scheduler.tokens.level == pytest.approx(3000, abs=50)
+    
+    @pytest.mark.asyncio
+    async def test_uncounted_failures_are_refunded(self):
+        """Test that attempts the provider never counted give their reservation back"""
+        scheduler = self.make_scheduler(requests_per_minute=60, tokens_per_minute=6000, max_retries=2)
+        flaky = Mock(side_effect=[httpx.ConnectError("refused"), provider_error(503), "ok"])
+        
+        assert await scheduler.run(None, flaky, tokens=1000) == "ok"
+        assert scheduler.requests.level == pytest.approx(59, abs=0.1)
+        assert scheduler.tokens.level == pytest.approx(5000, abs=50)
+        
+        failing = Mock(side_effect=provider_error(502))
+        with pytest.raises(openai.APIStatusError):
+            await scheduler.run(None, failing, tokens=1000)
+        assert scheduler.requests.level == pytest.approx(59, abs=0.1)
+        assert scheduler.tokens.level == pytest.approx(5000, abs=50)
+    
+    @pytest.mark.asyncio
+    async def test_request_budget_bounds_sustained_rate(self):
+        """Test that a burst beyond the requests-per-minute budget is spread out"""
+        # 600 RPM: a burst of 600, then 10 per second
+        scheduler = self.make_scheduler(requests_per_minute=600)
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(scheduler.run(None, lambda: None) for _ in range(605)))
+        
+        assert 0.45 <= time.perf_counter() - start < 1.5
+    
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that backoff grows exponentially under a random jitter and stays under max_delay"""
+        scheduler = self.make_scheduler(base_delay=1.0, max_delay=5.0)
+        delays = [scheduler._backoff(attempt) for attempt in range(10) for _ in range(20)]
+        
+        assert all(0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) > 1
+        assert all(scheduler._backoff(0) <= 1.0 for _ in range(20))
+    
+    def test_retry_after_parsing(self):
+        """Test seconds, milliseconds, HTTP-date and missing Retry-After headers"""
+        assert retry_after_seconds(provider_error(429, {"retry-after": "7"})) == 7
+        assert retry_after_seconds(provider_error(429, {"retry-after-ms": "1500"})) == 1.5
+        assert retry_after_seconds(provider_error(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+        assert retry_after_seconds(provider_error(429)) is None
+        assert retry_after_seconds(Exception("no response")) is None
+        assert is_retryable(provider_error(429)) and not is_retryable(ValueError("bad"))
+    
+    def test_schedulers_shared_per_provider(self):
+        """Test that every service of one provider shares a scheduler until limits change"""
+        with patch.dict(os.environ, {"GROQ_REQUESTS_PER_MINUTE": "30"}):
+            first = rate_limiter_from_env("groq", "GROQ")
+            assert rate_limiter_from_env("groq", "GROQ") is first
+            assert first.requests.capacity == 30
+        with patch.dict(os.environ, {"GROQ_REQUESTS_PER_MINUTE": "60"}):
+            assert rate_limiter_from_env("groq", "GROQ") is not first
+
+
+class TestProjectEdit:
+    """Tests for project_edit"""
+    
+    UNITS = ["Hello Bob, welcome.", "We ship on Friday.", "Thanks everyone."]
+    
+    def test_unchanged_units_keep_their_words(self):
+        """Test that only the unit holding an edited word changes"""
+        edited = project_edit(self.UNITS, "Hello Rob, welcome. We ship on Friday. Thanks  everyone.")
+        
+        assert edited == ["Hello Rob, welcome.", "We ship on Friday.", "Thanks everyone."]
+    
+    def test_insertions_and_deletions(self):
+        """Test that inserted words join the preceding unit and deleted units come back empty"""
+        edited = project_edit(self.UNITS, "Hi all. Hello Bob, welcome. We ship on Friday.")
+        
+        assert edited == ["Hi all. Hello Bob, welcome.", "We ship on Friday.", ""]
+    
+    def test_replacement_across_units(self):
+        """Test that a rewrite spanning two units is shared between them"""
+        edited = project_edit(self.UNITS, "Hello Bob, we ship Monday. Thanks everyone.")
+        
+        assert " ".join(edited[:2]).split() == "Hello Bob, we ship Monday.".split()
+        assert edited[2] == "Thanks everyone."
+    
+    def test_degenerate_inputs(self):
+        """Test empty units and an empty original"""
+        assert project_edit([], "Anything") == []
+        assert project_edit(["", ""], "New text") == ["New text", ""]
+        assert project_edit(self.UNITS, "") == ["", "", ""]
+
+
+class TestTextDirection:
+    """Tests for RTL detection"""
+    
+    def test_is_rtl(self):
+        """Test that direction follows the share of right-to-left letters, ignoring neutral characters"""
+        assert is_rtl("שלום לכולם")
+        assert is_rtl("مرحبا بالجميع")
+        assert is_rtl("נדבר על ה-roadmap ועל ה-API היום")  # Mostly Hebrew with English terms
+        assert not is_rtl("Hello everyone")
+        assert not is_rtl("We met with דני about the roadmap")  # Mostly English with a Hebrew name
+        assert is_rtl("2024-01-15, 10:30 — דני!")  # Digits and punctuation do not count
+        assert not is_rtl("2024-01-15")
+        assert not is_rtl("")
+    
+    def test_rtl_flags_per_text(self):
+        """Test that a batch classifies each text on its own, including empty and non-BMP ones"""
+        texts = ["Hello", "", "שלום", "😀 שלום 😀", "Hi 😀", "\ud800"]
+        
+        assert rtl_flags(texts) == [False, False, True, True, False, False]
+        assert rtl_flags([]) == []
+        assert rtl_flags(["", ""]) == [False, False]
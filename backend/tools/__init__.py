@@ -0,0 +1 @@
+# Development tools - Standalone helper scripts (not part of the application)
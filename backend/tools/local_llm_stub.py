@@ -0,0 +1,137 @@
+"""Stand-in for a local LLM server (llama.cpp's OpenAI-compatible API)
+
+Answers POST /v1/chat/completions with a deterministic meeting analysis built
+from the transcript by simple heuristics, after an optional delay that mimics
+CPU generation speed. Use it to develop and load-test the local analysis
+backend without downloading a model.
+
+Usage (from the backend directory):
+    python -m tools.local_llm_stub [--port 8080] [--delay 0.5] [--tokens-per-second 0]
+
+Then set LOCAL_LLM_ENABLED=true and LOCAL_LLM_BASE_URL=http://127.0.0.1:8080/v1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from typing import Dict, List
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+# Roughly matches estimate_tokens in app.services.analysis_backend
+CHARS_PER_TOKEN = 3
+
+SPEAKER_PATTERN = re.compile(r"(?:^|[.!?]\s+|\n)([A-Z][a-z]+):")
+DECISION_PATTERN = re.compile(r"\b(decided|agreed|approved|will go with)\b", re.IGNORECASE)
+ACTION_PATTERN = re.compile(r"\b([A-Z][a-z]+) will ([^.!?]+)")
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str = "local-stub"
+    messages: List[ChatMessage]
+    temperature: float = 0.3
+    max_tokens: int = 2000
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+
+def analyze(transcript: str) -> Dict:
+    """Heuristic meeting analysis in the shape the real prompts ask for"""
+    sentences = _sentences(transcript)
+    participants = list(dict.fromkeys(SPEAKER_PATTERN.findall(transcript)))
+    return {
+        "summary": " ".join(sentences[:3]),
+        "participants": participants,
+        "decisions": [s for s in sentences if DECISION_PATTERN.search(s)],
+        "action_items": [
+            {"task": task.strip(), "assignee": name, "deadline": None}
+            for name, task in ACTION_PATTERN.findall(transcript)
+        ]
+    }
+
+
+def reduce_summaries(user_prompt: str) -> Dict:
+    """Join the numbered per-part summaries, as the reduce prompt asks"""
+    parts = re.split(r"PART \d+:\n", user_prompt)[1:]
+    return {"summary": " ".join(part.strip() for part in parts)}
+
+
+def create_app(delay: float = 0.0, tokens_per_second: float = 0.0) -> FastAPI:
+    """
+    Build the stub server
+
+    Args:
+        delay: Fixed seconds to wait before every response
+        tokens_per_second: If set, also wait prompt tokens / this rate, like CPU prefill
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Local LLM stub")
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "local-stub", "object": "model", "owned_by": "local"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: ChatCompletionRequest):
+        system = next((m.content for m in request.messages if m.role == "system"), "")
+        user = next((m.content for m in reversed(request.messages) if m.role == "user"), "")
+        prompt_tokens = sum(len(m.content) for m in request.messages) // CHARS_PER_TOKEN
+
+        wait = delay + (prompt_tokens / tokens_per_second if tokens_per_second > 0 else 0.0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        if "summaries of consecutive parts" in system:
+            payload = reduce_summaries(user)
+        else:
+            # "TRANSCRIPTION (...):\n<transcript>\n\n<instruction>"
+            payload = analyze(user.split(":\n", 1)[-1].rsplit("\n\n", 1)[0])
+        content = json.dumps(payload, ensure_ascii=False)
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // CHARS_PER_TOKEN,
+                "total_tokens": prompt_tokens + len(content) // CHARS_PER_TOKEN
+            }
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=float(os.getenv("LOCAL_LLM_STUB_DELAY", "0")))
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated prefill speed (0 = instant)")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.delay, args.tokens_per_second), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
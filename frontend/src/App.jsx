@@ -17,6 +17,8 @@ function App() {
   const [stage, setStage] = useState('uploading');
   const [result, setResult] = useState(null);
   const [error, setError] = useState(null);
+  const [partialChunks, setPartialChunks] = useState([]);
+  const [partialSections, setPartialSections] = useState({});
 
   const handleFileSelect = (file) => {
     setSelectedFile(file);
@@ -32,33 +34,56 @@ function App() {
     setProgress(0);
     setStage('uploading');
 
+    setPartialChunks([]);
+    setPartialSections({});
+
+    // Each server event moves the progress bar and fills in partial results
+    const handleEvent = (eventName, data) => {
+      switch (eventName) {
+        case 'upload_received':
+          setStage('transcribing');
+          setProgress(15);
+          break;
+        case 'chunk_transcribed':
+          // Chunks finish out of order; keep them in timeline order
+          setPartialChunks((chunks) => {
+            const next = [...chunks];
+            next[data.index] = data.text;
+            return next;
+          });
+          // Analysis may already have started on earlier chunks; never move the bar back
+          setProgress((current) => (current >= 60 ? current : Math.min(60, current + Math.round(45 / data.total)))); // 15-60%
+          break;
+        case 'transcription_complete':
+          setPartialChunks([data.transcription]);
+          setProgress((current) => Math.max(current, 60));
+          break;
+        case 'analysis_started':
+          setStage('analyzing');
+          setProgress((current) => Math.max(current, 65));
+          break;
+        case 'analysis_segment':
+          // total is null while segments are analyzed during transcription
+          setProgress((current) => (data.total
+            ? Math.max(current, 65 + Math.round(((data.index + 1) * 25) / data.total))
+            : Math.min(90, current + 2))); // 65-90%
+          break;
+        case 'section':
+          setPartialSections((sections) => ({ ...sections, [data.name]: data.value }));
+          setProgress(95);
+          break;
+        default:
+          break;
+      }
+    };
+
     try {
-      // Upload stage
-      setProgress(10);
-      
-      const response = await apiService.transcribeAudio(
+      const response = await apiService.transcribeAudioStream(
         selectedFile,
         language === 'auto' ? null : language,
-        (progressEvent) => {
-          const percentCompleted = Math.round(
-            (progressEvent.loaded * 30) / progressEvent.total
-          );
-          setProgress(10 + percentCompleted); // 10-40%
-        }
+        handleEvent
       );
 
-      // Transcribing stage
-      setStage('transcribing');
-      setProgress(50);
-      
-      // Simulate processing time for better UX
-      await new Promise(resolve => setTimeout(resolve, 500));
-
-      // Analyzing stage
-      setStage('analyzing');
-      setProgress(75);
-      await new Promise(resolve => setTimeout(resolve, 500));
-
       // Complete
       setStage('complete');
       setProgress(100);
@@ -188,6 +213,32 @@ function App() {
                   Processing
                 </h2>
                 <ProgressBar stage={stage} progress={progress} />
+
+                {/* Text received so far */}
+                {partialChunks.length > 0 && (
+                  <div className="mt-6">
+                    <h3 className="text-sm font-medium text-gray-700 mb-2">
+                      Transcription so far
+                    </h3>
+                    <div
+                      dir="auto"
+                      className="max-h-64 overflow-y-auto p-4 bg-gray-50 rounded-lg text-gray-700 whitespace-pre-wrap"
+                    >
+                      {partialChunks.filter((text) => text !== undefined).join('\n\n')}
+                    </div>
+                  </div>
+                )}
+
+                {partialSections.summary && (
+                  <div className="mt-6">
+                    <h3 className="text-sm font-medium text-gray-700 mb-2">
+                      Summary
+                    </h3>
+                    <p dir="auto" className="p-4 bg-gray-50 rounded-lg text-gray-700">
+                      {partialSections.summary}
+                    </p>
+                  </div>
+                )}
               </div>
             )}
 
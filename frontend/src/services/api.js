@@ -49,6 +49,75 @@ class ApiService {
     }
   }
 
+  /**
+   * Transcribe audio file, receiving pipeline progress as Server-Sent Events
+   * @param {File} audioFile - Audio file (mp3/wav)
+   * @param {string|null} language - Language code ('en', 'he', or null for auto-detect)
+   * @param {Function} onEvent - Called with (eventName, data) for each progress event
+   * @returns {Promise} Transcription response (the final 'result' event)
+   */
+  async transcribeAudioStream(audioFile, language = null, onEvent = () => {}) {
+    const formData = new FormData();
+    formData.append('file', audioFile);
+
+    const url = language
+      ? `${API_BASE_URL}/api/transcribe/stream?language=${language}`
+      : `${API_BASE_URL}/api/transcribe/stream`;
+
+    // EventSource cannot POST a file, so read the event stream from fetch
+    let response;
+    try {
+      response = await fetch(url, { method: 'POST', body: formData });
+    } catch (error) {
+      console.error('Transcription error:', error);
+      throw new Error('No response from server. Please check if the backend is running.');
+    }
+
+    if (!response.ok) {
+      const body = await response.json().catch(() => ({}));
+      throw new Error(body.detail || body.message || 'Server error occurred');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let eventName = 'message';
+        let data = '';
+        block.split('\n').forEach((line) => {
+          if (line.startsWith('event: ')) eventName = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        const payload = data ? JSON.parse(data) : {};
+
+        if (eventName === 'error') {
+          throw new Error(payload.detail || 'Server error occurred');
+        }
+        if (eventName === 'result') {
+          result = payload;
+        }
+        onEvent(eventName, payload);
+      }
+    }
+
+    if (!result) {
+      throw new Error('Connection closed before the transcription finished');
+    }
+    return result;
+  }
+
   /**
    * Export transcription results to Word document
    * @param {Object} data - Transcription data